@@ -5,10 +5,15 @@
 提供Android设备控制和自动化功能接口
 """
 
+import io
+import itertools
 import json
 import logging
+import queue
 import subprocess
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
@@ -16,11 +21,111 @@ from datetime import datetime
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class ADBShellSession:
+    """设备上常驻的 adb shell 会话
+
+    命令通过同一个 shell 进程执行，每条命令后追加结束标记和退出码，
+    多条命令可一次写入（流水线），再按顺序收集各自的输出。
+    stdin 以二进制方式写入，避免 Windows 文本模式把换行转成 \r\n 传给设备端 sh。
+    """
+
+    def __init__(self, adb_path, device_id=None):
+        cmd = [adb_path]
+        if device_id:
+            cmd.extend(["-s", device_id])
+        cmd.append("shell")
+
+        self.device_id = device_id
+        self.process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT
+        )
+        self._stdout = io.TextIOWrapper(self.process.stdout, encoding="utf-8", errors="replace")
+        self._lines = queue.Queue()
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+        self._reader = threading.Thread(target=self._read_output, daemon=True)
+        self._reader.start()
+
+    def _read_output(self):
+        """后台读取 shell 输出"""
+        for line in self._stdout:
+            self._lines.put(line.rstrip("\r\n"))
+        self._lines.put(None)
+
+    def is_alive(self):
+        return self.process.poll() is None
+
+    def run_many(self, commands, timeout=30):
+        """一次发送多条命令，返回 [(输出, 退出码), ...]，顺序与 commands 一致"""
+        with self._lock:
+            markers = []
+            script = []
+            for command in commands:
+                marker = f"__ADB_MCP_END_{next(self._counter)}__"
+                markers.append(marker)
+                script.append(f"{{ {command}\n}} 2>&1; echo \"{marker} $?\"\n")
+
+            self.process.stdin.write("".join(script).encode("utf-8"))
+            self.process.stdin.flush()
+
+            deadline = time.monotonic() + timeout
+            results = []
+            for marker in markers:
+                output = []
+                while True:
+                    remaining = deadline - time.monotonic()
+                    try:
+                        if remaining <= 0:
+                            raise queue.Empty
+                        line = self._lines.get(timeout=remaining)
+                    except queue.Empty:
+                        raise TimeoutError("命令执行超时")
+                    if line is None:
+                        raise ConnectionError("adb shell 会话已断开")
+
+                    index = line.find(marker)
+                    if index < 0:
+                        output.append(line)
+                        continue
+                    if index > 0:
+                        output.append(line[:index])
+                    code = line[index + len(marker):].strip()
+                    results.append(("\n".join(output).strip(), int(code) if code.isdigit() else 0))
+                    break
+            return results
+
+    def close(self):
+        """结束会话"""
+        if self.is_alive():
+            try:
+                self.process.stdin.write(b"exit\n")
+                self.process.stdin.flush()
+                self.process.wait(timeout=2)
+            except (OSError, subprocess.TimeoutExpired):
+                self.process.kill()
+
+
 class LocalADBMCPServer:
-    def __init__(self):
+    # 常用按键映射
+    KEY_MAPPING = {
+        "home": "KEYCODE_HOME",
+        "back": "KEYCODE_BACK",
+        "menu": "KEYCODE_MENU",
+        "power": "KEYCODE_POWER",
+        "volume_up": "KEYCODE_VOLUME_UP",
+        "volume_down": "KEYCODE_VOLUME_DOWN",
+        "enter": "KEYCODE_ENTER",
+        "space": "KEYCODE_SPACE",
+        "delete": "KEYCODE_DEL"
+    }
+
+    def __init__(self, adb_path=None, base_dir=None, persistent_shell=True):
         self.server_name = "Local ADB MCP Server"
         self.version = "1.0.0"
-        self.base_dir = Path(__file__).parent
+        self.base_dir = Path(base_dir) if base_dir else Path(__file__).parent
         self.screenshots_dir = self.base_dir / "adb-screenshots"
         self.logs_dir = self.base_dir / "adb-logs"
         self.scripts_dir = self.base_dir / "adb-scripts"
@@ -31,7 +136,12 @@ class LocalADBMCPServer:
         self.scripts_dir.mkdir(exist_ok=True)
         
         # ADB可执行文件路径
-        self.adb_path = self._find_adb_path()
+        self.adb_path = adb_path or self._find_adb_path()
+        
+        # 每个设备一个常驻 shell 会话
+        self.persistent_shell = persistent_shell
+        self._shell_sessions = {}
+        self._sessions_lock = threading.Lock()
         
         logger.info(f"启动 {self.server_name} v{self.version}")
         if self.adb_path:
@@ -80,7 +190,9 @@ class LocalADBMCPServer:
             "stop_app - 停止应用",
             "get_logs - 获取系统日志",
             "push_file - 推送文件到设备",
-            "pull_file - 从设备拉取文件"
+            "pull_file - 从设备拉取文件",
+            "execute_actions - 通过同一 shell 会话批量执行操作序列",
+            "execute_actions_on_devices - 在多台设备上并发执行操作序列"
         ]
         
         logger.info("支持的功能:")
@@ -94,6 +206,10 @@ class LocalADBMCPServer:
         if not self.adb_path:
             return "错误: 未找到ADB安装路径"
         
+        # shell 命令走常驻会话，避免每条命令启动一个 adb 进程
+        if self.persistent_shell and command.startswith("shell "):
+            return self.shell(command[len("shell "):], device_id)
+        
         try:
             cmd = [self.adb_path]
             if device_id:
@@ -117,6 +233,50 @@ class LocalADBMCPServer:
         except Exception as e:
             return f"错误: {str(e)}"
     
+    def _get_shell_session(self, device_id=None):
+        """获取（必要时创建）设备的常驻 shell 会话"""
+        with self._sessions_lock:
+            session = self._shell_sessions.get(device_id)
+            if session is None or not session.is_alive():
+                session = ADBShellSession(self.adb_path, device_id)
+                self._shell_sessions[device_id] = session
+            return session
+    
+    def _close_shell_session(self, device_id=None):
+        with self._sessions_lock:
+            session = self._shell_sessions.pop(device_id, None)
+        if session:
+            session.close()
+    
+    def close_sessions(self):
+        """关闭所有常驻 shell 会话"""
+        for device_id in list(self._shell_sessions):
+            self._close_shell_session(device_id)
+    
+    def shell_batch(self, commands, device_id=None, timeout=30):
+        """在设备的常驻会话中一次执行多条 shell 命令，返回与 execute_adb_command 相同格式的结果列表"""
+        if not self.adb_path:
+            return ["错误: 未找到ADB安装路径"] * len(commands)
+        if not commands:
+            return []
+        
+        try:
+            session = self._get_shell_session(device_id)
+            results = session.run_many(commands, timeout)
+        except TimeoutError:
+            # 会话状态已不可知，丢弃后下次重建
+            self._close_shell_session(device_id)
+            return ["错误: 命令执行超时"] * len(commands)
+        except (ConnectionError, OSError) as e:
+            self._close_shell_session(device_id)
+            return [f"错误: {str(e)}"] * len(commands)
+        
+        return [output if code == 0 else f"错误: {output}" for output, code in results]
+    
+    def shell(self, command, device_id=None, timeout=30):
+        """在设备的常驻会话中执行一条 shell 命令"""
+        return self.shell_batch([command], device_id, timeout)[0]
+    
     def list_devices(self):
         """列出连接的设备"""
         result = self.execute_adb_command("devices")
@@ -135,23 +295,19 @@ class LocalADBMCPServer:
     
     def device_info(self, device_id=None):
         """获取设备信息"""
-        info = {}
-        
-        # 获取设备型号
-        model = self.execute_adb_command("shell getprop ro.product.model", device_id)
-        info["model"] = model
-        
-        # 获取Android版本
-        version = self.execute_adb_command("shell getprop ro.build.version.release", device_id)
-        info["android_version"] = version
-        
-        # 获取屏幕分辨率
-        resolution = self.execute_adb_command("shell wm size", device_id)
-        info["resolution"] = resolution
+        queries = {
+            "model": "getprop ro.product.model",                   # 设备型号
+            "android_version": "getprop ro.build.version.release", # Android版本
+            "resolution": "wm size",                               # 屏幕分辨率
+            "battery": "dumpsys battery | grep level"              # 电池信息
+        }
         
-        # 获取电池信息
-        battery = self.execute_adb_command("shell dumpsys battery | grep level", device_id)
-        info["battery"] = battery
+        if self.persistent_shell:
+            # 一次往返完成全部查询
+            results = self.shell_batch(list(queries.values()), device_id)
+        else:
+            results = [self.execute_adb_command(f"shell {q}", device_id) for q in queries.values()]
+        info = dict(zip(queries, results))
         
         logger.info(f"设备信息: {info}")
         return info
@@ -192,34 +348,106 @@ class LocalADBMCPServer:
         logger.info(f"滑动屏幕: ({x1}, {y1}) -> ({x2}, {y2})")
         return result if "错误" in result else f"已滑动: ({x1}, {y1}) -> ({x2}, {y2})"
     
+    @staticmethod
+    def _escape_text(text):
+        """转义 input text 的特殊字符"""
+        return text.replace(' ', '%s').replace('&', '\\&')
+    
     def input_text(self, text, device_id=None):
         """输入文本"""
-        # 转义特殊字符
-        escaped_text = text.replace(' ', '%s').replace('&', '\\&')
+        escaped_text = self._escape_text(text)
         result = self.execute_adb_command(f"shell input text '{escaped_text}'", device_id)
         logger.info(f"输入文本: {text}")
         return result if "错误" in result else f"已输入文本: {text}"
     
     def press_key(self, keycode, device_id=None):
         """按键操作"""
-        # 常用按键映射
-        key_mapping = {
-            "home": "KEYCODE_HOME",
-            "back": "KEYCODE_BACK",
-            "menu": "KEYCODE_MENU",
-            "power": "KEYCODE_POWER",
-            "volume_up": "KEYCODE_VOLUME_UP",
-            "volume_down": "KEYCODE_VOLUME_DOWN",
-            "enter": "KEYCODE_ENTER",
-            "space": "KEYCODE_SPACE",
-            "delete": "KEYCODE_DEL"
-        }
-        
-        key = key_mapping.get(keycode.lower(), keycode)
+        key = self.KEY_MAPPING.get(keycode.lower(), keycode)
         result = self.execute_adb_command(f"shell input keyevent {key}", device_id)
         logger.info(f"按键: {keycode}")
         return result if "错误" in result else f"已按键: {keycode}"
     
+    def _action_to_shell_command(self, action):
+        """把自动化操作转换为 shell 命令，无法在 shell 中完成的操作返回 None"""
+        action_type = action["type"]
+        if action_type == "tap":
+            return f"input tap {action['x']} {action['y']}"
+        if action_type == "swipe":
+            return f"input swipe {action['x1']} {action['y1']} {action['x2']} {action['y2']} {action.get('duration', 300)}"
+        if action_type == "input":
+            return f"input text '{self._escape_text(action['text'])}'"
+        if action_type == "key":
+            return f"input keyevent {self.KEY_MAPPING.get(action['key'].lower(), action['key'])}"
+        if action_type == "wait":
+            return f"sleep {action['seconds']}"
+        return None
+    
+    def execute_actions(self, actions, device_id=None):
+        """批量执行操作序列
+        
+        连续的 tap/swipe/input/key/wait 操作合并后一次写入设备的常驻 shell 会话，
+        截图等需要单独 adb 命令的操作会先执行完之前积累的命令。
+        
+        Returns:
+            list: 每个操作一个结果 {"step", "type", "description", "result"}
+        """
+        results = [None] * len(actions)
+        pending = []
+        
+        def flush():
+            if not pending:
+                return
+            wait_seconds = sum(float(actions[i].get("seconds", 0)) for i, _ in pending if actions[i]["type"] == "wait")
+            outputs = self.shell_batch([c for _, c in pending], device_id, timeout=30 + wait_seconds)
+            for (i, _), output in zip(pending, outputs):
+                results[i] = output
+            pending.clear()
+        
+        for i, action in enumerate(actions):
+            command = self._action_to_shell_command(action)
+            if command is not None and self.persistent_shell:
+                pending.append((i, command))
+                continue
+            
+            flush()
+            if command is not None:
+                results[i] = self.execute_adb_command(f"shell {command}", device_id)
+            elif action["type"] == "screenshot":
+                results[i] = self.take_screenshot(device_id, action.get("filename") or None)
+            else:
+                results[i] = f"错误: 未知操作类型 {action['type']}"
+        flush()
+        
+        logger.info(f"批量执行 {len(actions)} 个操作")
+        return [
+            {
+                "step": i + 1,
+                "type": action["type"],
+                "description": action.get("description", ""),
+                "result": result
+            }
+            for i, (action, result) in enumerate(zip(actions, results))
+        ]
+    
+    def execute_actions_on_devices(self, actions, device_ids=None, max_workers=None):
+        """在多台设备上并发执行同一操作序列，默认使用所有在线设备
+        
+        Returns:
+            dict: 设备ID -> execute_actions 的结果
+        """
+        if device_ids is None:
+            devices = self.list_devices()
+            if isinstance(devices, str):
+                return devices
+            device_ids = [d["id"] for d in devices if d["status"] == "device"]
+        
+        if not device_ids:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=max_workers or len(device_ids)) as executor:
+            futures = {d: executor.submit(self.execute_actions, actions, d) for d in device_ids}
+            return {d: future.result() for d, future in futures.items()}
+    
     def list_apps(self, device_id=None):
         """列出已安装应用"""
         result = self.execute_adb_command("shell pm list packages", device_id)
@@ -274,23 +502,15 @@ def main():
     # 执行自动化操作
 '''
         
+        script_content += "    actions = [\n"
         for i, action in enumerate(actions):
-            script_content += f"    # 步骤 {i+1}: {action.get('description', '')}\n"
-            
-            if action["type"] == "tap":
-                script_content += f"    server.tap_screen({action['x']}, {action['y']}, device_id)\n"
-            elif action["type"] == "swipe":
-                script_content += f"    server.swipe_screen({action['x1']}, {action['y1']}, {action['x2']}, {action['y2']}, device_id=device_id)\n"
-            elif action["type"] == "input":
-                script_content += f"    server.input_text('{action['text']}', device_id)\n"
-            elif action["type"] == "key":
-                script_content += f"    server.press_key('{action['key']}', device_id)\n"
-            elif action["type"] == "wait":
-                script_content += f"    time.sleep({action['seconds']})\n"
-            elif action["type"] == "screenshot":
-                script_content += f"    server.take_screenshot(device_id, '{action.get('filename', '')}')\n"
-            
-            script_content += "\n"
+            script_content += f"        # 步骤 {i+1}: {action.get('description', '')}\n"
+            script_content += f"        {action!r},\n"
+        script_content += "    ]\n\n"
+        script_content += "    # 连续的操作通过同一个 adb shell 会话一次发送\n"
+        script_content += "    for step in server.execute_actions(actions, device_id):\n"
+        script_content += "        print(f\"步骤 {step['step']}: {step['result']}\")\n"
+        script_content += "    server.close_sessions()\n\n"
         
         script_content += '''    print("自动化脚本执行完成")
 
@@ -346,7 +566,10 @@ if __name__ == "__main__":
 def main():
     """主函数"""
     server = LocalADBMCPServer()
-    server.run_demo()
+    try:
+        server.run_demo()
+    finally:
+        server.close_sessions()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试用的假 adb
+用本机 sh 模拟设备 shell，设备端的 input/getprop/wm/dumpsys/screencap 由脚本模拟。
+
+环境变量:
+    FAKE_ADB_HOME  工作目录，记录 adb 启动次数(launches.log)、设备端命令(<设备ID>.log)
+                   和交互式 shell 收到的原始输入(<设备ID>.stdin)
+"""
+
+import os
+import subprocess
+import sys
+import threading
+
+DEVICES = ["emulator-5554", "emulator-5556"]
+
+DEVICE_TOOLS = {
+    "input": 'echo "input $*" >> "$FAKE_ADB_HOME/$FAKE_ADB_DEVICE.log"\n',
+    "getprop": 'case "$1" in\n'
+               '  ro.product.model) echo "Fake Pixel";;\n'
+               '  ro.build.version.release) echo "14";;\n'
+               'esac\n',
+    "wm": 'echo "Physical size: 1080x1920"\n',
+    "dumpsys": 'echo "  level: 87"\necho "  scale: 100"\n',
+    "screencap": 'echo "screencap $*" >> "$FAKE_ADB_HOME/$FAKE_ADB_DEVICE.log"\n',
+}
+
+
+def relay_shell(env, stdin_log):
+    """交互式 shell：原样记录收到的字节后转发给 sh，sh 退出时结束"""
+    shell = subprocess.Popen(["sh"], stdin=subprocess.PIPE, env=env)
+
+    def forward():
+        with open(stdin_log, "ab") as log:
+            while True:
+                data = os.read(0, 65536)
+                if not data:
+                    break
+                log.write(data)
+                log.flush()
+                try:
+                    shell.stdin.write(data)
+                    shell.stdin.flush()
+                except (BrokenPipeError, ValueError):
+                    break
+        try:
+            shell.stdin.close()
+        except BrokenPipeError:
+            pass
+
+    threading.Thread(target=forward, daemon=True).start()
+    return shell.wait()
+
+
+def main():
+    home = os.environ["FAKE_ADB_HOME"]
+    args = sys.argv[1:]
+
+    with open(os.path.join(home, "launches.log"), "a", encoding="utf-8") as f:
+        f.write(" ".join(args) + "\n")
+
+    device_id = DEVICES[0]
+    if args[:1] == ["-s"]:
+        device_id = args[1]
+        args = args[2:]
+
+    if args == ["version"]:
+        print("Android Debug Bridge version 1.0.41")
+        return 0
+
+    if args == ["devices"]:
+        print("List of devices attached")
+        for d in DEVICES:
+            print(f"{d}\tdevice")
+        return 0
+
+    if args[:1] == ["pull"]:
+        open(args[2], "wb").close()
+        return 0
+
+    if args[:1] == ["shell"]:
+        bin_dir = os.path.join(home, "device-bin")
+        os.makedirs(bin_dir, exist_ok=True)
+        for name, body in DEVICE_TOOLS.items():
+            path = os.path.join(bin_dir, name)
+            if not os.path.exists(path):
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write("#!/bin/sh\n" + body)
+                os.chmod(path, 0o755)
+
+        env = dict(os.environ, FAKE_ADB_DEVICE=device_id, PATH=bin_dir + os.pathsep + os.environ["PATH"])
+        if len(args) == 1:
+            return relay_shell(env, os.path.join(home, f"{device_id}.stdin"))
+        os.execvpe("sh", ["sh", "-c", " ".join(args[1:])], env)
+
+    print(f"fake adb: unsupported command {args}", file=sys.stderr)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
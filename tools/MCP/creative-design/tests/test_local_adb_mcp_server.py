@@ -0,0 +1,94 @@
+"""本地ADB MCP服务器测试（使用 fake_adb.py 模拟设备）"""
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+TESTS_DIR = Path(__file__).parent
+sys.path.insert(0, str(TESTS_DIR.parent))
+from local_adb_mcp_server import LocalADBMCPServer
+
+
+@pytest.fixture
+def fake_home(tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_ADB_HOME", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def server(fake_home):
+    server = LocalADBMCPServer(adb_path=str(TESTS_DIR / "fake_adb.py"), base_dir=fake_home)
+    yield server
+    server.close_sessions()
+
+
+def launches(home):
+    return (home / "launches.log").read_text(encoding="utf-8").splitlines()
+
+
+def device_log(home, device_id):
+    return (home / f"{device_id}.log").read_text(encoding="utf-8").splitlines()
+
+
+def test_device_info_uses_one_shell_session(server, fake_home):
+    info = server.device_info("emulator-5554")
+
+    assert info == {
+        "model": "Fake Pixel",
+        "android_version": "14",
+        "resolution": "Physical size: 1080x1920",
+        "battery": "level: 87",
+    }
+    assert launches(fake_home) == ["-s emulator-5554 shell"]
+
+
+def test_shell_reports_failures_and_keeps_session(server, fake_home):
+    assert server.shell("exit_code_test() { return 3; }; echo partial; exit_code_test").startswith("错误: partial")
+    assert server.tap_screen(10, 20) == "已点击坐标 (10, 20)"
+    assert launches(fake_home) == ["shell"]
+
+
+def test_execute_actions_batches_over_session(server, fake_home):
+    actions = [
+        {"type": "tap", "x": 1, "y": 2},
+        {"type": "wait", "seconds": 0},
+        {"type": "swipe", "x1": 1, "y1": 2, "x2": 3, "y2": 4},
+        {"type": "screenshot", "filename": "shot.png"},
+        {"type": "input", "text": "hello world"},
+        {"type": "key", "key": "back"},
+    ]
+
+    results = server.execute_actions(actions, "emulator-5554")
+
+    assert [r["step"] for r in results] == [1, 2, 3, 4, 5, 6]
+    assert "截图已保存" in results[3]["result"]
+    assert device_log(fake_home, "emulator-5554") == [
+        "input tap 1 2",
+        "input swipe 1 2 3 4 300",
+        "screencap -p /sdcard/screenshot.png",
+        "input text hello%sworld",
+        "input keyevent KEYCODE_BACK",
+    ]
+    assert launches(fake_home).count("-s emulator-5554 shell") == 1
+
+
+def test_execute_actions_on_all_devices(server, fake_home):
+    results = server.execute_actions_on_devices([{"type": "tap", "x": 5, "y": 6}])
+
+    assert set(results) == {"emulator-5554", "emulator-5556"}
+    for device_id in results:
+        assert device_log(fake_home, device_id) == ["input tap 5 6"]
+
+
+def test_session_sends_unix_newlines(server, fake_home):
+    """写入 shell 的脚本不经过文本模式换行转换（Windows 上会变成 \\r\\n）"""
+    assert server.tap_screen(1, 2) == "已点击坐标 (1, 2)"
+    assert server.shell("echo ok") == "ok"
+    session = next(iter(server._shell_sessions.values()))
+    assert not isinstance(session.process.stdin, io.TextIOBase)
+    server.close_sessions()
+
+    raw = (fake_home / "emulator-5554.stdin").read_bytes()
+    assert raw and b"\r" not in raw
+    assert device_log(fake_home, "emulator-5554") == ["input tap 1 2"]
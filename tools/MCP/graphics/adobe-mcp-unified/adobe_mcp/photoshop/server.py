@@ -21,9 +21,14 @@
 # SOFTWARE.
 
 from mcp.server.fastmcp import FastMCP, Image
-from ..shared import init, sendCommand, createCommand, list_all_fonts_postscript
+from ..shared import init, sendCommand, createCommand, sendBatch, list_all_fonts_postscript
 from ..shared import socket_client
-import numpy as np
+from ..shared.image_transfer import (
+    new_raw_transfer_path,
+    raw_pixel_array,
+    save_pixels_as_png,
+    release_raw_transfer
+)
 import base64
 import sys
 import os
@@ -245,18 +250,26 @@ def group_layers(group_name: str, layer_ids: list[str]) -> list:
     return sendCommand(command)
 
 @mcp.tool()
-def get_document_image():
-    """Returns a jpeg of the current visible Photoshop document as an MCP Image object that can be displayed."""
-    command = createCommand("getDocumentImage", {})
+def get_document_image(max_dimension: int = 0):
+    """Returns a jpeg of the current visible Photoshop document as an MCP Image object that can be displayed.
+
+    Args:
+        max_dimension (int, optional): If set, the image is downscaled in Photoshop so that its
+            longest side is at most this many pixels. Use for quick previews of large documents.
+            Defaults to 0 (full size).
+    """
+    options = {}
+    if max_dimension:
+        options["maxDimension"] = max_dimension
+
+    command = createCommand("getDocumentImage", options)
     response = sendCommand(command)
 
     if response.get('status') == 'SUCCESS' and 'response' in response:
         image_data = response['response']
-        data_url = image_data.get('dataUrl')
+        base64_data = image_data.get('base64Image')
 
-        if data_url and data_url.startswith("data:image/jpeg;base64,"):
-            # Strip the data URL prefix and decode the base64 JPEG bytes
-            base64_data = data_url.split(",", 1)[1]
+        if base64_data:
             jpeg_bytes = base64.b64decode(base64_data)
 
             return Image(data=jpeg_bytes, format="jpeg")
@@ -264,56 +277,62 @@ def get_document_image():
     return response
 
 @mcp.tool()
-def save_document_image_as_png(file_path: str):
+def save_document_image_as_png(file_path: str, max_dimension: int = 0, tile_size: int = 0):
     """
     Capture the Photoshop document and save as PNG file
-    
+
+    Pixels are transferred from Photoshop as raw data through a temporary file, so
+    very large canvases can be captured without holding encoded copies in memory.
+
     Args:
         file_path: Where to save the PNG file
-        
+        max_dimension: If set, downscale in Photoshop so the longest side is at most this many pixels
+        tile_size: If set, write the image as square PNG tiles of this size named
+            <name>_r<row>_c<col>.png next to file_path instead of a single file
+
     Returns:
         dict: Status and file info
     """
-    command = createCommand("getDocumentImage", {})
-    response = sendCommand(command)
-    
-    if response.get('format') == 'raw' and 'rawDataBase64' in response:
-        try:
-            # Decode raw data
-            raw_bytes = base64.b64decode(response['rawDataBase64'])
-            
-            # Extract metadata
-            width = response['width']
-            height = response['height']
-            components = response['components']
-            
-            # Convert to numpy array and reshape
-            pixel_array = np.frombuffer(raw_bytes, dtype=np.uint8)
-            image_array = pixel_array.reshape((height, width, components))
-            
-            # Create and save PNG
-            mode = 'RGBA' if components == 4 else 'RGB'
-            image = Image.fromarray(image_array, mode)
-            image.save(file_path, 'PNG')
-            
-            return {
-                'status': 'success',
-                'file_path': file_path,
-                'width': width,
-                'height': height,
-                'size_bytes': os.path.getsize(file_path)
-            }
-            
-        except Exception as e:
+    options = {
+        "format":"raw",
+        "rawFilePath":new_raw_transfer_path()
+    }
+    if max_dimension:
+        options["maxDimension"] = max_dimension
+
+    command = createCommand("getDocumentImage", options)
+
+    image_data = {"rawFilePath":options["rawFilePath"]}
+    pixels = None
+    try:
+        response = sendCommand(command)
+        image_data = response.get('response') or image_data
+
+        if image_data.get('format') != 'raw':
             return {
                 'status': 'error',
-                'error': str(e)
+                'error': 'No raw image data received'
             }
-    else:
+
+        pixels = raw_pixel_array(image_data)
+        written = save_pixels_as_png(pixels, file_path, tile_size)
+
+        return {
+            'status': 'success',
+            'file_path': file_path,
+            'files': written,
+            'width': image_data['width'],
+            'height': image_data['height'],
+            'size_bytes': sum(os.path.getsize(f) for f in written)
+        }
+
+    except Exception as e:
         return {
             'status': 'error',
-            'error': 'No raw image data received'
+            'error': str(e)
         }
+    finally:
+        release_raw_transfer(image_data, pixels)
 
 @mcp.tool()
 def get_layers() -> list:
@@ -1428,6 +1447,30 @@ def apply_motion_blur(layer_id: int, angle: int = 0, distance: float = 30):
     return sendCommand(command)
 
 
+@mcp.tool()
+def batch(commands: list[dict], stop_on_error: bool = False):
+    """Runs several Photoshop commands in a single request and returns their results in order.
+
+    Use this instead of calling many individual tools when performing repetitive
+    work (for example renaming, moving or exporting many layers), since all
+    commands are sent to Photoshop in one exchange.
+
+    Args:
+        commands (list[dict]): Commands to run, in order. Each dict has:
+            - "action" (str): The command name used by the plugin, e.g. "renameLayer"
+                with options {"layerId": 2, "newLayerName": "Title"}.
+            - "options" (dict): The options for that command.
+        stop_on_error (bool): If True, commands after the first failure are skipped.
+            Defaults to False, so every command is attempted.
+
+    Returns:
+        dict: Response whose "response"["results"] list holds one entry per command
+            with index, action, status (SUCCESS, FAILURE or SKIPPED) and its response
+            or error message. "summary" holds the counts and "failures" the failed entries.
+    """
+
+    return sendBatch(commands, stop_on_error)
+
 @mcp.resource("config://get_instructions")
 def get_instructions() -> str:
     """Read this first! Returns information and instructions on how to use Photoshop and this API"""
@@ -22,27 +22,36 @@
 
 import os
 import sys
-import glob
+import json
+import difflib
+from concurrent.futures import ProcessPoolExecutor
 from fontTools.ttLib import TTFont
 
-def list_all_fonts_postscript():
+FONT_EXTENSIONS = ('.ttf', '.ttc', '.otf')
+FONT_INDEX_VERSION = 1
+#below this many changed files the index is built in-process
+PARALLEL_SCAN_THRESHOLD = 64
+
+_font_index = None
+
+def get_font_directories():
     """
-    Returns a list of PostScript names for all fonts installed on the system.
-    Works on both Windows and macOS.
-    
+    Returns the font directories for the current platform.
+    Works on Windows, macOS and Linux.
+
     Returns:
-        list: A list of PostScript font names as strings
+        list: Font directory paths (not all of them necessarily exist)
     """
-    postscript_names = []
-    
-    # Get font directories based on platform
     font_dirs = []
-    
+
     if sys.platform == 'win32':  # Windows
         # Windows font directory
         if 'WINDIR' in os.environ:
             font_dirs.append(os.path.join(os.environ['WINDIR'], 'Fonts'))
-    
+        # Fonts installed for the current user only
+        if 'LOCALAPPDATA' in os.environ:
+            font_dirs.append(os.path.join(os.environ['LOCALAPPDATA'], 'Microsoft', 'Windows', 'Fonts'))
+
     elif sys.platform == 'darwin':  # macOS
         # macOS system font directories
         font_dirs.extend([
@@ -50,59 +59,254 @@ def list_all_fonts_postscript():
             '/Library/Fonts',
             os.path.expanduser('~/Library/Fonts')
         ])
-    
-    else:
-        print(f"Unsupported platform: {sys.platform}")
-        return []
-    
-    # Get all font files from all directories
-    font_extensions = ['*.ttf', '*.ttc', '*.otf']
-    font_files = []
-    
-    for font_dir in font_dirs:
-        if os.path.exists(font_dir):
-            for ext in font_extensions:
-                font_files.extend(glob.glob(os.path.join(font_dir, ext)))
-                # Also check subdirectories on macOS
-                if sys.platform == 'darwin':
-                    font_files.extend(glob.glob(os.path.join(font_dir, '**', ext), recursive=True))
-    
-    # Process each font file
-    for font_path in font_files:
+
+    else:  # Linux and other freedesktop systems
+        font_dirs.extend([
+            '/usr/share/fonts',
+            '/usr/local/share/fonts',
+            os.path.expanduser('~/.local/share/fonts'),
+            os.path.expanduser('~/.fonts')
+        ])
+
+    return font_dirs
+
+def get_font_index_cache_path():
+    """
+    Returns the path of the on-disk font index cache.
+
+    The location can be overridden with the ADOBE_MCP_CACHE_DIR environment variable.
+    """
+    cache_dir = os.environ.get('ADOBE_MCP_CACHE_DIR')
+    if not cache_dir:
+        if sys.platform == 'win32' and 'LOCALAPPDATA' in os.environ:
+            cache_dir = os.path.join(os.environ['LOCALAPPDATA'], 'adobe_mcp')
+        else:
+            cache_dir = os.path.join(os.path.expanduser('~'), '.cache', 'adobe_mcp')
+    return os.path.join(cache_dir, 'font_index.json')
+
+def _normalize_font_name(name):
+    return "".join(c for c in name.lower() if c.isalnum())
+
+def _scan_font_file(font_path):
+    """
+    Reads the naming information of every font in a font file.
+
+    Returns:
+        list: One dict per font with postscript_name, family, style, full_name, file and index
+    """
+    records = []
+    is_collection = font_path.lower().endswith('.ttc')
+    try:
+        if is_collection:
+            ttc = TTFont(font_path, fontNumber=0, lazy=True)
+            num_fonts = ttc.reader.numFonts
+            ttc.close()
+        else:
+            num_fonts = 1
+    except Exception as e:
+        print(f"Error determining number of fonts in {font_path}: {e}", file=sys.stderr)
+        return records
+
+    for i in range(num_fonts):
         try:
-            # TrueType Collections (.ttc files) can contain multiple fonts
-            if font_path.lower().endswith('.ttc'):
-                try:
-                    ttc = TTFont(font_path, fontNumber=0)
-                    num_fonts = ttc.reader.numFonts
-                    ttc.close()
-                    
-                    # Extract PostScript name from each font in the collection
-                    for i in range(num_fonts):
-                        try:
-                            font = TTFont(font_path, fontNumber=i)
-                            ps_name = _extract_postscript_name(font)
-                            if ps_name and not ps_name.startswith('.'):
-                                postscript_names.append(ps_name)
-                            font.close()
-                        except Exception as e:
-                            print(f"Error processing font {i} in collection {font_path}: {e}")
-                except Exception as e:
-                    print(f"Error determining number of fonts in collection {font_path}: {e}")
+            if is_collection:
+                font = TTFont(font_path, fontNumber=i, lazy=True)
             else:
-                # Regular TTF/OTF file
-                try:
-                    font = TTFont(font_path)
-                    ps_name = _extract_postscript_name(font)
-                    if ps_name:
-                        postscript_names.append(ps_name)
-                    font.close()
-                except Exception as e:
-                    print(f"Error processing font {font_path}: {e}")
+                font = TTFont(font_path, lazy=True)
+            try:
+                ps_name = _extract_postscript_name(font)
+                if not ps_name or ps_name.startswith('.'):
+                    continue
+                name_table = font['name'] if 'name' in font else None
+                family = style = full_name = None
+                if name_table is not None:
+                    family = name_table.getDebugName(16) or name_table.getDebugName(1)
+                    style = name_table.getDebugName(17) or name_table.getDebugName(2)
+                    full_name = name_table.getDebugName(4)
+                records.append({
+                    "postscript_name": ps_name,
+                    "family": family or ps_name,
+                    "style": style or "Regular",
+                    "full_name": full_name or ps_name,
+                    "file": font_path,
+                    "index": i
+                })
+            finally:
+                font.close()
         except Exception as e:
-            print(f"Error with font file {font_path}: {e}")
- 
-    return list(set(postscript_names))
+            print(f"Error processing font {i} in {font_path}: {e}", file=sys.stderr)
+
+    return records
+
+def _scan_font_files(font_paths):
+    return [(path, _scan_font_file(path)) for path in font_paths]
+
+def _walk_font_directories(font_dirs):
+    """Returns ({directory: mtime}, [font file paths]) for the existing font directories."""
+    dir_mtimes = {}
+    font_files = []
+    for font_dir in font_dirs:
+        if not os.path.isdir(font_dir):
+            continue
+        for root, dirs, files in os.walk(font_dir):
+            try:
+                dir_mtimes[root] = os.stat(root).st_mtime
+            except OSError:
+                continue
+            for name in files:
+                if name.lower().endswith(FONT_EXTENSIONS):
+                    font_files.append(os.path.join(root, name))
+    return dir_mtimes, font_files
+
+class FontIndex:
+    """
+    Index of installed fonts with lookup by PostScript or display name.
+
+    Records are dicts with postscript_name, family, style, full_name, file and index
+    (the font number inside a .ttc collection).
+    """
+
+    def __init__(self, records):
+        self.records = records
+        self.by_postscript_name = {}
+        self._by_display_name = {}
+
+        for record in records:
+            self.by_postscript_name.setdefault(record["postscript_name"], record)
+            for name in (
+                record["postscript_name"],
+                record["full_name"],
+                f'{record["family"]} {record["style"]}'
+            ):
+                self._by_display_name.setdefault(_normalize_font_name(name), record)
+            if record["style"].lower() in ("regular", "normal", "roman", "book"):
+                self._by_display_name.setdefault(_normalize_font_name(record["family"]), record)
+
+    def postscript_names(self):
+        """Returns the unique PostScript names in the index."""
+        return list(self.by_postscript_name)
+
+    def find(self, display_name, cutoff=0.8):
+        """
+        Finds the font record for a display name such as "Arial Bold" or "Arial-BoldMT".
+
+        Exact PostScript names match first, then names compared ignoring case, spaces and
+        punctuation, then the closest fuzzy match above the cutoff.
+
+        Returns:
+            dict: The matching record, or None if nothing is close enough
+        """
+        if display_name in self.by_postscript_name:
+            return self.by_postscript_name[display_name]
+
+        key = _normalize_font_name(display_name)
+        if key in self._by_display_name:
+            return self._by_display_name[key]
+
+        matches = difflib.get_close_matches(key, self._by_display_name.keys(), n=1, cutoff=cutoff)
+        if matches:
+            return self._by_display_name[matches[0]]
+        return None
+
+def build_font_index(font_dirs=None, cache_path=None, max_workers=None):
+    """
+    Builds the font index, reusing the on-disk cache where possible.
+
+    When none of the font directory mtimes changed the cached index is returned without
+    opening any font. Otherwise only new or modified files are parsed, in parallel across
+    a process pool when there are many of them, and the cache is rewritten.
+
+    Args:
+        font_dirs (list, optional): Directories to index, defaults to get_font_directories()
+        cache_path (str, optional): Cache file, defaults to get_font_index_cache_path()
+        max_workers (int, optional): Process pool size
+
+    Returns:
+        FontIndex: The font index
+    """
+    font_dirs = font_dirs if font_dirs is not None else get_font_directories()
+    cache_path = cache_path or get_font_index_cache_path()
+
+    cache = {}
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get("version") != FONT_INDEX_VERSION:
+            cache = {}
+    except (OSError, ValueError):
+        cache = {}
+
+    cached_files = cache.get("files", {})
+    dir_mtimes, font_files = _walk_font_directories(font_dirs)
+
+    if cache and cache.get("dirs") == dir_mtimes:
+        return FontIndex([r for entry in cached_files.values() for r in entry["fonts"]])
+
+    files = {}
+    to_scan = []
+    for path in font_files:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        entry = cached_files.get(path)
+        if entry and entry["size"] == st.st_size and entry["mtime"] == st.st_mtime:
+            files[path] = entry
+        else:
+            files[path] = {"size": st.st_size, "mtime": st.st_mtime, "fonts": []}
+            to_scan.append(path)
+
+    if len(to_scan) >= PARALLEL_SCAN_THRESHOLD and max_workers != 1:
+        workers = max_workers or os.cpu_count() or 1
+        chunk_size = max(1, len(to_scan) // (workers * 4))
+        chunks = [to_scan[i:i + chunk_size] for i in range(0, len(to_scan), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for results in executor.map(_scan_font_files, chunks):
+                for path, records in results:
+                    files[path]["fonts"] = records
+    else:
+        for path, records in _scan_font_files(to_scan):
+            files[path]["fonts"] = records
+
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": FONT_INDEX_VERSION, "dirs": dir_mtimes, "files": files}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Could not write font index cache {cache_path}: {e}", file=sys.stderr)
+
+    return FontIndex([r for entry in files.values() for r in entry["fonts"]])
+
+def get_font_index(refresh=False):
+    """Returns the font index for the system font directories, built once per process."""
+    global _font_index
+    if _font_index is None or refresh:
+        _font_index = build_font_index()
+    return _font_index
+
+def find_font(display_name):
+    """
+    Returns the PostScript name for a font display name, or None if not installed.
+
+    Args:
+        display_name (str): Name such as "Arial Bold", "Helvetica Neue" or a PostScript name
+    """
+    record = get_font_index().find(display_name)
+    return record["postscript_name"] if record else None
+
+def list_all_fonts_postscript():
+    """
+    Returns a list of PostScript names for all fonts installed on the system.
+    Works on Windows, macOS and Linux.
+
+    Fonts are read from a cached index that is only rebuilt for files that changed.
+
+    Returns:
+        list: A list of PostScript font names as strings
+    """
+    return get_font_index().postscript_names()
 
 def _extract_postscript_name(font):
     """
@@ -143,4 +347,4 @@ def _extract_postscript_name(font):
 
 if __name__ == "__main__":
     font_names = list_all_fonts_postscript()
-    print(f"Number of fonts found: {len(font_names)}")
\ No newline at end of file
+    print(f"Number of fonts found: {len(font_names)}")
@@ -0,0 +1,75 @@
+"""Test the cached system font index."""
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("fontTools")
+from fontTools.fontBuilder import FontBuilder
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "adobe_mcp" / "shared"))
+import fonts
+
+
+def make_font(path, family, style):
+    """Write a minimal TrueType font with the given naming."""
+    ps_name = f"{family.replace(' ', '')}-{style.replace(' ', '')}"
+    fb = FontBuilder(1000, isTTF=True)
+    fb.setupGlyphOrder([".notdef"])
+    fb.setupCharacterMap({})
+    fb.setupGlyf({".notdef": _empty_glyph()})
+    fb.setupHorizontalMetrics({".notdef": (500, 0)})
+    fb.setupHorizontalHeader(ascent=800, descent=-200)
+    fb.setupNameTable({
+        "familyName": family,
+        "styleName": style,
+        "fullName": f"{family} {style}",
+        "psName": ps_name,
+    })
+    fb.setupOS2()
+    fb.setupPost()
+    fb.save(str(path))
+    return ps_name
+
+
+def _empty_glyph():
+    from fontTools.pens.ttGlyphPen import TTGlyphPen
+    return TTGlyphPen(None).glyph()
+
+
+@pytest.fixture
+def font_dir(tmp_path):
+    d = tmp_path / "fonts"
+    (d / "sub").mkdir(parents=True)
+    make_font(d / "Demo-Regular.ttf", "Demo Sans", "Regular")
+    make_font(d / "sub" / "Demo-Bold.ttf", "Demo Sans", "Bold")
+    return d
+
+
+def test_index_lookup(font_dir, tmp_path):
+    index = fonts.build_font_index([str(font_dir)], cache_path=str(tmp_path / "index.json"))
+
+    assert sorted(index.postscript_names()) == ["DemoSans-Bold", "DemoSans-Regular"]
+    assert index.find("DemoSans-Bold")["style"] == "Bold"
+    assert index.find("Demo Sans Bold")["postscript_name"] == "DemoSans-Bold"
+    assert index.find("demo sans")["postscript_name"] == "DemoSans-Regular"
+    assert index.find("Demo Sans Bld")["postscript_name"] == "DemoSans-Bold"
+    assert index.find("Completely Different") is None
+
+
+def test_cache_reused_until_directory_changes(font_dir, tmp_path, monkeypatch):
+    cache_path = str(tmp_path / "index.json")
+    fonts.build_font_index([str(font_dir)], cache_path=cache_path)
+
+    scanned = []
+    original = fonts._scan_font_file
+    monkeypatch.setattr(fonts, "_scan_font_file", lambda p: scanned.append(p) or original(p))
+
+    index = fonts.build_font_index([str(font_dir)], cache_path=cache_path)
+    assert scanned == []
+    assert len(index.records) == 2
+
+    make_font(font_dir / "Other-Italic.ttf", "Other Serif", "Italic")
+    index = fonts.build_font_index([str(font_dir)], cache_path=cache_path)
+    assert scanned == [str(font_dir / "Other-Italic.ttf")]
+    assert index.find("Other Serif Italic")["postscript_name"] == "OtherSerif-Italic"
@@ -82,8 +82,45 @@ const parseAndRouteCommand = async (command) => {
 };
 
 
+//runs a list of commands sent in a single packet, in order, and returns a
+//result entry for each one so that partial failures can be reported
+const batch = async (command) => {
+    let options = command.options;
+    let commands = options.commands || [];
+    let stopOnError = options.stopOnError;
+
+    let results = [];
+    let failed = false;
+
+    for (let i = 0; i < commands.length; i++) {
+        let c = commands[i];
+
+        if (failed && stopOnError) {
+            results.push({ index: i, action: c.action, status: "SKIPPED" });
+            continue;
+        }
+
+        try {
+            await checkRequiresActiveDocument(c);
+            let response = await parseAndRouteCommand(c);
+            results.push({ index: i, action: c.action, status: "SUCCESS", response: response });
+        } catch (e) {
+            failed = true;
+            results.push({
+                index: i,
+                action: c.action,
+                status: "FAILURE",
+                message: `Error calling ${c.action} : ${e}`,
+            });
+        }
+    }
+
+    return { results: results };
+};
+
 const commandHandlers = {
-    createDocument
+    createDocument,
+    batch
 };
 
 
@@ -112,7 +149,7 @@ const getActiveDocumentSettings = (command) => {
 }
 
 const checkRequiresActiveDocument = async (command) => {
-    if (!requiresActiveProject(command)) {
+    if (!requiresActiveDocument(command)) {
         return;
     }
 
@@ -125,7 +162,7 @@ const checkRequiresActiveDocument = async (command) => {
 };
 
 const requiresActiveDocument = (command) => {
-    return !["createDocument"].includes(command.action);
+    return !["createDocument", "batch"].includes(command.action);
 };
 
 
@@ -2,10 +2,7 @@ import subprocess
 import tempfile
 import os
 import asyncio
-import base64
-import io
 import logging
-import time
 import json
 import sys
 
@@ -13,7 +10,6 @@ import mcp.types as types
 from mcp.server.models import InitializationOptions
 from mcp.server import NotificationOptions, Server
 import mcp.server.stdio
-from PIL import ImageGrab
 
 # Handle win32com import with better error handling
 try:
@@ -34,6 +30,7 @@ from .prompt import (
     display_help,
     format_advanced_template
 )
+from .capture import IllustratorCapture
 
 # Set up logging
 logging.basicConfig(
@@ -43,6 +40,7 @@ logging.basicConfig(
 )
 
 server = Server("illustrator")
+screen_capture = IllustratorCapture()
 
 @server.list_tools()
 async def handle_list_tools() -> list[types.Tool]:
@@ -51,7 +49,15 @@ async def handle_list_tools() -> list[types.Tool]:
         types.Tool(
             name="view",
             description="View a screenshot of the Adobe Illustrator window",
-            inputSchema={"type": "object", "properties": {}},
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "max_dimension": {
+                        "type": "integer",
+                        "description": "Optional: Longest side of the returned image in pixels (default 1280)"
+                    }
+                }
+            },
         ),
         types.Tool(
             name="run",
@@ -123,20 +129,14 @@ async def handle_list_tools() -> list[types.Tool]:
         ),
     ]
 
-def capture_illustrator() -> list[types.TextContent | types.ImageContent]:
+def capture_illustrator(max_dimension: int | None = None) -> list[types.TextContent | types.ImageContent]:
     logging.info("Starting screenshot capture for Illustrator.")
     if not WIN32_AVAILABLE:
         return [types.TextContent(type="text", text="Win32 COM not available. Please install pywin32 and restart the server.")]
     
     try:
-        shell = win32com.client.Dispatch("WScript.Shell")
-        shell.AppActivate("Adobe Illustrator")
-        time.sleep(1)
-        screenshot = ImageGrab.grab()
-        buffer = io.BytesIO()
-        screenshot.save(buffer, format="JPEG", quality=50, optimize=True)
-        screenshot_data = base64.b64encode(buffer.getvalue()).decode("utf-8")
-        logging.info("Screenshot captured successfully.")
+        screenshot_data, changed = screen_capture.capture(max_dimension)
+        logging.info("Screenshot captured successfully." if changed else "Screenshot unchanged, reused cached image.")
         return [types.ImageContent(type="image", mimeType="image/jpeg", data=screenshot_data)]
     except Exception as e:
         logging.error(f"Failed to capture screenshot: {str(e)}")
@@ -167,7 +167,8 @@ async def handle_call_tool(name: str, arguments: dict | None):
     logging.info(f"Received tool call: {name} with arguments: {arguments}")
     
     if name == "view":
-        return capture_illustrator()
+        max_dimension = arguments.get("max_dimension") if arguments else None
+        return capture_illustrator(max_dimension)
     
     elif name == "run":
         if not arguments or "code" not in arguments:
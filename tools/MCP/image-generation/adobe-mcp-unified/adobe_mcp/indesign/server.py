@@ -21,7 +21,7 @@
 # SOFTWARE.
 
 from mcp.server.fastmcp import FastMCP
-from ..shared import init, sendCommand, createCommand, socket_client
+from ..shared import init, sendCommand, createCommand, sendBatch, socket_client
 import sys
 
 #logger.log(f"Python path: {sys.executable}")
@@ -66,6 +66,29 @@ def create_document(
 
     return sendCommand(command)
 
+@mcp.tool()
+def batch(commands: list[dict], stop_on_error: bool = False):
+    """Runs several InDesign commands in a single request and returns their results in order.
+
+    Use this instead of calling many individual tools when performing repetitive
+    work (for example renaming, moving or exporting many layers), since all
+    commands are sent to InDesign in one exchange.
+
+    Args:
+        commands (list[dict]): Commands to run, in order. Each dict has:
+            - "action" (str): The command name used by the plugin, e.g. "createDocument".
+            - "options" (dict): The options for that command.
+        stop_on_error (bool): If True, commands after the first failure are skipped.
+            Defaults to False, so every command is attempted.
+
+    Returns:
+        dict: Response whose "response"["results"] list holds one entry per command
+            with index, action, status (SUCCESS, FAILURE or SKIPPED) and its response
+            or error message. "summary" holds the counts and "failures" the failed entries.
+    """
+
+    return sendBatch(commands, stop_on_error)
+
 @mcp.resource("config://get_instructions")
 def get_instructions() -> str:
     """Read this first! Returns information and instructions on how to use Photoshop and this API"""
@@ -1,18 +1,23 @@
 """Shared utilities for Adobe MCP servers."""
 
-from .core import init, sendCommand, createCommand
+from .core import init, sendCommand, createCommand, sendBatch, createBatchCommand
 from .socket_client import configure, connect, disconnect, send_command
 from .logger import log
-from .fonts import list_all_fonts_postscript
+from .fonts import list_all_fonts_postscript, find_font, get_font_index, FontIndex
 
 __all__ = [
     "init",
     "sendCommand", 
     "createCommand",
+    "sendBatch",
+    "createBatchCommand",
     "configure",
     "connect",
     "disconnect",
     "send_command",
     "log",
-    "list_all_fonts_postscript"
+    "list_all_fonts_postscript",
+    "find_font",
+    "get_font_index",
+    "FontIndex"
 ]
\ No newline at end of file
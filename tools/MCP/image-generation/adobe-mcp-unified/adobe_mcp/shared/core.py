@@ -3,6 +3,9 @@ import logger
 application = None
 socket_client = None
 
+#extra seconds allowed per command when a batch is sent in a single packet
+BATCH_TIMEOUT_PER_COMMAND = 2
+
 def init(app, socket):
     global application, socket_client
     application = app
@@ -18,9 +21,65 @@ def createCommand(action:str, options:dict) -> str:
 
     return command
 
-def sendCommand(command:dict):
+def sendCommand(command:dict, timeout=None):
+
+    response = socket_client.send_message_blocking(command, timeout=timeout)
 
-    response = socket_client.send_message_blocking(command)
-    
     logger.log(f"Final response: {response['status']}")
-    return response
\ No newline at end of file
+    return response
+
+
+def createBatchCommand(commands:list, stop_on_error:bool = False) -> dict:
+    """
+    Wraps a list of {"action", "options"} dicts into a single batch command
+    that the plugin executes in order and answers with one response packet.
+    """
+
+    if not commands:
+        raise ValueError("Batch requires at least one command")
+
+    batch_commands = []
+    for index, c in enumerate(commands):
+        if not isinstance(c, dict) or not c.get("action"):
+            raise ValueError(f"Batch command {index} is missing an 'action'")
+        batch_commands.append(createCommand(c["action"], c.get("options") or {}))
+
+    return createCommand("batch", {
+        "commands":batch_commands,
+        "stopOnError":stop_on_error
+    })
+
+def sendBatch(commands:list, stop_on_error:bool = False):
+    """
+    Sends a list of commands to the application in one exchange and returns
+    the per-command results in order, with a summary of any failures.
+
+    Each entry of the returned response["response"]["results"] has an index,
+    action and status (SUCCESS, FAILURE or SKIPPED), plus either the command
+    response or an error message.
+    """
+
+    command = createBatchCommand(commands, stop_on_error)
+
+    timeout = None
+    if socket_client.proxy_timeout:
+        timeout = socket_client.proxy_timeout + BATCH_TIMEOUT_PER_COMMAND * len(commands)
+
+    response = sendCommand(command, timeout=timeout)
+
+    results = (response.get("response") or {}).get("results", [])
+    summary = {"total":len(commands), "succeeded":0, "failed":0, "skipped":0}
+    for r in results:
+        status = r.get("status")
+        if status == "SUCCESS":
+            summary["succeeded"] += 1
+        elif status == "FAILURE":
+            summary["failed"] += 1
+        else:
+            summary["skipped"] += 1
+
+    response["summary"] = summary
+    response["failures"] = [r for r in results if r.get("status") == "FAILURE"]
+
+    logger.log(f"Batch complete: {summary}")
+    return response
@@ -0,0 +1,110 @@
+"""Raw pixel transfer helpers for application document captures.
+
+Large canvases are handed off from the plugin either through a temporary file
+(read back with a memory map) or as a Socket.IO binary attachment, so pixel
+data is never base64 encoded and is only copied when it is finally encoded.
+"""
+
+import base64
+import os
+import tempfile
+
+import numpy as np
+from PIL import Image as PILImage
+
+import logger
+
+
+def new_raw_transfer_path(prefix="adobe_mcp_"):
+    """
+    Creates an empty temporary file that the plugin can write raw pixels into.
+
+    Returns:
+        str: Absolute path of the temporary file
+    """
+    fd, path = tempfile.mkstemp(prefix=prefix, suffix=".raw")
+    os.close(fd)
+    return path
+
+
+def raw_pixel_array(image_data):
+    """
+    Returns a (height, width, components) uint8 view over the raw pixels in a
+    getDocumentImage response without copying them.
+
+    Args:
+        image_data (dict): The "response" part of a raw getDocumentImage reply
+
+    Returns:
+        numpy.ndarray: Pixel array backed by the file mapping or received buffer
+    """
+    shape = (image_data['height'], image_data['width'], image_data['components'])
+
+    if image_data.get('rawFilePath'):
+        return np.memmap(image_data['rawFilePath'], dtype=np.uint8, mode='r', shape=shape)
+
+    if image_data.get('rawData') is not None:
+        raw = image_data['rawData']
+    elif image_data.get('rawDataBase64'):
+        raw = base64.b64decode(image_data['rawDataBase64'])
+    else:
+        raise ValueError("No raw image data received")
+
+    return np.frombuffer(raw, dtype=np.uint8).reshape(shape)
+
+
+def _to_pil(pixels):
+    if pixels.shape[2] == 1:
+        return PILImage.fromarray(pixels[:, :, 0], 'L')
+    if pixels.shape[2] == 4:
+        return PILImage.fromarray(pixels, 'RGBA')
+    return PILImage.fromarray(pixels[:, :, :3], 'RGB')
+
+
+def save_pixels_as_png(pixels, file_path, tile_size=0):
+    """
+    Saves a pixel array as PNG, optionally split into square tiles.
+
+    Tiles are written next to file_path as <name>_r<row>_c<col>.png and only
+    one tile is materialized at a time.
+
+    Args:
+        pixels (numpy.ndarray): (height, width, components) uint8 array
+        file_path (str): Destination PNG path
+        tile_size (int): Tile edge length in pixels, 0 to write a single file
+
+    Returns:
+        list: Paths of the files that were written
+    """
+    if not tile_size or tile_size <= 0:
+        _to_pil(pixels).save(file_path, 'PNG')
+        return [file_path]
+
+    stem, ext = os.path.splitext(file_path)
+    height, width = pixels.shape[:2]
+    written = []
+    for row, top in enumerate(range(0, height, tile_size)):
+        for col, left in enumerate(range(0, width, tile_size)):
+            tile = pixels[top:top + tile_size, left:left + tile_size]
+            tile_path = f"{stem}_r{row}_c{col}{ext or '.png'}"
+            _to_pil(tile).save(tile_path, 'PNG')
+            written.append(tile_path)
+    return written
+
+
+def release_raw_transfer(image_data, pixels=None):
+    """Closes the mapping for a file based transfer and removes the temporary file."""
+    mapping = getattr(pixels, '_mmap', None)
+    if mapping is not None:
+        try:
+            mapping.close()
+        except BufferError:
+            #still referenced elsewhere, the mapping closes once it is collected
+            pass
+
+    path = image_data.get('rawFilePath')
+    if path and os.path.exists(path):
+        try:
+            os.remove(path)
+        except OSError as e:
+            logger.log(f"Could not remove raw transfer file {path}: {e}")
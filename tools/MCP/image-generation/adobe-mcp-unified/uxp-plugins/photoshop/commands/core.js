@@ -23,6 +23,7 @@
 
 const { app, constants, action, imaging } = require("photoshop");
 const fs = require("uxp").storage.localFileSystem;
+const openfs = require("fs");
 
 const {
     _saveDocumentAs,
@@ -126,30 +127,64 @@ const placeImage = async (command) => {
 };
 
 const getDocumentImage = async (command) => {
+    let options = command.options || {};
+
     let out = await execute(async () => {
 
         const pixelsOpt = {
             applyAlpha: true
         };
 
-        const imgObj = await imaging.getPixels(pixelsOpt);
+        //optional downscaled preview, resampled by Photoshop before transfer
+        if (options.maxDimension) {
+            let doc = app.activeDocument;
+            let scale = options.maxDimension / Math.max(doc.width, doc.height);
+            if (scale < 1) {
+                pixelsOpt.targetSize = {
+                    width: Math.max(1, Math.round(doc.width * scale)),
+                    height: Math.max(1, Math.round(doc.height * scale)),
+                };
+            }
+        }
 
-        const base64Data = await imaging.encodeImageData({
-            imageData: imgObj.imageData,
-            base64: true,
-        });
+        const imgObj = await imaging.getPixels(pixelsOpt);
+        const imageData = imgObj.imageData;
 
         const result = {
-            base64Image: base64Data,
-            dataUrl: `data:image/jpeg;base64,${base64Data}`,
-            width: imgObj.imageData.width,
-            height: imgObj.imageData.height,
-            colorSpace: imgObj.imageData.colorSpace,
-            components: imgObj.imageData.components,
-            format: "jpeg",
+            width: imageData.width,
+            height: imageData.height,
+            colorSpace: imageData.colorSpace,
+            components: imageData.components,
         };
 
-        imgObj.imageData.dispose();
+        if (options.format === "raw") {
+            const pixels = await imageData.getData({ chunky: true });
+            let buffer = pixels.buffer;
+            if (pixels.byteOffset !== 0 || pixels.byteLength !== buffer.byteLength) {
+                buffer = buffer.slice(pixels.byteOffset, pixels.byteOffset + pixels.byteLength);
+            }
+
+            if (options.rawFilePath) {
+                //hand off through a file so large canvases never pass through the socket
+                await openfs.writeFile(`file:${options.rawFilePath}`, buffer);
+                result.rawFilePath = options.rawFilePath;
+            } else {
+                //sent as a Socket.IO binary attachment rather than base64 text
+                result.rawData = buffer;
+            }
+            result.format = "raw";
+        } else {
+            const base64Data = await imaging.encodeImageData({
+                imageData: imageData,
+                base64: true,
+            });
+
+            result.base64Image = base64Data;
+            result.dataUrl = `data:image/jpeg;base64,${base64Data}`;
+            result.format = "jpeg";
+        }
+
+        imageData.dispose();
         return result;
     });
 
@@ -54,6 +54,42 @@ const parseAndRouteCommand = async (command) => {
     return f(command);
 };
 
+//runs a list of commands sent in a single packet, in order, and returns a
+//result entry for each one so that partial failures can be reported
+const batch = async (command) => {
+    let options = command.options;
+    let commands = options.commands || [];
+    let stopOnError = options.stopOnError;
+
+    let results = [];
+    let failed = false;
+
+    for (let i = 0; i < commands.length; i++) {
+        let c = commands[i];
+
+        if (failed && stopOnError) {
+            results.push({ index: i, action: c.action, status: "SKIPPED" });
+            continue;
+        }
+
+        try {
+            checkRequiresActiveDocument(c);
+            let response = await parseAndRouteCommand(c);
+            results.push({ index: i, action: c.action, status: "SUCCESS", response: response });
+        } catch (e) {
+            failed = true;
+            results.push({
+                index: i,
+                action: c.action,
+                status: "FAILURE",
+                message: `Error calling ${c.action} : ${e}`,
+            });
+        }
+    }
+
+    return { results: results };
+};
+
 const checkRequiresActiveDocument = (command) => {
     if (!requiresActiveDocument(command)) {
         return;
@@ -67,7 +103,7 @@ const checkRequiresActiveDocument = (command) => {
 };
 
 const requiresActiveDocument = (command) => {
-    return !["createDocument", "openFile"].includes(command.action);
+    return !["createDocument", "openFile", "batch"].includes(command.action);
 };
 
 const commandHandlers = {
@@ -76,7 +112,8 @@ const commandHandlers = {
     ...core.commandHandlers,
     ...adjustmentLayers.commandHandlers,
     ...layerStyles.commandHandlers,
-    ...layers.commandHandlers
+    ...layers.commandHandlers,
+    batch
 };
 
 module.exports = {
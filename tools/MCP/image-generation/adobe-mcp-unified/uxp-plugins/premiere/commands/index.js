@@ -707,6 +707,42 @@ const parseAndRouteCommand = async (command) => {
     return f(command);
 };
 
+//runs a list of commands sent in a single packet, in order, and returns a
+//result entry for each one so that partial failures can be reported
+const batch = async (command) => {
+    let options = command.options;
+    let commands = options.commands || [];
+    let stopOnError = options.stopOnError;
+
+    let results = [];
+    let failed = false;
+
+    for (let i = 0; i < commands.length; i++) {
+        let c = commands[i];
+
+        if (failed && stopOnError) {
+            results.push({ index: i, action: c.action, status: "SKIPPED" });
+            continue;
+        }
+
+        try {
+            await checkRequiresActiveProject(c);
+            let response = await parseAndRouteCommand(c);
+            results.push({ index: i, action: c.action, status: "SUCCESS", response: response });
+        } catch (e) {
+            failed = true;
+            results.push({
+                index: i,
+                action: c.action,
+                status: "FAILURE",
+                message: `Error calling ${c.action} : ${e}`,
+            });
+        }
+    }
+
+    return { results: results };
+};
+
 const commandHandlers = {
     openProject,
     saveProjectAs,
@@ -724,6 +760,7 @@ const commandHandlers = {
     addMediaToSequence,
     importMedia,
     createProject,
+    batch,
 };
 
 const checkRequiresActiveProject = async (command) => {
@@ -740,7 +777,7 @@ const checkRequiresActiveProject = async (command) => {
 };
 
 const requiresActiveProject = (command) => {
-    return !["createProject", "openProject"].includes(command.action);
+    return !["createProject", "openProject", "batch"].includes(command.action);
 };
 
 module.exports = {
@@ -0,0 +1,99 @@
+import base64
+import hashlib
+import io
+import logging
+import os
+import time
+
+from PIL import Image, ImageGrab
+
+try:
+    import win32con
+    import win32gui
+    WIN32GUI_AVAILABLE = True
+except ImportError:
+    WIN32GUI_AVAILABLE = False
+
+# Longest side of the image returned by the view tool, override with ILLUSTRATOR_VIEW_MAX_DIMENSION
+DEFAULT_MAX_DIMENSION = int(os.environ.get("ILLUSTRATOR_VIEW_MAX_DIMENSION", "1280"))
+# Time for the window to repaint after it had to be brought to the front
+ACTIVATE_SETTLE_SECONDS = 0.15
+
+
+class IllustratorCapture:
+    """
+    Captures the Illustrator window for the view tool.
+
+    The grab is cropped to the Illustrator window and downsampled before it is
+    hashed; when the frame is identical to the previous capture the previously
+    encoded JPEG is returned without encoding again.
+    """
+
+    def __init__(self, window_title="Adobe Illustrator", max_dimension=DEFAULT_MAX_DIMENSION, quality=50):
+        self.window_title = window_title
+        self.max_dimension = max_dimension
+        self.quality = quality
+        self._last_key = None
+        self._last_data = None
+
+    def find_window(self):
+        """Return the handle of the top-level Illustrator window, or None."""
+        if not WIN32GUI_AVAILABLE:
+            return None
+
+        handles = []
+
+        def on_window(hwnd, _):
+            if win32gui.IsWindowVisible(hwnd) and self.window_title in win32gui.GetWindowText(hwnd):
+                handles.append(hwnd)
+            return True
+
+        win32gui.EnumWindows(on_window, None)
+        return handles[0] if handles else None
+
+    def _activate(self, hwnd):
+        """Bring the window to the front, waiting only if it was not already there."""
+        if win32gui.GetForegroundWindow() == hwnd:
+            return
+        if win32gui.IsIconic(hwnd):
+            win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
+        win32gui.SetForegroundWindow(hwnd)
+        time.sleep(ACTIVATE_SETTLE_SECONDS)
+
+    def grab(self):
+        """Grab the Illustrator window, or the whole desktop when it cannot be located."""
+        hwnd = self.find_window()
+        if hwnd is None:
+            logging.warning("Illustrator window not found, capturing the full desktop.")
+            return ImageGrab.grab()
+
+        self._activate(hwnd)
+        left, top, right, bottom = win32gui.GetWindowRect(hwnd)
+        return ImageGrab.grab(bbox=(left, top, right, bottom), all_screens=True)
+
+    def capture(self, max_dimension=None):
+        """
+        Capture the window and return (base64 JPEG data, changed).
+
+        changed is False when the frame matched the previous capture and the cached
+        encoding was returned.
+        """
+        max_dimension = max_dimension or self.max_dimension
+        image = self.grab()
+
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        if max_dimension and max(image.size) > max_dimension:
+            image.thumbnail((max_dimension, max_dimension), Image.BILINEAR)
+
+        digest = hashlib.blake2b(image.tobytes(), digest_size=16).hexdigest()
+        key = (digest, image.size, self.quality)
+        if key == self._last_key:
+            logging.info("Screenshot unchanged since last capture, returning cached image.")
+            return self._last_data, False
+
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=self.quality, optimize=True)
+        self._last_key = key
+        self._last_data = base64.b64encode(buffer.getvalue()).decode("utf-8")
+        return self._last_data, True
@@ -1,5 +1,6 @@
 import win32com.client
 import os
+import difflib
 from mcp.server.fastmcp import FastMCP
 import os
 from dotenv import load_dotenv
@@ -462,11 +463,39 @@ def shortName(font):
             break
     return name, family
 
+# Photoshop font names, read once from psApp.fonts (each COM access is slow)
+_available_fonts = None
+_ps_font_map = None
+_ps_font_map_normalized = None
+
+def _normalize_font_name(name):
+    return "".join(c for c in name.lower() if c.isalnum())
+
+def _load_photoshop_fonts(refresh=False):
+    """Build the display name -> PostScript name maps from Photoshop's font list"""
+    global _ps_font_map, _ps_font_map_normalized
+    if _ps_font_map is None or refresh:
+        font_map = {}
+        for font in psApp.fonts:
+            font_map.setdefault(font.name, font.postScriptName)
+            font_map.setdefault(font.postScriptName, font.postScriptName)
+        _ps_font_map = font_map
+        _ps_font_map_normalized = {_normalize_font_name(name): ps for name, ps in font_map.items()}
+    return _ps_font_map
+
 def getPostScriptNameFromDisplayName(winName):
     """Find PostScript name from display name using Photoshop font list"""
-    for font in psApp.fonts:
-        if font.name == winName:
-            return font.postScriptName
+    font_map = _load_photoshop_fonts()
+    if winName in font_map:
+        return font_map[winName]
+
+    key = _normalize_font_name(winName)
+    if key in _ps_font_map_normalized:
+        return _ps_font_map_normalized[key]
+
+    matches = difflib.get_close_matches(key, _ps_font_map_normalized.keys(), n=1, cutoff=0.8)
+    if matches:
+        return _ps_font_map_normalized[matches[0]]
     return None
 
 @mcp.tool()
@@ -551,6 +580,9 @@ def list_available_fonts() -> list[str]:
     """
     List available font names that can be used in Photoshop (Windows only).
     """
+    global _available_fonts
+    if _available_fonts is not None:
+        return _available_fonts
     try:
         fso = win32com.client.Dispatch("Scripting.FileSystemObject")
         shell = win32com.client.Dispatch("Shell.Application")
@@ -561,7 +593,8 @@ def list_available_fonts() -> list[str]:
             font_name = item.Name
             if font_name:
                 fonts.add(font_name.split(' (')[0])  # Clean names like "Arial (TrueType)"
-        return sorted(list(fonts))
+        _available_fonts = sorted(list(fonts))
+        return _available_fonts
     except Exception as e:
         return [f"Error fetching fonts: {e}"]
     
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量文档转换驱动
+
+供 batch_md_to_pdf 和 md_to_docx_converter 共用：
+1. 输出文件比源文件新时跳过（除非 force）
+2. 按文件大小从大到小排序，大文档先开始，避免最后只剩一个大文件在跑
+3. 进程池并行转换，每个工作进程只创建一次转换器（样式、模板、浏览器会话等）
+4. 结束后写出汇总清单 conversion_manifest.json
+
+转换器由 converter_factory 创建（需为模块顶层的类或函数，以便传入子进程），
+实例需提供 convert(source, output) -> dict（含 status 和 message），可选 close()。
+"""
+
+import os
+import json
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "conversion_manifest.json"
+
+# 工作进程内的转换器实例
+_worker_converter = None
+
+
+@dataclass
+class ConversionJob:
+    """一个转换任务"""
+    source: str
+    output: str
+    size: int
+
+
+@dataclass
+class ConversionResult:
+    """一个任务的结果"""
+    source: str
+    output: str
+    status: str          # success / error / skipped
+    message: str = ""
+    seconds: float = 0.0
+
+
+@dataclass
+class BatchSummary:
+    """批量转换汇总"""
+    total: int = 0
+    success: int = 0
+    failed: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+    results: List[ConversionResult] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        return {
+            "generated_at": datetime.now().isoformat(),
+            "total": self.total,
+            "success": self.success,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "seconds": round(self.seconds, 3),
+            "files": [asdict(result) for result in self.results],
+        }
+
+
+def plan_jobs(sources: Iterable[Path], output_for: Callable[[Path], Path],
+              force: bool = False) -> (List[ConversionJob], List[ConversionResult]):
+    """生成任务列表
+
+    Returns:
+        (按大小从大到小排序的任务, 因输出已是最新而跳过的结果)
+    """
+    jobs = []
+    skipped = []
+    for source in sources:
+        source = Path(source)
+        output = Path(output_for(source))
+        try:
+            st = source.stat()
+        except OSError as e:
+            skipped.append(ConversionResult(str(source), str(output), "error", f"无法读取源文件: {e}"))
+            continue
+        if not force:
+            try:
+                if output.stat().st_mtime >= st.st_mtime:
+                    skipped.append(ConversionResult(str(source), str(output), "skipped", "输出已是最新"))
+                    continue
+            except OSError:
+                pass
+        jobs.append(ConversionJob(str(source), str(output), st.st_size))
+
+    jobs.sort(key=lambda job: job.size, reverse=True)
+    return jobs, skipped
+
+
+def _init_worker(converter_factory: Callable[[], object]):
+    global _worker_converter
+    _worker_converter = converter_factory()
+
+
+def _run_job(job: ConversionJob) -> ConversionResult:
+    start = time.perf_counter()
+    try:
+        Path(job.output).parent.mkdir(parents=True, exist_ok=True)
+        result = _worker_converter.convert(job.source, job.output)
+        status = "success" if result.get("status") == "success" else "error"
+        message = result.get("message", "")
+    except Exception as e:
+        status, message = "error", str(e)
+    return ConversionResult(job.source, job.output, status, message, time.perf_counter() - start)
+
+
+def _close_worker_converter():
+    global _worker_converter
+    close = getattr(_worker_converter, "close", None)
+    if close:
+        try:
+            close()
+        except Exception:
+            pass
+    _worker_converter = None
+
+
+def run_batch(sources: Iterable[Path], output_for: Callable[[Path], Path],
+              converter_factory: Callable[[], object], manifest_dir: Optional[Path] = None,
+              max_workers: Optional[int] = None, force: bool = False) -> BatchSummary:
+    """执行批量转换
+
+    Args:
+        sources: 源文件
+        output_for: 根据源文件计算输出路径（在主进程中调用）
+        converter_factory: 创建转换器的顶层类或函数，每个工作进程调用一次
+        manifest_dir: 汇总清单目录，None 表示不写清单
+        max_workers: 进程数，默认CPU核数；为1时在当前进程中执行
+        force: 忽略输出文件的时间戳，全部重新转换
+
+    Returns:
+        汇总结果
+    """
+    start = time.perf_counter()
+    jobs, skipped = plan_jobs(sources, output_for, force)
+    summary = BatchSummary(total=len(jobs) + len(skipped))
+    summary.results.extend(skipped)
+
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    if jobs:
+        logger.info(f"待转换 {len(jobs)} 个文件，跳过 {len(skipped)} 个，使用 {workers} 个进程")
+
+    if workers == 1:
+        _init_worker(converter_factory)
+        try:
+            for job in jobs:
+                summary.results.append(_log_result(_run_job(job)))
+        finally:
+            _close_worker_converter()
+    elif workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(converter_factory,)) as executor:
+            for result in executor.map(_run_job, jobs):
+                summary.results.append(_log_result(result))
+
+    for result in summary.results:
+        if result.status == "success":
+            summary.success += 1
+        elif result.status == "skipped":
+            summary.skipped += 1
+        else:
+            summary.failed += 1
+    summary.seconds = time.perf_counter() - start
+
+    if manifest_dir is not None:
+        write_manifest(summary, Path(manifest_dir) / MANIFEST_NAME)
+
+    logger.info(f"转换完成: 成功 {summary.success}，失败 {summary.failed}，跳过 {summary.skipped}，"
+                f"耗时 {summary.seconds:.1f} 秒")
+    return summary
+
+
+def _log_result(result: ConversionResult) -> ConversionResult:
+    if result.status == "success":
+        logger.info(f"✅ 转换成功: {result.output} ({result.seconds:.1f}s)")
+    else:
+        logger.error(f"❌ 转换失败: {result.source} - {result.message}")
+    return result
+
+
+def write_manifest(summary: BatchSummary, manifest_file: Path):
+    """写出汇总清单"""
+    try:
+        manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(manifest_file, "w", encoding="utf-8") as f:
+            json.dump(summary.to_dict(), f, ensure_ascii=False, indent=2)
+        logger.info(f"转换清单已保存: {manifest_file}")
+    except OSError as e:
+        logger.warning(f"保存转换清单失败: {e}")
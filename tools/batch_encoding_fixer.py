@@ -9,13 +9,14 @@
 
 import os
 import shutil
-import chardet
 from pathlib import Path
 from datetime import datetime
 import json
 import logging
 from typing import Dict, List, Tuple
 
+from encoding_audit import EncodingAuditor, DEFAULT_EXCLUDE_DIRS, detect_file_encoding
+
 class BatchEncodingFixer:
     def __init__(self, project_root: str):
         self.project_root = Path(project_root)
@@ -37,6 +38,10 @@ class BatchEncodingFixer:
         )
         self.logger = logging.getLogger(__name__)
         
+        # 编码审计（跳过bak目录，避免改写备份文件）
+        self.auditor = EncodingAuditor(self.project_root, exclude_dirs=DEFAULT_EXCLUDE_DIRS | {'bak'})
+        self._encoding_groups = None
+        
         # 修复统计
         self.stats = {
             'utf8_sig_fixed': 0,
@@ -50,14 +55,27 @@ class BatchEncodingFixer:
     
     def detect_encoding(self, file_path: Path) -> Tuple[str, float]:
         """检测文件编码"""
-        try:
-            with open(file_path, 'rb') as f:
-                raw_data = f.read()
-                result = chardet.detect(raw_data)
-                return result['encoding'], result['confidence']
-        except Exception as e:
-            self.logger.error(f"检测编码失败 {file_path}: {e}")
+        encoding, confidence = detect_file_encoding(str(file_path))
+        if encoding.startswith('error:'):
+            self.logger.error(f"检测编码失败 {file_path}: {encoding[7:]}")
             return None, 0.0
+        return encoding, confidence
+    
+    def get_files_by_encoding(self, *encodings: str) -> List[Tuple[Path, str]]:
+        """返回指定编码的文件列表 [(文件路径, 编码)]，审计结果在本次运行中复用"""
+        if self._encoding_groups is None:
+            self.logger.info("开始编码审计...")
+            records = self.auditor.audit()
+            self._encoding_groups = EncodingAuditor.group_by_encoding(records)
+            self.logger.info(f"编码审计完成，共检查 {len(records)} 个文件")
+        
+        files = []
+        for encoding in encodings:
+            for record in self._encoding_groups.get(encoding, []):
+                file_path = self.project_root / record.path
+                if file_path.exists() and not self.should_skip_file(file_path):
+                    files.append((file_path, encoding))
+        return files
     
     def backup_file(self, file_path: Path) -> Path:
         """备份文件"""
@@ -166,31 +184,7 @@ class BatchEncodingFixer:
         """第一阶段：修复UTF-8-SIG编码问题"""
         self.logger.info("开始第一阶段：修复UTF-8-SIG编码问题")
         
-        # 读取编码检查结果
-        encoding_result_file = self.project_root / "encoding_check_result_utf8.txt"
-        if not encoding_result_file.exists():
-            self.logger.error("编码检查结果文件不存在，请先运行编码检查")
-            return
-        
-        utf8_sig_files = []
-        try:
-            with open(encoding_result_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            for i, line in enumerate(lines):
-                line = line.strip()
-                if line.startswith('[ERROR]') and i + 1 < len(lines):
-                    next_line = lines[i + 1].strip()
-                    if 'UTF-8-SIG' in next_line:
-                        # 提取文件路径
-                        path_part = line[7:].strip()  # 去掉 '[ERROR] '
-                        file_path = self.project_root / path_part
-                        if file_path.exists() and not self.should_skip_file(file_path):
-                            utf8_sig_files.append(file_path)
-        
-        except Exception as e:
-            self.logger.error(f"读取编码检查结果文件失败: {e}")
-            return
+        utf8_sig_files = [file_path for file_path, _ in self.get_files_by_encoding('UTF-8-SIG')]
         
         self.logger.info(f"发现 {len(utf8_sig_files)} 个UTF-8-SIG文件需要修复")
         
@@ -201,28 +195,7 @@ class BatchEncodingFixer:
         """第二阶段：修复Windows编码问题"""
         self.logger.info("开始第二阶段：修复Windows编码问题")
         
-        encoding_result_file = self.project_root / "encoding_check_result_utf8.txt"
-        windows_files = []
-        
-        try:
-            with open(encoding_result_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            for i, line in enumerate(lines):
-                line = line.strip()
-                if line.startswith('[ERROR]') and i + 1 < len(lines):
-                    next_line = lines[i + 1].strip()
-                    if 'Windows-1254' in next_line or 'Windows-1252' in next_line:
-                        # 提取文件路径
-                        path_part = line[7:].strip()  # 去掉 '[ERROR] '
-                        file_path = self.project_root / path_part
-                        encoding = 'Windows-1254' if 'Windows-1254' in next_line else 'Windows-1252'
-                        if file_path.exists() and not self.should_skip_file(file_path):
-                            windows_files.append((file_path, encoding))
-        
-        except Exception as e:
-            self.logger.error(f"读取编码检查结果文件失败: {e}")
-            return
+        windows_files = self.get_files_by_encoding('Windows-1254', 'Windows-1252')
         
         self.logger.info(f"发现 {len(windows_files)} 个Windows编码文件需要修复")
         
@@ -233,28 +206,7 @@ class BatchEncodingFixer:
         """第三阶段：修复特殊编码问题"""
         self.logger.info("开始第三阶段：修复特殊编码问题")
         
-        encoding_result_file = self.project_root / "encoding_check_result_utf8.txt"
-        special_files = []
-        
-        try:
-            with open(encoding_result_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            for i, line in enumerate(lines):
-                line = line.strip()
-                if line.startswith('[ERROR]') and i + 1 < len(lines):
-                    next_line = lines[i + 1].strip()
-                    if 'MacRoman' in next_line or 'ISO-8859-1' in next_line:
-                        # 提取文件路径
-                        path_part = line[7:].strip()  # 去掉 '[ERROR] '
-                        file_path = self.project_root / path_part
-                        encoding = 'MacRoman' if 'MacRoman' in next_line else 'ISO-8859-1'
-                        if file_path.exists() and not self.should_skip_file(file_path):
-                            special_files.append((file_path, encoding))
-        
-        except Exception as e:
-            self.logger.error(f"读取编码检查结果文件失败: {e}")
-            return
+        special_files = self.get_files_by_encoding('MacRoman', 'ISO-8859-1')
         
         self.logger.info(f"发现 {len(special_files)} 个特殊编码文件需要修复")
         
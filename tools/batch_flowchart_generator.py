@@ -3,18 +3,33 @@
 """
 批量ISO流程图生成器
 基于详细流程图生成器，为所有ISO文档批量生成流程图
+
+流程图由 DrawioDocument 直接写出，输出不含生成时间，相同输入得到相同字节；
+generate_folder 在进程池中将整个目录的流程文档转换为流程图，跳过未变化的文档。
 """
 
 import os
 import sys
 import json
+import argparse
+from functools import partial
 from pathlib import Path
 from datetime import datetime
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
+
+from batch_conversion import run_batch
+from drawio_writer import DrawioDocument, write_if_changed
+
+# 流程文档格式
+PROCESS_DOCUMENT_FORMATS = ('.doc', '.docx')
 
 class BatchFlowchartGenerator:
-    def __init__(self, input_dir, output_dir):
+    def __init__(self, input_dir, output_dir, scan_existing=True):
+        """
+        Args:
+            input_dir: 流程文档目录
+            output_dir: 流程图输出目录
+            scan_existing: 是否扫描已生成的流程图（批量工作进程中不需要）
+        """
         self.input_dir = Path(input_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -35,7 +50,7 @@ class BatchFlowchartGenerator:
         }
         
         # 动态检查已生成的文档列表
-        self.generated_docs = self.get_already_generated_docs()
+        self.generated_docs = self.get_already_generated_docs() if scan_existing else []
         
     def get_already_generated_docs(self):
         """获取已生成的文档列表"""
@@ -76,8 +91,8 @@ class BatchFlowchartGenerator:
         remaining_docs = [doc for doc in suitable_docs if doc not in self.generated_docs]
         return remaining_docs
     
-    def create_document_based_flowchart(self, doc_name):
-        """基于文档内容创建流程图"""
+    def create_document_based_flowchart(self, doc_name, doc_path=None):
+        """基于文档内容创建流程图（doc_path 已知时不再搜索文档）"""
         try:
             # 对于HQ-QP-09，使用详细流程图生成器
             if 'HQ-QP-09' in doc_name:
@@ -89,7 +104,7 @@ class BatchFlowchartGenerator:
                 return result
             else:
                 # 对于其他文档，基于内容生成
-                return self.analyze_and_generate_flowchart(doc_name)
+                return self.analyze_and_generate_flowchart(doc_name, doc_path)
                 
         except Exception as e:
             import traceback
@@ -98,14 +113,14 @@ class BatchFlowchartGenerator:
             print("使用通用模板")
             return self.create_generic_flowchart(doc_name)
     
-    def analyze_and_generate_flowchart(self, doc_name):
+    def analyze_and_generate_flowchart(self, doc_name, doc_path=None):
         """分析文档内容并生成对应流程图"""
         try:
             # 导入文档读取器
             from office_document_reader import OfficeDocumentReader
             
             # 查找对应的文档文件
-            doc_path = self.find_document_path(doc_name)
+            doc_path = doc_path or self.find_document_path(doc_name)
             if not doc_path:
                 print(f"找不到文档: {doc_name}，使用通用模板")
                 return self.create_generic_flowchart(doc_name)
@@ -121,8 +136,9 @@ class BatchFlowchartGenerator:
             # 分析文档内容，提取流程步骤
             steps = self.extract_process_steps_from_content(content, doc_name)
             
-            # 基于提取的步骤生成流程图
-            return self.generate_drawio_xml(doc_name, steps)
+            # 基于提取的步骤生成流程图（修改时间取自源文档，保证输出稳定）
+            modified = datetime.fromtimestamp(os.path.getmtime(doc_path)).isoformat()
+            return self.generate_drawio_xml(doc_name, steps, modified)
             
         except Exception as e:
             print(f"文档分析失败: {str(e)}，使用通用模板")
@@ -354,21 +370,18 @@ class BatchFlowchartGenerator:
         
         return self.generate_drawio_xml(process_name, steps)
     
-    def generate_drawio_xml(self, process_name, steps):
-        """生成Draw.io格式的XML"""
-        # 创建根元素
-        mxfile = ET.Element('mxfile', host="app.diagrams.net", modified=datetime.now().isoformat(), agent="5.0", version="24.7.17")
-        diagram = ET.SubElement(mxfile, 'diagram', name="流程图", id="flowchart")
-        mxGraphModel = ET.SubElement(diagram, 'mxGraphModel', dx="1422", dy="794", grid="1", gridSize="10", guides="1", tooltips="1", connect="1", arrows="1", fold="1", page="1", pageScale="1", pageWidth="827", pageHeight="1169", math="0", shadow="0")
-        root = ET.SubElement(mxGraphModel, 'root')
-        
-        # 添加默认层
-        ET.SubElement(root, 'mxCell', id="0")
-        ET.SubElement(root, 'mxCell', id="1", parent="0")
+    def generate_drawio_xml(self, process_name, steps, modified=None):
+        """生成Draw.io格式的文档
+        
+        Args:
+            process_name: 流程名称
+            steps: 流程步骤
+            modified: 文档修改时间（None 表示不写入，保证相同输入输出相同）
+        """
+        document = DrawioDocument(modified=modified)
         
         # 添加标题
-        title_cell = ET.SubElement(root, 'mxCell', id="title", value=f"{process_name}流程图", style="text;html=1;strokeColor=none;fillColor=none;align=center;verticalAlign=middle;whiteSpace=wrap;rounded=0;fontSize=16;fontStyle=1;", vertex="1", parent="1")
-        title_geom = ET.SubElement(title_cell, 'mxGeometry', x="300", y="20", width="200", height="30", **{"as": "geometry"})
+        document.add_vertex("title", f"{process_name}流程图", "text;html=1;strokeColor=none;fillColor=none;align=center;verticalAlign=middle;whiteSpace=wrap;rounded=0;fontSize=16;fontStyle=1;", "300", "20", "200", "30")
         
         # 计算位置
         start_x = 100
@@ -393,14 +406,11 @@ class BatchFlowchartGenerator:
             
             # 添加步骤单元格
             step_text = f"{step['text']}\n({step['dept']})"
-            step_cell = ET.SubElement(root, 'mxCell', id=str(cell_id), value=step_text, style=style, vertex="1", parent="1")
-            step_geom = ET.SubElement(step_cell, 'mxGeometry', x=str(start_x), y=str(y_pos), width=width, height=height, **{"as": "geometry"})
+            document.add_vertex(cell_id, step_text, style, str(start_x), str(y_pos), width, height)
             
             # 添加连接线（除了最后一个步骤）
             if i < len(steps) - 1:
-                edge_id = cell_id + 100
-                edge_cell = ET.SubElement(root, 'mxCell', id=str(edge_id), value="", style="edgeStyle=orthogonalEdgeStyle;rounded=0;orthogonalLoop=1;jettySize=auto;html=1;", edge="1", parent="1", source=str(cell_id), target=str(cell_id + 1))
-                edge_geom = ET.SubElement(edge_cell, 'mxGeometry', relative="1", **{"as": "geometry"})
+                document.add_edge(cell_id + 100, cell_id, cell_id + 1, style="edgeStyle=orthogonalEdgeStyle;rounded=0;orthogonalLoop=1;jettySize=auto;html=1;")
             
             cell_id += 1
         
@@ -412,37 +422,51 @@ class BatchFlowchartGenerator:
                 source_id = str(i + 2)  # 决策节点的ID
                 target_id = str(max(1, i))  # 回到前一个步骤
                 
-                no_edge_cell = ET.SubElement(root, 'mxCell', id=str(no_edge_id), value="否", style="edgeStyle=orthogonalEdgeStyle;rounded=0;orthogonalLoop=1;jettySize=auto;html=1;exitX=0;exitY=0.5;exitDx=0;exitDy=0;entryX=0;entryY=0.5;entryDx=0;entryDy=0;", edge="1", parent="1", source=source_id, target=target_id)
-                no_edge_geom = ET.SubElement(no_edge_cell, 'mxGeometry', relative="1", **{"as": "geometry"})
+                document.add_edge(no_edge_id, source_id, target_id, value="否", style="edgeStyle=orthogonalEdgeStyle;rounded=0;orthogonalLoop=1;jettySize=auto;html=1;exitX=0;exitY=0.5;exitDx=0;exitDy=0;entryX=0;entryY=0.5;entryDx=0;entryDy=0;")
                 
-                # 添加"是"标签到下一个步骤的连接线
+                # 添加"是"标签到下一个步骤的连接线（按id直接查找）
                 if i < len(steps) - 1:
-                    yes_edge_id = i + 2 + 100  # 对应的连接线ID
-                    # 找到对应的边并添加"是"标签
-                    for edge in root.findall(".//mxCell[@id='{}'][@edge='1']".format(yes_edge_id)):
-                        edge.set('value', '是')
+                    yes_edge = document.get(i + 2 + 100)
+                    if yes_edge is not None and yes_edge.get('edge') == '1':
+                        yes_edge['value'] = '是'
                 break
         
-        return mxfile
+        return document
     
-    def save_flowchart(self, xml_element, filename):
-        """保存流程图到文件"""
-        # 格式化XML
-        rough_string = ET.tostring(xml_element, encoding='unicode')
-        reparsed = minidom.parseString(rough_string)
-        pretty_xml = reparsed.toprettyxml(indent="  ")
-        
-        # 移除空行
-        lines = [line for line in pretty_xml.split('\n') if line.strip()]
-        formatted_xml = '\n'.join(lines)
-        
-        # 保存文件
+    def save_flowchart(self, document, filename):
+        """保存流程图到文件（内容未变化时不重写）"""
         output_path = self.output_dir / f"{filename.replace('.doc', '')}.drawio"
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(formatted_xml)
-        
+        write_if_changed(output_path, document.to_bytes())
         return output_path
     
+    def generate_folder(self, input_dir=None, workers=None, force=False):
+        """
+        并行将目录（含子目录）中的所有流程文档转换为流程图
+        
+        流程图比源文档新的跳过（force=True 时全部重新生成），
+        转换清单 conversion_manifest.json 写入输出目录。
+        
+        Returns:
+            (生成的文件列表, 失败的文档列表)
+        """
+        input_dir = Path(input_dir) if input_dir else self.input_dir
+        documents = [path for path in input_dir.rglob('*')
+                     if path.suffix.lower() in PROCESS_DOCUMENT_FORMATS and not path.name.startswith('~$')]
+        
+        print(f"找到 {len(documents)} 个流程文档，开始并行生成流程图...")
+        summary = run_batch(
+            documents,
+            lambda path: self.output_dir / f"{path.stem}.drawio",
+            partial(FlowchartWorker, str(input_dir), str(self.output_dir)),
+            manifest_dir=self.output_dir,
+            max_workers=workers,
+            force=force
+        )
+        
+        generated_files = [r.output for r in summary.results if r.status == 'success']
+        failed_files = [Path(r.source).name for r in summary.results if r.status == 'error']
+        return generated_files, failed_files
+    
     def generate_all_remaining_flowcharts(self):
         """生成所有剩余的流程图"""
         remaining_docs = self.get_suitable_documents()
@@ -467,7 +491,7 @@ class BatchFlowchartGenerator:
                     generated_files.append(str(output_path))
                     print(f"✅ 成功生成: {output_path.name}")
                 else:
-                    # 如果返回的是XML元素，使用原有的保存方法
+                    # 如果返回的是流程图文档，保存为.drawio文件
                     output_path = self.save_flowchart(result, doc_name)
                     generated_files.append(str(output_path))
                     print(f"✅ 成功生成: {output_path.name}")
@@ -542,15 +566,40 @@ class BatchFlowchartGenerator:
         print(f"\n📊 汇总报告已生成: {report_path}")
         return report_path
 
+class FlowchartWorker:
+    """工作进程内的流程图生成器（每个进程创建一次）"""
+    
+    def __init__(self, input_dir, output_dir):
+        self.generator = BatchFlowchartGenerator(input_dir, output_dir, scan_existing=False)
+    
+    def convert(self, source, output):
+        source = Path(source)
+        result = self.generator.create_document_based_flowchart(source.name, str(source))
+        if isinstance(result, str):
+            # 详细流程图生成器自行保存文件
+            return {"status": "success", "message": f"详细流程图已生成: {result}"}
+        written = write_if_changed(output, result.to_bytes())
+        return {"status": "success", "message": "流程图已更新" if written else "流程图内容未变化"}
+
 def main():
-    input_dir = "S:/PG-GMO/01-Input/原始文档/PG-ISO文件"
-    output_dir = "S:/PG-GMO/02-Output/品高ISO流程图"
+    parser = argparse.ArgumentParser(description="品高ISO流程图批量生成器")
+    parser.add_argument("--input-dir", default="S:/PG-GMO/01-Input/原始文档/PG-ISO文件", help="流程文档目录")
+    parser.add_argument("--output-dir", default="S:/PG-GMO/02-Output/品高ISO流程图", help="流程图输出目录")
+    parser.add_argument("--folder", action="store_true", help="并行转换目录中的所有流程文档")
+    parser.add_argument("-w", "--workers", type=int, help="并行进程数（默认CPU核数）")
+    parser.add_argument("-f", "--force", action="store_true", help="忽略时间戳，全部重新生成")
+    args = parser.parse_args()
+    input_dir = args.input_dir
+    output_dir = args.output_dir
     
     print("=== 品高ISO流程图批量生成器 ===")
     print(f"输出目录: {output_dir}\n")
     
-    generator = BatchFlowchartGenerator(input_dir, output_dir)
-    generated_files, failed_files = generator.generate_all_remaining_flowcharts()
+    generator = BatchFlowchartGenerator(input_dir, output_dir, scan_existing=not args.folder)
+    if args.folder:
+        generated_files, failed_files = generator.generate_folder(workers=args.workers, force=args.force)
+    else:
+        generated_files, failed_files = generator.generate_all_remaining_flowcharts()
     
     print(f"\n=== 批量生成完成 ===")
     print(f"✅ 成功生成: {len(generated_files)} 个流程图")
@@ -4,6 +4,10 @@
 批量ISO文档部门角色分析工具
 用于重新分析所有ISO文档，确保统计的准确性和完整性
 
+发现线程边遍历目录边把文档送入进程池（读取+分析），分析结果按路径、大小和修改时间
+缓存，重复运行时只分析变化的文档；每个文档的结果逐行写入 JSON Lines 文件，汇总报告
+只保留统计计数，内存占用不随文档数量增长。
+
 作者: 雨俊
 创建时间: 2025-01-26
 """
@@ -11,6 +15,12 @@
 import os
 import json
 import re
+import queue
+import sqlite3
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict, Counter
@@ -20,38 +30,134 @@ import sys
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-try:
-    from tools.office_document_reader import read_office_document
-except ImportError:
-    print("警告: 无法导入office_document_reader，将使用基础文档读取功能")
+from tools.keyword_matcher import KeywordMatcher
+
+# 分析结果缓存
+CACHE_FILE = project_root / ".cache" / "iso_analysis.sqlite3"
+CACHE_VERSION = 1
     
-    def read_office_document(file_path):
-        """基础文档读取功能"""
-        try:
-            if file_path.endswith('.docx'):
-                from docx import Document
-                doc = Document(file_path)
-                content = []
-                for paragraph in doc.paragraphs:
-                    if paragraph.text.strip():
-                        content.append(paragraph.text.strip())
-                for table in doc.tables:
-                    for row in table.rows:
-                        for cell in row.cells:
-                            if cell.text.strip():
-                                content.append(cell.text.strip())
-                return '\n'.join(content)
-            else:
-                return f"不支持的文件格式: {file_path}"
-        except Exception as e:
-            return f"读取文件失败: {str(e)}"
+# 每个工作进程最多排队的文档数
+QUEUE_PER_WORKER = 4
+
+# 发现线程与分析循环之间的队列长度
+DISCOVERY_QUEUE_SIZE = 1024
+
+# 纯文本格式
+TEXT_FORMATS = {'.md', '.txt'}
+
+# 工作进程内的匹配器
+_worker_matcher = None
+
+
+def read_office_document(file_path):
+    """读取文档文本（.docx 读取段落和表格，.md/.txt 直接读取）"""
+    try:
+        suffix = Path(file_path).suffix.lower()
+        if suffix == '.docx':
+            from docx import Document
+            doc = Document(file_path)
+            content = []
+            for paragraph in doc.paragraphs:
+                if paragraph.text.strip():
+                    content.append(paragraph.text.strip())
+            for table in doc.tables:
+                for row in table.rows:
+                    for cell in row.cells:
+                        if cell.text.strip():
+                            content.append(cell.text.strip())
+            return '\n'.join(content)
+        elif suffix in TEXT_FORMATS:
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                return f.read()
+        else:
+            return f"不支持的文件格式: {file_path}"
+    except Exception as e:
+        return f"读取文件失败: {str(e)}"
+
+
+def _init_worker(department_keywords, role_keywords):
+    global _worker_matcher
+    _worker_matcher = KeywordMatcher({'departments': department_keywords, 'roles': role_keywords})
+
+
+def _analyze_document(path, size, mtime_ns):
+    """进程池任务：读取并分析一个文档"""
+    result = {
+        'name': Path(path).name,
+        'path': path,
+        'size': size,
+        'mtime_ns': mtime_ns,
+    }
+    content = read_office_document(path)
+    if not content or content.startswith(("读取文件失败", "不支持的文件格式")):
+        result['error'] = content or "文档内容为空"
+        return result
+
+    counts = _worker_matcher.count(content)
+    result.update({
+        'departments': dict(counts['departments']),
+        'roles': dict(counts['roles']),
+        'content_length': len(content),
+    })
+    return result
+
+
+class AnalysisCache:
+    """分析结果缓存（SQLite）：路径 -> (大小, 修改时间, 结果)，词表变化时整体失效"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS results (
+        path TEXT PRIMARY KEY,
+        size INTEGER NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        signature TEXT NOT NULL,
+        result TEXT NOT NULL
+    )
+    """
+
+    # 每写入多少条提交一次
+    COMMIT_INTERVAL = 200
+
+    def __init__(self, db_file: Path, signature: str):
+        self.db_file = Path(db_file)
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self.signature = signature
+        self._conn = sqlite3.connect(str(self.db_file))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(self.SCHEMA)
+        self._uncommitted = 0
+
+    def lookup(self, path: str, size: int, mtime_ns: int):
+        row = self._conn.execute(
+            "SELECT result FROM results WHERE path = ? AND size = ? AND mtime_ns = ? AND signature = ?",
+            (path, size, mtime_ns, self.signature)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def store(self, result: dict):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO results (path, size, mtime_ns, signature, result) VALUES (?, ?, ?, ?, ?)",
+            (result['path'], result['size'], result['mtime_ns'], self.signature,
+             json.dumps(result, ensure_ascii=False))
+        )
+        self._uncommitted += 1
+        if self._uncommitted >= self.COMMIT_INTERVAL:
+            self._conn.commit()
+            self._uncommitted = 0
+
+    def close(self):
+        self._conn.commit()
+        self._conn.close()
+
 
 class BatchISOAnalyzer:
     """批量ISO文档分析器"""
     
-    def __init__(self):
+    def __init__(self, cache_file=CACHE_FILE):
         self.base_path = Path("S:/PG-GMO/01-Input/原始文档")
         self.output_path = Path("S:/PG-GMO/02-Output")
+        self.cache_file = Path(cache_file) if cache_file else None
         
         # 扩展的部门关键词（基于HQ-QP-09的发现）
         self.department_keywords = [
@@ -74,24 +180,36 @@ class BatchISOAnalyzer:
             '操作人员', '检查员', '评价员', '评审员', '施工人员', '聘请老师'
         ]
         
-        # 统计结果
+        # 部门和角色词表编译为一个匹配器，每个文档只扫描一次
+        self.matcher = KeywordMatcher({
+            'departments': self.department_keywords,
+            'roles': self.role_keywords
+        })
+        
+        # 统计结果（每个文档的详情写入 results_file，不常驻内存）
         self.department_stats = Counter()
         self.role_stats = Counter()
-        self.document_results = {}
+        self.results_file = self.output_path / "ISO文档批量重新分析结果.jsonl"
         self.total_documents = 0
         self.processed_documents = 0
+        self.cached_documents = 0
         self.failed_documents = []
+        self._detail_index = []  # (文档名, 在 results_file 中的偏移)
         
-    def find_all_documents(self):
-        """查找所有ISO文档"""
-        documents = []
+    @property
+    def signature(self):
+        """词表签名，词表变化时缓存失效"""
+        data = json.dumps([CACHE_VERSION, self.department_keywords, self.role_keywords], ensure_ascii=False)
+        return hashlib.blake2b(data.encode('utf-8'), digest_size=8).hexdigest()
         
+    def iter_documents(self):
+        """逐个输出ISO文档（不排序，供流水线边发现边分析）"""
         # 查找docx格式文档（优先）
         docx_path = self.base_path / "PG-ISO文件_docx"
         if docx_path.exists():
             for item in docx_path.rglob("*.docx"):
                 if not item.name.startswith('~$'):  # 排除临时文件
-                    documents.append(item)
+                    yield item
         
         # 查找doc格式文档（作为备选）
         doc_path = self.base_path / "PG-ISO文件"
@@ -100,111 +218,123 @@ class BatchISOAnalyzer:
                 # 检查是否已有对应的docx文件
                 docx_equivalent = docx_path / item.relative_to(doc_path).with_suffix('.docx')
                 if not docx_equivalent.exists():
-                    documents.append(item)
+                    yield item
         
-        return sorted(documents)
+    def find_all_documents(self):
+        """查找所有ISO文档"""
+        return sorted(self.iter_documents())
     
     def analyze_document_content(self, content, doc_name):
         """分析单个文档内容"""
         if not content or "读取文件失败" in content or "不支持的文件格式" in content:
             return {}, {}
         
-        lines = content.split('\n')
-        doc_departments = Counter()
-        doc_roles = Counter()
-        
-        for line_num, line in enumerate(lines, 1):
-            line = line.strip()
-            if not line:
-                continue
-            
-            # 分析部门 - 使用简单包含匹配（与专门分析工具一致）
-            for dept in self.department_keywords:
-                if dept in line:
-                    # 计算出现次数
-                    count = line.count(dept)
-                    if count > 0:
-                        doc_departments[dept] += count
-                        print(f"  [{doc_name}] 第{line_num}行发现部门 '{dept}' {count}次: {line[:100]}...")
-            
-            # 分析角色 - 使用简单包含匹配（与专门分析工具一致）
-            for role in self.role_keywords:
-                if role in line:
-                    # 计算出现次数
-                    count = line.count(role)
-                    if count > 0:
-                        doc_roles[role] += count
-                        print(f"  [{doc_name}] 第{line_num}行发现角色 '{role}' {count}次: {line[:100]}...")
+        # 简单包含匹配（与专门分析工具一致），各关键词分别计数
+        counts = self.matcher.count(content)
+        doc_departments = counts['departments']
+        doc_roles = counts['roles']
         
         return doc_departments, doc_roles
     
-    def analyze_single_document(self, doc_path):
-        """分析单个文档"""
-        doc_name = doc_path.name
-        print(f"\n正在分析: {doc_name}")
-        print(f"文件路径: {doc_path}")
-        
+    def _discover(self, output: queue.Queue):
+        """发现线程：遍历目录，将 (路径, 大小, 修改时间) 放入队列，结束时放入 None"""
         try:
-            # 读取文档内容
-            content = read_office_document(str(doc_path))
-            
-            if not content or "读取文件失败" in content:
-                print(f"  ❌ 读取失败: {content}")
-                self.failed_documents.append(str(doc_path))
-                return
-            
-            print(f"  ✅ 成功读取，内容长度: {len(content)} 字符")
-            
-            # 分析内容
-            doc_departments, doc_roles = self.analyze_document_content(content, doc_name)
+            for doc_path in self.iter_documents():
+                try:
+                    st = doc_path.stat()
+                except OSError as e:
+                    output.put((str(doc_path), None, str(e)))
+                    continue
+                output.put((str(doc_path), st.st_size, st.st_mtime_ns))
+        finally:
+            output.put(None)
+        
+    def _record(self, result, out, cache=None, cached=False):
+        """汇总一个文档的结果，并写入 JSON Lines 文件"""
+        if 'error' in result:
+            print(f"  ❌ {result['name']}: {result['error']}")
+            self.failed_documents.append(result['path'])
+            return
             
-            # 更新总统计
-            self.department_stats.update(doc_departments)
-            self.role_stats.update(doc_roles)
+        self.department_stats.update(result['departments'])
+        self.role_stats.update(result['roles'])
+        self.processed_documents += 1
+        if cached:
+            self.cached_documents += 1
+        elif cache is not None:
+            cache.store(result)
             
-            # 保存文档结果
-            self.document_results[doc_name] = {
-                'path': str(doc_path),
-                'departments': dict(doc_departments),
-                'roles': dict(doc_roles),
-                'content_length': len(content),
-                'analysis_time': datetime.now().isoformat()
-            }
+        detail = dict(result, analysis_time=datetime.now().isoformat(), cached=cached)
+        self._detail_index.append((result['name'], out.tell()))
+        out.write((json.dumps(detail, ensure_ascii=False) + "\n").encode('utf-8'))
             
-            print(f"  📊 发现部门: {len(doc_departments)} 个")
-            print(f"  👥 发现角色: {len(doc_roles)} 个")
+        print(f"  ✅ {result['name']}: 部门 {len(result['departments'])} 个, "
+              f"角色 {len(result['roles'])} 个{'（缓存）' if cached else ''}")
             
-            self.processed_documents += 1
+    def run_analysis(self, workers=None, force=False):
+        """运行批量分析
             
-        except Exception as e:
-            print(f"  ❌ 分析失败: {str(e)}")
-            self.failed_documents.append(str(doc_path))
-    
-    def run_analysis(self):
-        """运行批量分析"""
+        Args:
+            workers: 进程数（默认CPU核数）
+            force: 忽略缓存，全部重新分析
+        """
         print("🚀 开始批量ISO文档分析...")
         print(f"基础路径: {self.base_path}")
         
-        # 查找所有文档
-        documents = self.find_all_documents()
-        self.total_documents = len(documents)
+        workers = workers or os.cpu_count() or 1
+        discovered = queue.Queue(maxsize=DISCOVERY_QUEUE_SIZE)
+        threading.Thread(target=self._discover, args=(discovered,), daemon=True).start()
         
-        print(f"\n📁 找到 {self.total_documents} 个文档")
+        cache = AnalysisCache(self.cache_file, self.signature) if self.cache_file else None
+        self.output_path.mkdir(parents=True, exist_ok=True)
         
-        if not documents:
+        try:
+            with open(self.results_file, 'wb') as out, ProcessPoolExecutor(
+                    max_workers=workers, initializer=_init_worker,
+                    initargs=(self.department_keywords, self.role_keywords)) as executor:
+                pending = set()
+
+                def collect(done):
+                    for future in done:
+                        self._record(future.result(), out, cache)
+
+                while True:
+                    item = discovered.get()
+                    if item is None:
+                        break
+                    path, size, mtime_ns = item
+                    self.total_documents += 1
+                    if size is None:
+                        self._record({'name': Path(path).name, 'path': path, 'error': mtime_ns}, out)
+                        continue
+
+                    cached = cache.lookup(path, size, mtime_ns) if cache and not force else None
+                    if cached is not None:
+                        self._record(cached, out, cached=True)
+                        continue
+
+                    pending.add(executor.submit(_analyze_document, path, size, mtime_ns))
+                    if len(pending) >= workers * QUEUE_PER_WORKER:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        collect(done)
+
+                collect(wait(pending).done)
+        finally:
+            if cache:
+                cache.close()
+
+        print(f"\n📁 共发现 {self.total_documents} 个文档")
+
+        if not self.total_documents:
             print("❌ 未找到任何文档！")
             return
         
-        # 分析每个文档
-        for doc_path in documents:
-            self.analyze_single_document(doc_path)
-        
         # 生成报告
         self.generate_reports()
         
         print(f"\n✅ 分析完成！")
         print(f"📊 总文档数: {self.total_documents}")
-        print(f"✅ 成功处理: {self.processed_documents}")
+        print(f"✅ 成功处理: {self.processed_documents}（其中缓存命中 {self.cached_documents}）")
         print(f"❌ 失败文档: {len(self.failed_documents)}")
         
         if self.failed_documents:
@@ -212,22 +342,30 @@ class BatchISOAnalyzer:
             for failed in self.failed_documents:
                 print(f"  - {failed}")
     
+    def iter_document_details(self):
+        """按文档名顺序逐个读取 JSON Lines 中的文档结果"""
+        with open(self.results_file, 'rb') as f:
+            for _, offset in sorted(self._detail_index):
+                f.seek(offset)
+                yield json.loads(f.readline().decode('utf-8'))
+
     def generate_reports(self):
         """生成分析报告"""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
-        # 生成JSON报告
+        # 生成JSON报告（文档详情见 JSON Lines 文件）
         json_report = {
             'analysis_info': {
                 'timestamp': timestamp,
                 'total_documents': self.total_documents,
                 'processed_documents': self.processed_documents,
+                'cached_documents': self.cached_documents,
                 'failed_documents': len(self.failed_documents),
-                'analyzer_version': '2.0 - 批量重新分析版'
+                'analyzer_version': '2.1 - 并行缓存版'
             },
             'department_statistics': dict(self.department_stats.most_common()),
             'role_statistics': dict(self.role_stats.most_common()),
-            'document_details': self.document_results,
+            'document_details_file': str(self.results_file),
             'failed_documents': self.failed_documents
         }
         
@@ -236,16 +374,19 @@ class BatchISOAnalyzer:
             json.dump(json_report, f, ensure_ascii=False, indent=2)
         
         print(f"\n📄 JSON报告已保存: {json_file}")
+        print(f"📄 文档详情已保存: {self.results_file}")
         
         # 生成Markdown报告
         self.generate_markdown_report(timestamp)
     
     def generate_markdown_report(self, timestamp):
-        """生成Markdown格式报告"""
-        md_content = f"""# ISO文档批量重新分析报告 🔄
+        """生成Markdown格式报告（逐段写入文件）"""
+        md_file = self.output_path / "ISO文档批量重新分析报告.md"
+        with open(md_file, 'w', encoding='utf-8') as f:
+            f.write(f"""# ISO文档批量重新分析报告 🔄
 
 **分析时间**: {timestamp}
-**分析工具**: 批量ISO分析器 v2.0
+**分析工具**: 批量ISO分析器 v2.1
 **总文档数**: {self.total_documents}
 **成功处理**: {self.processed_documents}
 **失败文档**: {len(self.failed_documents)}
@@ -259,74 +400,73 @@ class BatchISOAnalyzer:
 
 | 排名 | 部门名称 | 出现次数 | 占比 |
 |------|----------|----------|------|
-"""
+""")
         
-        total_dept_count = sum(self.department_stats.values())
-        for i, (dept, count) in enumerate(self.department_stats.most_common(20), 1):
-            percentage = (count / total_dept_count * 100) if total_dept_count > 0 else 0
-            md_content += f"| {i} | **{dept}** | {count} | {percentage:.1f}% |\n"
+            total_dept_count = sum(self.department_stats.values())
+            for i, (dept, count) in enumerate(self.department_stats.most_common(20), 1):
+                percentage = (count / total_dept_count * 100) if total_dept_count > 0 else 0
+                f.write(f"| {i} | **{dept}** | {count} | {percentage:.1f}% |\n")
         
-        md_content += f"\n**部门总计**: {len(self.department_stats)} 个不同部门\n"
-        md_content += f"**部门提及总次数**: {total_dept_count} 次\n\n"
+            f.write(f"\n**部门总计**: {len(self.department_stats)} 个不同部门\n")
+            f.write(f"**部门提及总次数**: {total_dept_count} 次\n\n")
         
-        md_content += "## 👥 角色统计总览\n\n"
-        md_content += "| 排名 | 角色名称 | 出现次数 | 占比 |\n"
-        md_content += "|------|----------|----------|------|\n"
+            f.write("## 👥 角色统计总览\n\n")
+            f.write("| 排名 | 角色名称 | 出现次数 | 占比 |\n")
+            f.write("|------|----------|----------|------|\n")
         
-        total_role_count = sum(self.role_stats.values())
-        for i, (role, count) in enumerate(self.role_stats.most_common(20), 1):
-            percentage = (count / total_role_count * 100) if total_role_count > 0 else 0
-            md_content += f"| {i} | **{role}** | {count} | {percentage:.1f}% |\n"
+            total_role_count = sum(self.role_stats.values())
+            for i, (role, count) in enumerate(self.role_stats.most_common(20), 1):
+                percentage = (count / total_role_count * 100) if total_role_count > 0 else 0
+                f.write(f"| {i} | **{role}** | {count} | {percentage:.1f}% |\n")
         
-        md_content += f"\n**角色总计**: {len(self.role_stats)} 个不同角色\n"
-        md_content += f"**角色提及总次数**: {total_role_count} 次\n\n"
+            f.write(f"\n**角色总计**: {len(self.role_stats)} 个不同角色\n")
+            f.write(f"**角色提及总次数**: {total_role_count} 次\n\n")
         
-        # 添加文档详情
-        md_content += "## 📋 文档分析详情\n\n"
+            # 添加文档详情
+            f.write("## 📋 文档分析详情\n\n")
         
-        for doc_name, details in sorted(self.document_results.items()):
-            md_content += f"### {doc_name}\n\n"
+            for details in self.iter_document_details():
+                f.write(f"### {details['name']}\n\n")
             
-            if details['departments']:
-                md_content += "**部门**: "
-                dept_list = [f"{dept}({count}次)" for dept, count in sorted(details['departments'].items(), key=lambda x: x[1], reverse=True)]
-                md_content += ", ".join(dept_list) + "\n\n"
-            else:
-                md_content += "**部门**: 未发现\n\n"
+                if details['departments']:
+                    dept_list = [f"{dept}({count}次)" for dept, count in sorted(details['departments'].items(), key=lambda x: x[1], reverse=True)]
+                    f.write("**部门**: " + ", ".join(dept_list) + "\n\n")
+                else:
+                    f.write("**部门**: 未发现\n\n")
             
-            if details['roles']:
-                md_content += "**角色**: "
-                role_list = [f"{role}({count}次)" for role, count in sorted(details['roles'].items(), key=lambda x: x[1], reverse=True)]
-                md_content += ", ".join(role_list) + "\n\n"
-            else:
-                md_content += "**角色**: 未发现\n\n"
-        
-        if self.failed_documents:
-            md_content += "## ❌ 处理失败的文档\n\n"
-            for failed in self.failed_documents:
-                md_content += f"- {failed}\n"
-            md_content += "\n"
-        
-        md_content += f"## 📈 分析总结\n\n"
-        md_content += f"- 本次重新分析发现了 **{len(self.department_stats)}** 个不同部门\n"
-        md_content += f"- 本次重新分析发现了 **{len(self.role_stats)}** 个不同角色\n"
-        md_content += f"- 部门提及总次数: **{total_dept_count}** 次\n"
-        md_content += f"- 角色提及总次数: **{total_role_count}** 次\n"
-        md_content += f"- 成功处理文档: **{self.processed_documents}/{self.total_documents}** 个\n\n"
-        
-        md_content += "---\n\n"
-        md_content += "*本报告由批量ISO分析器自动生成*\n"
-        
-        md_file = self.output_path / "ISO文档批量重新分析报告.md"
-        with open(md_file, 'w', encoding='utf-8') as f:
-            f.write(md_content)
+                if details['roles']:
+                    role_list = [f"{role}({count}次)" for role, count in sorted(details['roles'].items(), key=lambda x: x[1], reverse=True)]
+                    f.write("**角色**: " + ", ".join(role_list) + "\n\n")
+                else:
+                    f.write("**角色**: 未发现\n\n")
+        
+            if self.failed_documents:
+                f.write("## ❌ 处理失败的文档\n\n")
+                for failed in self.failed_documents:
+                    f.write(f"- {failed}\n")
+                f.write("\n")
+        
+            f.write(f"## 📈 分析总结\n\n")
+            f.write(f"- 本次重新分析发现了 **{len(self.department_stats)}** 个不同部门\n")
+            f.write(f"- 本次重新分析发现了 **{len(self.role_stats)}** 个不同角色\n")
+            f.write(f"- 部门提及总次数: **{total_dept_count}** 次\n")
+            f.write(f"- 角色提及总次数: **{total_role_count}** 次\n")
+            f.write(f"- 成功处理文档: **{self.processed_documents}/{self.total_documents}** 个\n\n")
+        
+            f.write("---\n\n")
+            f.write("*本报告由批量ISO分析器自动生成*\n")
         
         print(f"📄 Markdown报告已保存: {md_file}")
 
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description="批量ISO文档部门角色分析")
+    parser.add_argument("-w", "--workers", type=int, help="并行进程数（默认CPU核数）")
+    parser.add_argument("-f", "--force", action="store_true", help="忽略缓存，全部重新分析")
+    args = parser.parse_args()
+
     analyzer = BatchISOAnalyzer()
-    analyzer.run_analysis()
+    analyzer.run_analysis(workers=args.workers, force=args.force)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
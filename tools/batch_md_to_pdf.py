@@ -13,20 +13,73 @@ import glob
 from pathlib import Path
 import argparse
 import logging
-from markdown_to_pdf_converter import MarkdownToPDFConverter
+from batch_conversion import run_batch
+from chrome_pdf_pool import ChromePdfPool, is_available
+from html_to_pdf_converter import HTMLToPDFConverter
+from markdown_to_html_converter import MarkdownToHTMLConverter
 
 # 配置日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def batch_convert_md_to_pdf(source_dir, output_dir=None, file_pattern="*.md"):
+
+class MarkdownToPDFWorker:
+    """
+    工作进程内的Markdown转PDF转换器
+    
+    每个工作进程只创建一次：Markdown转换器和无头Chrome会话在整个批次内复用，
+    Chrome不可用时回退为逐个文件调用命令行模式。
+    """
+    
+    def __init__(self):
+        self.html_converter = MarkdownToHTMLConverter()
+        self.pdf_pool = ChromePdfPool(size=1) if is_available() else None
+        self.pdf_converter = HTMLToPDFConverter()
+    
+    def convert(self, md_file: str, output_pdf: str) -> dict:
+        # 中间HTML放在Markdown文件旁边，保证相对路径的图片可以加载
+        md_path = Path(md_file)
+        html_file = md_path.with_name(f".{md_path.stem}.{os.getpid()}.html")
+        try:
+            result = self.html_converter.convert_markdown_to_html(str(md_path), str(html_file))
+            if result["status"] != "success":
+                return result
+            if self.pdf_pool is not None:
+                return self.pdf_pool.convert(str(html_file), output_pdf)
+            return self.pdf_converter.convert_html_to_pdf_chrome(str(html_file), output_pdf)
+        finally:
+            try:
+                html_file.unlink()
+            except OSError:
+                pass
+    
+    def close(self):
+        if self.pdf_pool is not None:
+            self.pdf_pool.close()
+
+
+def _stats_from_summary(summary) -> dict:
+    """转换为原有的统计信息格式"""
+    return {
+        "success": summary.success,
+        "failed": summary.failed,
+        "skipped": summary.skipped,
+        "total": summary.total,
+    }
+
+def batch_convert_md_to_pdf(source_dir, output_dir=None, file_pattern="*.md", workers=None, force=False):
     """
     批量将指定目录下的Markdown文件转换为PDF
     
+    在进程池中并行转换，大文件优先；PDF比Markdown新的文件跳过。
+    转换清单 conversion_manifest.json 写入输出目录。
+    
     Args:
         source_dir: 源文件目录
         output_dir: 输出目录（可选）
         file_pattern: 文件匹配模式（默认为"*.md"）
+        workers: 并行进程数（默认CPU核数）
+        force: 忽略时间戳，全部重新转换
         
     Returns:
         转换结果统计信息
@@ -47,41 +100,18 @@ def batch_convert_md_to_pdf(source_dir, output_dir=None, file_pattern="*.md"):
     
     if not md_files:
         logger.warning(f"在 {source_dir} 中未找到匹配的Markdown文件")
-        return {"success": 0, "failed": 0, "total": 0}
+        return {"success": 0, "failed": 0, "skipped": 0, "total": 0}
     
     logger.info(f"找到 {len(md_files)} 个Markdown文件")
     
-    # 初始化转换器
-    converter = MarkdownToPDFConverter()
-    
-    # 统计信息
-    stats = {"success": 0, "failed": 0, "total": len(md_files)}
-    
-    # 批量转换
-    for md_file in md_files:
+    def output_for(md_file):
         # 确定输出PDF文件路径
-        relative_path = md_file.relative_to(source_dir) if md_file.is_relative_to(source_dir) else md_file.name
-        output_pdf = output_dir / relative_path.with_suffix('.pdf')
-        
-        # 确保输出目录存在
-        output_pdf.parent.mkdir(parents=True, exist_ok=True)
-        
-        logger.info(f"正在转换: {md_file} -> {output_pdf}")
-        
-        # 执行转换
-        result = converter.convert_markdown_to_pdf(str(md_file), str(output_pdf))
-        
-        if result["status"] == "success":
-            stats["success"] += 1
-            logger.info(f"✅ 转换成功: {output_pdf}")
-        else:
-            stats["failed"] += 1
-            logger.error(f"❌ 转换失败: {md_file} - {result['message']}")
-    
-    # 打印统计信息
-    logger.info(f"转换完成: 成功 {stats['success']}/{stats['total']}, 失败 {stats['failed']}/{stats['total']}")
+        relative_path = md_file.relative_to(source_dir) if md_file.is_relative_to(source_dir) else Path(md_file.name)
+        return output_dir / relative_path.with_suffix('.pdf')
     
-    return stats
+    summary = run_batch(md_files, output_for, MarkdownToPDFWorker, manifest_dir=output_dir,
+                        max_workers=workers, force=force)
+    return _stats_from_summary(summary)
 
 def main():
     """
@@ -91,11 +121,13 @@ def main():
     parser.add_argument("source_dir", help="源Markdown文件目录")
     parser.add_argument("-o", "--output-dir", help="输出PDF文件目录（默认与源目录相同）")
     parser.add_argument("-p", "--pattern", default="*.md", help="文件匹配模式（默认为'*.md'）")
+    parser.add_argument("-w", "--workers", type=int, help="并行进程数（默认CPU核数）")
+    parser.add_argument("-f", "--force", action="store_true", help="忽略时间戳，全部重新转换")
     
     args = parser.parse_args()
     
     # 执行批量转换
-    stats = batch_convert_md_to_pdf(args.source_dir, args.output_dir, args.pattern)
+    stats = batch_convert_md_to_pdf(args.source_dir, args.output_dir, args.pattern, args.workers, args.force)
     
     # 根据转换结果设置退出码
     if stats["failed"] > 0:
@@ -104,7 +136,7 @@ def main():
         sys.exit(0)
 
 # 便捷函数，用于直接从其他脚本调用
-def convert_md_files(source_dir, output_dir=None, file_pattern="*.md"):
+def convert_md_files(source_dir, output_dir=None, file_pattern="*.md", workers=None, force=False):
     """
     便捷函数，用于从其他脚本调用批量转换功能
     
@@ -112,14 +144,16 @@ def convert_md_files(source_dir, output_dir=None, file_pattern="*.md"):
         source_dir: 源文件目录
         output_dir: 输出目录（可选）
         file_pattern: 文件匹配模式（默认为"*.md"）
+        workers: 并行进程数（默认CPU核数）
+        force: 忽略时间戳，全部重新转换
         
     Returns:
         转换结果统计信息
     """
-    return batch_convert_md_to_pdf(source_dir, output_dir, file_pattern)
+    return batch_convert_md_to_pdf(source_dir, output_dir, file_pattern, workers, force)
 
 # 便捷函数，用于转换指定范围的文件
-def convert_md_files_range(source_dir, start_file, end_file, output_dir=None):
+def convert_md_files_range(source_dir, start_file, end_file, output_dir=None, workers=None, force=False):
     """
     转换指定范围内的Markdown文件为PDF
     
@@ -128,6 +162,8 @@ def convert_md_files_range(source_dir, start_file, end_file, output_dir=None):
         start_file: 起始文件名（包含）
         end_file: 结束文件名（包含）
         output_dir: 输出目录（可选）
+        workers: 并行进程数（默认CPU核数）
+        force: 忽略时间戳，全部重新转换
         
     Returns:
         转换结果统计信息
@@ -149,21 +185,17 @@ def convert_md_files_range(source_dir, start_file, end_file, output_dir=None):
     
     if start_idx is None or end_idx is None:
         logger.error(f"无法找到指定的起始或结束文件")
-        return {"success": 0, "failed": 0, "total": 0}
+        return {"success": 0, "failed": 0, "skipped": 0, "total": 0}
     
     # 获取范围内的文件
     files_to_convert = all_files[start_idx:end_idx+1]
     
     if not files_to_convert:
         logger.warning(f"在指定范围内未找到Markdown文件")
-        return {"success": 0, "failed": 0, "total": 0}
+        return {"success": 0, "failed": 0, "skipped": 0, "total": 0}
     
     logger.info(f"找到 {len(files_to_convert)} 个Markdown文件在指定范围内")
     
-    # 初始化转换器和统计信息
-    converter = MarkdownToPDFConverter()
-    stats = {"success": 0, "failed": 0, "total": len(files_to_convert)}
-    
     # 如果未指定输出目录，则使用源目录
     if output_dir is None:
         output_dir = source_dir
@@ -172,27 +204,9 @@ def convert_md_files_range(source_dir, start_file, end_file, output_dir=None):
         # 确保输出目录存在
         output_dir.mkdir(parents=True, exist_ok=True)
     
-    # 批量转换
-    for md_file in files_to_convert:
-        # 确定输出PDF文件路径
-        output_pdf = output_dir / md_file.with_suffix('.pdf').name
-        
-        logger.info(f"正在转换: {md_file} -> {output_pdf}")
-        
-        # 执行转换
-        result = converter.convert_markdown_to_pdf(str(md_file), str(output_pdf))
-        
-        if result["status"] == "success":
-            stats["success"] += 1
-            logger.info(f"✅ 转换成功: {output_pdf}")
-        else:
-            stats["failed"] += 1
-            logger.error(f"❌ 转换失败: {md_file} - {result['message']}")
-    
-    # 打印统计信息
-    logger.info(f"转换完成: 成功 {stats['success']}/{stats['total']}, 失败 {stats['failed']}/{stats['total']}")
-    
-    return stats
+    summary = run_batch(files_to_convert, lambda md_file: output_dir / md_file.with_suffix('.pdf').name,
+                        MarkdownToPDFWorker, manifest_dir=output_dir, max_workers=workers, force=force)
+    return _stats_from_summary(summary)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -6,13 +6,14 @@
 """
 
 import os
-import re
 import sys
 import json
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Tuple
 
+from date_scanner import DateScanner
+
 class DocumentDateChecker:
     """文档日期检查器"""
     
@@ -24,15 +25,9 @@ class DocumentDateChecker:
         # 定义禁止的历史年份
         self.forbidden_years = ["2024", "2023", "2022", "2021", "2020", "2019", "2018", "2017", "2016", "2015"]
         
-        # 定义日期模式
-        self.date_patterns = [
-            r'创建日期[：:]\s*(\d{4}年\d{1,2}月)',
-            r'最后更新[：:]\s*(\d{4}年\d{1,2}月)',
-            r'修改日期[：:]\s*(\d{4}年\d{1,2}月)',
-            r'更新日期[：:]\s*(\d{4}年\d{1,2}月)',
-            r'版本日期[：:]\s*(\d{4}年\d{1,2}月)',
-            r'发布日期[：:]\s*(\d{4}年\d{1,2}月)'
-        ]
+        # 定义日期标签和格式（合并为一个扫描器，单次扫描给出行号和行内容）
+        self.date_labels = ["创建日期", "最后更新", "修改日期", "更新日期", "版本日期", "发布日期"]
+        self.scanner = DateScanner(labels=self.date_labels, date_formats=[r'\d{4}年\d{1,2}月'])
     
     def get_current_year(self) -> str:
         """获取当前年份"""
@@ -43,34 +38,22 @@ class DocumentDateChecker:
         violations = []
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            for pattern in self.date_patterns:
-                matches = re.findall(pattern, content)
-                for match in matches:
-                    for forbidden_year in self.forbidden_years:
-                        if forbidden_year in match:
-                            violations.append({
-                                'file': str(file_path.relative_to(self.project_root)),
-                                'violation': f"发现历史日期: {match}",
-                                'pattern': pattern,
-                                'line_content': self._find_line_with_date(content, match)
-                            })
+            for match in self.scanner.scan_file(file_path):
+                for forbidden_year in self.forbidden_years:
+                    if forbidden_year in match.value:
+                        violations.append({
+                            'file': str(file_path.relative_to(self.project_root)),
+                            'violation': f"发现历史日期: {match.value}",
+                            'label': match.label,
+                            'line': match.line,
+                            'line_content': match.line_content
+                        })
         
         except Exception as e:
             print(f"检查文件 {file_path} 时出错: {e}")
         
         return violations
     
-    def _find_line_with_date(self, content: str, date_str: str) -> str:
-        """查找包含日期的行"""
-        lines = content.split('\n')
-        for line in lines:
-            if date_str in line:
-                return line.strip()
-        return ""
-    
     def check_all_documents(self) -> bool:
         """检查所有文档"""
         print("开始检查文档日期合规性...")
@@ -101,7 +84,7 @@ class DocumentDateChecker:
                     self.violations.extend(file_violations)
                     print(f"错误: {file_path.name}: 发现 {len(file_violations)} 个日期违规")
                     for violation in file_violations:
-                        print(f"   - {violation['violation']}")
+                        print(f"   - 第{violation['line']}行: {violation['violation']}")
                         if violation['line_content']:
                             print(f"     行内容: {violation['line_content']}")
         
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+无头Chrome渲染池
+
+保持少量长期运行的无头Chrome进程，通过DevTools协议（CDP）在每个进程中新建标签页
+渲染HTML并调用 Page.printToPDF，多个进程并行处理批量任务。页面在 load 事件和
+字体加载完成后立即打印，不再使用固定的 --virtual-time-budget 等待；Chrome可执行
+文件只查找一次。
+
+依赖 websocket-client（import websocket），未安装时 is_available() 返回 False，
+调用方应回退为逐个启动Chrome的命令行模式。
+"""
+
+import os
+import json
+import time
+import queue
+import base64
+import shutil
+import logging
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import websocket
+except ImportError:
+    websocket = None
+
+logger = logging.getLogger(__name__)
+
+# 常见的Chrome安装位置（按顺序查找）
+CHROME_CANDIDATES = [
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+    os.path.join(os.getenv("LOCALAPPDATA", ""), r"Google\Chrome\Application\chrome.exe"),
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+]
+
+# PATH 中可能的可执行文件名
+CHROME_COMMANDS = ["chrome", "google-chrome", "google-chrome-stable", "chromium", "chromium-browser"]
+
+# 等待Chrome写出调试端口的时间（秒）
+STARTUP_TIMEOUT = 15
+
+# 单个页面的渲染超时（秒）
+PAGE_TIMEOUT = 30
+
+# 打印参数：与命令行 --print-to-pdf-no-header 一致，不输出页眉页脚
+PRINT_OPTIONS = {
+    "displayHeaderFooter": False,
+    "printBackground": True,
+    "preferCSSPageSize": True,
+}
+
+
+@lru_cache(maxsize=1)
+def find_chrome_executable() -> Optional[str]:
+    """查找Chrome可执行文件（结果缓存，进程内只查找一次）"""
+    for path in CHROME_CANDIDATES:
+        if path and os.path.exists(path):
+            return path
+    for command in CHROME_COMMANDS:
+        path = shutil.which(command)
+        if path:
+            return path
+    return None
+
+
+def is_available() -> bool:
+    """是否可以使用渲染池"""
+    return websocket is not None and find_chrome_executable() is not None
+
+
+def file_url(path: Path) -> str:
+    return Path(path).resolve().as_uri()
+
+
+class RenderError(Exception):
+    """页面渲染失败"""
+
+
+class ChromeSession:
+    """一个长期运行的无头Chrome进程及其DevTools连接"""
+
+    def __init__(self, executable: Optional[str] = None, page_timeout: float = PAGE_TIMEOUT):
+        self.executable = executable or find_chrome_executable()
+        if not self.executable:
+            raise RenderError("未找到Chrome浏览器，请确保已安装Chrome")
+        if websocket is None:
+            raise RenderError("缺少 websocket-client，无法使用DevTools协议")
+
+        self.page_timeout = page_timeout
+        self._next_id = 0
+        self._events: List[Dict] = []
+        self._profile_dir = tempfile.mkdtemp(prefix="chrome_pdf_")
+        self._process = subprocess.Popen(
+            [
+                self.executable,
+                "--headless",
+                "--disable-gpu",
+                "--no-sandbox",
+                "--disable-dev-shm-usage",
+                "--no-first-run",
+                "--no-default-browser-check",
+                "--remote-debugging-port=0",
+                "--remote-allow-origins=*",
+                f"--user-data-dir={self._profile_dir}",
+                "about:blank",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            self._ws = websocket.create_connection(
+                self._wait_for_endpoint(), timeout=self.page_timeout, suppress_origin=True
+            )
+        except Exception:
+            self.close()
+            raise
+
+    def _wait_for_endpoint(self) -> str:
+        """读取Chrome在用户目录写出的 DevToolsActivePort 文件"""
+        port_file = Path(self._profile_dir) / "DevToolsActivePort"
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                raise RenderError(f"Chrome启动失败，返回码: {self._process.returncode}")
+            try:
+                lines = port_file.read_text(encoding="utf-8").split("\n")
+                if len(lines) >= 2 and lines[0].strip() and lines[1].strip():
+                    return f"ws://127.0.0.1:{lines[0].strip()}{lines[1].strip()}"
+            except OSError:
+                pass
+            time.sleep(0.05)
+        raise RenderError("等待Chrome调试端口超时")
+
+    def _send(self, method: str, params: Optional[Dict] = None, session_id: Optional[str] = None) -> Dict:
+        """发送CDP命令并等待对应的响应，期间收到的事件暂存"""
+        self._next_id += 1
+        message = {"id": self._next_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        self._ws.send(json.dumps(message))
+
+        deadline = time.monotonic() + self.page_timeout
+        while time.monotonic() < deadline:
+            reply = json.loads(self._ws.recv())
+            if reply.get("id") == self._next_id:
+                if "error" in reply:
+                    raise RenderError(f"{method} 失败: {reply['error'].get('message')}")
+                return reply.get("result", {})
+            if "method" in reply:
+                self._events.append(reply)
+        raise RenderError(f"{method} 超时")
+
+    def _wait_event(self, method: str, session_id: str):
+        deadline = time.monotonic() + self.page_timeout
+        while True:
+            for i, event in enumerate(self._events):
+                if event["method"] == method and event.get("sessionId") == session_id:
+                    del self._events[i]
+                    return
+            if time.monotonic() >= deadline:
+                raise RenderError(f"等待 {method} 超时")
+            event = json.loads(self._ws.recv())
+            if "method" in event:
+                self._events.append(event)
+
+    def render(self, url: str, output_pdf: Path):
+        """在新标签页中打开页面并打印为PDF"""
+        target_id = self._send("Target.createTarget", {"url": "about:blank"})["targetId"]
+        try:
+            session_id = self._send("Target.attachToTarget", {"targetId": target_id, "flatten": True})["sessionId"]
+            self._send("Page.enable", session_id=session_id)
+            navigation = self._send("Page.navigate", {"url": url}, session_id=session_id)
+            if navigation.get("errorText"):
+                raise RenderError(f"页面加载失败: {navigation['errorText']}")
+            self._wait_event("Page.loadEventFired", session_id)
+            # 等待网页字体加载完成，替代固定的虚拟时间预算
+            self._send("Runtime.evaluate", {"expression": "document.fonts.ready.then(() => true)",
+                                            "awaitPromise": True}, session_id=session_id)
+            data = self._send("Page.printToPDF", PRINT_OPTIONS, session_id=session_id)["data"]
+            output_pdf = Path(output_pdf)
+            output_pdf.parent.mkdir(parents=True, exist_ok=True)
+            output_pdf.write_bytes(base64.b64decode(data))
+        finally:
+            try:
+                self._send("Target.closeTarget", {"targetId": target_id})
+            except Exception:
+                pass
+            self._events = [e for e in self._events if e.get("sessionId") is None]
+
+    def close(self):
+        ws = getattr(self, "_ws", None)
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:
+                pass
+        if self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        shutil.rmtree(self._profile_dir, ignore_errors=True)
+
+
+class PlaceholderRenderer:
+    """占位渲染器：不启动浏览器，只写出一页空白PDF（用于测试和试运行）"""
+
+    PDF = (
+        b"%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+        b"2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n"
+        b"3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 595 842]>>endobj\n"
+        b"trailer<</Root 1 0 R>>\n%%EOF\n"
+    )
+
+    def render(self, url: str, output_pdf: Path):
+        output_pdf = Path(output_pdf)
+        output_pdf.parent.mkdir(parents=True, exist_ok=True)
+        output_pdf.write_bytes(self.PDF)
+
+    def close(self):
+        pass
+
+
+class ChromePdfPool:
+    """渲染池：size 个会话按需启动，批量任务在线程池中分配给空闲会话"""
+
+    def __init__(self, size: int = 4, renderer_factory: Optional[Callable[[], object]] = None):
+        """
+        Args:
+            size: 会话数量（同时运行的Chrome进程数）
+            renderer_factory: 创建渲染会话的函数，默认启动 ChromeSession；
+                              会话需提供 render(url, output_pdf) 和 close()
+        """
+        self.size = max(1, size)
+        self.renderer_factory = renderer_factory or ChromeSession
+        self._idle: "queue.Queue" = queue.Queue()
+        self._sessions: List[object] = []
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._sessions) < self.size:
+                session = self.renderer_factory()
+                self._sessions.append(session)
+                return session
+        return self._idle.get()
+
+    def _discard(self, session):
+        """会话出错后关闭并移出池，下次按需重建"""
+        with self._lock:
+            if session in self._sessions:
+                self._sessions.remove(session)
+        try:
+            session.close()
+        except Exception:
+            pass
+
+    def convert(self, html_file, output_pdf=None) -> Dict:
+        """转换单个文件，返回与 HTMLToPDFConverter 一致的结果字典"""
+        html_path = Path(html_file)
+        if not html_path.exists():
+            return {"status": "error", "message": f"HTML文件不存在: {html_file}"}
+        output_pdf = str(output_pdf) if output_pdf else str(html_path.with_suffix(".pdf"))
+
+        try:
+            session = self._acquire()
+        except Exception as e:
+            return {"status": "error", "message": f"启动Chrome失败: {e}"}
+
+        try:
+            session.render(file_url(html_path), Path(output_pdf))
+        except Exception as e:
+            self._discard(session)
+            return {"status": "error", "message": f"PDF生成失败: {e}"}
+        self._idle.put(session)
+        return {
+            "status": "success",
+            "message": f"PDF文件已生成: {output_pdf}",
+            "input_file": str(html_file),
+            "output_file": output_pdf,
+        }
+
+    def convert_many(self, jobs: Sequence[Tuple[str, Optional[str]]]) -> List[Dict]:
+        """并行转换多个文件，jobs 为 (html_file, output_pdf) 列表，结果按输入顺序返回"""
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            return list(executor.map(lambda job: self.convert(*job), jobs))
+
+    def close(self):
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            try:
+                session.close()
+            except Exception:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
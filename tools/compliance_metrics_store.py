@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+合规指标时间序列存储
+
+每次生成日报时追加一条指标样本（每个指标一列），写入的同时在同一事务中更新
+按天和按周（ISO周，以周一为键）的预聚合行：样本数、总和、平方和、最小值、最大值
+和最后一次取值。日报、周报和任意时间段报告都直接读取预聚合行，读取量只与所查询
+的天数有关，与历史数据总量无关。
+"""
+
+import math
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# 记录的指标（与 UnifiedReportGenerator 的摘要字段一致）
+METRICS = (
+    "total_violations",
+    "resolved_violations",
+    "unresolved_violations",
+    "resolution_rate",
+    "compliance_score",
+)
+
+PERIOD_DAY = "day"
+PERIOD_WEEK = "week"
+
+
+@dataclass
+class MetricSummary:
+    """某个时间段内一个指标的聚合结果"""
+    count: int          # 样本数
+    mean: float         # 样本均值
+    minimum: float
+    maximum: float
+    stddev: float
+    last: float         # 时间段内最后一次取值
+    days: int = 0       # 有数据的天数
+    sum_daily_last: float = 0.0  # 各天最后取值之和
+
+    @property
+    def mean_daily_last(self) -> float:
+        """各天最后取值的均值（与按天保存的日报一致）"""
+        return self.sum_daily_last / self.days if self.days else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.minimum,
+            "max": self.maximum,
+            "stddev": self.stddev,
+            "last": self.last,
+            "days": self.days,
+            "mean_daily_last": self.mean_daily_last,
+        }
+
+
+def week_start(day: date) -> date:
+    """ISO周的周一"""
+    return day - timedelta(days=day.weekday())
+
+
+def _percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """线性插值百分位数"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * pct / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return sorted_values[lower]
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+class ComplianceMetricsStore:
+    """合规指标存储（SQLite，追加写入 + 写入时预聚合）"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS metric_samples (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TEXT NOT NULL,
+        day TEXT NOT NULL,
+        total_violations REAL,
+        resolved_violations REAL,
+        unresolved_violations REAL,
+        resolution_rate REAL,
+        compliance_score REAL
+    );
+
+    CREATE TABLE IF NOT EXISTS metric_rollups (
+        period TEXT NOT NULL,
+        bucket TEXT NOT NULL,
+        metric TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        sum REAL NOT NULL,
+        sum_sq REAL NOT NULL,
+        min REAL NOT NULL,
+        max REAL NOT NULL,
+        last REAL NOT NULL,
+        last_timestamp TEXT NOT NULL,
+        PRIMARY KEY (period, metric, bucket)
+    ) WITHOUT ROWID;
+    """
+
+    UPSERT_ROLLUP = """
+    INSERT INTO metric_rollups (period, bucket, metric, count, sum, sum_sq, min, max, last, last_timestamp)
+    VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (period, metric, bucket) DO UPDATE SET
+        count = count + 1,
+        sum = sum + excluded.sum,
+        sum_sq = sum_sq + excluded.sum_sq,
+        min = MIN(min, excluded.min),
+        max = MAX(max, excluded.max),
+        last = CASE WHEN excluded.last_timestamp >= last_timestamp THEN excluded.last ELSE last END,
+        last_timestamp = MAX(last_timestamp, excluded.last_timestamp)
+    """
+
+    def __init__(self, db_file: Path):
+        self.db_file = Path(db_file)
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_file), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        self._conn.commit()
+
+    def _insert(self, metrics: Dict, timestamp: datetime):
+        day = timestamp.date()
+        ts = timestamp.isoformat()
+        values = [metrics.get(name) for name in METRICS]
+        self._conn.execute(
+            f"INSERT INTO metric_samples (timestamp, day, {', '.join(METRICS)}) "
+            f"VALUES (?, ?, {', '.join('?' * len(METRICS))})",
+            [ts, day.isoformat()] + values
+        )
+        buckets = ((PERIOD_DAY, day.isoformat()), (PERIOD_WEEK, week_start(day).isoformat()))
+        for name, value in zip(METRICS, values):
+            if value is None:
+                continue
+            value = float(value)
+            for period, bucket in buckets:
+                self._conn.execute(self.UPSERT_ROLLUP,
+                                   (period, bucket, name, value, value * value, value, value, value, ts))
+
+    def append(self, metrics: Dict, timestamp: Optional[datetime] = None):
+        """追加一条指标样本并更新日、周预聚合"""
+        with self._lock:
+            self._insert(metrics, timestamp or datetime.now())
+            self._conn.commit()
+
+    def append_many(self, samples: Iterable[Tuple[datetime, Dict]]):
+        """在一个事务中追加多条样本（用于导入历史日报）"""
+        with self._lock:
+            for timestamp, metrics in samples:
+                self._insert(metrics, timestamp)
+            self._conn.commit()
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM metric_samples LIMIT 1").fetchone() is None
+
+    def summary(self, start: date, end: date) -> Dict[str, MetricSummary]:
+        """汇总 [start, end] 内各指标（按天预聚合行合并）"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT metric, SUM(count), SUM(sum), SUM(sum_sq), MIN(min), MAX(max), "
+                "COUNT(*), SUM(last), MAX(last_timestamp) "
+                "FROM metric_rollups WHERE period = ? AND bucket BETWEEN ? AND ? GROUP BY metric",
+                (PERIOD_DAY, start.isoformat(), end.isoformat())
+            ).fetchall()
+            result = {}
+            for metric, count, total, total_sq, minimum, maximum, days, sum_last, last_ts in rows:
+                last = self._conn.execute(
+                    "SELECT last FROM metric_rollups WHERE period = ? AND metric = ? "
+                    "AND bucket BETWEEN ? AND ? AND last_timestamp = ? LIMIT 1",
+                    (PERIOD_DAY, metric, start.isoformat(), end.isoformat(), last_ts)
+                ).fetchone()[0]
+                result[metric] = self._make_summary(count, total, total_sq, minimum, maximum, last, days, sum_last)
+        return result
+
+    def week_summary(self, day: date) -> Dict[str, MetricSummary]:
+        """读取 day 所在ISO周的预聚合结果"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT metric, count, sum, sum_sq, min, max, last FROM metric_rollups "
+                "WHERE period = ? AND bucket = ?",
+                (PERIOD_WEEK, week_start(day).isoformat())
+            ).fetchall()
+        return {
+            metric: self._make_summary(count, total, total_sq, minimum, maximum, last)
+            for metric, count, total, total_sq, minimum, maximum, last in rows
+        }
+
+    def daily_series(self, metric: str, start: date, end: date, field: str = "last") -> List[Tuple[str, float]]:
+        """按天返回指标序列 [(日期, 值)]，field 为 last（当天最后取值）或 mean"""
+        if metric not in METRICS:
+            raise ValueError(f"未知指标: {metric}")
+        value_expr = "sum / count" if field == "mean" else "last"
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT bucket, {value_expr} FROM metric_rollups "
+                "WHERE period = ? AND metric = ? AND bucket BETWEEN ? AND ? ORDER BY bucket",
+                (PERIOD_DAY, metric, start.isoformat(), end.isoformat())
+            ).fetchall()
+
+    def moving_average(self, metric: str, start: date, end: date, window: int = 7) -> List[Tuple[str, float]]:
+        """按天的滑动平均（窗口按日历天计算，窗口内缺数据的天不计入）"""
+        history = self.daily_series(metric, start - timedelta(days=window - 1), end)
+        result = []
+        window_values: List[Tuple[date, float]] = []
+        total = 0.0
+        for bucket, value in history:
+            day = date.fromisoformat(bucket)
+            window_values.append((day, value))
+            total += value
+            while window_values[0][0] <= day - timedelta(days=window):
+                total -= window_values.pop(0)[1]
+            if day >= start:
+                result.append((bucket, total / len(window_values)))
+        return result
+
+    def trend(self, metric: str, start: date, end: date, window: int = 7,
+              percentiles: Sequence[float] = (50, 90)) -> Dict:
+        """指标趋势：每日序列、滑动平均、百分位数和最小二乘斜率"""
+        series = self.daily_series(metric, start, end)
+        if not series:
+            return {"trend": "无数据"}
+
+        values = [value for _, value in series]
+        sorted_values = sorted(values)
+
+        # 以天为横轴的最小二乘斜率，不受首尾单日波动影响
+        xs = [(date.fromisoformat(bucket) - start).days for bucket, _ in series]
+        mean_x = sum(xs) / len(xs)
+        mean_y = sum(values) / len(values)
+        var_x = sum((x - mean_x) ** 2 for x in xs)
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, values)) / var_x if var_x else 0.0
+
+        return {
+            "series": values,
+            "days": [bucket for bucket, _ in series],
+            "average": mean_y,
+            "moving_average": [value for _, value in self.moving_average(metric, start, end, window)],
+            "percentiles": {f"p{pct:g}": _percentile(sorted_values, pct) for pct in percentiles},
+            "slope_per_day": slope,
+        }
+
+    @staticmethod
+    def _make_summary(count, total, total_sq, minimum, maximum, last, days=0, sum_last=0.0) -> MetricSummary:
+        mean = total / count if count else 0.0
+        variance = max(0.0, total_sq / count - mean * mean) if count else 0.0
+        return MetricSummary(count, mean, minimum, maximum, math.sqrt(variance), last, days, sum_last or 0.0)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
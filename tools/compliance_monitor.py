@@ -17,6 +17,8 @@ import json
 import yaml
 import logging
 import re
+import sqlite3
+import threading
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, List, Set, Optional, Tuple
@@ -26,6 +28,7 @@ from watchdog.events import FileSystemEventHandler, FileCreatedEvent, FileModifi
 # 添加项目根目录到Python路径
 sys.path.insert(0, str(Path(__file__).parent))
 from pre_operation_check import ProjectComplianceChecker
+from date_scanner import DateScanner
 
 
 class ComplianceViolation:
@@ -41,6 +44,7 @@ class ComplianceViolation:
         self.resolution_action = None
         self.date_issues = []  # 新增：日期相关问题
         self.suggested_fixes = []  # 新增：修复建议
+        self.id = None  # 违规存储中的记录ID
     
     def to_dict(self) -> Dict:
         return {
@@ -69,19 +73,9 @@ class DateConsistencyChecker:
             "2006-", "2020/", "2019/", "2018/", "2017/", "2016/", "2015/", "2014/", 
             "2013/", "2012/", "2011/", "2010/", "2009/", "2008/", "2007/", "2006/"
         ]
-        self.date_patterns = [
-            r'创建日期[：:]\s*(\d{4}年\d{1,2}月\d{1,2}日)',
-            r'修改日期[：:]\s*(\d{4}年\d{1,2}月\d{1,2}日)',
-            r'更新日期[：:]\s*(\d{4}年\d{1,2}月\d{1,2}日)',
-            r'升级日期[：:]\s*(\d{4}年\d{1,2}月\d{1,2}日)',
-            r'完成日期[：:]\s*(\d{4}年\d{1,2}月\d{1,2}日)',
-            r'创建日期[：:]\s*(\d{4}-\d{1,2}-\d{1,2})',
-            r'修改日期[：:]\s*(\d{4}-\d{1,2}-\d{1,2})',
-            r'更新日期[：:]\s*(\d{4}-\d{1,2}-\d{1,2})',
-            r'创建日期[：:]\s*(\d{4}/\d{1,2}/\d{1,2})',
-            r'修改日期[：:]\s*(\d{4}/\d{1,2}/\d{1,2})',
-            r'更新日期[：:]\s*(\d{4}/\d{1,2}/\d{1,2})'
-        ]
+        # 带标签日期与禁止标记合并为一个扫描器，每个文件只扫描一遍
+        self.date_labels = ["创建日期", "修改日期", "更新日期", "升级日期", "完成日期"]
+        self.scanner = DateScanner(labels=self.date_labels, forbidden_markers=self.forbidden_dates)
     
     def check_file_dates(self, file_path: Path) -> List[str]:
         """检查文件中的日期一致性"""
@@ -91,20 +85,20 @@ class DateConsistencyChecker:
             return issues
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            found_markers = set()
+            date_issues = []
+            for match in self.scanner.scan_file(file_path):
+                if match.kind == "forbidden":
+                    found_markers.add(match.value)
+                else:
+                    # 检查日期格式和合理性
+                    date_issues.extend(self._validate_date(match.value))
             
             # 检查禁止的历史日期
             for forbidden_date in self.forbidden_dates:
-                if forbidden_date in content:
+                if forbidden_date in found_markers:
                     issues.append(f"发现禁止的历史日期: {forbidden_date}")
-            
-            # 检查日期格式和合理性
-            for pattern in self.date_patterns:
-                matches = re.findall(pattern, content)
-                for date_str in matches:
-                    date_issues = self._validate_date(date_str)
-                    issues.extend(date_issues)
+            issues.extend(date_issues)
             
         except Exception as e:
             issues.append(f"日期检查失败: {str(e)}")
@@ -322,6 +316,9 @@ class ComplianceFileSystemHandler(FileSystemEventHandler):
                 
                 violation.resolved = True
                 violation.resolution_action = f"文件已自动移动到: {target_path}"
+                if violation.id is not None:
+                    self.monitor.store.mark_resolved(violation.id, violation.resolution_action)
+                self.monitor.stats["auto_resolved"] += 1
                 
                 self.monitor.logger.info(f"自动解决违规: {file_path} -> {target_path}")
         
@@ -347,6 +344,207 @@ class ComplianceFileSystemHandler(FileSystemEventHandler):
         return suggestions.get(file_ext)
 
 
+class ViolationStore:
+    """违规记录存储（SQLite，追加写入 + 索引查询）
+
+    每条违规单独插入一行，不再整体重写JSON文件；按类型、严重程度、路径、时间
+    建立索引；各类计数由触发器在写入时增量维护，汇总统计无需扫描全部记录。
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS violations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        violation_type TEXT NOT NULL,
+        file_path TEXT NOT NULL,
+        description TEXT NOT NULL,
+        severity TEXT NOT NULL,
+        timestamp TEXT NOT NULL,
+        resolved INTEGER NOT NULL DEFAULT 0,
+        resolution_action TEXT,
+        date_issues TEXT,
+        suggested_fixes TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_violations_type ON violations (violation_type, timestamp);
+    CREATE INDEX IF NOT EXISTS idx_violations_severity ON violations (severity, timestamp);
+    CREATE INDEX IF NOT EXISTS idx_violations_path ON violations (file_path);
+    CREATE INDEX IF NOT EXISTS idx_violations_time ON violations (timestamp);
+    CREATE INDEX IF NOT EXISTS idx_violations_resolved ON violations (resolved, timestamp);
+
+    CREATE TABLE IF NOT EXISTS violation_stats (
+        violation_type TEXT NOT NULL,
+        severity TEXT NOT NULL,
+        resolved INTEGER NOT NULL,
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (violation_type, severity, resolved)
+    );
+
+    CREATE TRIGGER IF NOT EXISTS trg_violations_insert AFTER INSERT ON violations BEGIN
+        INSERT INTO violation_stats (violation_type, severity, resolved, count)
+        VALUES (NEW.violation_type, NEW.severity, NEW.resolved, 1)
+        ON CONFLICT (violation_type, severity, resolved) DO UPDATE SET count = count + 1;
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_violations_delete AFTER DELETE ON violations BEGIN
+        UPDATE violation_stats SET count = count - 1
+        WHERE violation_type = OLD.violation_type AND severity = OLD.severity AND resolved = OLD.resolved;
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_violations_resolve AFTER UPDATE OF resolved ON violations
+    WHEN OLD.resolved != NEW.resolved BEGIN
+        UPDATE violation_stats SET count = count - 1
+        WHERE violation_type = OLD.violation_type AND severity = OLD.severity AND resolved = OLD.resolved;
+        INSERT INTO violation_stats (violation_type, severity, resolved, count)
+        VALUES (NEW.violation_type, NEW.severity, NEW.resolved, 1)
+        ON CONFLICT (violation_type, severity, resolved) DO UPDATE SET count = count + 1;
+    END;
+    """
+
+    def __init__(self, db_file: Path):
+        self.db_file = Path(db_file)
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        # watchdog 回调在独立线程中执行，连接共享并加锁
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_file), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        self._conn.commit()
+
+    def _insert(self, violation: ComplianceViolation) -> int:
+        cursor = self._conn.execute(
+            "INSERT INTO violations (violation_type, file_path, description, severity, timestamp, "
+            "resolved, resolution_action, date_issues, suggested_fixes) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                violation.violation_type,
+                violation.file_path,
+                violation.description,
+                violation.severity,
+                violation.timestamp.isoformat(),
+                int(violation.resolved),
+                violation.resolution_action,
+                json.dumps(violation.date_issues, ensure_ascii=False) if violation.date_issues else None,
+                json.dumps(violation.suggested_fixes, ensure_ascii=False) if violation.suggested_fixes else None
+            )
+        )
+        violation.id = cursor.lastrowid
+        return violation.id
+
+    def append(self, violation: ComplianceViolation) -> int:
+        """追加一条违规记录，返回记录ID"""
+        with self._lock:
+            violation_id = self._insert(violation)
+            self._conn.commit()
+        return violation_id
+
+    def append_many(self, violations: List[ComplianceViolation]):
+        """在一个事务中追加多条违规记录（用于迁移历史记录）"""
+        with self._lock:
+            for violation in violations:
+                self._insert(violation)
+            self._conn.commit()
+
+    def mark_resolved(self, violation_id: int, resolution_action: Optional[str] = None):
+        """标记违规已解决"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE violations SET resolved = 1, resolution_action = ? WHERE id = ?",
+                (resolution_action, violation_id)
+            )
+            self._conn.commit()
+
+    def query(self, violation_type: Optional[str] = None, severity: Optional[str] = None,
+              path_prefix: Optional[str] = None, since: Optional[datetime] = None,
+              until: Optional[datetime] = None, resolved: Optional[bool] = None,
+              limit: Optional[int] = None) -> List[ComplianceViolation]:
+        """按条件查询违规记录（按时间倒序）"""
+        conditions = []
+        params = []
+        if violation_type is not None:
+            conditions.append("violation_type = ?")
+            params.append(violation_type)
+        if severity is not None:
+            conditions.append("severity = ?")
+            params.append(severity)
+        if path_prefix is not None:
+            # 使用范围比较以便命中 file_path 索引
+            conditions.append("file_path >= ? AND file_path < ?")
+            params.extend([path_prefix, path_prefix + "\U0010ffff"])
+        if since is not None:
+            conditions.append("timestamp >= ?")
+            params.append(since.isoformat())
+        if until is not None:
+            conditions.append("timestamp < ?")
+            params.append(until.isoformat())
+        if resolved is not None:
+            conditions.append("resolved = ?")
+            params.append(int(resolved))
+
+        sql = "SELECT * FROM violations"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY timestamp DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._row_to_violation(row) for row in rows]
+
+    def counts(self) -> Dict:
+        """返回增量维护的汇总计数"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT violation_type, severity, resolved, count FROM violation_stats WHERE count > 0"
+            ).fetchall()
+
+        summary = {"total": 0, "resolved": 0, "by_type": {}, "by_severity": {}}
+        for row in rows:
+            count = row["count"]
+            summary["total"] += count
+            by_type = summary["by_type"].setdefault(row["violation_type"], {"total": 0, "resolved": 0})
+            by_type["total"] += count
+            summary["by_severity"][row["severity"]] = summary["by_severity"].get(row["severity"], 0) + count
+            if row["resolved"]:
+                summary["resolved"] += count
+                by_type["resolved"] += count
+        summary["unresolved"] = summary["total"] - summary["resolved"]
+        return summary
+
+    def compact(self, retention_days: int = 30) -> int:
+        """删除超过保留期且已解决的记录，返回删除条数"""
+        cutoff = (datetime.now() - timedelta(days=retention_days)).isoformat()
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM violations WHERE resolved = 1 AND timestamp <= ?", (cutoff,)
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM violations LIMIT 1").fetchone() is None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _row_to_violation(row) -> ComplianceViolation:
+        violation = ComplianceViolation(
+            violation_type=row["violation_type"],
+            file_path=row["file_path"],
+            description=row["description"],
+            severity=row["severity"]
+        )
+        violation.id = row["id"]
+        violation.timestamp = datetime.fromisoformat(row["timestamp"])
+        violation.resolved = bool(row["resolved"])
+        violation.resolution_action = row["resolution_action"]
+        violation.date_issues = json.loads(row["date_issues"]) if row["date_issues"] else []
+        violation.suggested_fixes = json.loads(row["suggested_fixes"]) if row["suggested_fixes"] else []
+        return violation
+
+
 class ComplianceMonitor:
     """合规性监控器"""
     
@@ -354,6 +552,7 @@ class ComplianceMonitor:
         self.project_root = Path(project_root)
         self.config_file = self.project_root / "docs" / "03-管理" / "project_config.yaml"
         self.violations_file = self.project_root / "logs" / "合规性报告" / "violations.json"
+        self.violations_db = self.project_root / "logs" / "合规性报告" / "violations.sqlite3"
         
         # 确保日志目录存在
         self.violations_file.parent.mkdir(parents=True, exist_ok=True)
@@ -367,9 +566,10 @@ class ComplianceMonitor:
         # 初始化日志
         self._setup_logging()
         
-        # 违规记录
-        self.violations: List[ComplianceViolation] = []
-        self._load_violations()
+        # 违规记录（SQLite存储，旧版JSON记录首次启动时迁移）
+        self.store = ViolationStore(self.violations_db)
+        self._migrate_legacy_violations()
+        self.retention_days = self.config.get("compliance", {}).get("monitoring", {}).get("retention_days", 30)
         
         # 文件系统监控
         self.observer = None
@@ -411,45 +611,51 @@ class ComplianceMonitor:
         
         self.logger = logging.getLogger('ComplianceMonitor')
     
-    def _load_violations(self):
-        """加载历史违规记录"""
-        if self.violations_file.exists():
-            try:
-                with open(self.violations_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    for item in data:
-                        violation = ComplianceViolation(
-                            violation_type=item["violation_type"],
-                            file_path=item["file_path"],
-                            description=item["description"],
-                            severity=item["severity"]
-                        )
-                        violation.timestamp = datetime.fromisoformat(item["timestamp"])
-                        violation.resolved = item["resolved"]
-                        violation.resolution_action = item.get("resolution_action")
-                        self.violations.append(violation)
-            except Exception as e:
-                self.logger.error(f"加载违规记录失败: {e}")
-    
-    def _save_violations(self):
-        """保存违规记录"""
+    def _migrate_legacy_violations(self):
+        """将旧版 violations.json 中的记录一次性导入违规存储"""
+        if not self.violations_file.exists():
+            return
+        
         try:
-            data = [violation.to_dict() for violation in self.violations]
-            with open(self.violations_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with open(self.violations_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            
+            violations = []
+            for item in data:
+                violation = ComplianceViolation(
+                    violation_type=item["violation_type"],
+                    file_path=item["file_path"],
+                    description=item["description"],
+                    severity=item["severity"]
+                )
+                violation.timestamp = datetime.fromisoformat(item["timestamp"])
+                violation.resolved = item["resolved"]
+                violation.resolution_action = item.get("resolution_action")
+                violation.date_issues = item.get("date_issues", [])
+                violation.suggested_fixes = item.get("suggested_fixes", [])
+                violations.append(violation)
+            
+            if self.store.is_empty():
+                self.store.append_many(violations)
+            
+            # 保留原文件备查，避免重复导入
+            self.violations_file.rename(self.violations_file.with_suffix(".json.migrated"))
+            self.logger.info(f"已迁移 {len(violations)} 条历史违规记录到 {self.violations_db}")
         except Exception as e:
-            self.logger.error(f"保存违规记录失败: {e}")
+            self.logger.error(f"迁移违规记录失败: {e}")
     
     def record_violation(self, violation: ComplianceViolation):
         """记录违规行为"""
-        self.violations.append(violation)
         self.stats["total_violations"] += 1
         
         # 记录日志
         self.logger.warning(str(violation))
         
-        # 保存到文件
-        self._save_violations()
+        # 追加到违规存储
+        try:
+            self.store.append(violation)
+        except sqlite3.Error as e:
+            self.logger.error(f"保存违规记录失败: {e}")
         
         # 发送通知
         self._send_notification(violation)
@@ -506,6 +712,7 @@ class ComplianceMonitor:
         
         self.logger.info("监控已停止")
         self._generate_summary_report()
+        self.store.close()
     
     def _periodic_check(self):
         """定期检查"""
@@ -592,33 +799,22 @@ class ComplianceMonitor:
         return violations
     
     def _cleanup_old_violations(self):
-        """清理旧的违规记录"""
-        cutoff_date = datetime.now() - timedelta(days=30)
-        
-        old_count = len(self.violations)
-        self.violations = [v for v in self.violations if v.timestamp > cutoff_date or not v.resolved]
-        new_count = len(self.violations)
-        
-        if old_count != new_count:
-            self.logger.info(f"清理了 {old_count - new_count} 条旧违规记录")
-            self._save_violations()
+        """清理超过保留期且已解决的违规记录"""
+        removed = self.store.compact(self.retention_days)
+        if removed:
+            self.logger.info(f"清理了 {removed} 条旧违规记录")
     
     def _generate_summary_report(self):
         """生成汇总报告（升级版）"""
         report_file = self.project_root / "logs" / "合规性报告" / f"summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
         
-        # 统计信息
-        total_violations = len(self.violations)
-        resolved_violations = len([v for v in self.violations if v.resolved])
-        unresolved_violations = total_violations - resolved_violations
-        date_violations = len([v for v in self.violations if v.violation_type == "date_consistency_violation"])
-        
-        # 按类型分组
-        violations_by_type = {}
-        for violation in self.violations:
-            if violation.violation_type not in violations_by_type:
-                violations_by_type[violation.violation_type] = []
-            violations_by_type[violation.violation_type].append(violation)
+        # 统计信息（由违规存储增量维护）
+        counts = self.store.counts()
+        total_violations = counts["total"]
+        resolved_violations = counts["resolved"]
+        unresolved_violations = counts["unresolved"]
+        violations_by_type = counts["by_type"]
+        date_violations = violations_by_type.get("date_consistency_violation", {}).get("total", 0)
         
         # 生成报告
         report_content = f"""# 项目合规性监控汇总报告（升级版）
@@ -639,7 +835,7 @@ class ComplianceMonitor:
 
 """
         
-        for violation_type, violations in violations_by_type.items():
+        for violation_type, type_counts in violations_by_type.items():
             type_name = {
                 "date_consistency_violation": "日期一致性违规",
                 "file_naming_violation": "文件命名违规", 
@@ -651,15 +847,15 @@ class ComplianceMonitor:
             }.get(violation_type, violation_type)
             
             report_content += f"### {type_name} ({violation_type})\n"
-            report_content += f"- 总数: {len(violations)}\n"
-            report_content += f"- 已解决: {len([v for v in violations if v.resolved])}\n"
-            report_content += f"- 未解决: {len([v for v in violations if not v.resolved])}\n\n"
+            report_content += f"- 总数: {type_counts['total']}\n"
+            report_content += f"- 已解决: {type_counts['resolved']}\n"
+            report_content += f"- 未解决: {type_counts['total'] - type_counts['resolved']}\n\n"
         
-        # 未解决的违规详情
-        unresolved = [v for v in self.violations if not v.resolved]
+        # 未解决的违规详情（最近10个）
+        unresolved = self.store.query(resolved=False, limit=10)
         if unresolved:
             report_content += "## 未解决的违规问题\n\n"
-            for violation in unresolved[-10:]:  # 最近10个
+            for violation in reversed(unresolved):
                 report_content += f"- **{violation.violation_type}**: {violation.description}\n"
                 report_content += f"  - 文件: `{violation.file_path}`\n"
                 report_content += f"  - 时间: {violation.timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n"
@@ -699,15 +895,15 @@ class ComplianceMonitor:
     
     def get_status(self) -> Dict:
         """获取监控状态"""
-        total_violations = len(self.violations)
-        resolved_violations = len([v for v in self.violations if v.resolved])
+        counts = self.store.counts()
         
         return {
             "monitoring_active": self.observer is not None and self.observer.is_alive(),
             "project_root": str(self.project_root),
-            "total_violations": total_violations,
-            "resolved_violations": resolved_violations,
-            "unresolved_violations": total_violations - resolved_violations,
+            "total_violations": counts["total"],
+            "resolved_violations": counts["resolved"],
+            "unresolved_violations": counts["unresolved"],
+            "violations_by_severity": counts["by_severity"],
             "last_check": datetime.now().isoformat(),
             "uptime": str(datetime.now() - self.stats["start_time"])
         }
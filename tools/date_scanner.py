@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文档日期扫描器
+
+将禁止的历史日期标记和“创建日期：xxxx年x月x日”等带标签的日期合并为一个预编译的
+正则表达式，按块流式读取文件、一次扫描即给出所有命中及其行号、列号和行内容。
+供 compliance_monitor、check_document_dates、pre_operation_check、
+git_pre_commit_check 共用，整仓库日期审计时不再对每个模式重复扫描全文。
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, TextIO
+
+# 常用的日期标签
+DEFAULT_LABELS = [
+    "创建日期", "修改日期", "更新日期", "升级日期", "完成日期",
+    "最后更新", "版本日期", "发布日期"
+]
+
+# 常用的日期格式（年月日 / 横线 / 斜线）
+DEFAULT_DATE_FORMATS = [
+    r"\d{4}年\d{1,2}月\d{1,2}日",
+    r"\d{4}-\d{1,2}-\d{1,2}",
+    r"\d{4}/\d{1,2}/\d{1,2}"
+]
+
+# 每次读取的字符数（按整行切块，日期匹配不会跨块）
+CHUNK_SIZE = 1024 * 1024
+
+_DATE_PARTS = re.compile(r"(\d{4})(?:年|-|/)(\d{1,2})(?:月|-|/)(\d{1,2})日?$")
+
+
+@dataclass
+class DateMatch:
+    """一次扫描命中"""
+    kind: str            # "labeled" 带标签日期，"forbidden" 禁止的日期标记
+    value: str           # 日期字符串或禁止标记
+    line: int            # 行号（从1开始）
+    column: int          # 列号（从1开始）
+    line_content: str    # 所在行内容（已去除首尾空白）
+    label: Optional[str] = None
+
+
+class DateScanner:
+    """单次扫描的日期检查器"""
+
+    def __init__(self, labels: Optional[Iterable[str]] = None,
+                 date_formats: Optional[Iterable[str]] = None,
+                 forbidden_markers: Optional[Iterable[str]] = None):
+        self.labels = list(labels) if labels is not None else list(DEFAULT_LABELS)
+        self.date_formats = list(date_formats) if date_formats is not None else list(DEFAULT_DATE_FORMATS)
+        self.forbidden_markers = list(forbidden_markers or [])
+
+        alternatives = []
+        if self.labels and self.date_formats:
+            # 标签与日期之间只允许同一行内的空白
+            alternatives.append(
+                r"(?P<label>%s)[：:][^\S\n]*(?P<date>%s)" % (
+                    "|".join(map(re.escape, self.labels)),
+                    "|".join(f"(?:{fmt})" for fmt in self.date_formats)
+                )
+            )
+
+        self.marker_pattern = None
+        if self.forbidden_markers:
+            # 较长的标记优先，避免被其前缀抢先匹配
+            markers = "|".join(map(re.escape, sorted(set(self.forbidden_markers), key=len, reverse=True)))
+            self.marker_pattern = re.compile(markers)
+            alternatives.append(f"(?P<marker>{markers})")
+
+        self.pattern = re.compile("|".join(alternatives)) if alternatives else None
+
+    def scan_text(self, text: str) -> List[DateMatch]:
+        """扫描一段文本"""
+        return list(self._scan_block(text, 1))
+
+    def scan_stream(self, stream: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[DateMatch]:
+        """按整行分块流式扫描"""
+        line_no = 1
+        while True:
+            lines = stream.readlines(chunk_size)
+            if not lines:
+                break
+            if self.pattern is not None:
+                yield from self._scan_block("".join(lines), line_no)
+            line_no += len(lines)
+
+    def scan_file(self, file_path: Path, encoding: str = "utf-8") -> List[DateMatch]:
+        """扫描文件，读取或解码失败时抛出异常"""
+        with open(file_path, "r", encoding=encoding) as f:
+            return list(self.scan_stream(f))
+
+    def _scan_block(self, block: str, first_line: int) -> Iterator[DateMatch]:
+        if self.pattern is None:
+            return
+
+        line_no = first_line
+        line_start = 0
+        cursor = 0
+        for match in self.pattern.finditer(block):
+            start = match.start()
+            newlines = block.count("\n", cursor, start)
+            if newlines:
+                line_no += newlines
+                line_start = block.rfind("\n", cursor, start) + 1
+            cursor = start
+
+            line_end = block.find("\n", start)
+            line_content = block[line_start:line_end if line_end != -1 else len(block)].strip()
+
+            if match.lastgroup == "marker":
+                yield DateMatch("forbidden", match.group("marker"), line_no, start - line_start + 1, line_content)
+                continue
+
+            yield DateMatch("labeled", match.group("date"), line_no, match.start("date") - line_start + 1,
+                            line_content, label=match.group("label"))
+
+            # 带标签日期内部的禁止标记（如“创建日期：2024年1月1日”中的“2024年”）
+            if self.marker_pattern is not None:
+                for inner in self.marker_pattern.finditer(block, match.start("date"), match.end("date")):
+                    yield DateMatch("forbidden", inner.group(0), line_no, inner.start() - line_start + 1, line_content)
+
+
+def parse_date(date_str: str) -> Optional[datetime]:
+    """解析扫描得到的日期字符串，格式不符返回 None，日期非法时抛出 ValueError"""
+    match = _DATE_PARTS.match(date_str)
+    if not match:
+        return None
+    year, month, day = map(int, match.groups())
+    return datetime(year, month, day)
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+目录增量同步
+
+为源目录和目标目录各生成一份清单（相对路径、大小、修改时间，必要时计算内容哈希），
+只复制新增或变化的文件、只删除源目录中已不存在的文件。大小相同而修改时间不同的
+文件（例如git检出后）比较内容哈希，内容一致时只更新修改时间。复制在线程池中并行
+执行，同一文件系统上优先使用reflink（写时复制），也可选择硬链接。
+"""
+
+import os
+import sys
+import shutil
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 读取文件计算哈希时的块大小
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Linux FICLONE ioctl
+FICLONE = 0x40049409
+
+
+def default_ignore(name: str) -> bool:
+    """只忽略.git、__pycache__和Python缓存文件（.gitignore、*.lock 等照常同步）"""
+    return name in ('.git', '__pycache__') or name.endswith(('.pyc', '.pyo'))
+
+
+@dataclass
+class FileEntry:
+    """清单中的一个文件"""
+    size: int
+    mtime_ns: int
+    path: str
+    digest: Optional[str] = None
+
+    def content_hash(self) -> str:
+        if self.digest is None:
+            h = hashlib.blake2b(digest_size=20)
+            with open(self.path, 'rb') as f:
+                for block in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                    h.update(block)
+            self.digest = h.hexdigest()
+        return self.digest
+
+
+@dataclass
+class SyncPlan:
+    """同步计划"""
+    copy: List[str] = field(default_factory=list)      # 新增或内容变化的文件
+    touch: List[str] = field(default_factory=list)     # 内容相同仅修改时间不同的文件
+    delete: List[str] = field(default_factory=list)    # 源目录中已不存在的文件
+    unchanged: int = 0
+
+    @property
+    def in_sync(self) -> bool:
+        return not (self.copy or self.touch or self.delete)
+
+
+def build_manifest(root: Path, ignore: Optional[Callable[[str], bool]] = default_ignore) -> Dict[str, FileEntry]:
+    """遍历目录生成清单 {相对路径: FileEntry}，相对路径使用 / 分隔"""
+    manifest = {}
+    root = Path(root)
+    if not root.exists():
+        return manifest
+
+    stack = [(str(root), "")]
+    while stack:
+        current, rel = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if ignore and ignore(entry.name):
+                        continue
+                    rel_path = f"{rel}{entry.name}"
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, rel_path + "/"))
+                    elif entry.is_file(follow_symlinks=False):
+                        st = entry.stat()
+                        manifest[rel_path] = FileEntry(st.st_size, st.st_mtime_ns, entry.path)
+        except OSError as e:
+            logger.warning(f"无法读取目录 {current}: {e}")
+    return manifest
+
+
+def plan_sync(source: Dict[str, FileEntry], target: Dict[str, FileEntry]) -> SyncPlan:
+    """比较两份清单，生成同步计划"""
+    plan = SyncPlan()
+    for rel_path, src in source.items():
+        dst = target.get(rel_path)
+        if dst is None or dst.size != src.size:
+            plan.copy.append(rel_path)
+        elif dst.mtime_ns == src.mtime_ns:
+            plan.unchanged += 1
+        elif dst.content_hash() == src.content_hash():
+            plan.touch.append(rel_path)
+        else:
+            plan.copy.append(rel_path)
+
+    plan.delete = [rel_path for rel_path in target if rel_path not in source]
+    return plan
+
+
+def _reflink(src: str, dst: str) -> bool:
+    """尝试写时复制，不支持时返回 False"""
+    if not sys.platform.startswith('linux'):
+        return False
+    try:
+        import fcntl
+        with open(src, 'rb') as s, open(dst, 'wb') as d:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        return True
+    except (OSError, ImportError):
+        try:
+            os.remove(dst)
+        except OSError:
+            pass
+        return False
+
+
+def _place_file(src: FileEntry, dst: Path, link_mode: str):
+    """将源文件放到目标位置：先写临时文件再替换，避免改写已有的硬链接"""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f".{dst.name}.sync.tmp")
+
+    if link_mode == "hardlink":
+        try:
+            os.link(src.path, tmp)
+            os.replace(tmp, dst)
+            return
+        except OSError:
+            pass  # 跨文件系统等情况回退为复制
+
+    if link_mode in ("auto", "reflink") and _reflink(src.path, str(tmp)):
+        shutil.copystat(src.path, tmp)
+    else:
+        shutil.copy2(src.path, tmp)
+    os.replace(tmp, dst)
+
+
+def _prune_empty_dirs(root: Path, rel_paths: List[str]):
+    """删除文件后清理空目录"""
+    dirs = {str(Path(rel_path).parent) for rel_path in rel_paths}
+    for rel_dir in sorted(dirs, key=lambda d: d.count(os.sep), reverse=True):
+        current = root / rel_dir
+        while current != root:
+            try:
+                current.rmdir()
+            except OSError:
+                break
+            current = current.parent
+
+
+def sync_tree(source_dir: Path, target_dir: Path, ignore: Optional[Callable[[str], bool]] = default_ignore,
+              dry_run: bool = False, link_mode: str = "auto", max_workers: Optional[int] = None) -> SyncPlan:
+    """增量同步目录
+
+    Args:
+        source_dir: 源目录
+        target_dir: 目标目录
+        ignore: 按文件或目录名判断是否忽略，被忽略的条目在两侧都不处理
+        dry_run: 只生成计划不执行
+        link_mode: auto（优先reflink）、reflink、hardlink 或 copy
+        max_workers: 复制线程数
+
+    Returns:
+        同步计划
+    """
+    source_dir = Path(source_dir)
+    target_dir = Path(target_dir)
+    source = build_manifest(source_dir, ignore)
+    plan = plan_sync(source, build_manifest(target_dir, ignore))
+
+    if dry_run or plan.in_sync:
+        return plan
+
+    target_dir.mkdir(parents=True, exist_ok=True)
+
+    failed = []
+
+    def copy_one(rel_path):
+        try:
+            _place_file(source[rel_path], target_dir / rel_path, link_mode)
+        except OSError as e:
+            failed.append(rel_path)
+            logger.warning(f"复制文件失败 {rel_path}: {e}")
+
+    with ThreadPoolExecutor(max_workers=max_workers or min(32, (os.cpu_count() or 1) * 2)) as executor:
+        list(executor.map(copy_one, plan.copy))
+
+    for rel_path in plan.touch:
+        entry = source[rel_path]
+        os.utime(target_dir / rel_path, ns=(entry.mtime_ns, entry.mtime_ns))
+
+    for rel_path in plan.delete:
+        try:
+            (target_dir / rel_path).unlink()
+        except OSError as e:
+            logger.warning(f"删除文件失败 {rel_path}: {e}")
+    _prune_empty_dirs(target_dir, plan.delete)
+
+    if failed:
+        failed_set = set(failed)
+        plan.copy = [rel_path for rel_path in plan.copy if rel_path not in failed_set]
+    logger.info(f"同步完成: 复制 {len(plan.copy)} 个，更新时间 {len(plan.touch)} 个，"
+                f"删除 {len(plan.delete)} 个，未变化 {plan.unchanged} 个")
+    return plan
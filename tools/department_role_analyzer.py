@@ -14,6 +14,8 @@ from datetime import datetime
 import subprocess
 import sys
 
+from keyword_matcher import WordPatternMatcher
+
 class DepartmentRoleAnalyzer:
     def __init__(self, input_dir, output_dir):
         self.input_dir = Path(input_dir)
@@ -65,6 +67,12 @@ class DepartmentRoleAnalyzer:
             '工程师', '程序师', '设计师', '分析师'
         }
         
+        # 部门和角色模式按词段一次匹配
+        self.matcher = WordPatternMatcher(
+            {'departments': self.department_patterns, 'roles': self.role_patterns},
+            self.exclude_words
+        )
+        
         self.departments = Counter()
         self.roles = Counter()
         self.document_stats = []
@@ -110,22 +118,9 @@ class DepartmentRoleAnalyzer:
         if not content:
             return [], []
         
-        departments_found = set()
-        roles_found = set()
-        
-        # 提取部门
-        for pattern in self.department_patterns:
-            matches = re.findall(pattern, content)
-            for match in matches:
-                if match and len(match) >= 2 and match not in self.exclude_words:
-                    departments_found.add(match)
-        
-        # 提取角色
-        for pattern in self.role_patterns:
-            matches = re.findall(pattern, content)
-            for match in matches:
-                if match and len(match) >= 2 and match not in self.exclude_words:
-                    roles_found.add(match)
+        found = self.matcher.extract(content)
+        departments_found = found['departments']
+        roles_found = found['roles']
         
         return list(departments_found), list(roles_found)
     
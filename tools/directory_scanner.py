@@ -70,6 +70,9 @@ class DirectoryScanner:
             'Thumbs.db', '.DS_Store', 'Everything.db',
             'desktop.ini', '.gitkeep'
         ]))
+        
+        # 最近一次扫描得到的目录（相对路径，不带结尾 /），供目录树渲染直接判断类型
+        self.directories: Set[str] = set()
     
     def should_ignore_directory(self, dir_name: str, parent_path: str = "") -> bool:
         """判断是否应该忽略某个目录"""
@@ -112,7 +115,7 @@ class DirectoryScanner:
             for_standard_list: 是否为生成标准清单（True）还是检查对比（False）
         
         Returns:
-            包含所有路径的集合
+            包含所有路径的集合（目录以 / 结尾，目录集合同时记录在 self.directories）
         """
         paths = set()
         
@@ -161,6 +164,7 @@ class DirectoryScanner:
         # 从项目根目录开始扫描
         scan_recursive(self.project_root)
         
+        self.directories = {path.rstrip('/') for path in paths if path.endswith('/')}
         return paths
     
     def _handle_bak_directory(self, bak_path: Path, relative_path: str, 
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+目录树渲染
+
+扫描器已经知道哪些条目是目录、哪些是文件，渲染时不再访问文件系统：
+先把路径快照构建成前缀树，再按名称顺序深度优先逐行输出。调用方没有提供目录集合时，
+可以传入 probe，只对无法从快照判断的叶子条目查询一次是否为目录。
+供 report_generator 和 unified_report_generator 共用。
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Union
+
+PathLike = Union[str, Path]
+
+
+@dataclass
+class TreeNode:
+    """前缀树节点"""
+    is_dir: bool = False
+    children: Dict[str, "TreeNode"] = field(default_factory=dict)
+    # 快照中的原始路径（仅未确定类型的叶子保留，供 probe 查询）
+    source: Optional[PathLike] = None
+
+
+def _split(path: PathLike, root_prefix: str) -> List[str]:
+    """将路径拆分为相对根目录的各级名称（纯字符串操作）"""
+    text = str(path).replace("\\", "/")
+    if root_prefix and (text == root_prefix or text.startswith(root_prefix + "/")):
+        text = text[len(root_prefix):]
+    return [part for part in text.split("/") if part and part != "."]
+
+
+def build_tree(paths: Iterable[PathLike], dirs: Iterable[PathLike] = (),
+               root: Optional[PathLike] = None, max_depth: Optional[int] = None,
+               probe: Optional[Callable[[PathLike], bool]] = None) -> TreeNode:
+    """构建前缀树
+
+    Args:
+        paths: 路径快照（绝对路径或相对路径，以 / 结尾的视为目录）
+        dirs: 已知为目录的路径
+        root: 项目根目录，位于其下的路径转为相对路径
+        max_depth: 超过该层级的部分不显示，第 max_depth 级的祖先仍标记为目录
+        probe: 判断路径是否为目录的函数，只对无法从快照判断的叶子调用
+
+    Returns:
+        根节点。作为其他路径前缀的条目以及 dirs 中的条目为目录，其余叶子由 probe
+        判断（未提供时为文件）
+    """
+    root_prefix = str(root).replace("\\", "/").rstrip("/") if root else ""
+    tree = TreeNode(is_dir=True)
+
+    def insert(path: PathLike, is_dir: bool):
+        parts = _split(path, root_prefix)
+        if not parts:
+            return
+        if max_depth is not None and len(parts) > max_depth:
+            parts = parts[:max_depth]
+            is_dir = True
+        node = tree
+        for part in parts[:-1]:
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = TreeNode(is_dir=True)
+            else:
+                child.is_dir = True
+            node = child
+        leaf = node.children.get(parts[-1])
+        if leaf is None:
+            node.children[parts[-1]] = TreeNode(is_dir=is_dir, source=None if is_dir else path)
+        elif is_dir:
+            leaf.is_dir = True
+
+    for path in paths:
+        insert(path, str(path).endswith(("/", "\\")))
+    for path in dirs:
+        insert(path, True)
+    if probe is not None:
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            for child in node.children.values():
+                if child.children:
+                    stack.append(child)
+                elif not child.is_dir and child.source is not None:
+                    child.is_dir = probe(child.source)
+    return tree
+
+
+def iter_tree_lines(tree: TreeNode, indent_unit: str = "│   ", branch: str = "├── ") -> Iterator[str]:
+    """按名称顺序深度优先逐行输出（不含根节点）"""
+    stack = [(0, name, node) for name, node in sorted(tree.children.items(), reverse=True)]
+    while stack:
+        depth, name, node = stack.pop()
+        yield f"{indent_unit * depth}{branch}{name}{'/' if node.is_dir else ''}"
+        if node.children:
+            stack.extend((depth + 1, child_name, child)
+                         for child_name, child in sorted(node.children.items(), reverse=True))
+
+
+def render_tree(paths: Iterable[PathLike], dirs: Iterable[PathLike] = (),
+                root: Optional[PathLike] = None, max_depth: Optional[int] = 3,
+                probe: Optional[Callable[[PathLike], bool]] = None) -> str:
+    """渲染目录树文本，空快照返回 "(空目录)" """
+    tree = build_tree(paths, dirs, root, max_depth, probe)
+    if not tree.children:
+        return "(空目录)"
+    return "\n".join(iter_tree_lines(tree))
+
+
+def write_tree(stream: TextIO, paths: Iterable[PathLike], dirs: Iterable[PathLike] = (),
+               root: Optional[PathLike] = None, max_depth: Optional[int] = 3,
+               probe: Optional[Callable[[PathLike], bool]] = None) -> int:
+    """将目录树逐行写入流，返回写入的行数"""
+    count = 0
+    for line in iter_tree_lines(build_tree(paths, dirs, root, max_depth, probe)):
+        stream.write(line + "\n")
+        count += 1
+    return count
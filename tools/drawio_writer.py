@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Draw.io（mxGraph）文档写出器
+
+单元格按添加顺序保存在 id -> 单元格 的字典中（连接线查找和修改标签直接按id取），
+写出时逐个单元格直接生成缩进格式的XML文本，不构建ElementTree，也不再经过
+minidom重新解析和格式化。输出只由内容决定（不含当前时间），相同输入得到相同字节，
+配合 write_if_changed 可以跳过未变化的文件。
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# 属性值转义（换行等控制字符转为字符引用，解析后保持原样）
+_ATTR_ESCAPES = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "\n": "&#10;",
+    "\r": "&#13;",
+    "\t": "&#9;",
+})
+
+DEFAULT_MXFILE_ATTRS = (
+    ("host", "app.diagrams.net"),
+    ("agent", "5.0"),
+    ("version", "24.7.17"),
+)
+
+DEFAULT_MODEL_ATTRS = (
+    ("dx", "1422"), ("dy", "794"), ("grid", "1"), ("gridSize", "10"), ("guides", "1"),
+    ("tooltips", "1"), ("connect", "1"), ("arrows", "1"), ("fold", "1"), ("page", "1"),
+    ("pageScale", "1"), ("pageWidth", "827"), ("pageHeight", "1169"), ("math", "0"), ("shadow", "0"),
+)
+
+INDENT = "  "
+
+
+def escape_attr(value) -> str:
+    return str(value).translate(_ATTR_ESCAPES)
+
+
+def _attrs(pairs) -> str:
+    return "".join(f' {name}="{escape_attr(value)}"' for name, value in pairs if value is not None)
+
+
+class DrawioDocument:
+    """一个单页Draw.io文档"""
+
+    def __init__(self, diagram_name: str = "流程图", diagram_id: str = "flowchart",
+                 modified: Optional[str] = None, model_attrs=DEFAULT_MODEL_ATTRS,
+                 mxfile_attrs=DEFAULT_MXFILE_ATTRS):
+        """
+        Args:
+            diagram_name: 页面名称
+            diagram_id: 页面id
+            modified: mxfile 的 modified 属性，None 表示不写（保证输出稳定）
+        """
+        self.diagram_name = diagram_name
+        self.diagram_id = diagram_id
+        self.modified = modified
+        self.model_attrs = tuple(model_attrs)
+        self.mxfile_attrs = tuple(mxfile_attrs)
+        # id -> 单元格属性字典（保持添加顺序）
+        self.cells: Dict[str, Dict] = {}
+        self.add_cell("0")
+        self.add_cell("1", parent="0")
+
+    def add_cell(self, cell_id, geometry: Optional[List[Tuple[str, str]]] = None, **attrs) -> Dict:
+        """添加单元格，属性按传入顺序写出；geometry 为 mxGeometry 的属性列表"""
+        cell_id = str(cell_id)
+        if cell_id in self.cells:
+            raise ValueError(f"单元格id重复: {cell_id}")
+        cell = {"id": cell_id}
+        cell.update((name, value) for name, value in attrs.items() if value is not None)
+        cell["_geometry"] = geometry
+        self.cells[cell_id] = cell
+        return cell
+
+    def add_vertex(self, cell_id, value, style, x, y, width, height, parent="1") -> Dict:
+        return self.add_cell(cell_id, geometry=[("x", x), ("y", y), ("width", width), ("height", height),
+                                                ("as", "geometry")],
+                             value=value, style=style, vertex="1", parent=parent)
+
+    def add_edge(self, cell_id, source, target, value="", style="", parent="1") -> Dict:
+        return self.add_cell(cell_id, geometry=[("relative", "1"), ("as", "geometry")],
+                             value=value, style=style, edge="1", parent=parent,
+                             source=str(source), target=str(target))
+
+    def get(self, cell_id) -> Optional[Dict]:
+        return self.cells.get(str(cell_id))
+
+    def edges_from(self, source) -> Iterator[Dict]:
+        source = str(source)
+        return (cell for cell in self.cells.values() if cell.get("edge") == "1" and cell.get("source") == source)
+
+    def iter_lines(self) -> Iterator[str]:
+        """逐行生成XML文本"""
+        yield '<?xml version="1.0" ?>'
+        mxfile_attrs = list(self.mxfile_attrs)
+        mxfile_attrs.insert(1, ("modified", self.modified))
+        yield f"<mxfile{_attrs(mxfile_attrs)}>"
+        yield f'{INDENT}<diagram{_attrs([("name", self.diagram_name), ("id", self.diagram_id)])}>'
+        yield f"{INDENT * 2}<mxGraphModel{_attrs(self.model_attrs)}>"
+        yield f"{INDENT * 3}<root>"
+        cell_indent = INDENT * 4
+        for cell in self.cells.values():
+            attrs = _attrs((name, value) for name, value in cell.items() if name != "_geometry")
+            geometry = cell["_geometry"]
+            if geometry is None:
+                yield f"{cell_indent}<mxCell{attrs}/>"
+            else:
+                yield f"{cell_indent}<mxCell{attrs}>"
+                yield f"{cell_indent}{INDENT}<mxGeometry{_attrs(geometry)}/>"
+                yield f"{cell_indent}</mxCell>"
+        yield f"{INDENT * 3}</root>"
+        yield f"{INDENT * 2}</mxGraphModel>"
+        yield f"{INDENT}</diagram>"
+        yield "</mxfile>"
+
+    def to_string(self) -> str:
+        return "\n".join(self.iter_lines())
+
+    def to_bytes(self) -> bytes:
+        return self.to_string().encode("utf-8")
+
+
+def write_if_changed(path, data: bytes) -> bool:
+    """内容不同时才写入（原子替换），返回是否写入"""
+    path = Path(path)
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return True
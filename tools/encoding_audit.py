@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+编码审计引擎
+供 batch_encoding_fixer 和 encoding_compliance_analysis 共用
+
+检测顺序：
+1. UTF-8 BOM 直接判定为 UTF-8-SIG
+2. 分块流式严格 UTF-8 解码，成功即为 utf-8（绝大多数文件到此结束）
+3. 解码失败时只取文件开头和出错位置附近的样本交给 chardet 检测
+
+检测结果按 (相对路径, 大小, 修改时间) 缓存在 .cache/encoding_audit.json，
+未缓存的文件在进程池中并行检测。缓存由不同扫描范围的审计共用，每次只清理
+本次范围内已删除文件的条目。
+"""
+
+import os
+import json
+import codecs
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import chardet
+except ImportError:
+    chardet = None
+
+logger = logging.getLogger(__name__)
+
+# 流式解码的块大小
+READ_CHUNK_SIZE = 1024 * 1024
+
+# chardet 样本大小（文件开头与解码出错位置附近各取一段）
+SAMPLE_SIZE = 64 * 1024
+
+# 少于该数量的待检测文件直接在当前进程中处理
+PARALLEL_THRESHOLD = 64
+
+CACHE_VERSION = 1
+
+UTF8_BOM = codecs.BOM_UTF8
+
+# 默认排除的目录
+DEFAULT_EXCLUDE_DIRS = {
+    '.git', '.venv', '__pycache__', 'node_modules', '.pytest_cache',
+    'venv', 'env', '.env', 'build', 'dist', '.tox', '.coverage',
+    'htmlcov', '.mypy_cache', '.idea', '.vscode', '.cache'
+}
+
+# 默认检查的文本文件扩展名
+DEFAULT_EXTENSIONS = {
+    '.py', '.md', '.txt', '.json', '.yaml', '.yml', '.html', '.css',
+    '.js', '.ts', '.xml', '.csv', '.sql', '.sh', '.bat', '.ps1',
+    '.rst', '.ini', '.cfg', '.conf', '.toml'
+}
+
+
+@dataclass
+class EncodingRecord:
+    """单个文件的检测结果"""
+    path: str           # 相对项目根目录的路径（/ 分隔）
+    encoding: str
+    confidence: float
+
+
+def _chardet_sample(f, error_offset: int) -> Tuple[str, float]:
+    """对文件开头和出错位置附近的样本运行 chardet"""
+    if chardet is None:
+        return 'unknown', 0.0
+
+    f.seek(0)
+    sample = f.read(SAMPLE_SIZE)
+    if error_offset > SAMPLE_SIZE:
+        f.seek(max(0, error_offset - SAMPLE_SIZE // 2))
+        sample += f.read(SAMPLE_SIZE)
+
+    result = chardet.detect(sample)
+    return result['encoding'] or 'unknown', result['confidence'] or 0.0
+
+
+def detect_file_encoding(file_path: str) -> Tuple[str, float]:
+    """检测单个文件的编码，返回 (编码, 置信度)"""
+    try:
+        with open(file_path, 'rb') as f:
+            head = f.read(len(UTF8_BOM))
+            if head == UTF8_BOM:
+                return 'UTF-8-SIG', 1.0
+
+            decoder = codecs.getincrementaldecoder('utf-8')('strict')
+            offset = 0
+            chunk = head
+            try:
+                while chunk:
+                    decoder.decode(chunk)
+                    offset += len(chunk)
+                    chunk = f.read(READ_CHUNK_SIZE)
+                decoder.decode(b'', final=True)
+                return 'utf-8', 1.0
+            except UnicodeDecodeError as e:
+                return _chardet_sample(f, offset + e.start)
+    except OSError as e:
+        return f'error: {e}', 0.0
+
+
+def _detect_many(paths: List[str]) -> List[Tuple[str, float]]:
+    return [detect_file_encoding(path) for path in paths]
+
+
+class EncodingAuditor:
+    """项目编码审计"""
+
+    def __init__(self, project_root, exclude_dirs: Optional[Set[str]] = None,
+                 extensions: Optional[Set[str]] = None, cache_file: Optional[Path] = None,
+                 max_workers: Optional[int] = None):
+        self.project_root = Path(project_root)
+        self.exclude_dirs = exclude_dirs if exclude_dirs is not None else DEFAULT_EXCLUDE_DIRS
+        self.extensions = extensions if extensions is not None else DEFAULT_EXTENSIONS
+        self.cache_file = Path(cache_file) if cache_file else self.project_root / ".cache" / "encoding_audit.json"
+        self.max_workers = max_workers
+        self._cache = self._load_cache()
+
+    def _load_cache(self) -> Dict[str, list]:
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                return data.get('files', {})
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def _save_cache(self):
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'files': self._cache}, f, ensure_ascii=False)
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            logger.warning(f"保存编码审计缓存失败: {e}")
+
+    def in_scope(self, rel_path: str) -> bool:
+        """相对路径是否在本次审计的范围内（扩展名符合且不位于排除目录下）"""
+        directories, _, name = rel_path.rpartition('/')
+        if os.path.splitext(name)[1].lower() not in self.extensions:
+            return False
+        return not directories or self.exclude_dirs.isdisjoint(directories.split('/'))
+
+    def iter_files(self) -> Iterable[Tuple[str, os.stat_result]]:
+        """遍历项目中需要检查的文件，返回 (相对路径, stat)"""
+        stack = [(str(self.project_root), '')]
+        while stack:
+            current, rel = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in self.exclude_dirs:
+                                stack.append((entry.path, f"{rel}{entry.name}/"))
+                        elif entry.is_file(follow_symlinks=False):
+                            if os.path.splitext(entry.name)[1].lower() in self.extensions:
+                                yield f"{rel}{entry.name}", entry.stat()
+            except OSError as e:
+                logger.warning(f"无法读取目录 {current}: {e}")
+
+    def audit(self) -> List[EncodingRecord]:
+        """审计所有文件的编码"""
+        records = []
+        pending = []
+        seen = {}
+
+        for rel_path, st in self.iter_files():
+            seen[rel_path] = (st.st_size, st.st_mtime_ns)
+            cached = self._cache.get(rel_path)
+            if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+                records.append(EncodingRecord(rel_path, cached[2], cached[3]))
+            else:
+                pending.append(rel_path)
+
+        if pending:
+            results = self._detect(pending)
+            for rel_path, (encoding, confidence) in zip(pending, results):
+                size, mtime_ns = seen[rel_path]
+                if not encoding.startswith('error:'):
+                    self._cache[rel_path] = [size, mtime_ns, encoding, confidence]
+                records.append(EncodingRecord(rel_path, encoding, confidence))
+
+        # 清理已删除文件的缓存。缓存文件由不同扫描范围的审计共用，
+        # 只清理本次范围内未再出现的条目，范围外的条目保留给其他调用方
+        stale = {rel_path for rel_path in self._cache
+                 if rel_path not in seen and self.in_scope(rel_path)}
+        if pending or stale:
+            for rel_path in stale:
+                del self._cache[rel_path]
+            self._save_cache()
+
+        records.sort(key=lambda r: r.path)
+        return records
+
+    def _detect(self, rel_paths: List[str]) -> List[Tuple[str, float]]:
+        paths = [str(self.project_root / rel_path) for rel_path in rel_paths]
+        if len(paths) < PARALLEL_THRESHOLD:
+            return _detect_many(paths)
+
+        # 按批分发，减少进程间通信次数
+        workers = self.max_workers or os.cpu_count() or 1
+        batch = max(16, len(paths) // (workers * 4))
+        batches = [paths[i:i + batch] for i in range(0, len(paths), batch)]
+        results = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for batch_result in executor.map(_detect_many, batches):
+                results.extend(batch_result)
+        return results
+
+    @staticmethod
+    def group_by_encoding(records: Iterable[EncodingRecord]) -> Dict[str, List[EncodingRecord]]:
+        """按编码分组"""
+        groups: Dict[str, List[EncodingRecord]] = {}
+        for record in records:
+            groups.setdefault(record.encoding, []).append(record)
+        return groups
@@ -6,27 +6,13 @@
 """
 
 import os
-import chardet
 from pathlib import Path
 
+from encoding_audit import EncodingAuditor, detect_file_encoding
+
 def detect_encoding(file_path):
-    """检测文件编码"""
-    try:
-        with open(file_path, 'rb') as f:
-            raw_data = f.read()
-            if not raw_data:
-                return 'empty', 1.0
-            
-            result = chardet.detect(raw_data)
-            encoding = result['encoding']
-            confidence = result['confidence']
-            
-            if encoding is None:
-                return 'unknown', 0.0
-            
-            return encoding, confidence
-    except Exception as e:
-        return f'error: {str(e)}', 0.0
+    """检测文件编码（先严格UTF-8解码，失败时再抽样检测）"""
+    return detect_file_encoding(str(file_path))
 
 def is_utf8_compliant(encoding):
     """检查编码是否符合UTF-8规范"""
@@ -79,44 +65,37 @@ def analyze_encoding_compliance():
     print("Acceptable: UTF-8, UTF-8-SIG (with BOM)")
     print("=" * 50)
     
-    for root, dirs, files in os.walk(project_root):
-        # 排除指定目录
-        dirs[:] = [d for d in dirs if d not in exclude_dirs]
+    # 并行检测，未变化的文件直接使用缓存结果
+    auditor = EncodingAuditor(project_root, exclude_dirs=exclude_dirs, extensions=check_extensions)
+    
+    for record in auditor.audit():
+        total_files += 1
+        encoding, confidence = record.encoding, record.confidence
         
-        for file in files:
-            file_path = Path(root) / file
-            
-            # 只检查指定扩展名的文件
-            if file_path.suffix.lower() not in check_extensions:
-                continue
+        # 检查是否符合严格UTF-8规范
+        if not is_utf8_compliant(encoding):
+            problem_files += 1
             
-            total_files += 1
-            encoding, confidence = detect_encoding(file_path)
+            # 检查是否至少是可接受的编码
+            if is_acceptable_encoding(encoding):
+                acceptable_files += 1
+                acceptable_but_not_strict.append({
+                    'file': record.path,
+                    'encoding': encoding,
+                    'confidence': confidence
+                })
+            else:
+                strict_violations += 1
+                strict_violations_list.append({
+                    'file': record.path,
+                    'encoding': encoding,
+                    'confidence': confidence
+                })
             
-            # 检查是否符合严格UTF-8规范
-            if not is_utf8_compliant(encoding):
-                problem_files += 1
-                
-                # 检查是否至少是可接受的编码
-                if is_acceptable_encoding(encoding):
-                    acceptable_files += 1
-                    acceptable_but_not_strict.append({
-                        'file': str(file_path.relative_to(project_root)),
-                        'encoding': encoding,
-                        'confidence': confidence
-                    })
-                else:
-                    strict_violations += 1
-                    strict_violations_list.append({
-                        'file': str(file_path.relative_to(project_root)),
-                        'encoding': encoding,
-                        'confidence': confidence
-                    })
-                
-                # 统计违规类型
-                if encoding not in violations_by_type:
-                    violations_by_type[encoding] = 0
-                violations_by_type[encoding] += 1
+            # 统计违规类型
+            if encoding not in violations_by_type:
+                violations_by_type[encoding] = 0
+            violations_by_type[encoding] += 1
     
     # 输出分析结果
     print(f"\nSummary:")
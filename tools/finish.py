@@ -249,16 +249,19 @@ def organize_office_documents():
         return False
 
 
-def run_backup(full_backup=False):
+def run_backup(full_backup=False, incremental_backup=False):
     """执行备份操作
     
     Args:
         full_backup (bool): 是否进行全量zip压缩备份
+        incremental_backup (bool): 是否进行增量备份（只保存变化的内容）
     """
     logger.info("开始备份操作...")
 
     try:
-        if full_backup:
+        if incremental_backup:
+            return run_incremental_backup()
+        elif full_backup:
             # 全量zip压缩备份
             return run_full_zip_backup()
         else:
@@ -371,6 +374,30 @@ def run_full_zip_backup():
         return False
 
 
+def run_incremental_backup():
+    """执行增量备份（内容寻址块仓库，未变化的文件不再读取和压缩）"""
+    logger.info("开始增量备份...")
+    
+    try:
+        from incremental_backup import IncrementalBackup
+        
+        engine = IncrementalBackup(PROJECT_ROOT)
+        manifest = engine.backup()
+        stats = manifest["stats"]
+        
+        logger.info(f"增量备份完成！")
+        logger.info(f"备份清单: {manifest['name']}")
+        logger.info(f"文件数: {stats['files']}，变更: {stats['changed']}")
+        logger.info(f"新写入: {stats['bytes_written'] / (1024 * 1024):.2f} MB")
+        logger.info(f"恢复: python tools/incremental_backup.py restore {manifest['name']} <目标目录>")
+        
+        return True
+
+    except Exception as e:
+        logger.error(f"执行增量备份时出错: {e}")
+        return False
+
+
 def run_pre_commit_check():
     """运行Git提交前检查"""
     logger.info("开始Git提交前检查...")
@@ -418,19 +445,7 @@ def sync_to_backup_repo():
             if source_dir.exists():
                 logger.info(f"同步目录: {dir_name}")
                 
-                # 删除目标目录（如果存在）
-                if target_dir.exists():
-                    try:
-                        shutil.rmtree(target_dir)
-                    except Exception as e:
-                        logger.warning(f"删除目标目录失败: {e}，尝试重命名")
-                        # 如果删除失败，尝试重命名
-                        backup_name = f"{target_dir.name}_backup_{int(time.time())}"
-                        backup_path = target_dir.parent / backup_name
-                        target_dir.rename(backup_path)
-                        logger.info(f"目标目录已重命名为: {backup_path}")
-                
-                # 复制源目录到目标位置（跳过Git子模块）
+                # 增量同步到目标位置（跳过Git子模块）
                 copy_directory_excluding_git(source_dir, target_dir)
                 logger.info(f"✅ {dir_name} 目录同步完成")
             else:
@@ -444,54 +459,24 @@ def sync_to_backup_repo():
         return False
 
 
+def ignore_git_dirs(name):
+    """忽略.git开头的条目、__pycache__、Python缓存文件以及.tmp/.lock文件"""
+    return (
+        name.startswith('.git')
+        or name == '__pycache__'
+        or name.endswith(('.pyc', '.pyo', '.tmp', '.lock'))
+    )
+
+
 def copy_directory_excluding_git(source_dir, target_dir):
-    """复制目录，但跳过.git文件夹"""
-    import shutil
-    import time
+    """增量同步目录，跳过.git、__pycache__和临时文件
     
-    def ignore_git_dirs(dir_path, names):
-        """忽略.git目录、__pycache__目录和其他不需要的文件"""
-        ignore_list = []
-        for name in names:
-            if name == '.git' or name.startswith('.git'):
-                ignore_list.append(name)
-            elif name == '__pycache__' or name.endswith('.pyc') or name.endswith('.pyo'):
-                ignore_list.append(name)
-            elif name.endswith('.tmp') or name.endswith('.lock'):
-                ignore_list.append(name)
-        return ignore_list
+    只复制新增或变化的文件，删除源目录中已不存在的文件，未变化的文件不再重写。
+    """
+    from delta_sync import sync_tree
     
-    try:
-        shutil.copytree(source_dir, target_dir, ignore=ignore_git_dirs)
-    except Exception as e:
-        logger.warning(f"复制目录失败: {e}，尝试手动复制")
-        
-        # 手动复制文件，跳过有问题的文件
-        target_dir.mkdir(parents=True, exist_ok=True)
-        
-        for item in source_dir.rglob('*'):
-            if item.is_file():
-                rel_path_parts = str(item.relative_to(source_dir)).split('/')
-                
-                # 检查是否在.git目录中
-                if '.git' in rel_path_parts:
-                    continue
-                
-                # 检查是否在__pycache__目录中或是Python缓存文件
-                if '__pycache__' in rel_path_parts or item.suffix in ['.pyc', '.pyo']:
-                    continue
-                    
-                # 计算目标文件路径
-                rel_path = item.relative_to(source_dir)
-                target_file = target_dir / rel_path
-                
-                try:
-                    # 创建目标目录
-                    target_file.parent.mkdir(parents=True, exist_ok=True)
-                    # 复制文件
-                    shutil.copy2(item, target_file)
-                except Exception as file_error:
-                    logger.warning(f"复制文件失败 {item}: {file_error}")
+    plan = sync_tree(source_dir, target_dir, ignore=ignore_git_dirs)
+    logger.info(f"复制 {len(plan.copy)} 个文件，删除 {len(plan.delete)} 个文件，未变化 {plan.unchanged} 个文件")
 
 
 def run_git_push():
@@ -624,18 +609,22 @@ def main():
                        help='进行全量zip压缩备份到常规备份目录')
     parser.add_argument('--core-backup', action='store_true', default=True,
                        help='进行核心文件备份（默认启用）')
+    parser.add_argument('--incremental-backup', action='store_true', default=False,
+                       help='进行增量备份到bak/增量备份（只保存变化的内容）')
     parser.add_argument('--backup-only', action='store_true',
                        help='仅执行备份操作，跳过结构检查和Git推送')
     args = parser.parse_args()
     
-    # 如果指定了全量备份，则覆盖默认的核心备份
-    if args.full_backup:
+    # 如果指定了全量备份或增量备份，则覆盖默认的核心备份
+    if args.full_backup or args.incremental_backup:
         args.core_backup = False
     
     try:
         logger.info("启动高效办公助手系统完成流程")
         logger.info(f"项目根目录: {PROJECT_ROOT}")
-        if args.full_backup:
+        if args.incremental_backup:
+            logger.info("[模式] 增量备份模式")
+        elif args.full_backup:
             logger.info("[模式] 全量zip压缩备份模式")
         elif args.core_backup:
             logger.info("[模式] 核心文件备份模式（默认）")
@@ -727,7 +716,7 @@ def main():
         # 4. 备份操作
         step_num = "1/1" if args.backup_only else "4/6"
         logger.info(f"\n[STEP {step_num}] 备份操作")
-        backup_result = run_backup(full_backup=args.full_backup)
+        backup_result = run_backup(full_backup=args.full_backup, incremental_backup=args.incremental_backup)
         logger.debug(f"备份操作返回值: {backup_result}")
         if backup_result:
             success_count += 1
@@ -3,13 +3,20 @@
 """
 连接线重叠修复工具
 专门解决流程图中连接线重叠造成关系错乱的问题
+
+重建的连接线由 OrthogonalRouter 一次完成正交路由：避开所有图形和泳道边框，
+同一通道内的平行线段自动错开，不再依赖手工路径点和反复检查。
 """
 
+import time
 import xml.etree.ElementTree as ET
 from datetime import datetime
 
+from orthogonal_router import OrthogonalRouter, add_graph_cells
+
 class ConnectionOverlapFixer:
     def __init__(self):
+        self.routed_count = 0
         # 清理重建的连接关系（避免重叠）
         self.clean_connections = [
             # 第一阶段：需求到决策
@@ -89,16 +96,33 @@ class ConnectionOverlapFixer:
         print(f"✅ 删除了 {removed_count} 条旧连接线")
         return removed_count
     
+    def route_connections(self, graph_model):
+        """对重建的连接线做正交路由，返回路由器（端点图形不存在的连接线不路由）"""
+        router = OrthogonalRouter()
+        add_graph_cells(router, graph_model.find('root'))
+        for conn_info in self.clean_connections:
+            if conn_info['source'] in router.nodes and conn_info['target'] in router.nodes:
+                router.add_edge(conn_info['id'], conn_info['source'], conn_info['target'])
+        
+        start = time.perf_counter()
+        router.route_all()
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"✅ 正交路由 {len(router.routes)} 条连接线，耗时 {elapsed:.1f} ms，"
+              f"共用线段 {len(router.shared_segments())} 处")
+        return router
+    
     def create_clean_connections(self, graph_model):
         """创建清晰无重叠的连接线"""
         root_element = graph_model.find('root')
+        router = self.route_connections(graph_model)
         created_count = 0
         
         for conn_info in self.clean_connections:
+            routed = conn_info['id'] in router.routes
             edge = ET.SubElement(root_element, 'mxCell')
             edge.set('id', conn_info['id'])
             edge.set('value', conn_info['label'])
-            edge.set('style', self.get_connection_style(conn_info))
+            edge.set('style', self.get_connection_style(conn_info, router.port_style(conn_info['id'])))
             edge.set('edge', '1')
             edge.set('parent', '1')
             edge.set('source', conn_info['source'])
@@ -109,21 +133,33 @@ class ConnectionOverlapFixer:
             geometry.set('relative', '1')
             geometry.set('as', 'geometry')
             
-            # 为分支连接添加路径点避免重叠
-            if conn_info['source'] in ['S19', 'D04', 'D01']:
+            # 写入路由得到的路径点
+            waypoints = router.waypoints(conn_info['id']) if routed else []
+            if waypoints:
                 points = ET.SubElement(geometry, 'Array')
                 points.set('as', 'points')
-                self.add_branch_points(points, conn_info)
+                for x, y in waypoints:
+                    point = ET.SubElement(points, 'mxPoint')
+                    point.set('x', str(x))
+                    point.set('y', str(y))
             
             created_count += 1
         
+        self.routed_count = len(router.routes)
         print(f"✅ 创建了 {created_count} 条清晰连接线")
         return created_count
     
-    def get_connection_style(self, conn_info):
-        """获取连接线样式"""
-        base_style = ("edgeStyle=orthogonalEdgeStyle;rounded=0;orthogonalLoop=1;"
-                     "jettySize=auto;html=1;curved=0;")
+    def get_connection_style(self, conn_info, port_style=""):
+        """获取连接线样式
+
+        port_style 为路由器给出的端口位置；已路由的连接线按路径点直线连接，
+        不再使用 orthogonalEdgeStyle（否则 draw.io 会重新计算路径）。
+        """
+        if port_style:
+            base_style = "rounded=0;html=1;" + port_style
+        else:
+            base_style = ("edgeStyle=orthogonalEdgeStyle;rounded=0;orthogonalLoop=1;"
+                         "jettySize=auto;html=1;curved=0;")
         
         # 分支连接使用不同颜色避免混乱
         if conn_info['source'] == 'S19':  # 生产分支
@@ -135,34 +171,6 @@ class ConnectionOverlapFixer:
         else:
             return base_style + "strokeColor=#333333;strokeWidth=1;"
     
-    def add_branch_points(self, points, conn_info):
-        """为分支连接添加路径点避免重叠"""
-        if conn_info['source'] == 'S19':
-            # 生产分支路径点
-            if conn_info['target'] == 'S20.1':
-                point = ET.SubElement(points, 'mxPoint')
-                point.set('x', '150')
-                point.set('y', '0')
-            elif conn_info['target'] == 'S20.2':
-                point = ET.SubElement(points, 'mxPoint')
-                point.set('x', '150')
-                point.set('y', '100')
-            elif conn_info['target'] == 'S20.3':
-                point = ET.SubElement(points, 'mxPoint')
-                point.set('x', '150')
-                point.set('y', '200')
-        
-        elif conn_info['source'] == 'D04':
-            # 付款决策分支路径点
-            if conn_info['target'] == 'S30':
-                point = ET.SubElement(points, 'mxPoint')
-                point.set('x', '0')
-                point.set('y', '-200')
-            elif conn_info['target'] == 'S29':
-                point = ET.SubElement(points, 'mxPoint')
-                point.set('x', '100')
-                point.set('y', '0')
-    
     def add_connection_legend(self, graph_model):
         """添加连接线说明"""
         root_element = graph_model.find('root')
@@ -176,7 +184,7 @@ class ConnectionOverlapFixer:
             "• 删除所有重叠连接线\\n"
             "• 重建42条清晰连接\\n"
             "• 分支连接使用不同颜色\\n"
-            "• 添加路径点避免重叠\\n\\n"
+            "• 正交路由生成路径点\\n\\n"
             "🌈 连接线颜色说明:\\n"
             "• 黑色：主流程连接\\n"
             "• 橙色：生产分支连接\\n"
@@ -224,7 +232,7 @@ class ConnectionOverlapFixer:
         print(f"📊 修复统计:")
         print(f"   • 删除重叠连接: {removed_count} 条")
         print(f"   • 创建清晰连接: {created_count} 条")
-        print(f"   • 分支连接优化: 9 处")
+        print(f"   • 正交路由连接: {self.routed_count} 条")
         
         return output_file
 
@@ -12,6 +12,7 @@ import os
 import sys
 import json
 import subprocess
+from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 
@@ -28,6 +29,10 @@ sys.path.insert(0, str(tools_dir))
 
 from logging_config import get_logger
 from exceptions import ValidationError
+from date_scanner import DateScanner, parse_date
+
+# 提交前检查的日期标签
+FILE_DATE_LABELS = ["创建日期", "修改日期", "更新日期"]
 
 
 class GitPreCommitChecker:
@@ -38,6 +43,8 @@ class GitPreCommitChecker:
         self.logger = get_logger("git_pre_commit_check")
         self.errors = []
         self.warnings = []
+        # 只检查记录既成事实的日期；完成/发布/版本日期可以是计划中的未来日期
+        self.date_scanner = DateScanner(labels=FILE_DATE_LABELS)
 
         # 项目结构标准配置
         self.expected_structure = {
@@ -236,6 +243,29 @@ class GitPreCommitChecker:
             self.warnings.append(f"无法检查文件编码: {file_path} - {e}")
             return True
 
+    def check_file_dates(self, file_path: str) -> bool:
+        """检查暂存文件中的创建、修改、更新日期，未来日期只给出警告，不阻止提交"""
+        full_path = self.repo_path / file_path
+
+        if not full_path.exists() or not file_path.endswith((".py", ".md", ".txt")):
+            return True
+
+        try:
+            matches = self.date_scanner.scan_file(full_path)
+        except Exception:
+            return True  # 编码问题由 check_file_encoding 报告
+
+        now = datetime.now()
+        for match in matches:
+            try:
+                file_date = parse_date(match.value)
+            except ValueError:
+                self.warnings.append(f"日期格式错误: {file_path} (第{match.line}行) {match.value}")
+                continue
+            if file_date and file_date > now:
+                self.warnings.append(f"文件包含未来日期: {file_path} (第{match.line}行) {match.label}: {match.value}")
+        return True
+
     def run_checks(self) -> bool:
         """运行所有检查"""
         self.logger.info("开始Git提交前检查...")
@@ -255,6 +285,7 @@ class GitPreCommitChecker:
         for file_path in staged_files:
             files_ok &= self.check_file_content_type(file_path)
             files_ok &= self.check_file_encoding(file_path)
+            files_ok &= self.check_file_dates(file_path)
 
         # 输出检查结果
         self.print_results()
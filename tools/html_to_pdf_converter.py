@@ -12,8 +12,11 @@ import sys
 import time
 import subprocess
 from pathlib import Path
+from typing import List, Optional
 import logging
 
+from chrome_pdf_pool import ChromePdfPool, find_chrome_executable, is_available
+
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -66,21 +69,8 @@ class HTMLToPDFConverter:
                 file_url
             ]
             
-            # 尝试找到Chrome可执行文件
-            chrome_paths = [
-                r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-                r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
-                r"C:\Users\{}\AppData\Local\Google\Chrome\Application\chrome.exe".format(os.getenv('USERNAME', '')),
-                "chrome",  # 如果在PATH中
-                "google-chrome",  # Linux
-                "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"  # macOS
-            ]
-            
-            chrome_exe = None
-            for path in chrome_paths:
-                if os.path.exists(path) or path in ["chrome", "google-chrome"]:
-                    chrome_exe = path
-                    break
+            # 查找Chrome可执行文件（进程内只查找一次）
+            chrome_exe = find_chrome_executable()
             
             if not chrome_exe:
                 return {
@@ -119,6 +109,37 @@ class HTMLToPDFConverter:
                 "message": f"转换失败: {str(e)}"
             }
     
+    def convert_batch(self, html_files: List[str], output_dir: Optional[str] = None,
+                      workers: int = 4, renderer_factory=None) -> List[dict]:
+        """
+        批量转换HTML为PDF
+        
+        使用常驻的无头Chrome渲染池（DevTools协议）并行渲染，浏览器只启动 workers 次；
+        渲染池不可用时回退为逐个文件调用命令行模式。
+        
+        Args:
+            html_files: HTML文件路径列表
+            output_dir: 输出目录（可选，默认与HTML文件同目录）
+            workers: 并行的浏览器会话数
+            renderer_factory: 自定义渲染会话（测试时可传入占位渲染器）
+            
+        Returns:
+            每个文件的结果字典列表（与输入顺序一致）
+        """
+        jobs = []
+        for html_file in html_files:
+            output_pdf = None
+            if output_dir:
+                output_pdf = str(Path(output_dir) / Path(html_file).with_suffix('.pdf').name)
+            jobs.append((html_file, output_pdf))
+        
+        if renderer_factory is None and not is_available():
+            logger.info("渲染池不可用（缺少Chrome或websocket-client），逐个文件转换")
+            return [self.convert_html_to_pdf_chrome(html_file, output_pdf) for html_file, output_pdf in jobs]
+        
+        with ChromePdfPool(size=workers, renderer_factory=renderer_factory) as pool:
+            return pool.convert_many(jobs)
+    
     def open_html_for_manual_print(self, html_file: str) -> dict:
         """
         在浏览器中打开HTML文件，供用户手动打印为PDF
@@ -161,12 +182,36 @@ def main():
         print("使用方法:")
         print("  自动转换: python html_to_pdf_converter.py <html_file> [output_pdf]")
         print("  手动打印: python html_to_pdf_converter.py <html_file> --manual")
+        print("  批量转换: python html_to_pdf_converter.py --batch <html文件或目录>... [--workers N]")
         sys.exit(1)
     
-    html_file = sys.argv[1]
-    
     converter = HTMLToPDFConverter()
     
+    if sys.argv[1] == "--batch":
+        args = sys.argv[2:]
+        workers = 4
+        if "--workers" in args:
+            index = args.index("--workers")
+            workers = int(args[index + 1])
+            del args[index:index + 2]
+        
+        html_files = []
+        for arg in args:
+            path = Path(arg)
+            if path.is_dir():
+                html_files.extend(str(p) for p in sorted(path.rglob("*.html")))
+            else:
+                html_files.append(arg)
+        
+        results = converter.convert_batch(html_files, workers=workers)
+        failed = [r for r in results if r["status"] != "success"]
+        for result in failed:
+            print(f"❌ {result['message']}")
+        print(f"✅ 批量转换完成: 成功 {len(results) - len(failed)} 个，失败 {len(failed)} 个")
+        sys.exit(1 if failed else 0)
+    
+    html_file = sys.argv[1]
+    
     # 检查是否是手动模式
     if len(sys.argv) > 2 and sys.argv[2] == "--manual":
         result = converter.open_html_for_manual_print(html_file)
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+增量备份引擎（内容寻址）
+
+文件按固定大小切块，以块内容的SHA-256作为对象名存入块仓库，相同内容只保存一份；
+每次备份生成一份清单（manifest）记录各文件的块列表。大小和修改时间与上一次备份
+相同的文件直接复用上次的块列表，不再读取。已压缩格式（docx/pptx/pdf/png等）原样
+存储，其余内容使用zlib压缩；哈希和压缩在线程池中并行执行。
+
+用法：
+    python incremental_backup.py backup
+    python incremental_backup.py list
+    python incremental_backup.py verify [清单名]
+    python incremental_backup.py restore <清单名> <目标目录> [--path 相对路径 ...]
+"""
+
+import os
+import sys
+import json
+import zlib
+import hashlib
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 块大小
+CHUNK_SIZE = 4 * 1024 * 1024
+
+# 默认备份的目录
+DEFAULT_BACKUP_DIRS = ["docs", "project", "tools", "data", "docker", "AI调度表", "office", "02-Output", "01-Input", "03-WorkTask"]
+
+# 遍历时跳过的目录
+EXCLUDED_DIRS = {"__pycache__", ".git"}
+
+# 已压缩的格式，原样存储不再压缩
+STORED_EXTENSIONS = {
+    ".docx", ".xlsx", ".pptx", ".pdf", ".png", ".jpg", ".jpeg", ".gif", ".webp",
+    ".zip", ".7z", ".rar", ".gz", ".bz2", ".xz", ".mp3", ".mp4", ".avi", ".mov"
+}
+
+# 压缩后至少节省的比例，不足时原样存储
+MIN_COMPRESSION_SAVING = 0.05
+
+# 块对象头：Z 为zlib压缩，R 为原样存储
+_COMPRESSED = b"Z"
+_RAW = b"R"
+
+
+class ChunkStore:
+    """内容寻址的块仓库"""
+
+    def __init__(self, objects_dir: Path):
+        self.objects_dir = Path(objects_dir)
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+
+    def object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def has(self, digest: str) -> bool:
+        return self.object_path(digest).exists()
+
+    def put(self, data: bytes, compress: bool = True) -> Tuple[str, int]:
+        """写入一个块，返回 (哈希, 新写入的字节数)；块已存在时写入字节数为0"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.object_path(digest)
+        if path.exists():
+            return digest, 0
+
+        payload = _RAW + data
+        if compress:
+            compressed = zlib.compress(data, 6)
+            if len(compressed) <= len(data) * (1 - MIN_COMPRESSION_SAVING):
+                payload = _COMPRESSED + compressed
+
+        path.parent.mkdir(exist_ok=True)
+        # 先写临时文件再改名，并发写入同一块时互不影响
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+        return digest, len(payload)
+
+    def get(self, digest: str) -> bytes:
+        """读取一个块并校验内容哈希"""
+        with open(self.object_path(digest), "rb") as f:
+            payload = f.read()
+        data = zlib.decompress(payload[1:]) if payload[:1] == _COMPRESSED else payload[1:]
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"块内容校验失败: {digest}")
+        return data
+
+
+class IncrementalBackup:
+    """增量备份：备份、列出、校验和恢复"""
+
+    def __init__(self, project_root: Path, backup_root: Optional[Path] = None,
+                 backup_dirs: Optional[List[str]] = None, max_workers: Optional[int] = None):
+        self.project_root = Path(project_root)
+        self.backup_root = Path(backup_root) if backup_root else self.project_root / "bak" / "增量备份"
+        self.backup_dirs = backup_dirs or DEFAULT_BACKUP_DIRS
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.store = ChunkStore(self.backup_root / "objects")
+        self.manifests_dir = self.backup_root / "manifests"
+        self.manifests_dir.mkdir(parents=True, exist_ok=True)
+
+    # ---- 清单 ----
+
+    def list_manifests(self) -> List[Path]:
+        """按时间顺序列出清单"""
+        return sorted(self.manifests_dir.glob("*.json"))
+
+    def load_manifest(self, name: Optional[str] = None) -> Optional[Dict]:
+        """加载指定清单，未指定时加载最新的清单"""
+        if name:
+            path = Path(name)
+            if not path.exists():
+                path = self.manifests_dir / (name if name.endswith(".json") else f"{name}.json")
+        else:
+            manifests = self.list_manifests()
+            if not manifests:
+                return None
+            path = manifests[-1]
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _manifest_name(self, now: datetime) -> str:
+        """清单名：时间戳精确到微秒，仍与已有清单重名时追加序号（按名称排序仍是时间顺序）"""
+        base = now.strftime("%Y%m%d_%H%M%S_%f")
+        name, seq = base, 0
+        while (self.manifests_dir / f"{name}.json").exists():
+            seq += 1
+            name = f"{base}_{seq:03d}"
+        return name
+
+    # ---- 备份 ----
+
+    def _iter_files(self) -> Iterable[Tuple[str, os.DirEntry]]:
+        """遍历备份目录，返回 (相对路径, 目录项)"""
+        for dir_name in self.backup_dirs:
+            source_dir = self.project_root / dir_name
+            if not source_dir.exists():
+                logger.warning(f"目录不存在，跳过: {dir_name}")
+                continue
+            stack = [(source_dir, dir_name)]
+            while stack:
+                current, rel = stack.pop()
+                try:
+                    with os.scandir(current) as it:
+                        for entry in it:
+                            rel_path = f"{rel}/{entry.name}"
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.name not in EXCLUDED_DIRS:
+                                    stack.append((entry.path, rel_path))
+                            elif entry.is_file(follow_symlinks=False):
+                                yield rel_path, entry
+                except OSError as e:
+                    logger.warning(f"无法读取目录 {current}: {e}")
+
+    def _backup_file(self, path: str, compress: bool) -> Tuple[List[str], str, int]:
+        """切块写入一个文件，返回 (块列表, 文件哈希, 新写入字节数)"""
+        chunks = []
+        written = 0
+        file_hash = hashlib.sha256()
+        with open(path, "rb") as f:
+            while True:
+                data = f.read(CHUNK_SIZE)
+                if not data:
+                    break
+                file_hash.update(data)
+                digest, size = self.store.put(data, compress)
+                chunks.append(digest)
+                written += size
+        return chunks, file_hash.hexdigest(), written
+
+    def backup(self) -> Dict:
+        """执行一次增量备份，返回清单"""
+        previous = self.load_manifest()
+        previous_files = previous["files"] if previous else {}
+
+        files = {}
+        pending = []
+        stats = {"files": 0, "unchanged": 0, "changed": 0, "bytes_total": 0, "bytes_read": 0, "bytes_written": 0}
+
+        for rel_path, entry in self._iter_files():
+            st = entry.stat()
+            stats["files"] += 1
+            stats["bytes_total"] += st.st_size
+            old = previous_files.get(rel_path)
+            if old and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns:
+                files[rel_path] = old
+                stats["unchanged"] += 1
+            else:
+                pending.append((rel_path, entry.path, st))
+
+        # 变更文件并行哈希、压缩、写入
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                rel_path: (st, executor.submit(self._backup_file, path,
+                                               Path(rel_path).suffix.lower() not in STORED_EXTENSIONS))
+                for rel_path, path, st in pending
+            }
+            for rel_path, (st, future) in futures.items():
+                try:
+                    chunks, file_hash, written = future.result()
+                except OSError as e:
+                    logger.warning(f"备份文件失败，跳过: {rel_path} ({e})")
+                    continue
+                files[rel_path] = {
+                    "size": st.st_size,
+                    "mtime_ns": st.st_mtime_ns,
+                    "sha256": file_hash,
+                    "chunks": chunks
+                }
+                stats["changed"] += 1
+                stats["bytes_read"] += st.st_size
+                stats["bytes_written"] += written
+                if stats["changed"] % 100 == 0:
+                    logger.info(f"已处理 {stats['changed']} 个变更文件...")
+
+        now = datetime.now()
+        timestamp = self._manifest_name(now)
+        manifest = {
+            "name": timestamp,
+            "created_at": now.isoformat(),
+            "project_root": str(self.project_root),
+            "backup_dirs": self.backup_dirs,
+            "stats": stats,
+            "files": dict(sorted(files.items()))
+        }
+
+        manifest_path = self.manifests_dir / f"{timestamp}.json"
+        tmp_path = manifest_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, manifest_path)
+
+        logger.info(f"增量备份完成: {manifest_path}")
+        logger.info(f"文件数: {stats['files']}，未变化: {stats['unchanged']}，变更: {stats['changed']}")
+        logger.info(f"读取 {stats['bytes_read'] / (1024 * 1024):.2f} MB，新写入 {stats['bytes_written'] / (1024 * 1024):.2f} MB")
+        return manifest
+
+    # ---- 校验与恢复 ----
+
+    def verify(self, name: Optional[str] = None) -> List[str]:
+        """校验清单引用的所有块，返回问题列表"""
+        manifest = self.load_manifest(name)
+        if manifest is None:
+            return ["没有可校验的备份清单"]
+
+        problems = []
+        digests = {digest for info in manifest["files"].values() for digest in info["chunks"]}
+
+        def check(digest):
+            try:
+                self.store.get(digest)
+                return None
+            except FileNotFoundError:
+                return f"缺少块: {digest}"
+            except (ValueError, zlib.error) as e:
+                return f"块已损坏: {digest} ({e})"
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            bad = {digest: result for digest, result in zip(digests, executor.map(check, digests)) if result}
+
+        for rel_path, info in manifest["files"].items():
+            for digest in info["chunks"]:
+                if digest in bad:
+                    problems.append(f"{rel_path}: {bad[digest]}")
+        return problems
+
+    def restore(self, name: Optional[str], target_dir: Path, paths: Optional[List[str]] = None) -> int:
+        """将清单中的文件恢复到目标目录，paths 可限定相对路径或目录前缀，返回恢复的文件数"""
+        manifest = self.load_manifest(name)
+        if manifest is None:
+            raise FileNotFoundError("没有可恢复的备份清单")
+
+        target_dir = Path(target_dir)
+        prefixes = [p.replace("\\", "/").rstrip("/") for p in paths] if paths else None
+        restored = 0
+        for rel_path, info in manifest["files"].items():
+            if prefixes and not any(rel_path == p or rel_path.startswith(p + "/") for p in prefixes):
+                continue
+
+            target = target_dir / rel_path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            file_hash = hashlib.sha256()
+            with open(target, "wb") as f:
+                for digest in info["chunks"]:
+                    data = self.store.get(digest)
+                    file_hash.update(data)
+                    f.write(data)
+            if file_hash.hexdigest() != info["sha256"]:
+                raise ValueError(f"恢复后文件校验失败: {rel_path}")
+            os.utime(target, ns=(info["mtime_ns"], info["mtime_ns"]))
+            restored += 1
+
+        logger.info(f"已恢复 {restored} 个文件到: {target_dir}")
+        return restored
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="增量备份工具")
+    parser.add_argument("--project-root", default="s:/PG-GMO", help="项目根目录")
+    parser.add_argument("--backup-root", help="备份仓库目录（默认 bak/增量备份）")
+    subparsers = parser.add_subparsers(dest="command", help="可用命令")
+
+    subparsers.add_parser("backup", help="执行增量备份")
+    subparsers.add_parser("list", help="列出备份清单")
+    verify_parser = subparsers.add_parser("verify", help="校验备份")
+    verify_parser.add_argument("manifest", nargs="?", help="清单名（默认最新）")
+    restore_parser = subparsers.add_parser("restore", help="恢复备份")
+    restore_parser.add_argument("manifest", help="清单名")
+    restore_parser.add_argument("target", help="恢复到的目录")
+    restore_parser.add_argument("--path", action="append", help="只恢复指定的相对路径（可多次指定）")
+
+    args = parser.parse_args()
+    if not args.command:
+        parser.print_help()
+        return 1
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    engine = IncrementalBackup(Path(args.project_root), Path(args.backup_root) if args.backup_root else None)
+
+    if args.command == "backup":
+        engine.backup()
+    elif args.command == "list":
+        for path in engine.list_manifests():
+            with open(path, "r", encoding="utf-8") as f:
+                stats = json.load(f).get("stats", {})
+            print(f"{path.stem}  文件数: {stats.get('files', 0)}  变更: {stats.get('changed', 0)}  "
+                  f"新写入: {stats.get('bytes_written', 0) / (1024 * 1024):.2f} MB")
+    elif args.command == "verify":
+        problems = engine.verify(args.manifest)
+        if problems:
+            for problem in problems:
+                print(f"错误: {problem}")
+            return 1
+        print("成功: 备份校验通过")
+    elif args.command == "restore":
+        engine.restore(args.manifest, Path(args.target), args.path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
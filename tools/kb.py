@@ -18,9 +18,13 @@ if sys.platform == "win32":
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8")
 import re
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import matplotlib.patches as patches
 from matplotlib.patches import Rectangle
 import numpy as np
@@ -30,12 +34,207 @@ from datetime import datetime, timedelta
 plt.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei']
 plt.rcParams['axes.unicode_minus'] = False
 
+# 默认使用轻量分辨率，高清导出时使用 HIGH_RES_DPI
+DEFAULT_DPI = 100
+HIGH_RES_DPI = 300
+
+
+class KanbanChartRenderer:
+    """看板图表渲染器
+
+    直接在 Agg 画布上绘制，不初始化 GUI 后端。四个面板分别绘制到独立画布后拼接，
+    可以在多个进程中并行绘制。
+    """
+
+    TITLE = 'PG-GMO项目开发进度看板'
+    PANEL_SIZE = (8, 6)     # 单个面板尺寸（英寸）
+    TITLE_HEIGHT = 0.8      # 标题栏高度（英寸）
+    PANELS = (
+        '_draw_completion_pie',     # 1. 模块完成度饼图
+        '_draw_category_progress',  # 2. 各类别进度条图
+        '_draw_module_heatmap',     # 3. 详细模块状态热力图
+        '_draw_timeline_gantt',     # 4. 时间线甘特图
+    )
+
+    def __init__(self, modules: Dict):
+        self.modules = modules
+
+    def render_panel(self, index: int, dpi: int) -> np.ndarray:
+        """绘制单个面板，返回 RGBA 像素数组"""
+        fig = Figure(figsize=self.PANEL_SIZE, dpi=dpi, layout='constrained')
+        canvas = FigureCanvasAgg(fig)
+        getattr(self, self.PANELS[index])(fig.add_subplot())
+        canvas.draw()
+        return np.asarray(canvas.buffer_rgba()).copy()
+
+    def render(self, output_path: Path, dpi: int = DEFAULT_DPI, parallel: bool = False):
+        """绘制四个面板并拼接为一张图"""
+        indexes = range(len(self.PANELS))
+        if parallel:
+            with ProcessPoolExecutor(max_workers=len(self.PANELS)) as executor:
+                panels = list(executor.map(
+                    _render_kanban_panel,
+                    [self.modules] * len(self.PANELS), indexes, [dpi] * len(self.PANELS)
+                ))
+        else:
+            panels = [self.render_panel(i, dpi) for i in indexes]
+
+        panel_height, panel_width = panels[0].shape[:2]
+        title_height = int(self.TITLE_HEIGHT * dpi)
+        total_height = 2 * panel_height + title_height
+
+        fig = Figure(figsize=(2 * panel_width / dpi, total_height / dpi), dpi=dpi)
+        FigureCanvasAgg(fig)
+        for i, panel in enumerate(panels):
+            row, col = divmod(i, 2)
+            fig.figimage(panel, xo=col * panel_width, yo=(1 - row) * panel_height, origin='upper')
+        fig.suptitle(self.TITLE, fontsize=20, fontweight='bold', va='center',
+                     y=1 - title_height / 2 / total_height)
+        fig.savefig(output_path, dpi=dpi)
+
+    def _draw_completion_pie(self, ax):
+        """绘制完成度饼图"""
+        status_counts = {"完成": 0, "进行中": 0, "待开发": 0, "待完善": 0, "开始开发": 0, "待检测": 0}
+        
+        for category, items in self.modules.items():
+            for module_name, info in items.items():
+                status_counts[info["status"]] += 1
+        
+        labels = list(status_counts.keys())
+        sizes = list(status_counts.values())
+        colors = ['#2ecc71', '#f39c12', '#e74c3c', '#9b59b6', '#ff6b35', '#34495e']
+        
+        wedges, texts, autotexts = ax.pie(sizes, labels=labels, colors=colors, 
+                                          autopct='%1.1f%%', startangle=90)
+        ax.set_title('模块完成状态分布', fontsize=14, fontweight='bold')
+        
+        # 添加图例
+        ax.legend(wedges, [f'{label}: {size}个' for label, size in zip(labels, sizes)],
+                 loc="center left", bbox_to_anchor=(1, 0, 0.5, 1))
+    
+    def _draw_category_progress(self, ax):
+        """绘制各类别进度条"""
+        categories = list(self.modules.keys())
+        progress_data = []
+        
+        for category, items in self.modules.items():
+            total_progress = sum(info["progress"] for info in items.values())
+            avg_progress = total_progress / len(items) if items else 0
+            progress_data.append(avg_progress)
+        
+        y_pos = np.arange(len(categories))
+        bars = ax.barh(y_pos, progress_data, color=['#3498db', '#e67e22', '#27ae60', '#8e44ad'])
+        
+        ax.set_yticks(y_pos)
+        ax.set_yticklabels(categories)
+        ax.set_xlabel('完成度 (%)')
+        ax.set_title('各模块类别平均进度', fontsize=14, fontweight='bold')
+        ax.set_xlim(0, 100)
+        
+        # 添加数值标签
+        for i, (bar, progress) in enumerate(zip(bars, progress_data)):
+            ax.text(progress + 2, i, f'{progress:.1f}%', 
+                   va='center', fontweight='bold')
+    
+    def _draw_module_heatmap(self, ax):
+        """绘制模块状态热力图"""
+        all_modules = []
+        all_progress = []
+        category_labels = []
+        
+        for category, items in self.modules.items():
+            for module_name, info in items.items():
+                all_modules.append(f"{category}\n{module_name}")
+                all_progress.append(info["progress"])
+                category_labels.append(category)
+        
+        # 创建热力图数据
+        rows = 6  # 每行显示的模块数
+        cols = (len(all_modules) + rows - 1) // rows
+        
+        heatmap_data = np.zeros((rows, cols))
+        module_labels = [[""] * cols for _ in range(rows)]
+        
+        for i, progress in enumerate(all_progress):
+            row = i % rows
+            col = i // rows
+            if col < cols:
+                heatmap_data[row, col] = progress
+                module_labels[row][col] = all_modules[i].split('\n')[1][:8] + ".." if len(all_modules[i].split('\n')[1]) > 8 else all_modules[i].split('\n')[1]
+        
+        im = ax.imshow(heatmap_data, cmap='RdYlGn', aspect='auto', vmin=0, vmax=100)
+        
+        # 设置标签
+        ax.set_xticks(range(cols))
+        ax.set_yticks(range(rows))
+        
+        # 添加文本标签
+        for i in range(rows):
+            for j in range(cols):
+                if module_labels[i][j]:
+                    text = ax.text(j, i, f'{module_labels[i][j]}\n{heatmap_data[i, j]:.0f}%',
+                                 ha="center", va="center", fontsize=8, fontweight='bold')
+        
+        ax.set_title('模块进度热力图', fontsize=14, fontweight='bold')
+        
+        # 添加颜色条
+        cbar = ax.figure.colorbar(im, ax=ax, shrink=0.8)
+        cbar.set_label('完成度 (%)', rotation=270, labelpad=15)
+    
+    def _draw_timeline_gantt(self, ax):
+        """绘制时间线甘特图"""
+        # 模拟项目时间线
+        timeline_data = [
+            ("项目架构", "2025-01-01", "2025-01-15", "完成"),
+            ("后端API", "2025-01-10", "2025-02-15", "进行中"),
+            ("前端界面", "2025-01-20", "2025-03-01", "进行中"),
+            ("系统集成", "2025-02-15", "2025-03-15", "待开发"),
+            ("测试部署", "2025-03-01", "2025-03-20", "待开发")
+        ]
+        
+        colors = {"完成": "#2ecc71", "进行中": "#f39c12", "待开发": "#e74c3c"}
+        
+        for i, (task, start, end, status) in enumerate(timeline_data):
+            start_date = datetime.strptime(start, "%Y-%m-%d")
+            end_date = datetime.strptime(end, "%Y-%m-%d")
+            duration = (end_date - start_date).days
+            
+            ax.barh(i, duration, left=start_date.toordinal(), 
+                   color=colors[status], alpha=0.7, height=0.6)
+            
+            # 添加任务标签
+            ax.text(start_date.toordinal() + duration/2, i, task, 
+                   ha='center', va='center', fontweight='bold', fontsize=10)
+        
+        ax.set_yticks(range(len(timeline_data)))
+        ax.set_yticklabels([item[0] for item in timeline_data])
+        ax.set_title('项目时间线', fontsize=14, fontweight='bold')
+        
+        # 设置x轴日期格式
+        import matplotlib.dates as mdates
+        ax.xaxis.set_major_formatter(mdates.DateFormatter('%m-%d'))
+        ax.xaxis.set_major_locator(mdates.WeekdayLocator(interval=2))
+        
+        # 添加今天的标记线
+        today = datetime.now().toordinal()
+        ax.axvline(x=today, color='red', linestyle='--', alpha=0.7, linewidth=2)
+        ax.text(today, len(timeline_data)-0.5, '今天', rotation=90, 
+               ha='right', va='top', color='red', fontweight='bold')
+    
+
+
+def _render_kanban_panel(modules: Dict, index: int, dpi: int) -> np.ndarray:
+    """进程池任务：绘制单个面板"""
+    return KanbanChartRenderer(modules).render_panel(index, dpi)
+
+
 class ProjectKanban:
     """项目看板类"""
     
     def __init__(self, project_root: str):
         self.project_root = Path(project_root)
         self.config_file = self.project_root / "tools" / "kanban_config.json"
+        self.render_state_file = self.project_root / ".cache" / "kanban_render.json"
         self.last_update = datetime.now()
         self.modules = self._load_or_create_module_status()
         
@@ -677,166 +876,69 @@ class ProjectKanban:
         self.last_update = datetime.now()
         print("✅ 看板数据更新完成")
     
-    def generate_overview_chart(self):
-        """生成项目总览图表"""
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
-        fig.suptitle('PG-GMO项目开发进度看板', fontsize=20, fontweight='bold')
-        
-        # 1. 模块完成度饼图
-        self._draw_completion_pie(ax1)
-        
-        # 2. 各类别进度条图
-        self._draw_category_progress(ax2)
-        
-        # 3. 详细模块状态热力图
-        self._draw_module_heatmap(ax3)
-        
-        # 4. 时间线甘特图
-        self._draw_timeline_gantt(ax4)
-        
-        plt.tight_layout()
-        plt.subplots_adjust(top=0.93)
-        
+    def _model_digest(self, *extra) -> str:
+        """计算模块状态模型的摘要（包含当天日期，图表中的今天标记和相对时间随日期变化）"""
+        payload = json.dumps(
+            [self.modules, extra, datetime.now().date().isoformat()],
+            ensure_ascii=False, sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _load_render_state(self) -> Dict:
+        try:
+            with open(self.render_state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_render_state(self, state: Dict):
+        try:
+            self.render_state_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.render_state_file, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            print(f"⚠️  保存渲染状态失败: {e}")
+
+    def generate_overview_chart(self, dpi: int = DEFAULT_DPI, force: bool = False,
+                                parallel: Optional[bool] = None) -> bool:
+        """生成项目总览图表，模块状态未变化时跳过渲染
+
+        Args:
+            dpi: 输出分辨率，高清导出使用 HIGH_RES_DPI
+            force: 忽略变更检测，强制重新渲染
+            parallel: 是否在多个进程中并行绘制四个面板，None 表示仅高清导出时并行
+
+        Returns:
+            bool: 是否重新渲染了图表
+        """
+        # 高清图表单独保存，不被日常刷新覆盖
+        file_name = "项目进度看板_高清.png" if dpi >= HIGH_RES_DPI else "项目进度看板.png"
+        output_path = self.project_root / "docs" / "03-管理" / file_name
+        state_key = f"chart_{dpi}"
+        digest = self._model_digest(state_key)
+        state = self._load_render_state()
+        if not force and state.get(state_key) == digest and output_path.exists():
+            print(f"看板数据未变化，跳过图表渲染: {output_path}")
+            return False
+
+        if parallel is None:
+            parallel = dpi >= HIGH_RES_DPI
+
         # 保存图表
-        output_path = self.project_root / "docs" / "03-管理" / "项目进度看板.png"
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        KanbanChartRenderer(self.modules).render(output_path, dpi=dpi, parallel=parallel)
         print(f"看板图表已保存到: {output_path}")
-        
+
+        state[state_key] = digest
+        self._save_render_state(state)
+
         # 只有在交互模式下才显示图表
-        if not plt.isinteractive():
-            plt.close(fig)
-        else:
+        if plt.isinteractive():
+            plt.imshow(plt.imread(output_path))
+            plt.axis('off')
             plt.show()
-    
-    def _draw_completion_pie(self, ax):
-        """绘制完成度饼图"""
-        status_counts = {"完成": 0, "进行中": 0, "待开发": 0, "待完善": 0, "开始开发": 0, "待检测": 0}
-        
-        for category, items in self.modules.items():
-            for module_name, info in items.items():
-                status_counts[info["status"]] += 1
-        
-        labels = list(status_counts.keys())
-        sizes = list(status_counts.values())
-        colors = ['#2ecc71', '#f39c12', '#e74c3c', '#9b59b6', '#ff6b35', '#34495e']
-        
-        wedges, texts, autotexts = ax.pie(sizes, labels=labels, colors=colors, 
-                                          autopct='%1.1f%%', startangle=90)
-        ax.set_title('模块完成状态分布', fontsize=14, fontweight='bold')
-        
-        # 添加图例
-        ax.legend(wedges, [f'{label}: {size}个' for label, size in zip(labels, sizes)],
-                 loc="center left", bbox_to_anchor=(1, 0, 0.5, 1))
-    
-    def _draw_category_progress(self, ax):
-        """绘制各类别进度条"""
-        categories = list(self.modules.keys())
-        progress_data = []
-        
-        for category, items in self.modules.items():
-            total_progress = sum(info["progress"] for info in items.values())
-            avg_progress = total_progress / len(items) if items else 0
-            progress_data.append(avg_progress)
-        
-        y_pos = np.arange(len(categories))
-        bars = ax.barh(y_pos, progress_data, color=['#3498db', '#e67e22', '#27ae60', '#8e44ad'])
-        
-        ax.set_yticks(y_pos)
-        ax.set_yticklabels(categories)
-        ax.set_xlabel('完成度 (%)')
-        ax.set_title('各模块类别平均进度', fontsize=14, fontweight='bold')
-        ax.set_xlim(0, 100)
-        
-        # 添加数值标签
-        for i, (bar, progress) in enumerate(zip(bars, progress_data)):
-            ax.text(progress + 2, i, f'{progress:.1f}%', 
-                   va='center', fontweight='bold')
-    
-    def _draw_module_heatmap(self, ax):
-        """绘制模块状态热力图"""
-        all_modules = []
-        all_progress = []
-        category_labels = []
-        
-        for category, items in self.modules.items():
-            for module_name, info in items.items():
-                all_modules.append(f"{category}\n{module_name}")
-                all_progress.append(info["progress"])
-                category_labels.append(category)
-        
-        # 创建热力图数据
-        rows = 6  # 每行显示的模块数
-        cols = (len(all_modules) + rows - 1) // rows
-        
-        heatmap_data = np.zeros((rows, cols))
-        module_labels = [[""] * cols for _ in range(rows)]
-        
-        for i, progress in enumerate(all_progress):
-            row = i % rows
-            col = i // rows
-            if col < cols:
-                heatmap_data[row, col] = progress
-                module_labels[row][col] = all_modules[i].split('\n')[1][:8] + ".." if len(all_modules[i].split('\n')[1]) > 8 else all_modules[i].split('\n')[1]
-        
-        im = ax.imshow(heatmap_data, cmap='RdYlGn', aspect='auto', vmin=0, vmax=100)
-        
-        # 设置标签
-        ax.set_xticks(range(cols))
-        ax.set_yticks(range(rows))
-        
-        # 添加文本标签
-        for i in range(rows):
-            for j in range(cols):
-                if module_labels[i][j]:
-                    text = ax.text(j, i, f'{module_labels[i][j]}\n{heatmap_data[i, j]:.0f}%',
-                                 ha="center", va="center", fontsize=8, fontweight='bold')
-        
-        ax.set_title('模块进度热力图', fontsize=14, fontweight='bold')
-        
-        # 添加颜色条
-        cbar = plt.colorbar(im, ax=ax, shrink=0.8)
-        cbar.set_label('完成度 (%)', rotation=270, labelpad=15)
-    
-    def _draw_timeline_gantt(self, ax):
-        """绘制时间线甘特图"""
-        # 模拟项目时间线
-        timeline_data = [
-            ("项目架构", "2025-01-01", "2025-01-15", "完成"),
-            ("后端API", "2025-01-10", "2025-02-15", "进行中"),
-            ("前端界面", "2025-01-20", "2025-03-01", "进行中"),
-            ("系统集成", "2025-02-15", "2025-03-15", "待开发"),
-            ("测试部署", "2025-03-01", "2025-03-20", "待开发")
-        ]
-        
-        colors = {"完成": "#2ecc71", "进行中": "#f39c12", "待开发": "#e74c3c"}
-        
-        for i, (task, start, end, status) in enumerate(timeline_data):
-            start_date = datetime.strptime(start, "%Y-%m-%d")
-            end_date = datetime.strptime(end, "%Y-%m-%d")
-            duration = (end_date - start_date).days
-            
-            ax.barh(i, duration, left=start_date.toordinal(), 
-                   color=colors[status], alpha=0.7, height=0.6)
-            
-            # 添加任务标签
-            ax.text(start_date.toordinal() + duration/2, i, task, 
-                   ha='center', va='center', fontweight='bold', fontsize=10)
-        
-        ax.set_yticks(range(len(timeline_data)))
-        ax.set_yticklabels([item[0] for item in timeline_data])
-        ax.set_title('项目时间线', fontsize=14, fontweight='bold')
-        
-        # 设置x轴日期格式
-        import matplotlib.dates as mdates
-        ax.xaxis.set_major_formatter(mdates.DateFormatter('%m-%d'))
-        ax.xaxis.set_major_locator(mdates.WeekdayLocator(interval=2))
-        
-        # 添加今天的标记线
-        today = datetime.now().toordinal()
-        ax.axvline(x=today, color='red', linestyle='--', alpha=0.7, linewidth=2)
-        ax.text(today, len(timeline_data)-0.5, '今天', rotation=90, 
-               ha='right', va='top', color='red', fontweight='bold')
-    
+        return True
+
     def evaluate_task_completion(self):
         """评估任务完成情况"""
         print("\n🔍 正在评估任务完成情况...")
@@ -892,8 +994,8 @@ class ProjectKanban:
         
         return task_evaluation
     
-    def update_kanban_md(self):
-        """更新看板.md文件"""
+    def update_kanban_md(self, force: bool = False):
+        """更新看板.md文件，模块状态未变化时不重写"""
         print("\n📝 正在更新看板.md文件...")
         
         kanban_file = self.project_root / "docs" / "03-管理" / "看板.md"
@@ -901,6 +1003,12 @@ class ProjectKanban:
         # 评估任务完成情况
         task_eval = self.evaluate_task_completion()
         
+        digest = self._model_digest("markdown", task_eval)
+        state = self._load_render_state()
+        if not force and state.get("markdown") == digest and kanban_file.exists():
+            print(f"✅ 看板数据未变化，跳过更新: {kanban_file}")
+            return True
+        
         # 生成更新内容
         update_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
@@ -1004,6 +1112,9 @@ class ProjectKanban:
             with open(kanban_file, 'w', encoding='utf-8') as f:
                 f.write(new_content)
             
+            state["markdown"] = digest
+            self._save_render_state(state)
+            
             print(f"✅ 看板.md文件已更新: {kanban_file}")
             return True
             
@@ -1338,6 +1449,8 @@ def main():
     parser.add_argument('--no-chart', '-n', action='store_true', help='只显示摘要，不生成图表')
     parser.add_argument('--config', '-c', help='指定配置文件路径')
     parser.add_argument('--non-interactive', action='store_true', help='非交互模式，不显示图表窗口并使用ASCII字符')
+    parser.add_argument('--force', '-f', action='store_true', help='忽略变更检测，强制重新生成图表和看板.md')
+    parser.add_argument('--high-res', action='store_true', help=f'以{HIGH_RES_DPI}dpi导出高清图表（多进程并行绘制）')
     
     args = parser.parse_args()
     
@@ -1357,7 +1470,7 @@ def main():
         
         # 全面检查评估任务完成情况并更新看板.md
         print("\n🔄 开始全面检查评估任务完成情况...")
-        kanban.update_kanban_md()
+        kanban.update_kanban_md(force=args.force)
         
         # 打印摘要信息
         kanban.print_summary(non_interactive=args.non_interactive)
@@ -1368,7 +1481,10 @@ def main():
             # 在非交互模式下，不显示图表窗口
             if args.non_interactive:
                 plt.ioff()
-            kanban.generate_overview_chart()
+            kanban.generate_overview_chart(
+                dpi=HIGH_RES_DPI if args.high_res else DEFAULT_DPI,
+                force=args.force
+            )
             if args.non_interactive:
                 plt.ion()
         else:
@@ -1379,6 +1495,7 @@ def main():
         print("\n💡 使用提示:")
         print("   python kb.py --update     # 强制更新看板数据")
         print("   python kb.py --no-chart   # 只显示摘要，不生成图表")
+        print("   python kb.py --high-res   # 导出高清图表")
         print("   python kb.py --help       # 显示帮助信息")
         
     except KeyboardInterrupt:
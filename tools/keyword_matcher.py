@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+关键词与词段模式匹配
+
+KeywordMatcher：将多个词表（部门、角色等）编译成一个前缀树，用所有关键词首字符
+组成的字符类正则在C层快速定位候选位置，再沿前缀树匹配，整篇文档只扫描一次，
+返回每个关键词的位置和次数。计数规则与逐个关键词 str.count 一致：同一关键词的
+出现不重叠，不同关键词之间可以重叠（“副总经理”同时计入“副总经理”“总经理”
+“经理”“副总”）。
+
+WordPatternMatcher：用于 \\w*部 这类只匹配单词字符的正则。文本先一次切分为 \\w+
+词段，每个不同的词段只匹配一次并缓存结果，结果与对全文逐个 re.findall 相同。
+
+供 batch_iso_analyzer 和 department_role_analyzer 共用。
+"""
+
+import re
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+_WORD_RUN = re.compile(r"\w+")
+
+# 词段结果缓存的最大条目数
+RUN_CACHE_SIZE = 200000
+
+
+class KeywordMatch(NamedTuple):
+    """一次关键词匹配"""
+    keyword: str
+    start: int
+    end: int
+
+
+class KeywordScan(NamedTuple):
+    """一篇文档的匹配结果"""
+    counts: Dict[str, Counter]                  # 词表名 -> {关键词: 次数}
+    positions: Dict[str, List[int]]             # 关键词 -> 起始位置列表
+
+
+class KeywordMatcher:
+    """多词表单次扫描匹配器"""
+
+    def __init__(self, vocabularies: Dict[str, Iterable[str]]):
+        """
+        Args:
+            vocabularies: {词表名: 关键词列表}，同一关键词可以属于多个词表
+        """
+        self.vocabularies = {name: list(dict.fromkeys(k for k in words if k))
+                             for name, words in vocabularies.items()}
+        self._owners: Dict[str, Tuple[str, ...]] = {}
+        self._trie: Dict = {}
+        for name, words in self.vocabularies.items():
+            for keyword in words:
+                self._owners[keyword] = self._owners.get(keyword, ()) + (name,)
+                node = self._trie
+                for ch in keyword:
+                    node = node.setdefault(ch, {})
+                node[""] = keyword
+
+        first_chars = sorted({keyword[0] for keyword in self._owners})
+        self._candidates = re.compile("[" + "".join(re.escape(ch) for ch in first_chars) + "]") \
+            if first_chars else None
+
+    def iter_matches(self, text: str) -> Iterator[KeywordMatch]:
+        """按位置顺序输出所有匹配（同一关键词不重叠）"""
+        if not text or self._candidates is None:
+            return
+        trie = self._trie
+        length = len(text)
+        next_allowed: Dict[str, int] = {}
+        for candidate in self._candidates.finditer(text):
+            start = candidate.start()
+            node = trie
+            i = start
+            while i < length:
+                node = node.get(text[i])
+                if node is None:
+                    break
+                i += 1
+                keyword = node.get("")
+                if keyword is not None and start >= next_allowed.get(keyword, 0):
+                    next_allowed[keyword] = i
+                    yield KeywordMatch(keyword, start, i)
+
+    def scan(self, text: str, with_positions: bool = False) -> KeywordScan:
+        """扫描文本，返回各词表的关键词次数（以及可选的位置）"""
+        counts = {name: Counter() for name in self.vocabularies}
+        positions: Dict[str, List[int]] = {}
+        for match in self.iter_matches(text):
+            for name in self._owners[match.keyword]:
+                counts[name][match.keyword] += 1
+            if with_positions:
+                positions.setdefault(match.keyword, []).append(match.start)
+        return KeywordScan(counts, positions)
+
+    def count(self, text: str) -> Dict[str, Counter]:
+        """只返回各词表的关键词次数"""
+        return self.scan(text).counts
+
+
+class WordPatternMatcher:
+    """按词段匹配的多组正则（正则只能匹配单词字符，末尾可带针对单词字符的否定前瞻）"""
+
+    def __init__(self, groups: Dict[str, Sequence[str]], exclude_words: Iterable[str] = (),
+                 min_length: int = 2):
+        """
+        Args:
+            groups: {组名: 正则列表}，每个正则含一个捕获组
+            exclude_words: 需要排除的词
+            min_length: 结果的最小长度
+        """
+        self.groups = {name: [re.compile(pattern) for pattern in patterns]
+                       for name, patterns in groups.items()}
+        self.exclude_words = set(exclude_words)
+        self.min_length = min_length
+        self._cache: Dict[str, Tuple[Tuple[str, ...], ...]] = {}
+
+    def _match_run(self, run: str) -> Tuple[Tuple[str, ...], ...]:
+        cached = self._cache.get(run)
+        if cached is None:
+            cached = tuple(
+                tuple({
+                    match for pattern in patterns for match in pattern.findall(run)
+                    if match and len(match) >= self.min_length and match not in self.exclude_words
+                })
+                for patterns in self.groups.values()
+            )
+            if len(self._cache) >= RUN_CACHE_SIZE:
+                self._cache.clear()
+            self._cache[run] = cached
+        return cached
+
+    def extract(self, text: str) -> Dict[str, Set[str]]:
+        """提取各组匹配到的不同词"""
+        found = {name: set() for name in self.groups}
+        if not text:
+            return found
+        names = list(self.groups)
+        for run in set(_WORD_RUN.findall(text)):
+            for name, matches in zip(names, self._match_run(run)):
+                found[name].update(matches)
+        return found
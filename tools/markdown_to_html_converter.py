@@ -9,7 +9,9 @@ Markdown转HTML工具
 
 import os
 import sys
+import threading
 from pathlib import Path
+from typing import List, Optional
 import markdown
 import logging
 
@@ -17,46 +19,11 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class MarkdownToHTMLConverter:
-    """Markdown转HTML转换器类"""
-    
-    def __init__(self):
-        self.name = "Markdown转HTML工具"
-        self.version = "1.0.0"
-        
-    def convert_markdown_to_html(self, markdown_file: str, output_html: str = None) -> dict:
-        """
-        将Markdown文件转换为HTML
-        
-        Args:
-            markdown_file: Markdown文件路径
-            output_html: 输出HTML文件路径（可选）
-            
-        Returns:
-            包含操作结果的字典
-        """
-        try:
-            # 检查输入文件
-            if not Path(markdown_file).exists():
-                return {
-                    "status": "error",
-                    "message": f"Markdown文件不存在: {markdown_file}"
-                }
-            
-            # 确定输出文件路径
-            if output_html is None:
-                output_html = str(Path(markdown_file).with_suffix('.html'))
-            
-            # 读取Markdown文件
-            with open(markdown_file, 'r', encoding='utf-8') as f:
-                markdown_content = f.read()
-            
-            # 转换Markdown为HTML
-            md = markdown.Markdown(extensions=['tables', 'toc', 'codehilite', 'fenced_code'])
-            html_content = md.convert(markdown_content)
-            
-            # 创建完整的HTML文档
-            full_html = f"""
+# Markdown扩展
+MARKDOWN_EXTENSIONS = ['tables', 'toc', 'codehilite', 'fenced_code']
+
+# 页面模板（{html_content} 为正文位置）
+PAGE_TEMPLATE = """
 <!DOCTYPE html>
 <html lang="zh-CN">
 <head>
@@ -261,6 +228,71 @@ class MarkdownToHTMLConverter:
 </body>
 </html>
             """
+
+# 模板只格式化一次，拆分为正文前后两段，转换时直接拼接
+_PAGE_HEAD, _PAGE_TAIL = PAGE_TEMPLATE.format(html_content="\0").split("\0")
+
+# 每个线程一个Markdown引擎，扩展只加载一次
+_thread_state = threading.local()
+
+
+def get_markdown_engine() -> markdown.Markdown:
+    """获取当前线程的Markdown引擎（已重置，可直接 convert）"""
+    engine = getattr(_thread_state, "engine", None)
+    if engine is None:
+        engine = _thread_state.engine = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+    return engine.reset()
+
+
+def render_page(html_content: str) -> str:
+    """将正文HTML放入页面模板"""
+    return _PAGE_HEAD + html_content + _PAGE_TAIL
+
+
+def render_markdown(markdown_content: str) -> str:
+    """将Markdown文本渲染为完整的HTML页面（不读写文件，供预览使用）"""
+    return render_page(get_markdown_engine().convert(markdown_content))
+
+
+class MarkdownToHTMLConverter:
+    """Markdown转HTML转换器类"""
+    
+    def __init__(self):
+        self.name = "Markdown转HTML工具"
+        self.version = "1.0.0"
+        
+    def convert_markdown_to_html(self, markdown_file: str, output_html: str = None) -> dict:
+        """
+        将Markdown文件转换为HTML
+        
+        Args:
+            markdown_file: Markdown文件路径
+            output_html: 输出HTML文件路径（可选）
+            
+        Returns:
+            包含操作结果的字典
+        """
+        try:
+            # 检查输入文件
+            if not Path(markdown_file).exists():
+                return {
+                    "status": "error",
+                    "message": f"Markdown文件不存在: {markdown_file}"
+                }
+            
+            # 确定输出文件路径
+            if output_html is None:
+                output_html = str(Path(markdown_file).with_suffix('.html'))
+            
+            # 读取Markdown文件
+            with open(markdown_file, 'r', encoding='utf-8') as f:
+                markdown_content = f.read()
+            
+            # 转换Markdown为HTML（复用当前线程的引擎）
+            html_content = get_markdown_engine().convert(markdown_content)
+            
+            # 创建完整的HTML文档
+            full_html = render_page(html_content)
             
             # 写入HTML文件
             with open(output_html, 'w', encoding='utf-8') as f:
@@ -280,6 +312,27 @@ class MarkdownToHTMLConverter:
                 "message": f"转换失败: {str(e)}"
             }
 
+    def convert_batch(self, markdown_files: List[str], output_dir: Optional[str] = None) -> List[dict]:
+        """
+        批量将Markdown文件转换为HTML（同一线程内共用一个Markdown引擎）
+
+        Args:
+            markdown_files: Markdown文件路径列表
+            output_dir: 输出目录（可选，默认与Markdown文件同目录）
+
+        Returns:
+            每个文件的结果字典列表（与输入顺序一致）
+        """
+        if output_dir:
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+        results = []
+        for markdown_file in markdown_files:
+            output_html = None
+            if output_dir:
+                output_html = str(Path(output_dir) / Path(markdown_file).with_suffix('.html').name)
+            results.append(self.convert_markdown_to_html(str(markdown_file), output_html))
+        return results
+
 def main():
     """主函数"""
     if len(sys.argv) < 2:
@@ -1,10 +1,12 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-Markdown to Word鏂囨。杞崲鍣?浣滆€咃細闆ㄤ繆
-鍔熻兘锛氬皢閮ㄩ棬鍩虹寤鸿宸ヤ綔鎴愭灉涓殑鎵€鏈?md鏂囦欢杞崲涓?docx鏂囦欢
+Markdown to Word文档转换器
+作者：雨俊
+功能：将部门基础建设工作成果中的所有md文件转换为docx文件
 """
 
+import io
 import os
 import sys
 from pathlib import Path
@@ -17,54 +19,73 @@ from docx.shared import Pt
 from docx.oxml.shared import OxmlElement, qn
 import re
 
+from batch_conversion import run_batch
+
 def setup_document_styles(doc):
-    """璁剧疆鏂囨。鏍峰紡"""
-    # 璁剧疆鏍囬鏍峰紡
+    """设置文档样式"""
+    # 设置标题样式
     try:
         heading1 = doc.styles['Heading 1']
-        heading1.font.name = '寰蒋闆呴粦'
+        heading1.font.name = '微软雅黑'
         heading1.font.size = Pt(16)
         heading1.font.bold = True
-        
+
         heading2 = doc.styles['Heading 2']
-        heading2.font.name = '寰蒋闆呴粦'
+        heading2.font.name = '微软雅黑'
         heading2.font.size = Pt(14)
         heading2.font.bold = True
-        
+
         heading3 = doc.styles['Heading 3']
-        heading3.font.name = '寰蒋闆呴粦'
+        heading3.font.name = '微软雅黑'
         heading3.font.size = Pt(12)
         heading3.font.bold = True
-        
-        # 璁剧疆姝ｆ枃鏍峰紡
+
+        # 设置正文样式
         normal = doc.styles['Normal']
-        normal.font.name = '瀹嬩綋'
+        normal.font.name = '宋体'
         normal.font.size = Pt(11)
     except Exception as e:
-        print(f"璁剧疆鏍峰紡鏃跺嚭閿? {e}")
+        print(f"设置样式时出错: {e}")
 
-def convert_markdown_to_docx(md_file_path, docx_file_path):
-    """灏嗗崟涓猰arkdown鏂囦欢杞崲涓篸ocx鏂囦欢"""
+def build_styled_template():
+    """创建已设置样式的空白文档模板（序列化为字节，批量转换时每个进程只创建一次）"""
+    doc = Document()
+    setup_document_styles(doc)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+def convert_markdown_to_docx(md_file_path, docx_file_path, template=None):
+    """将单个markdown文件转换为docx文件
+
+    Args:
+        md_file_path: markdown文件路径
+        docx_file_path: 输出docx文件路径
+        template: build_styled_template() 生成的模板，None 时重新创建文档并设置样式
+    """
     try:
-        # 璇诲彇markdown鏂囦欢
+        # 读取markdown文件
         with open(md_file_path, 'r', encoding='utf-8') as f:
             md_content = f.read()
-        
-        # 鍒涘缓Word鏂囨。
-        doc = Document()
-        setup_document_styles(doc)
-        
-        # 鎸夎澶勭悊markdown鍐呭
+
+        # 创建Word文档
+        if template is not None:
+            doc = Document(io.BytesIO(template))
+        else:
+            doc = Document()
+            setup_document_styles(doc)
+
+        # 按行处理markdown内容
         lines = md_content.split('\n')
-        
+
         for line in lines:
             line = line.strip()
             if not line:
-                # 绌鸿
+                # 空行
                 doc.add_paragraph()
                 continue
-            
-            # 澶勭悊鏍囬
+
+            # 处理标题
             if line.startswith('# '):
                 p = doc.add_heading(line[2:], level=1)
             elif line.startswith('## '):
@@ -77,76 +98,91 @@ def convert_markdown_to_docx(md_file_path, docx_file_path):
                 p = doc.add_heading(line[6:], level=5)
             elif line.startswith('###### '):
                 p = doc.add_heading(line[7:], level=6)
-            # 澶勭悊鍒楄〃
+            # 处理列表
             elif line.startswith('- ') or line.startswith('* '):
                 p = doc.add_paragraph(line[2:], style='List Bullet')
             elif re.match(r'^\d+\. ', line):
                 p = doc.add_paragraph(re.sub(r'^\d+\. ', '', line), style='List Number')
-            # 澶勭悊琛ㄦ牸锛堢畝鍗曞鐞嗭級
+            # 处理表格（简单处理）
             elif '|' in line and line.count('|') >= 2:
-                # 绠€鍗曡〃鏍煎鐞嗭紝杩欓噷鍙槸娣诲姞涓烘钀?                p = doc.add_paragraph(line)
+                # 简单表格处理，这里只是添加为段落
+                p = doc.add_paragraph(line)
             else:
-                # 鏅€氭钀?                p = doc.add_paragraph(line)
-        
-        # 淇濆瓨鏂囨。
+                # 普通段落
+                p = doc.add_paragraph(line)
+
+        # 保存文档
         os.makedirs(os.path.dirname(docx_file_path), exist_ok=True)
         doc.save(docx_file_path)
-        print(f"杞崲瀹屾垚: {md_file_path} -> {docx_file_path}")
+        print(f"转换完成: {md_file_path} -> {docx_file_path}")
         return True
-        
+
     except Exception as e:
-        print(f"杞崲澶辫触 {md_file_path}: {e}")
+        print(f"转换失败 {md_file_path}: {e}")
         return False
 
-def convert_all_md_files(source_dir, target_dir):
-    """杞崲鐩綍涓嬫墍鏈夌殑markdown鏂囦欢"""
+class MarkdownToDocxWorker:
+    """工作进程内的转换器：样式模板只创建一次，每个文件直接从模板加载"""
+
+    def __init__(self):
+        self.template = build_styled_template()
+
+    def convert(self, md_file_path, docx_file_path):
+        if convert_markdown_to_docx(md_file_path, docx_file_path, self.template):
+            return {"status": "success", "message": f"转换完成: {docx_file_path}"}
+        return {"status": "error", "message": f"转换失败: {md_file_path}"}
+
+def convert_all_md_files(source_dir, target_dir, workers=None, force=False):
+    """转换目录下所有的markdown文件
+
+    在进程池中并行转换，大文件优先；docx比md新的文件跳过（force=True 时全部重新转换）。
+    转换清单 conversion_manifest.json 写入目标目录。
+    """
     source_path = Path(source_dir)
     target_path = Path(target_dir)
-    
-    converted_count = 0
-    failed_count = 0
-    
-    # 閬嶅巻鎵€鏈?md鏂囦欢
-    for md_file in source_path.rglob('*.md'):
-        # 璁＄畻鐩稿璺緞
-        relative_path = md_file.relative_to(source_path)
-        
-        # 鏋勫缓鐩爣鏂囦欢璺緞锛堝皢.md鏇挎崲涓?docx锛?        docx_file = target_path / relative_path.with_suffix('.docx')
-        
-        # 杞崲鏂囦欢
-        if convert_markdown_to_docx(str(md_file), str(docx_file)):
-            converted_count += 1
-        else:
-            failed_count += 1
-    
-    print(f"\n杞崲瀹屾垚缁熻:")
-    print(f"鎴愬姛杞崲: {converted_count} 涓枃浠?)
-    print(f"杞崲澶辫触: {failed_count} 涓枃浠?)
-    
+
+    # 遍历所有.md文件，构建目标文件路径（将.md替换为.docx）
+    summary = run_batch(
+        source_path.rglob('*.md'),
+        lambda md_file: target_path / md_file.relative_to(source_path).with_suffix('.docx'),
+        MarkdownToDocxWorker,
+        manifest_dir=target_path,
+        max_workers=workers,
+        force=force
+    )
+    converted_count = summary.success
+    failed_count = summary.failed
+
+    print(f"\n转换完成统计:")
+    print(f"成功转换: {converted_count} 个文件")
+    print(f"转换失败: {failed_count} 个文件")
+    print(f"无需转换: {summary.skipped} 个文件")
+
     return converted_count, failed_count
 
 def main():
-    """涓诲嚱鏁?""
-    print("=== Markdown to Word 杞崲鍣?===")
-    print("浣滆€咃細闆ㄤ繆")
-    print("寮€濮嬭浆鎹㈤儴闂ㄥ熀纭€寤鸿宸ヤ綔鎴愭灉鏂囨。...\n")
-    
-    # 婧愮洰褰曞拰鐩爣鐩綍
-    source_dir = "S:/PG-GMO/02-Output/閮ㄩ棬鍩虹寤鸿宸ヤ綔鎴愭灉"
-    target_dir = "S:/PG-GMO/02-Output/閮ㄩ棬鍩虹寤鸿宸ヤ綔鎴愭灉_docx"
-    
+    """主函数"""
+    print("=== Markdown to Word 转换器 ===")
+    print("作者：雨俊")
+    print("开始转换部门基础建设工作成果文档...\n")
+
+    # 源目录和目标目录
+    source_dir = "S:/PG-GMO/02-Output/部门基础建设工作成果"
+    target_dir = "S:/PG-GMO/02-Output/部门基础建设工作成果_docx"
+
     if not os.path.exists(source_dir):
-        print(f"閿欒锛氭簮鐩綍涓嶅瓨鍦?{source_dir}")
+        print(f"错误：源目录不存在 {source_dir}")
         return
-    
-    # 寮€濮嬭浆鎹?    converted, failed = convert_all_md_files(source_dir, target_dir)
-    
+
+    # 开始转换
+    converted, failed = convert_all_md_files(source_dir, target_dir, force='--force' in sys.argv)
+
     if failed == 0:
-        print("\n鉁?鎵€鏈夋枃浠惰浆鎹㈡垚鍔燂紒")
+        print("\n✅ 所有文件转换成功！")
     else:
-        print(f"\n鈿狅笍 杞崲瀹屾垚锛屼絾鏈?{failed} 涓枃浠惰浆鎹㈠け璐?)
-    
-    print(f"杞崲鍚庣殑鏂囦欢淇濆瓨鍦? {target_dir}")
+        print(f"\n⚠️ 转换完成，但有 {failed} 个文件转换失败")
+
+    print(f"转换后的文件保存在: {target_dir}")
 
 if __name__ == "__main__":
     main()
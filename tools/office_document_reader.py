@@ -8,8 +8,13 @@ PG-GMO项目 - Office文档读取工具
 
 import os
 import sys
+import hashlib
+import threading
+from collections import OrderedDict
 import pandas as pd
+from pandas.io.parsers import TextParser
 from pathlib import Path
+from typing import Dict, Optional
 try:
     import openpyxl
     from docx import Document
@@ -21,28 +26,149 @@ except ImportError:
     from docx import Document
     import antiword
 
+# 解析结果缓存目录（按文件内容哈希命名）
+CACHE_DIR = Path(__file__).parent.parent / ".cache" / "office_documents"
+
+# 进程内缓存的工作簿数量
+MEMORY_CACHE_SIZE = 32
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# 使用 openpyxl 只读模式流式读取的格式
+OPENPYXL_FORMATS = {'.xlsx', '.xlsm'}
+
+
 class OfficeDocumentReader:
     """Office文档读取器"""
     
-    def __init__(self):
+    # 进程内缓存在所有实例间共享：批量分析时每个文档新建一个读取器也能命中
+    _memory_cache: "OrderedDict[tuple, Dict[str, pd.DataFrame]]" = OrderedDict()
+    _cache_lock = threading.Lock()
+    
+    def __init__(self, cache_dir: Optional[Path] = CACHE_DIR):
+        """
+        Args:
+            cache_dir: 磁盘缓存目录，None 表示只使用进程内缓存
+        """
         self.supported_formats = ['.xlsx', '.xls', '.docx', '.doc']
+        self.cache_dir = Path(cache_dir) if cache_dir else None
     
-    def read_excel(self, file_path):
-        """读取Excel文件"""
+    def read_excel(self, file_path, max_rows: Optional[int] = None):
+        """读取Excel文件
+        
+        工作簿只打开和解析一次：xlsx 以 openpyxl 只读模式逐行读取所有工作表，
+        指定 max_rows 时读够行数即停止；其他格式复用同一个 ExcelFile 句柄。解析结果
+        按文件内容哈希缓存，内容未变化的工作簿再次读取时不再解析。
+        
+        Args:
+            file_path: 文件路径
+            max_rows: 每个工作表最多读取的数据行数（不含表头），None 表示全部
+        """
         try:
-            # 读取所有工作表
-            excel_file = pd.ExcelFile(file_path)
-            result = {}
+            cache_key = (self._file_digest(file_path), max_rows)
+            result = self._get_cached(cache_key)
+            if result is None:
+                if Path(file_path).suffix.lower() in OPENPYXL_FORMATS:
+                    result = self._read_workbook_streaming(file_path, max_rows)
+                else:
+                    with pd.ExcelFile(file_path) as excel_file:
+                        # 读取所有工作表
+                        result = excel_file.parse(sheet_name=None, nrows=max_rows)
+                self._put_cached(cache_key, result)
             
-            for sheet_name in excel_file.sheet_names:
-                df = pd.read_excel(file_path, sheet_name=sheet_name)
-                result[sheet_name] = df
-                
-            return result
+            # 返回副本，调用方修改数据不影响缓存
+            return {sheet_name: df.copy() for sheet_name, df in result.items()}
         except Exception as e:
             print(f"读取Excel文件失败: {e}")
             return None
     
+    @staticmethod
+    def _read_workbook_streaming(file_path, max_rows: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+        """以只读模式逐行读取所有工作表，结果与 pd.read_excel(sheet_name=None) 一致"""
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+        result = {}
+        try:
+            # 表头占一行
+            row_limit = None if max_rows is None else max_rows + 1
+            for worksheet in workbook.worksheets:
+                rows = []
+                last_non_empty = 0
+                for values in worksheet.iter_rows(values_only=True):
+                    row = ["" if value is None else value for value in values]
+                    while row and row[-1] == "":
+                        row.pop()
+                    rows.append(row)
+                    if row:
+                        last_non_empty = len(rows)
+                    if row_limit is not None and len(rows) >= row_limit:
+                        break
+                
+                # 与 pandas 一致：去掉末尾空行，各行补齐到相同列数
+                rows = rows[:last_non_empty]
+                if not rows:
+                    result[worksheet.title] = pd.DataFrame()
+                    continue
+                width = max(len(row) for row in rows)
+                for row in rows:
+                    row.extend([""] * (width - len(row)))
+                result[worksheet.title] = TextParser(rows, header=0).read()
+        finally:
+            workbook.close()
+        return result
+    
+    @staticmethod
+    def _file_digest(file_path) -> str:
+        h = hashlib.blake2b(digest_size=20)
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                h.update(block)
+        return h.hexdigest()
+    
+    def _cache_file(self, cache_key: tuple) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        digest, max_rows = cache_key
+        suffix = "all" if max_rows is None else f"rows{max_rows}"
+        return self.cache_dir / f"{digest}_{suffix}.pkl"
+    
+    def _get_cached(self, cache_key: tuple) -> Optional[Dict[str, pd.DataFrame]]:
+        with self._cache_lock:
+            result = self._memory_cache.get(cache_key)
+            if result is not None:
+                self._memory_cache.move_to_end(cache_key)
+                return result
+        
+        cache_file = self._cache_file(cache_key)
+        if cache_file is None or not cache_file.exists():
+            return None
+        try:
+            result = pd.read_pickle(cache_file)
+        except Exception:
+            # 缓存损坏或 pandas 版本不兼容时重新解析
+            return None
+        self._remember(cache_key, result)
+        return result
+    
+    def _put_cached(self, cache_key: tuple, result: Dict[str, pd.DataFrame]):
+        self._remember(cache_key, result)
+        cache_file = self._cache_file(cache_key)
+        if cache_file is None:
+            return
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix('.tmp')
+            pd.to_pickle(result, tmp_file)
+            os.replace(tmp_file, cache_file)
+        except Exception as e:
+            print(f"保存解析缓存失败: {e}")
+    
+    def _remember(self, cache_key: tuple, result: Dict[str, pd.DataFrame]):
+        with self._cache_lock:
+            self._memory_cache[cache_key] = result
+            self._memory_cache.move_to_end(cache_key)
+            while len(self._memory_cache) > MEMORY_CACHE_SIZE:
+                self._memory_cache.popitem(last=False)
+    
     def read_word(self, file_path):
         """读取Word文档"""
         file_path = Path(file_path)
@@ -90,8 +216,13 @@ class OfficeDocumentReader:
             print(f"读取Word文档失败: {e}")
             return None
     
-    def read_document(self, file_path):
-        """统一文档读取接口"""
+    def read_document(self, file_path, max_rows: Optional[int] = None):
+        """统一文档读取接口
+        
+        Args:
+            file_path: 文件路径
+            max_rows: Excel每个工作表最多读取的数据行数，None 表示全部
+        """
         file_path = Path(file_path)
         
         if not file_path.exists():
@@ -101,7 +232,7 @@ class OfficeDocumentReader:
         suffix = file_path.suffix.lower()
         
         if suffix in ['.xlsx', '.xls']:
-            return self.read_excel(file_path)
+            return self.read_excel(file_path, max_rows=max_rows)
         elif suffix in ['.docx', '.doc']:
             return self.read_word(file_path)
         else:
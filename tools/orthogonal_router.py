@@ -0,0 +1,879 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+正交连接线路由引擎
+
+节点（步骤框）外扩 margin 后作为障碍物放入网格桶空间索引，每条连接线按以下顺序求路径：
+1. 端口：同一节点同一边上的多条连接线按对端位置均匀分布，不再共用边的中点；
+2. 候选：先试直线、L形、Z形等少量候选路径，取代价最小且不穿过节点者（多数连接线到此结束）；
+3. 搜索：候选都被挡住时，在障碍物边界坐标构成的稀疏网格上做A*搜索。
+路径代价 = 长度 + 拐弯罚分 + 与泳道边框线平行重合的长度罚分 + 与已布线段共线的长度罚分，
+所以泳道边框线附近和已占用的通道只在没有其他路可走时才使用。
+
+全部路由完成后按通道分配轨道：坐标相同且区间重叠的平行线段分到不同轨道，按 spacing 错开
+（不超过 margin，不会压到节点上），保证任意两条连接线不共用线段。移动节点时只重新路由与该
+节点相连、穿过其新位置或端口顺序发生变化的连接线，一次完成，不需要反复检查修正。
+
+以上保证要求节点之间（含移动后）的间距不小于 2×margin：间距更小时外扩后的障碍物相互重叠，
+节点之间没有可走的通道，连接线只能按 obstacle_penalty 穿过节点。
+"""
+
+import heapq
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from swimlane_connection_overlap_checker import TOLERANCE
+
+Point = Tuple[int, int]
+
+# 方向：右、下、左、上（y 轴向下）
+DIRECTIONS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+SIDE_DIRECTION = {"right": 0, "bottom": 1, "left": 2, "top": 3}
+
+# 空间索引网格桶大小（像素）
+BUCKET_SIZE = 100
+
+# A* 搜索范围：起终点外包框向外扩展的网格线数
+SEARCH_SLACK = 8
+
+# A* 最多展开的状态数，超过后放宽搜索条件
+MAX_EXPANSIONS = 50000
+
+# 通道分配的最多轮数
+NUDGE_ROUNDS = 4
+
+
+class Rect(NamedTuple):
+    """轴对齐矩形"""
+    x: int
+    y: int
+    width: int
+    height: int
+
+    @property
+    def right(self) -> int:
+        return self.x + self.width
+
+    @property
+    def bottom(self) -> int:
+        return self.y + self.height
+
+    @property
+    def cx(self) -> float:
+        return self.x + self.width / 2
+
+    @property
+    def cy(self) -> float:
+        return self.y + self.height / 2
+
+    def inflate(self, d: int) -> "Rect":
+        return Rect(self.x - d, self.y - d, self.width + 2 * d, self.height + 2 * d)
+
+    def crosses(self, p: Point, q: Point) -> int:
+        """水平/垂直线段穿过矩形内部的长度（只接触边框不算）"""
+        (x1, y1), (x2, y2) = p, q
+        if y1 == y2:
+            if not self.y < y1 < self.bottom:
+                return 0
+            lo, hi = min(x1, x2), max(x1, x2)
+            return max(0, min(hi, self.right) - max(lo, self.x))
+        if not self.x < x1 < self.right:
+            return 0
+        lo, hi = min(y1, y2), max(y1, y2)
+        return max(0, min(hi, self.bottom) - max(lo, self.y))
+
+
+class Port(NamedTuple):
+    """连接线在节点边上的端点"""
+    node: str
+    side: str
+    point: Point
+    fx: float      # 端点在节点上的相对位置（draw.io 的 exitX/entryX）
+    fy: float
+
+
+def _axis(p: Point, q: Point) -> int:
+    """线段方向：0 水平，1 垂直"""
+    return 0 if p[1] == q[1] else 1
+
+
+def _overlap(lo1, hi1, lo2, hi2) -> int:
+    return max(0, min(hi1, hi2) - max(lo1, lo2))
+
+
+def simplify_path(points: Iterable[Point]) -> List[Point]:
+    """去掉重复点和共线的中间点"""
+    result: List[Point] = []
+    for point in points:
+        if result and result[-1] == point:
+            continue
+        if len(result) >= 2:
+            (x0, y0), (x1, y1) = result[-2], result[-1]
+            if (x0 == x1 == point[0]) or (y0 == y1 == point[1]):
+                result[-1] = point
+                continue
+        result.append(point)
+    return result
+
+
+class OrthogonalRouter:
+    """正交连接线路由器"""
+
+    def __init__(self, margin: int = 10, spacing: int = 8, bend_penalty: int = 30,
+                 lane_penalty: int = 10, congestion_penalty: int = 3,
+                 obstacle_penalty: int = 1000, lane_clearance: int = TOLERANCE + 1):
+        """
+        Args:
+            margin: 连接线与节点的最小间距，也是端口引出线长度
+            spacing: 同一通道内平行线段的间距
+            bend_penalty: 每个拐弯折算的长度
+            lane_penalty: 与泳道边框线平行重合时每像素的罚分
+            congestion_penalty: 与已布线段共线时每像素的罚分
+            obstacle_penalty: 无路可走时穿过节点每像素的罚分
+            lane_clearance: 与泳道边框线距离小于该值的平行线段视为重合
+        """
+        self.margin = margin
+        self.spacing = spacing
+        self.bend_penalty = bend_penalty
+        self.lane_penalty = lane_penalty
+        self.congestion_penalty = congestion_penalty
+        self.obstacle_penalty = obstacle_penalty
+        self.lane_clearance = lane_clearance
+
+        self.nodes: Dict[str, Rect] = {}
+        # 节点外扩 margin 后的障碍物矩形
+        self._obstacles: Dict[str, Rect] = {}
+        self.lanes: List[Rect] = []
+        self.edges: Dict[str, Tuple[str, str]] = {}
+        self.ports: Dict[str, Tuple[Port, Port]] = {}
+        # 路由结果：_paths 为通道分配前的路径，routes 为最终路径（均含两端端口）
+        self._paths: Dict[str, List[Point]] = {}
+        # 通道分配状态：连接线id -> (起点, 终点, 线段列表)
+        self._layouts: Dict[str, Tuple[Point, Point, List[list]]] = {}
+        self.routes: Dict[str, List[Point]] = {}
+
+        self._buckets: Dict[Tuple[int, int], Set[str]] = defaultdict(set)
+        # 泳道边框线：轴 -> 按坐标排序的 (坐标, 起, 止)
+        self._lane_lines: Tuple[List, List] = ([], [])
+        # 已布线段：轴 -> 坐标 -> [(起, 止, 连接线id)]
+        self._usage: Tuple[Dict, Dict] = (defaultdict(list), defaultdict(list))
+        self._grid: Optional[Tuple[List[int], List[int]]] = None
+        self._static_cost: Dict[Tuple[Point, Point], Tuple[int, int]] = {}
+
+    # ------------------------------------------------------------------ 建模
+
+    def add_node(self, node_id, x, y, width, height) -> Rect:
+        """添加节点（同时是障碍物）"""
+        node_id = str(node_id)
+        rect = Rect(round(x), round(y), round(width), round(height))
+        if node_id in self.nodes:
+            self._unindex_node(node_id)
+        self.nodes[node_id] = rect
+        self._obstacles[node_id] = rect.inflate(self.margin)
+        self._index_node(node_id)
+        self._invalidate()
+        return rect
+
+    def add_lane(self, x, y, width, height) -> Rect:
+        """添加泳道（不是障碍物，连接线避免沿其边框线走）"""
+        rect = Rect(round(x), round(y), round(width), round(height))
+        self.lanes.append(rect)
+        horizontal, vertical = self._lane_lines
+        for y_line in (rect.y, rect.bottom):
+            horizontal.append((y_line, rect.x, rect.right))
+        for x_line in (rect.x, rect.right):
+            vertical.append((x_line, rect.y, rect.bottom))
+        horizontal.sort()
+        vertical.sort()
+        self._invalidate()
+        return rect
+
+    def add_edge(self, edge_id, source, target):
+        """添加连接线（源、目标节点须已添加）"""
+        self.edges[str(edge_id)] = (str(source), str(target))
+
+    def _bucket_keys(self, x1, y1, x2, y2):
+        for i in range(int(x1 // BUCKET_SIZE), int(x2 // BUCKET_SIZE) + 1):
+            for j in range(int(y1 // BUCKET_SIZE), int(y2 // BUCKET_SIZE) + 1):
+                yield i, j
+
+    def _index_node(self, node_id):
+        r = self._obstacles[node_id]
+        for key in self._bucket_keys(r.x, r.y, r.right, r.bottom):
+            self._buckets[key].add(node_id)
+
+    def _unindex_node(self, node_id):
+        r = self._obstacles[node_id]
+        for key in self._bucket_keys(r.x, r.y, r.right, r.bottom):
+            self._buckets[key].discard(node_id)
+
+    def _invalidate(self):
+        self._grid = None
+        self._static_cost.clear()
+
+    # ------------------------------------------------------------------ 端口
+
+    def _choose_sides(self, source: str, target: str) -> Tuple[str, str]:
+        s, t = self.nodes[source], self.nodes[target]
+        dx, dy = t.cx - s.cx, t.cy - s.cy
+        same_column = s.x < t.right and t.x < s.right
+        same_row = s.y < t.bottom and t.y < s.bottom
+        if same_column or (not same_row and abs(dy) >= abs(dx)):
+            return ("bottom", "top") if dy >= 0 else ("top", "bottom")
+        return ("right", "left") if dx >= 0 else ("left", "right")
+
+    def _assign_ports(self, nodes: Optional[Set[str]] = None) -> Set[str]:
+        """为连接线分配端口，返回端口发生变化的连接线
+
+        nodes 不为空时只重新分配这些节点上的端口。
+        """
+        groups: Dict[Tuple[str, str], List[Tuple[float, str, int]]] = defaultdict(list)
+        for edge_id, (source, target) in self.edges.items():
+            if source == target or source not in self.nodes or target not in self.nodes:
+                continue
+            source_side, target_side = self._choose_sides(source, target)
+            for end, (node, side, other) in enumerate(((source, source_side, target),
+                                                       (target, target_side, source))):
+                if nodes is not None and node not in nodes:
+                    continue
+                other_rect = self.nodes[other]
+                # 按对端位置排序，减少同一边上连接线的交叉
+                order = other_rect.cx if side in ("top", "bottom") else other_rect.cy
+                groups[(node, side)].append((order, edge_id, end))
+
+        changed = set()
+        for (node, side), members in groups.items():
+            rect = self.nodes[node]
+            members.sort()
+            count = len(members)
+            for i, (_, edge_id, end) in enumerate(members):
+                ratio = (i + 1) / (count + 1)
+                if side in ("top", "bottom"):
+                    px = rect.x + round(rect.width * ratio)
+                    py = rect.y if side == "top" else rect.bottom
+                else:
+                    px = rect.x if side == "left" else rect.right
+                    py = rect.y + round(rect.height * ratio)
+                if self._set_port(edge_id, end, self._make_port(node, side, px, py)):
+                    changed.add(edge_id)
+        return changed | self._separate_facing_ports(nodes)
+
+    def _make_port(self, node: str, side: str, px: int, py: int) -> Port:
+        rect = self.nodes[node]
+        return Port(node, side, (px, py),
+                    round((px - rect.x) / rect.width, 4) if rect.width else 0.5,
+                    round((py - rect.y) / rect.height, 4) if rect.height else 0.5)
+
+    def _set_port(self, edge_id: str, end: int, port: Port) -> bool:
+        ports = list(self.ports.get(edge_id, (None, None)))
+        if ports[end] == port:
+            return False
+        ports[end] = port
+        self.ports[edge_id] = tuple(ports)
+        return True
+
+    def _separate_facing_ports(self, nodes: Optional[Set[str]] = None) -> Set[str]:
+        """错开间距过近、在同一直线上相对的两个端口，返回端口发生变化的连接线
+
+        两条引出线相对且间距小于 2×(margin+最大偏移) 时，夹在中间的通道线段无论怎样
+        错开，总有一方的引出线会被拉长到与另一方共线（节点间距只有 2×margin 时必然
+        出现）。把其中一个端口沿所在边平移 spacing，两条引出线不再共线。优先平移
+        nodes 中节点上的端口，减少需要重新路由的连接线。
+        """
+        reach = 2 * (self.margin + self._channel_limit())
+        lines = defaultdict(list)     # (轴, 坐标) -> [(端口位置, 方向, 连接线id, 端)]
+        for edge_id, pair in self.ports.items():
+            for end, port in enumerate(pair):
+                if port is None:
+                    continue
+                direction = SIDE_DIRECTION[port.side]
+                axis = direction % 2
+                x, y = port.point
+                lines[(axis, y if axis == 0 else x)].append(
+                    (x if axis == 0 else y, direction, edge_id, end))
+
+        changed = set()
+        for (axis, _), members in lines.items():
+            members.sort()
+            for (a, a_dir, a_edge, a_end), (b, b_dir, b_edge, b_end) in zip(members, members[1:]):
+                # a 朝正方向（右/下）引出，b 朝负方向（左/上）引出，且两者相距不远
+                if a_dir != axis or b_dir != axis + 2 or not 0 < b - a < reach:
+                    continue
+                edge_id, end = b_edge, b_end
+                if nodes is not None and self.ports[b_edge][b_end].node not in nodes \
+                        and self.ports[a_edge][a_end].node in nodes:
+                    edge_id, end = a_edge, a_end
+                port = self.ports[edge_id][end]
+                rect = self.nodes[port.node]
+                px, py = port.point
+                # 向边的中点方向平移，不会移出节点边界
+                if axis == 0:
+                    py += self.spacing if py < rect.cy else -self.spacing
+                else:
+                    px += self.spacing if px < rect.cx else -self.spacing
+                if self._set_port(edge_id, end, self._make_port(port.node, port.side, px, py)):
+                    changed.add(edge_id)
+        return changed
+
+    def _stub(self, port: Port) -> Point:
+        dx, dy = DIRECTIONS[SIDE_DIRECTION[port.side]]
+        return port.point[0] + dx * self.margin, port.point[1] + dy * self.margin
+
+    # ------------------------------------------------------------------ 代价
+
+    def _static_segment_cost(self, p: Point, q: Point) -> Tuple[int, int]:
+        """线段的 (穿过节点长度, 与泳道边框重合长度)"""
+        key = (p, q) if p <= q else (q, p)
+        cached = self._static_cost.get(key)
+        if cached is not None:
+            return cached
+        (x1, y1), (x2, y2) = key
+        axis = 0 if y1 == y2 else 1
+        coord, lo, hi = (y1, x1, x2) if axis == 0 else (x1, y1, y2)
+        nearby = set()
+        for bucket in self._bucket_keys(x1, y1, x2, y2):
+            nearby.update(self._buckets.get(bucket, ()))
+        blocked = 0
+        for node_id in nearby:
+            r = self._obstacles[node_id]
+            r_lo, r_hi, o_lo, o_hi = (r.x, r.x + r.width, r.y, r.y + r.height) if axis == 0 else \
+                (r.y, r.y + r.height, r.x, r.x + r.width)
+            if o_lo < coord < o_hi and lo < r_hi and hi > r_lo:
+                blocked += min(hi, r_hi) - max(lo, r_lo)
+
+        lines = self._lane_lines[axis]
+        on_lane = 0
+        start = bisect_left(lines, (coord - self.lane_clearance + 1,))
+        stop = bisect_right(lines, (coord + self.lane_clearance,))
+        for _, line_lo, line_hi in lines[start:stop]:
+            on_lane = max(on_lane, _overlap(lo, hi, line_lo, line_hi))
+
+        cached = self._static_cost[key] = (blocked, on_lane)
+        return cached
+
+    def _congestion(self, p: Point, q: Point) -> int:
+        """线段与已布线段共线重合的长度"""
+        if p[1] == q[1]:
+            used = self._usage[0].get(p[1])
+            lo, hi = (p[0], q[0]) if p[0] < q[0] else (q[0], p[0])
+        else:
+            used = self._usage[1].get(p[0])
+            lo, hi = (p[1], q[1]) if p[1] < q[1] else (q[1], p[1])
+        total = 0
+        for used_lo, used_hi, _ in used or ():
+            if used_lo < hi and used_hi > lo:
+                total += min(hi, used_hi) - max(lo, used_lo)
+        return total
+
+    def _path_penalty(self, points: List[Point], soft: bool) -> Optional[float]:
+        """路径长度和拐弯之外的罚分；soft=False 时穿过节点返回 None"""
+        penalty = 0.0
+        for p, q in zip(points, points[1:]):
+            blocked, on_lane = self._static_segment_cost(p, q)
+            if blocked and not soft:
+                return None
+            penalty += (blocked * self.obstacle_penalty + on_lane * self.lane_penalty
+                        + self._congestion(p, q) * self.congestion_penalty)
+        return penalty
+
+    # ------------------------------------------------------------------ 路由
+
+    def _grid_coords(self) -> Tuple[List[int], List[int]]:
+        """稀疏网格的基础坐标：外扩后的节点边界（每次搜索再加入本连接线的起终点）"""
+        if self._grid is None:
+            xs, ys = set(), set()
+            for r in self._obstacles.values():
+                xs.update((r.x, r.right))
+                ys.update((r.y, r.bottom))
+            self._grid = (sorted(xs), sorted(ys))
+        return self._grid
+
+    @staticmethod
+    def _with_coords(coords: List[int], *extra: int) -> List[int]:
+        result = list(coords)
+        for value in extra:
+            i = bisect_left(result, value)
+            if i == len(result) or result[i] != value:
+                result.insert(i, value)
+        return result
+
+    def _line_congestion(self, axis: int, coord: int, cuts: List[int]) -> List[int]:
+        """一条网格线上各单元段与已布线段重合的长度"""
+        counts = [0] * (len(cuts) - 1)
+        for lo, hi, _ in self._usage[axis].get(coord, ()):
+            k = max(bisect_right(cuts, lo) - 1, 0)
+            while k < len(counts) and cuts[k] < hi:
+                counts[k] += _overlap(cuts[k], cuts[k + 1], lo, hi)
+                k += 1
+        return counts
+
+    def _free_extent(self, point: Point, axis: int) -> Tuple[float, float]:
+        """从 point 沿水平(axis=0)/垂直(axis=1)方向不穿过节点能到达的范围"""
+        x, y = point
+        coord, other = (x, y) if axis == 0 else (y, x)
+        lo, hi = float("-inf"), float("inf")
+        for r in self._obstacles.values():
+            r_lo, r_hi, o_lo, o_hi = (r.x, r.right, r.y, r.bottom) if axis == 0 else (r.y, r.bottom, r.x, r.right)
+            if not o_lo < other < o_hi:
+                continue
+            if r_hi <= coord:
+                lo = max(lo, r_hi)
+            elif r_lo >= coord:
+                hi = min(hi, r_lo)
+            else:
+                return coord, coord
+        return lo, hi
+
+    def _inside_obstacle(self, point: Point) -> bool:
+        lo, hi = self._free_extent(point, 0)
+        return lo == hi
+
+    def _candidates(self, a: Point, b: Point) -> Iterator[List[Point]]:
+        """直线、L形和Z形候选路径：中间线段取两端水平/垂直可达范围内的网格坐标"""
+        (ax, ay), (bx, by) = a, b
+        xs, ys = self._grid_coords()
+        for axis, coords in ((0, self._with_coords(xs, ax, bx)), (1, self._with_coords(ys, ay, by))):
+            a_lo, a_hi = self._free_extent(a, axis)
+            b_lo, b_hi = self._free_extent(b, axis)
+            lo, hi = max(a_lo, b_lo), min(a_hi, b_hi)
+            for m in coords[bisect_left(coords, lo):bisect_right(coords, hi)]:
+                if axis == 0:
+                    yield [a, (m, ay), (m, by), b]
+                else:
+                    yield [a, (ax, m), (bx, m), b]
+
+    def _search(self, a: Point, start_dir: int, b: Point, end_dir: int, soft: bool,
+                slack: Optional[int] = SEARCH_SLACK) -> Optional[List[Point]]:
+        """稀疏网格上的A*搜索（状态含方向，禁止掉头）
+
+        slack 不为 None 时只在起终点外包框向外 slack 条网格线的范围内搜索。
+        """
+        xs, ys = self._grid_coords()
+        xs, ys = self._with_coords(xs, a[0], b[0]), self._with_coords(ys, a[1], b[1])
+        ia, ib = bisect_left(xs, a[0]), bisect_left(xs, b[0])
+        ja, jb = bisect_left(ys, a[1]), bisect_left(ys, b[1])
+        start = (ia, ja, start_dir)
+        goal = (ib, jb)
+        bx, by = b
+        if slack is None:
+            i_min, i_max, j_min, j_max = 0, len(xs) - 1, 0, len(ys) - 1
+        else:
+            i_min, i_max = max(0, min(ia, ib) - slack), min(len(xs) - 1, max(ia, ib) + slack)
+            j_min, j_max = max(0, min(ja, jb) - slack), min(len(ys) - 1, max(ja, jb) + slack)
+
+        usage = self._usage
+        congestion = {}
+        segment_cost = self._static_segment_cost
+        bend = self.bend_penalty
+        lane_penalty, obstacle_penalty, congestion_penalty = \
+            self.lane_penalty, self.obstacle_penalty, self.congestion_penalty
+        end_dx, end_dy = DIRECTIONS[end_dir]
+
+        def estimate(x, y, d):
+            """剩余代价下界：距离 + 至少需要的拐弯"""
+            distance = abs(bx - x) + abs(by - y)
+            if d != end_dir:
+                return distance + bend
+            if end_dx == 0:
+                ahead = x == bx and (by - y) * end_dy >= 0
+            else:
+                ahead = y == by and (bx - x) * end_dx >= 0
+            return distance if ahead else distance + 2 * bend
+
+        counter = 0
+        best = {start: 0.0}
+        parent = {start: None}
+        heap = [(estimate(a[0], a[1], start_dir), 0, counter, start, False)]
+        expansions = 0
+        while heap:
+            _, g, _, state, done = heapq.heappop(heap)
+            if done:
+                path = []
+                while state is not None:
+                    path.append((xs[state[0]], ys[state[1]]))
+                    state = parent[state]
+                return path[::-1]
+            if g > best.get(state, float("inf")):
+                continue
+            i, j, d = state
+            if (i, j) == goal:
+                # 到达终点后还要转向端口方向
+                if d != (end_dir + 2) % 4:
+                    counter += 1
+                    total = g + (bend if d != end_dir else 0)
+                    heapq.heappush(heap, (total, total, counter, state, True))
+                continue
+            expansions += 1
+            if expansions > MAX_EXPANSIONS:
+                return None
+            p = (xs[i], ys[j])
+            for nd, (dx, dy) in enumerate(DIRECTIONS):
+                if nd == (d + 2) % 4:
+                    continue
+                ni, nj = i + dx, j + dy
+                if not (i_min <= ni <= i_max and j_min <= nj <= j_max):
+                    continue
+                q = (xs[ni], ys[nj])
+                blocked, on_lane = segment_cost(p, q)
+                if blocked and not soft:
+                    continue
+                step = abs(q[0] - p[0]) + abs(q[1] - p[1])
+                # 与已布线段重合的长度，按网格线缓存
+                line = (0, p[1]) if dy == 0 else (1, p[0])
+                used = 0
+                if line[1] in usage[line[0]]:
+                    counts = congestion.get(line)
+                    if counts is None:
+                        counts = congestion[line] = self._line_congestion(*line, xs if dy == 0 else ys)
+                    used = counts[min(i, ni) if dy == 0 else min(j, nj)]
+                ng = (g + step + blocked * obstacle_penalty + on_lane * lane_penalty
+                      + used * congestion_penalty + (bend if nd != d else 0))
+                next_state = (ni, nj, nd)
+                if ng < best.get(next_state, float("inf")):
+                    best[next_state] = ng
+                    parent[next_state] = state
+                    counter += 1
+                    heapq.heappush(heap, (ng + estimate(q[0], q[1], nd), ng, counter, next_state, False))
+        return None
+
+    def _route_edge(self, edge_id: str) -> List[Point]:
+        """求一条连接线的路径：[源端口, 源引出点, ..., 目标引出点, 目标端口]"""
+        source_port, target_port = self.ports[edge_id]
+        a, b = self._stub(source_port), self._stub(target_port)
+        start_dir = SIDE_DIRECTION[source_port.side]
+        end_dir = (SIDE_DIRECTION[target_port.side] + 2) % 4
+
+        # 候选按长度加拐弯（代价下界）排序，下界不小于已找到的最小代价时停止
+        candidates = []
+        for middle in self._candidates(a, b):
+            middle = simplify_path(middle)
+            if self._has_reversal([source_port.point] + middle + [target_port.point]):
+                continue
+            first_axis = _axis(middle[0], middle[1]) if len(middle) > 1 else end_dir % 2
+            last_axis = _axis(middle[-2], middle[-1]) if len(middle) > 1 else start_dir % 2
+            bends = len(middle) - 2 + (first_axis != start_dir % 2) + (last_axis != end_dir % 2)
+            length = sum(abs(q[0] - p[0]) + abs(q[1] - p[1]) for p, q in zip(middle, middle[1:]))
+            candidates.append((length + max(bends, 0) * self.bend_penalty, middle))
+        candidates.sort()
+
+        best_middle, best_cost = None, None
+        for lower_bound, middle in candidates:
+            if best_cost is not None and lower_bound >= best_cost:
+                break
+            # 引出线在节点的间距范围内，只检查引出点之间的部分
+            extra = self._path_penalty(middle, soft=False)
+            if extra is None:
+                continue
+            cost = lower_bound + extra
+            if best_cost is None or cost < best_cost:
+                best_middle, best_cost = middle, cost
+        # 没有不穿过节点的候选路径时才搜索；引出点落在其他节点范围内（节点挨得太近）时
+        # 不可能完全避开，直接按罚分搜索
+        if best_middle is None:
+            if not (self._inside_obstacle(a) or self._inside_obstacle(b)):
+                best_middle = (self._search(a, start_dir, b, end_dir, soft=False)
+                               or self._search(a, start_dir, b, end_dir, soft=False, slack=None))
+            best_middle = (best_middle
+                           or self._search(a, start_dir, b, end_dir, soft=True)
+                           or [a, (b[0], a[1]), b])
+        return [source_port.point] + simplify_path(best_middle) + [target_port.point]
+
+    @staticmethod
+    def _has_reversal(path: List[Point]) -> bool:
+        for p, q, r in zip(path, path[1:], path[2:]):
+            if (q[0] - p[0]) * (r[0] - q[0]) < 0 or (q[1] - p[1]) * (r[1] - q[1]) < 0:
+                return True
+        return False
+
+    def _use(self, edge_id: str, path: List[Point]):
+        for p, q in zip(path, path[1:]):
+            axis = _axis(p, q)
+            coord = p[1] if axis == 0 else p[0]
+            lo, hi = sorted((p[0], q[0]) if axis == 0 else (p[1], q[1]))
+            self._usage[axis][coord].append((lo, hi, edge_id))
+
+    def _release(self, edge_id: str):
+        path = self._paths.pop(edge_id, None)
+        if not path:
+            return
+        for p, q in zip(path, path[1:]):
+            axis = _axis(p, q)
+            coord = p[1] if axis == 0 else p[0]
+            used = self._usage[axis][coord]
+            used[:] = [item for item in used if item[2] != edge_id]
+            if not used:
+                del self._usage[axis][coord]
+
+    def _route_edges(self, edge_ids: Iterable[str]):
+        # 短连接线先布线，长连接线绕开已占用的通道
+        def length(edge_id):
+            s, t = self.ports[edge_id]
+            return abs(s.point[0] - t.point[0]) + abs(s.point[1] - t.point[1])
+
+        for edge_id in sorted(edge_ids, key=lambda e: (length(e), e)):
+            path = self._route_edge(edge_id)
+            self._paths[edge_id] = path
+            self._use(edge_id, path)
+
+    def route_all(self) -> Dict[str, List[Point]]:
+        """路由全部连接线，返回 {连接线id: 路径点（含两端端口）}"""
+        for edge_id in list(self._paths):
+            self._release(edge_id)
+        self.ports.clear()
+        self._assign_ports()
+        self._route_edges(self.ports)
+        self._assign_channels()
+        return self.routes
+
+    def move_node(self, node_id, x, y) -> Set[str]:
+        """移动节点并只重新路由受影响的连接线，返回重新路由的连接线id"""
+        node_id = str(node_id)
+        rect = self.nodes[node_id]
+        self.add_node(node_id, x, y, rect.width, rect.height)
+        moved = self._obstacles[node_id]
+
+        neighbours = {node_id}
+        affected = set()
+        for edge_id, (source, target) in self.edges.items():
+            if node_id in (source, target):
+                neighbours.update((source, target))
+                affected.add(edge_id)
+        for edge_id, path in self._paths.items():
+            if any(moved.crosses(p, q) for p, q in zip(path, path[1:])):
+                affected.add(edge_id)
+        affected |= self._assign_ports(neighbours)
+        affected &= set(self.ports)
+
+        for edge_id in affected:
+            self._release(edge_id)
+        self._route_edges(affected)
+        self._assign_channels(affected)
+        return affected
+
+    # ------------------------------------------------------------------ 通道分配
+
+    def _channel_limit(self) -> int:
+        """线段错开的最大偏移：不超过 margin，保证不压到节点上"""
+        return max(0, self.margin - 1)
+
+    @staticmethod
+    def _segments(path: List[Point]) -> List[list]:
+        """路径转为水平、垂直交替的线段列表 [轴, 坐标, 原坐标, 可否平移]
+
+        两端引出线固定；与引出线共线的线段之间插入零长度的固定折线，平移后在
+        引出点处形成一小段折线。
+        """
+        segments = []
+        last = len(path) - 2
+        for i, (p, q) in enumerate(zip(path, path[1:])):
+            axis = _axis(p, q)
+            coord = p[1] if axis == 0 else p[0]
+            if segments and segments[-1][0] == axis:
+                jog = p[0] if axis == 0 else p[1]
+                segments.append([1 - axis, jog, jog, False])
+            segments.append([axis, coord, coord, 0 < i < last])
+        return segments
+
+    @staticmethod
+    def _junctions(start: Point, end: Point, segments: List[list]) -> List[Point]:
+        """按各线段坐标求路径点"""
+        points = [start]
+        for (prev_axis, prev_coord, _, _), (_, next_coord, _, _) in zip(segments, segments[1:]):
+            points.append((next_coord, prev_coord) if prev_axis == 0 else (prev_coord, next_coord))
+        points.append(end)
+        return points
+
+    def _assign_channels(self, edge_ids: Optional[Set[str]] = None):
+        """同一坐标上区间重叠的平行线段分到不同轨道并错开
+
+        水平线段的范围只取决于垂直线段的坐标，反之亦然，所以按轴交替处理：第一轮
+        按通道着色为 edge_ids（None 表示全部）的线段分配轨道，其余连接线保持现有
+        位置；之后只移动仍与其他线段重合的线段，直到没有重合。
+        """
+        limit = self._channel_limit()
+        if edge_ids is None:
+            self._layouts = {}
+            edge_ids = set(self._paths)
+        for edge_id in list(self._layouts):
+            if edge_id not in self._paths:
+                del self._layouts[edge_id]
+        for edge_id in edge_ids:
+            if edge_id in self._paths:
+                path = self._paths[edge_id]
+                self._layouts[edge_id] = (path[0], path[-1], self._segments(path))
+
+        for round_no in range(NUDGE_ROUNDS):
+            moved = False
+            for axis in (0, 1):
+                moved |= self._nudge_axis(axis, limit, edge_ids if round_no == 0 else None)
+            if not moved and round_no > 0:
+                break
+        self.routes = {edge_id: simplify_path(self._junctions(*layout))
+                       for edge_id, layout in self._layouts.items()}
+
+    def _nudge_axis(self, axis: int, limit: int, spread: Optional[Set[str]]) -> bool:
+        """平移一个方向上的线段，返回是否有线段移动
+
+        spread 不为 None 时重新分配这些连接线的全部可平移线段，否则只移动重合的线段。
+        """
+        lines = defaultdict(list)     # 坐标 -> [(起, 止, 可否平移, 线段, 连接线id)]
+        for edge_id, (start, end, segments) in self._layouts.items():
+            points = self._junctions(start, end, segments)
+            for k, segment in enumerate(segments):
+                if segment[0] != axis:
+                    continue
+                p, q = points[k], points[k + 1]
+                lo, hi = sorted((p[0], q[0]) if axis == 0 else (p[1], q[1]))
+                if hi > lo:
+                    lines[segment[1]].append((lo, hi, segment[3], segment, edge_id))
+
+        occupied: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+        pending = []
+        for coord, items in lines.items():
+            items.sort(key=lambda item: (item[0], item[1]))
+            if spread is not None:
+                keep = []
+                for item in items:
+                    (pending if item[2] and item[4] in spread else keep).append(item)
+            else:
+                # 只移动与其他线段重合的线段（优先移动可平移的一方）
+                keep = []
+                for item in items:
+                    clash = next((other for other in keep if _overlap(item[0], item[1], other[0], other[1])), None)
+                    if clash is None:
+                        keep.append(item)
+                    elif item[2]:
+                        pending.append(item)
+                    elif clash[2]:
+                        keep.remove(clash)
+                        pending.append(clash)
+                        keep.append(item)
+                    else:
+                        keep.append(item)
+            for item in keep:
+                occupied[coord].append((item[0], item[1]))
+
+        wanted = {}
+        if spread is not None:
+            groups = defaultdict(list)
+            for item in pending:
+                groups[item[3][2]].append(item)
+            for base, items in groups.items():
+                # 区间图着色：不重叠的线段可以共用一条轨道
+                track_ends: List[int] = []
+                tracks = []
+                for item in items:
+                    lo, hi = item[0], item[1]
+                    for t, end in enumerate(track_ends):
+                        if end <= lo:
+                            track_ends[t] = hi
+                            break
+                    else:
+                        t = len(track_ends)
+                        track_ends.append(hi)
+                    tracks.append(t)
+                count = len(track_ends)
+                step = min(self.spacing, 2 * limit / (count - 1)) if count > 1 else 0
+                for item, t in zip(items, tracks):
+                    wanted[id(item[3])] = base + round((t - (count - 1) / 2) * step)
+
+        moved = False
+        for lo, hi, _, segment, _ in sorted(pending, key=lambda item: (item[3][2], item[0], item[1])):
+            final = self._free_coord(occupied, wanted.get(id(segment), segment[1]), segment[2],
+                                     limit, self.spacing, lo, hi)
+            occupied[final].append((lo, hi))
+            if final != segment[1]:
+                segment[1] = final
+                moved = True
+        return moved
+
+    @staticmethod
+    def _free_coord(occupied, wanted, base, limit, spacing, lo, hi) -> int:
+        """找 base±limit 内不与已占线段重合的坐标：先试 wanted，再按 spacing 间隔，最后逐像素"""
+        def free(c):
+            return all(_overlap(lo, hi, used_lo, used_hi) == 0 for used_lo, used_hi in occupied.get(c, ()))
+
+        if free(wanted):
+            return wanted
+        tried = {wanted}
+        for step in (max(spacing, 1), 1):
+            for k in range(1, 2 * limit // step + 1):
+                for c in (wanted + k * step, wanted - k * step):
+                    if c not in tried and abs(c - base) <= limit:
+                        tried.add(c)
+                        if free(c):
+                            return c
+        return wanted
+
+    # ------------------------------------------------------------------ 结果
+
+    def waypoints(self, edge_id) -> List[Point]:
+        """路径的中间拐点（draw.io 的 Array points）"""
+        return self.routes.get(str(edge_id), [])[1:-1]
+
+    def port_style(self, edge_id) -> str:
+        """端口位置的样式片段（exitX/exitY/entryX/entryY）"""
+        ports = self.ports.get(str(edge_id))
+        if ports is None:
+            return ""
+        source, target = ports
+        return (f"exitX={source.fx:g};exitY={source.fy:g};exitDx=0;exitDy=0;"
+                f"entryX={target.fx:g};entryY={target.fy:g};entryDx=0;entryDy=0;")
+
+    def shared_segments(self) -> List[Tuple[str, str]]:
+        """共用线段（同一坐标上区间重叠）的连接线对，路由正常时为空"""
+        lines = defaultdict(list)
+        for edge_id, path in self.routes.items():
+            for p, q in zip(path, path[1:]):
+                axis = _axis(p, q)
+                coord = p[1] if axis == 0 else p[0]
+                lo, hi = sorted((p[0], q[0]) if axis == 0 else (p[1], q[1]))
+                lines[(axis, coord)].append((lo, hi, edge_id))
+        shared = []
+        for segments in lines.values():
+            segments.sort()
+            active = []
+            for lo, hi, edge_id in segments:
+                active = [(a_hi, a_id) for a_hi, a_id in active if a_hi > lo]
+                shared.extend((a_id, edge_id) for _, a_id in active if a_id != edge_id)
+                active.append((hi, edge_id))
+        return shared
+
+
+def add_graph_cells(router: OrthogonalRouter, root_element) -> Dict[str, Rect]:
+    """把 draw.io 文档 root 下的图形加入路由器：泳道样式的单元格作为泳道，其余图形作为节点
+
+    子单元格的坐标相对于父单元格，按父链换算为绝对坐标。
+    """
+    cells = {cell.get("id"): cell for cell in root_element.iter("mxCell")}
+    absolute: Dict[str, Tuple[float, float]] = {}
+
+    def origin(cell_id, depth=0):
+        cell = cells.get(cell_id)
+        if cell is None or cell.get("vertex") != "1" or depth > 20:
+            return 0.0, 0.0
+        if cell_id not in absolute:
+            geometry = cell.find("mxGeometry")
+            px, py = origin(cell.get("parent"), depth + 1)
+            x = float(geometry.get("x", 0)) if geometry is not None else 0.0
+            y = float(geometry.get("y", 0)) if geometry is not None else 0.0
+            absolute[cell_id] = (px + x, py + y)
+        return absolute[cell_id]
+
+    added = {}
+    for cell_id, cell in cells.items():
+        geometry = cell.find("mxGeometry")
+        if cell.get("vertex") != "1" or geometry is None:
+            continue
+        style = cell.get("style", "")
+        if "group" in style or ("container=1" in style and "swimlane" not in style):
+            continue
+        x, y = origin(cell_id)
+        width = float(geometry.get("width", 0))
+        height = float(geometry.get("height", 0))
+        if "swimlane" in style:
+            added[cell_id] = router.add_lane(x, y, width, height)
+        else:
+            added[cell_id] = router.add_node(cell_id, x, y, width, height)
+    return added
@@ -12,12 +12,15 @@
 
 # import os  # unused
 # import sys  # unused
-import re
 import json
 from pathlib import Path
 from typing import Dict, List  # Optional, Tuple, Set unused
 from datetime import datetime
 from config_loader import get_project_root, get_config
+from text_pattern_scanner import MultiPatternScanner, ScanMatch, iter_files
+
+# 文本读取时依次尝试的编码
+READ_ENCODINGS = ("utf-8", "gbk", "latin-1")
 
 
 class PathStandardizer:
@@ -68,6 +71,7 @@ class PathStandardizer:
             ".vscode",
             ".idea",
             ".venv",
+            ".cache",
         }
 
         # 需要排除的文件扩展名
@@ -93,6 +97,10 @@ class PathStandardizer:
             ".7z",
         }
 
+        # 所有路径模式合并为一个表达式，整文件单次扫描
+        self.scanner = MultiPatternScanner([pattern for pattern, _ in self.path_patterns])
+        self.scan_cache_file = self.project_root / ".cache" / "path_scan.json"
+
     def should_skip_file(self, file_path: Path) -> bool:
         """判断是否应该跳过文件
 
@@ -154,64 +162,49 @@ class PathStandardizer:
         Returns:
             List[Dict]: 发现的路径问题列表
         """
+        try:
+            matches = self.scanner.scan_file(file_path, READ_ENCODINGS)
+        except Exception as e:
+            print(f"警告：无法读取文件 {file_path}: {e}")
+            return []
+
+        return self._issues_from_matches(file_path, matches or [])
+
+    def _issues_from_matches(self, file_path: Path, matches: List[ScanMatch]) -> List[Dict]:
+        """将扫描命中转换为路径问题"""
         issues = []
+        for match in matches:
+            original_path = match.text
+            line = match.line_text
 
-        try:
-            # 尝试以UTF-8编码读取文件
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-            except UnicodeDecodeError:
-                # 如果UTF-8失败，尝试其他编码
-                try:
-                    with open(file_path, "r", encoding="gbk") as f:
-                        content = f.read()
-                except UnicodeDecodeError:
-                    with open(file_path, "r", encoding="latin-1") as f:
-                        content = f.read()
+            # 跳过已经正确标准化的路径（避免误报）
+            if self._is_already_standardized(line, original_path):
+                continue
 
-            lines = content.split("\n")
-
-            for line_num, line in enumerate(lines, 1):
-                for pattern, path_type in self.path_patterns:
-                    matches = re.finditer(pattern, line, re.IGNORECASE)
-                    for match in matches:
-                        original_path = match.group(0)
-
-                        # 跳过已经正确标准化的路径（避免误报）
-                        if self._is_already_standardized(line, original_path):
-                            continue
-
-                        replacement = self.replacement_rules.get(
-                            path_type, "{{PROJECT_ROOT}}"
-                        )
-
-                        # 对于绝对路径，尝试转换为相对路径
-                        if path_type == "absolute_path":
-                            try:
-                                abs_path = Path(original_path)
-                                if abs_path.is_relative_to(self.project_root):
-                                    rel_path = abs_path.relative_to(self.project_root)
-                                    replacement = (
-                                        "{{ PROJECT_ROOT }}/" + rel_path.as_posix()
-                                    )
-                            except (ValueError, OSError):
-                                pass
-
-                        issues.append(
-                            {
-                                "file": str(file_path.relative_to(self.project_root)),
-                                "line": line_num,
-                                "column": match.start() + 1,
-                                "original": original_path,
-                                "suggested": replacement,
-                                "path_type": path_type,
-                                "context": line.strip(),
-                            }
-                        )
+            path_type = self.path_patterns[match.rule][1]
+            replacement = self.replacement_rules.get(path_type, "{{PROJECT_ROOT}}")
 
-        except Exception as e:
-            print(f"警告：无法读取文件 {file_path}: {e}")
+            # 对于绝对路径，尝试转换为相对路径
+            if path_type == "absolute_path":
+                try:
+                    abs_path = Path(original_path)
+                    if abs_path.is_relative_to(self.project_root):
+                        rel_path = abs_path.relative_to(self.project_root)
+                        replacement = "{{ PROJECT_ROOT }}/" + rel_path.as_posix()
+                except (ValueError, OSError):
+                    pass
+
+            issues.append(
+                {
+                    "file": str(file_path.relative_to(self.project_root)),
+                    "line": match.line,
+                    "column": match.column,
+                    "original": original_path,
+                    "suggested": replacement,
+                    "path_type": path_type,
+                    "context": line.strip(),
+                }
+            )
 
         return issues
 
@@ -224,19 +217,25 @@ class PathStandardizer:
         print(f"开始扫描项目路径标准化问题: {self.project_root}")
 
         all_issues = []
-        scanned_files = 0
         files_with_issues = 0
 
-        for file_path in self.project_root.rglob("*"):
-            if file_path.is_file() and not self.should_skip_file(file_path):
-                scanned_files += 1
-                issues = self.scan_file_for_paths(file_path)
-                if issues:
-                    files_with_issues += 1
-                    all_issues.extend(issues)
+        files = [
+            file_path
+            for file_path in iter_files(self.project_root, self.excluded_dirs)
+            if not self.should_skip_file(file_path)
+        ]
+        scanned_files = len(files)
+        print(f"待扫描 {scanned_files} 个文件...")
 
-                if scanned_files % 50 == 0:
-                    print(f"已扫描 {scanned_files} 个文件...")
+        # 进程池并行扫描，未变化的文件直接使用缓存结果
+        results = self.scanner.scan_paths(
+            files, READ_ENCODINGS, cache_file=self.scan_cache_file
+        )
+        for file_path in files:
+            issues = self._issues_from_matches(file_path, results.get(str(file_path)) or [])
+            if issues:
+                files_with_issues += 1
+                all_issues.extend(issues)
 
         # 统计信息
         total_issues = len(all_issues)
@@ -12,12 +12,102 @@
 
 import os
 import json
+import time
 import yaml
 import re
+import fnmatch
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional
 from datetime import datetime
 
+from date_scanner import DateScanner, parse_date
+
+# 前置检查关注的日期标签（年月日格式）
+DATE_SCANNER = DateScanner(
+    labels=["创建日期", "修改日期", "更新日期", "升级日期"],
+    date_formats=[r'\d{4}年\d{1,2}月\d{1,2}日']
+)
+
+# 检查结果缓存条数与配置文件变更检测间隔（秒）
+RESULT_CACHE_SIZE = 4096
+CONFIG_CHECK_INTERVAL = 2.0
+
+_TRIE_VALUE = object()
+
+
+class PathTrie:
+    """按路径段组织的前缀树，支持精确查找和最长前缀匹配"""
+    
+    def __init__(self):
+        self.root = {}
+    
+    def insert(self, parts: Iterable[str], value):
+        node = self.root
+        for part in parts:
+            node = node.setdefault(part, {})
+        node[_TRIE_VALUE] = value
+    
+    def longest_prefix(self, parts: Iterable[str]):
+        """返回与路径最长匹配的前缀上登记的值，没有则返回 None"""
+        node = self.root
+        found = node.get(_TRIE_VALUE)
+        for part in parts:
+            node = node.get(part)
+            if node is None:
+                break
+            found = node.get(_TRIE_VALUE, found)
+        return found
+
+
+class CompiledRules:
+    """预编译的文件操作规则
+    
+    标准目录、根目录限制、目录功能定位、受保护文件和命名规范在初始化时编译为
+    查找表、路径前缀树和正则表达式，单次检查只做常数次查找。
+    """
+    
+    ILLEGAL_CHARS = re.compile(r'[<>:"|?*]')
+    
+    def __init__(self, standard_dirs: Dict[str, str], forbidden_root_files: List[str],
+                 allowed_root_files: List[str], directory_rules: Dict[str, Tuple[str, frozenset, str]],
+                 protected_files: List[str], protected_patterns: List[str], version):
+        self.version = version
+        self.standard_dirs = frozenset(standard_dirs)
+        self.forbidden_root_exts = frozenset(forbidden_root_files)
+        self.allowed_root_files = frozenset(allowed_root_files)
+        
+        # 目录功能定位：(类型, 扩展名集合, 提示信息)，按最长路径前缀匹配
+        self.directory_rules = PathTrie()
+        for directory, rule in directory_rules.items():
+            self.directory_rules.insert(directory.split('/'), rule)
+        
+        # 受保护文件（登记目录时保护整个子树）
+        self.protected = PathTrie()
+        for rel_path in protected_files:
+            self.protected.insert(rel_path.split('/'), rel_path)
+        
+        # 只含文件名的保护模式合并为一个正则，带路径的模式保留 Path.match 语义
+        name_patterns = [p for p in protected_patterns if '/' not in p and '\\' not in p]
+        self.path_patterns = [p for p in protected_patterns if p not in name_patterns]
+        self.name_patterns = name_patterns
+        self.name_pattern_regex = None
+        if name_patterns:
+            self.name_pattern_regex = re.compile(
+                "|".join(f"(?P<p{i}>{fnmatch.translate(os.path.normcase(p))})" for i, p in enumerate(name_patterns))
+            )
+    
+    def match_protected_pattern(self, file_path: Path) -> Optional[str]:
+        """返回文件匹配到的保护模式"""
+        if self.name_pattern_regex is not None:
+            match = self.name_pattern_regex.match(os.path.normcase(file_path.name))
+            if match:
+                return self.name_patterns[int(match.lastgroup[1:])]
+        for pattern in self.path_patterns:
+            if file_path.match(pattern):
+                return pattern
+        return None
+
 
 class ProjectComplianceChecker:
     """项目合规性检查器（升级版）"""
@@ -36,6 +126,7 @@ class ProjectComplianceChecker:
         self.violation_log_path = self.project_root / "logs" / "pre_check_violations.log"
         
         # 加载项目配置
+        self.config_file = self.docs_dir / "03-管理" / "project_config.yaml"
         self.config = self._load_project_config()
         self.enhanced_config = self._load_enhanced_config() if enhanced_mode else {}
         
@@ -57,15 +148,97 @@ class ProjectComplianceChecker:
             ".py", ".js", ".ts", ".html", ".css",  # 代码文件
             ".md", ".doc", ".docx", ".pdf"  # 文档文件（除非特殊说明）
         ]
+        
+        # 允许在根目录创建的文件
+        self.allowed_root_files = [
+            "README.md", ".gitignore", "requirements.txt", 
+            "package.json", "pyproject.toml", "setup.py"
+        ]
+        
+        # 目录功能定位：目录 -> (类型, 扩展名, 提示)
+        # allow: 只允许列出的扩展名；hint: 列出的扩展名给出提示但不阻止
+        self.directory_rules = {
+            "docs": ("allow", frozenset([".md", ".yaml", ".yml", ".json", ".txt"]),
+                     "[警告] docs目录应主要包含文档文件，不建议放置 {ext} 文件"),
+            "project": ("hint", frozenset([".md"]), "[提示] 文档文件建议放在docs目录中"),
+            "AI助理生产成果": ("allow", frozenset([".prt", ".asm", ".drw", ".pro", ".txt", ".md"]),
+                         "[警告] AI助理生产成果目录应包含生产相关文件，不建议放置 {ext} 文件"),
+            "tools": ("allow", frozenset([".py", ".js", ".sh", ".bat", ".ps1", ".md"]),
+                      "[警告] tools目录应包含工具脚本，不建议放置 {ext} 文件")
+        }
+        
+        # 核心文档（修改、删除需要授权）
+        self.protected_files = [
+            "docs/01-设计/开发任务书.md",
+            "docs/01-设计/技术方案.md", 
+            "docs/01-设计/项目架构设计.md",
+            "docs/03-管理/规范与流程.md",
+            "docs/03-管理/project_config.yaml",
+            "tools/finish.py",
+            "tools/control.py",
+            "tools/check_structure.py",
+            "tools/update_structure.py"
+        ]
+        
+        # 编译规则并缓存检查结果（配置文件变化时自动重新编译）
+        self._project_root_key = os.path.normcase(str(self.project_root)).replace('\\', '/').rstrip('/')
+        self._result_cache: "OrderedDict[Tuple[str, str, object], Tuple[bool, Tuple[str, ...], bool]]" = OrderedDict()
+        self._config_checked_at = time.monotonic()
+        self._pending_violation_log: Optional[List[Dict]] = None
+        self.rules = self._compile_rules(self._config_version())
     
     def _load_project_config(self) -> Dict:
         """加载项目配置"""
-        config_file = self.docs_dir / "03-管理" / "project_config.yaml"
-        if config_file.exists():
-            with open(config_file, 'r', encoding='utf-8') as f:
+        if self.config_file.exists():
+            with open(self.config_file, 'r', encoding='utf-8') as f:
                 return yaml.safe_load(f)
         return {}
     
+    def _config_version(self):
+        """配置版本：配置文件的修改时间和大小"""
+        try:
+            stat = self.config_file.stat()
+            return (stat.st_mtime_ns, stat.st_size, self.enhanced_mode)
+        except OSError:
+            return (None, None, self.enhanced_mode)
+    
+    def _compile_rules(self, version) -> CompiledRules:
+        """将检查规则编译为查找结构"""
+        return CompiledRules(
+            standard_dirs=self.standard_dirs,
+            forbidden_root_files=self.forbidden_root_files,
+            allowed_root_files=self.allowed_root_files,
+            directory_rules=self.directory_rules,
+            protected_files=self.protected_files,
+            protected_patterns=self.enhanced_config.get("strict_mode", {}).get("protected_patterns", []),
+            version=version
+        )
+    
+    def _refresh_rules(self, force: bool = False):
+        """配置文件变化后重新加载配置并编译规则"""
+        now = time.monotonic()
+        if not force and now - self._config_checked_at < CONFIG_CHECK_INTERVAL:
+            return
+        self._config_checked_at = now
+        
+        version = self._config_version()
+        if version != self.rules.version:
+            self.config = self._load_project_config()
+            self.enhanced_config = self._load_enhanced_config() if self.enhanced_mode else {}
+            self.rules = self._compile_rules(version)
+            self._result_cache.clear()
+    
+    def _relative_parts(self, file_path: Path) -> Optional[Tuple[str, ...]]:
+        """返回相对项目根目录的路径段，不在项目根目录下时返回 None"""
+        path_str = str(file_path).replace('\\', '/')
+        key = os.path.normcase(path_str).replace('\\', '/')
+        root = self._project_root_key
+        if key == root:
+            return ()
+        if not key.startswith(root + '/'):
+            return None
+        return tuple(part for part in path_str[len(root) + 1:].split('/') if part and part != '.')
+    
     def _load_enhanced_config(self) -> Dict:
         """从project_config.yaml的enhanced_pre_check部分加载增强配置"""
         try:
@@ -115,6 +288,9 @@ class ProjectComplianceChecker:
     def check_file_operation(self, file_path: str, operation_type: str) -> Tuple[bool, List[str]]:
         """检查文件操作是否符合规范（增强版）
         
+        路径相关的检查结果按 (路径, 操作类型, 配置版本) 缓存，日期一致性检查依赖文件
+        内容，每次都会执行。
+        
         Args:
             file_path: 文件路径
             operation_type: 操作类型 (create, move, delete, modify)
@@ -122,64 +298,113 @@ class ProjectComplianceChecker:
         Returns:
             (是否通过检查, 检查结果消息列表)
         """
+        self._refresh_rules()
+        return self._check_file_operation(Path(file_path), operation_type)
+    
+    def check_many(self, file_paths: Iterable[str], operation_type: str = "create",
+                   check_dates: bool = True) -> Dict[str, Tuple[bool, List[str]]]:
+        """批量检查文件操作
+        
+        Args:
+            file_paths: 文件路径列表
+            operation_type: 操作类型 (create, move, delete, modify)
+            check_dates: 是否读取文件内容进行日期一致性检查
+            
+        Returns:
+            {文件路径: (是否通过检查, 检查结果消息列表)}
+        """
+        self._refresh_rules(force=True)
+        self._pending_violation_log = []
+        try:
+            return {
+                str(file_path): self._check_file_operation(Path(file_path), operation_type, check_dates)
+                for file_path in file_paths
+            }
+        finally:
+            pending, self._pending_violation_log = self._pending_violation_log, None
+            self._write_violation_log(pending)
+    
+    def _check_file_operation(self, file_path: Path, operation_type: str,
+                              check_dates: bool = True) -> Tuple[bool, List[str]]:
+        key = (str(file_path), operation_type, self.rules.version)
+        cached = self._result_cache.get(key)
+        if cached is None:
+            cached = self._evaluate_rules(file_path, operation_type)
+            self._result_cache[key] = cached
+            if len(self._result_cache) > RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+        else:
+            self._result_cache.move_to_end(key)
+        
+        passed, static_messages, blocked = cached
+        messages = list(static_messages)
+        
+        # 强制阻断模式
+        if blocked:
+            self._log_violation(file_path, operation_type, "强制阻断")
+            return False, messages
+        
+        # 检查6: 日期一致性检查
+        if check_dates and not self._check_date_consistency(file_path, messages):
+            passed = False
+        
+        # 增强模式后置处理
+        if self.enhanced_mode:
+            self._enhanced_post_check(file_path, operation_type, passed, messages)
+        
+        return passed, messages
+    
+    def _evaluate_rules(self, file_path: Path, operation_type: str) -> Tuple[bool, Tuple[str, ...], bool]:
+        """执行只依赖路径的检查，返回 (是否通过, 消息, 是否强制阻断)"""
         messages = []
         passed = True
-        
-        file_path = Path(file_path)
+        rel_parts = self._relative_parts(file_path)
         
         # 增强模式前置检查
         if self.enhanced_mode:
             if not self._enhanced_pre_check(file_path, operation_type, messages):
                 passed = False
-                # 强制阻断模式
                 if self.enhanced_config.get("monitoring", {}).get("block_operations", True):
-                    self._log_violation(file_path, operation_type, "强制阻断")
-                    return False, messages
+                    return False, tuple(messages), True
         
         # 检查1: 文件路径规范性
-        if not self._check_path_compliance(file_path, messages):
+        if not self._check_path_compliance(file_path, messages, rel_parts):
             passed = False
         
-        # 检查2: 根目录文件限制
-        if not self._check_root_directory_restrictions(file_path, operation_type, messages):
-            passed = False
-        
-        # 检查3: 目录功能定位
-        if not self._check_directory_purpose(file_path, messages):
-            passed = False
+        if rel_parts is not None:
+            # 检查2: 根目录文件限制
+            if not self._check_root_directory_restrictions(file_path, operation_type, messages, rel_parts):
+                passed = False
+            
+            # 检查3: 目录功能定位
+            if not self._check_directory_purpose(file_path, messages, rel_parts):
+                passed = False
         
         # 检查4: 文件命名规范
         if not self._check_naming_convention(file_path, messages):
             passed = False
         
         # 检查5: 权限要求
-        if not self._check_permission_requirements(file_path, operation_type, messages):
+        if rel_parts is not None and not self._check_permission_requirements(file_path, operation_type, messages, rel_parts):
             passed = False
         
-        # 检查6: 日期一致性检查
-        if not self._check_date_consistency(file_path, messages):
-            passed = False
-        
-        # 增强模式后置处理
-        if self.enhanced_mode:
-            self._enhanced_post_check(file_path, operation_type, passed, messages)
-        
-        return passed, messages
+        return passed, tuple(messages), False
     
-    def _check_path_compliance(self, file_path: Path, messages: List[str]) -> bool:
+    def _check_path_compliance(self, file_path: Path, messages: List[str],
+                               rel_parts: Optional[Tuple[str, ...]] = None) -> bool:
         """检查路径合规性"""
+        if rel_parts is None:
+            rel_parts = self._relative_parts(file_path)
+        
         # 检查是否在项目根目录下
-        try:
-            file_path.relative_to(self.project_root)
-        except ValueError:
+        if rel_parts is None:
             messages.append(f"[错误] 文件路径不在项目根目录下: {file_path}")
             return False
         
         # 检查路径是否使用了标准目录
-        rel_path = file_path.relative_to(self.project_root)
-        if len(rel_path.parts) > 0:
-            top_dir = rel_path.parts[0]
-            if top_dir not in self.standard_dirs and not top_dir.startswith('.'):
+        if rel_parts:
+            top_dir = rel_parts[0]
+            if top_dir not in self.rules.standard_dirs and not top_dir.startswith('.'):
                 messages.append(f"[错误] 使用了非标准顶级目录: {top_dir}")
                 messages.append(f"📋 标准目录: {', '.join(self.standard_dirs.keys())}")
                 return False
@@ -187,78 +412,62 @@ class ProjectComplianceChecker:
         messages.append(f"[通过] 路径合规性检查通过")
         return True
     
-    def _check_root_directory_restrictions(self, file_path: Path, operation_type: str, messages: List[str]) -> bool:
+    def _check_root_directory_restrictions(self, file_path: Path, operation_type: str, messages: List[str],
+                                           rel_parts: Optional[Tuple[str, ...]] = None) -> bool:
         """检查根目录文件限制"""
-        rel_path = file_path.relative_to(self.project_root)
+        if rel_parts is None:
+            rel_parts = self._relative_parts(file_path) or ()
         
         # 如果是根目录文件
-        if len(rel_path.parts) == 1:
+        if len(rel_parts) == 1:
             file_ext = file_path.suffix.lower()
             
             # 检查是否为禁止的文件类型
-            if file_ext in self.forbidden_root_files:
+            if file_ext in self.rules.forbidden_root_exts:
                 messages.append(f"[错误] 禁止在根目录创建 {file_ext} 类型文件")
                 messages.append(f"[建议] 将文件放置到合适的子目录中")
                 messages.append(f"📁 可选目录: {self._suggest_directory_for_file(file_ext)}")
                 return False
             
             # 特殊文件检查
-            if operation_type == "create":
-                allowed_root_files = [
-                    "README.md", ".gitignore", "requirements.txt", 
-                    "package.json", "pyproject.toml", "setup.py"
-                ]
-                if file_path.name not in allowed_root_files:
-                    messages.append(f"[警告] 不建议在根目录创建文件: {file_path.name}")
-                    messages.append(f"[建议] 将文件放置到合适的子目录中")
-                    return False
+            if operation_type == "create" and file_path.name not in self.rules.allowed_root_files:
+                messages.append(f"[警告] 不建议在根目录创建文件: {file_path.name}")
+                messages.append(f"[建议] 将文件放置到合适的子目录中")
+                return False
         
         messages.append(f"[通过] 根目录限制检查通过")
         return True
     
-    def _check_directory_purpose(self, file_path: Path, messages: List[str]) -> bool:
+    def _check_directory_purpose(self, file_path: Path, messages: List[str],
+                                 rel_parts: Optional[Tuple[str, ...]] = None) -> bool:
         """检查目录功能定位"""
-        rel_path = file_path.relative_to(self.project_root)
+        if rel_parts is None:
+            rel_parts = self._relative_parts(file_path) or ()
         
-        if len(rel_path.parts) > 0:
-            top_dir = rel_path.parts[0]
-            
-            # 检查文件是否放在了正确的目录中
-            if top_dir in self.standard_dirs:
-                if not self._validate_file_in_directory(file_path, top_dir, messages):
-                    return False
+        # 检查文件是否放在了正确的目录中
+        if rel_parts and rel_parts[0] in self.rules.standard_dirs:
+            if not self._validate_file_in_directory(file_path, rel_parts, messages):
+                return False
         
         messages.append(f"[通过] 目录功能定位检查通过")
         return True
     
-    def _validate_file_in_directory(self, file_path: Path, directory: str, messages: List[str]) -> bool:
-        """验证文件是否适合放在指定目录中"""
-        file_ext = file_path.suffix.lower()
-        file_name = file_path.name.lower()
-        
-        # docs目录检查
-        if directory == "docs":
-            if file_ext not in [".md", ".yaml", ".yml", ".json", ".txt"]:
-                messages.append(f"[警告] docs目录应主要包含文档文件，不建议放置 {file_ext} 文件")
-                return False
-        
-        # project目录检查
-        elif directory == "project":
-            if file_ext in [".md"] and "readme" not in file_name:
-                messages.append(f"[提示] 文档文件建议放在docs目录中")
+    def _validate_file_in_directory(self, file_path: Path, rel_parts: Tuple[str, ...], messages: List[str]) -> bool:
+        """验证文件是否适合放在所在目录中（按最长目录前缀匹配规则）"""
+        rule = self.rules.directory_rules.longest_prefix(rel_parts[:-1])
+        if rule is None:
+            return True
         
-        # AI助理生产成果目录检查
-        elif directory == "AI助理生产成果":
-            production_files = [".prt", ".asm", ".drw", ".pro", ".txt", ".md"]
-            if file_ext not in production_files:
-                messages.append(f"[警告] AI助理生产成果目录应包含生产相关文件，不建议放置 {file_ext} 文件")
-                return False
+        kind, extensions, message = rule
+        file_ext = file_path.suffix.lower()
         
-        # tools目录检查
-        elif directory == "tools":
-            if file_ext not in [".py", ".js", ".sh", ".bat", ".ps1", ".md"]:
-                messages.append(f"[警告] tools目录应包含工具脚本，不建议放置 {file_ext} 文件")
+        if kind == "allow":
+            if file_ext not in extensions:
+                messages.append(message.format(ext=file_ext))
                 return False
+        elif kind == "hint":
+            if file_ext in extensions and "readme" not in file_path.name.lower():
+                messages.append(message.format(ext=file_ext))
         
         return True
     
@@ -267,11 +476,10 @@ class ProjectComplianceChecker:
         file_name = file_path.name
         
         # 检查文件名是否包含非法字符
-        illegal_chars = ['<', '>', ':', '"', '|', '?', '*']
-        for char in illegal_chars:
-            if char in file_name:
-                messages.append(f"[错误] 文件名包含非法字符: {char}")
-                return False
+        illegal = CompiledRules.ILLEGAL_CHARS.search(file_name)
+        if illegal:
+            messages.append(f"[错误] 文件名包含非法字符: {illegal.group(0)}")
+            return False
         
         # 检查文件名长度
         if len(file_name) > 255:
@@ -286,24 +494,15 @@ class ProjectComplianceChecker:
         messages.append(f"[通过] 文件命名规范检查通过")
         return True
     
-    def _check_permission_requirements(self, file_path: Path, operation_type: str, messages: List[str]) -> bool:
+    def _check_permission_requirements(self, file_path: Path, operation_type: str, messages: List[str],
+                                       rel_parts: Optional[Tuple[str, ...]] = None) -> bool:
         """检查权限要求"""
-        # 核心文档权限检查
-        protected_files = [
-            "docs/01-设计/开发任务书.md",
-            "docs/01-设计/技术方案.md", 
-            "docs/01-设计/项目架构设计.md",
-            "docs/03-管理/规范与流程.md",
-            "docs/03-管理/project_config.yaml",
-            "tools/finish.py",
-            "tools/control.py",
-            "tools/check_structure.py",
-            "tools/update_structure.py"
-        ]
-        
-        rel_path_str = str(file_path.relative_to(self.project_root)).replace('\\', '/')
+        if rel_parts is None:
+            rel_parts = self._relative_parts(file_path) or ()
         
-        if rel_path_str in protected_files and operation_type in ["modify", "delete"]:
+        # 核心文档权限检查
+        if operation_type in ["modify", "delete"] and self.rules.protected.longest_prefix(rel_parts):
+            rel_path_str = '/'.join(rel_parts)
             messages.append(f"[错误] 核心文件需要特殊权限: {rel_path_str}")
             messages.append(f"[说明] 需要杨老师授权才能修改此文件")
             return False
@@ -322,36 +521,19 @@ class ProjectComplianceChecker:
             return True
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # 查找日期模式
-            date_patterns = [
-                r'创建日期[：:](\d{4}年\d{1,2}月\d{1,2}日)',
-                r'修改日期[：:](\d{4}年\d{1,2}月\d{1,2}日)',
-                r'更新日期[：:](\d{4}年\d{1,2}月\d{1,2}日)',
-                r'升级日期[：:](\d{4}年\d{1,2}月\d{1,2}日)'
-            ]
-            
-            found_dates = []
-            for pattern in date_patterns:
-                matches = re.findall(pattern, content)
-                found_dates.extend(matches)
+            # 单次扫描查找日期
+            found_dates = [match.value for match in DATE_SCANNER.scan_file(file_path)]
             
             if not found_dates:
                 messages.append(f"[通过] 日期一致性检查跳过（未找到日期信息）")
                 return True
             
             # 检查日期格式和合理性
-            current_date = datetime.now().strftime('%Y年%m月%d日')
             for date_str in found_dates:
                 try:
                     # 解析日期
-                    date_match = re.match(r'(\d{4})年(\d{1,2})月(\d{1,2})日', date_str)
-                    if date_match:
-                        year, month, day = map(int, date_match.groups())
-                        file_date = datetime(year, month, day)
-                        
+                    file_date = parse_date(date_str)
+                    if file_date:
                         # 检查日期是否合理（不能是未来日期）
                         if file_date > datetime.now():
                             messages.append(f"[错误] 发现未来日期: {date_str}")
@@ -515,11 +697,10 @@ class ProjectComplianceChecker:
                 return False
         
         # 保护模式检查
-        protected_patterns = self.enhanced_config.get("strict_mode", {}).get("protected_patterns", [])
-        for pattern in protected_patterns:
-            if file_path.match(pattern):
-                messages.append(f"[保护模式] 文件受保护: {file_path.name} 匹配模式 {pattern}")
-                return False
+        pattern = self.rules.match_protected_pattern(file_path)
+        if pattern:
+            messages.append(f"[保护模式] 文件受保护: {file_path.name} 匹配模式 {pattern}")
+            return False
         
         return True
     
@@ -535,20 +716,28 @@ class ProjectComplianceChecker:
             messages.extend(suggestions)
     
     def _log_violation(self, file_path: Path, operation_type: str, reason: str):
-        """记录违规操作"""
+        """记录违规操作（批量检查期间先缓存，结束时一次写入）"""
+        log_entry = {
+            "timestamp": datetime.now().isoformat(),
+            "file_path": str(file_path),
+            "operation_type": operation_type,
+            "reason": reason,
+            "user": os.getenv("USERNAME", "unknown")
+        }
+        
+        if self._pending_violation_log is not None:
+            self._pending_violation_log.append(log_entry)
+            return
+        self._write_violation_log([log_entry])
+    
+    def _write_violation_log(self, log_entries: List[Dict]):
+        """追加写入违规日志"""
+        if not log_entries:
+            return
         try:
             self.violation_log_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            log_entry = {
-                "timestamp": datetime.now().isoformat(),
-                "file_path": str(file_path),
-                "operation_type": operation_type,
-                "reason": reason,
-                "user": os.getenv("USERNAME", "unknown")
-            }
-            
             with open(self.violation_log_path, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
+                f.writelines(json.dumps(entry, ensure_ascii=False) + "\n" for entry in log_entries)
                 
         except Exception as e:
             print(f"警告：记录违规日志失败: {e}")
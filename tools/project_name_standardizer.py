@@ -12,10 +12,12 @@
 
 import re
 import json
+import fnmatch
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from config_loader import get_config
 from utils import get_project_root
+from text_pattern_scanner import MultiPatternScanner, ScanMatch, iter_files
 
 
 class ProjectNameStandardizer:
@@ -52,7 +54,7 @@ class ProjectNameStandardizer:
         ]
 
         # 排除的目录
-        self.exclude_dirs = {"bak", "logs", "__pycache__", ".git", "node_modules"}
+        self.exclude_dirs = {"bak", "logs", "__pycache__", ".git", "node_modules", ".cache"}
 
         # 从统一配置获取项目名称
         project_name = self.config.get("project_name", "PG-GMO")
@@ -83,25 +85,28 @@ class ProjectNameStandardizer:
             (r"name\s*=\s*3ai-([\w-]+)", r"name = 3AI-\1"),
         ]
 
+        # 所有替换规则合并为一个表达式，整文件单次扫描定位；替换仍按规则顺序依次执行
+        self.scanner = MultiPatternScanner(
+            [pattern for pattern, _ in self.replacement_rules],
+            replacements=[replacement for _, replacement in self.replacement_rules],
+        )
+        self.scan_cache_file = self.project_root / ".cache" / "project_name_scan.json"
+        self._file_name_pattern = re.compile(
+            "|".join(fnmatch.translate(pattern) for pattern in self.file_patterns)
+        )
+
     def scan_files(self) -> List[Path]:
         """扫描需要处理的文件
 
         Returns:
             需要处理的文件路径列表
         """
-        files = []
-
-        for pattern in self.file_patterns:
-            for file_path in self.project_root.rglob(pattern):
-                # 检查是否在排除目录中
-                if any(
-                    exclude_dir in file_path.parts for exclude_dir in self.exclude_dirs
-                ):
-                    continue
-
-                if file_path.is_file():
-                    files.append(file_path)
-
+        # 一次遍历，排除目录不进入
+        files = iter_files(
+            self.project_root,
+            self.exclude_dirs,
+            lambda name: self._file_name_pattern.match(name) is not None,
+        )
         return sorted(files)
 
     def analyze_file(self, file_path: Path) -> List[Tuple[int, str, str]]:
@@ -114,26 +119,26 @@ class ProjectNameStandardizer:
             (行号, 原始内容, 建议替换内容) 的列表
         """
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-        except (UnicodeDecodeError, PermissionError):
+            matches = self.scanner.scan_file(file_path)
+        except PermissionError:
             return []
 
+        return self._suggestions_from_matches(matches or [])
+
+    def _suggestions_from_matches(self, matches: List[ScanMatch]) -> List[Tuple[int, str, str]]:
+        """对命中的行应用替换规则，生成建议"""
         suggestions = []
+        seen_lines = set()
 
-        for line_num, line in enumerate(lines, 1):
-            original_line = line.rstrip()
-            modified_line = original_line
+        for match in matches:
+            if match.line in seen_lines:
+                continue
+            seen_lines.add(match.line)
 
-            # 应用替换规则
-            for pattern, replacement in self.replacement_rules:
-                if re.search(pattern, modified_line, re.IGNORECASE):
-                    new_line = re.sub(
-                        pattern, replacement, modified_line, flags=re.IGNORECASE
-                    )
-                    if new_line != modified_line:
-                        suggestions.append((line_num, original_line, new_line))
-                        modified_line = new_line
+            original_line = match.line_text.rstrip()
+            # 每条改变了该行的规则给出一条建议（内容为累计替换后的行）
+            for _, new_line in self.scanner.iter_substitutions(original_line):
+                suggestions.append((match.line, original_line, new_line))
 
         return suggestions
 
@@ -156,8 +161,7 @@ class ProjectNameStandardizer:
         original_content = content
 
         # 应用替换规则
-        for pattern, replacement in self.replacement_rules:
-            content = re.sub(pattern, replacement, content, flags=re.IGNORECASE)
+        content = self.scanner.substitute(content)
 
         # 检查是否有修改
         if content == original_content:
@@ -188,8 +192,11 @@ class ProjectNameStandardizer:
             "summary": {"total_issues": 0, "files_affected": 0},
         }
 
+        # 进程池并行扫描，未变化的文件直接使用缓存结果
+        results = self.scanner.scan_paths(files, cache_file=self.scan_cache_file)
+
         for file_path in files:
-            suggestions = self.analyze_file(file_path)
+            suggestions = self._suggestions_from_matches(results.get(str(file_path)) or [])
             if suggestions:
                 relative_path = file_path.relative_to(self.project_root)
                 file_report = {
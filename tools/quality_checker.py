@@ -3,154 +3,545 @@
 """
 品高ISO流程图质量检查工具
 检查生成的流程图文件是否符合命名规范、目录结构要求，验证流程图内容准确性和可读性
+
+每个文件只解析一次，得到紧凑的节点/连接线模型（DiagramModel），空间索引和
+邻接索引在模型上按需建立、供所有检查共用。检查项用 register_check 注册为插件，
+分为文件级（文件名、大小）和模型级两类。批量检查时模型级检查在进程池中并行执行，
+结果按文件内容的SHA-256缓存，内容未变的文件不再解析。
+
+插件需在模块导入时注册（工作进程按名称查找检查项）。判定文件不合格的检查与原有
+质量门禁一致（命名、空文件、XML、mxGraphModel、节点数、连接线）；新增的悬空连接线、
+节点重叠、孤立节点检查只作提示，不改变判定结果。
 """
 
 import os
-import re
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
 from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
 import xml.etree.ElementTree as ET
 
+project_root = Path(__file__).parent.parent
+
+# 检查结果缓存
+CACHE_FILE = project_root / ".cache" / "quality_check.sqlite3"
+CACHE_VERSION = 1
+
+# 每个工作进程最多排队的文件数
+QUEUE_PER_WORKER = 4
+
+# 空间索引的分桶大小（像素）
+BUCKET_SIZE = 200
+
+# 不参与重叠、孤立检查的样式（文字、容器、连接线标签等）
+NON_SHAPE_STYLES = {'text', 'swimlane', 'group', 'edgeLabel', 'label'}
+
+
+def parse_style(style: str) -> Tuple[set, Dict[str, str]]:
+    """拆分mxGraph样式：返回 (无值的样式名集合, 键值对)"""
+    names = set()
+    values = {}
+    for token in (style or '').split(';'):
+        if not token:
+            continue
+        key, sep, value = token.partition('=')
+        if sep:
+            values[key] = value
+        else:
+            names.add(key)
+    return names, values
+
+
+class DiagramModel:
+    """一个Draw.io文件的节点/连接线模型
+
+    节点和连接线按页面区分（不同页面的id可以重复），节点坐标已换算为页面绝对坐标。
+    """
+
+    def __init__(self, root: ET.Element):
+        self.page_count = 0
+        self.cell_count = 0
+        # 节点：并列列表，下标即节点序号
+        self.node_keys: List[Tuple[int, str]] = []
+        self.node_rects: List[Tuple[float, float, float, float]] = []
+        self.node_styles: List[str] = []
+        self.node_is_shape: List[bool] = []
+        # 连接线：(id, 页面, 起点id, 终点id)
+        self.edges: List[Tuple[str, int, Optional[str], Optional[str]]] = []
+        # (页面, id) -> 单元格类型（vertex / edge / other）
+        self.cell_kinds: Dict[Tuple[int, str], str] = {}
+
+        models = [root] if root.tag == 'mxGraphModel' else list(root.iter('mxGraphModel'))
+        self.page_count = len(models)
+        for page, graph_model in enumerate(models):
+            self._add_page(page, graph_model)
+        self.node_index = {key: i for i, key in enumerate(self.node_keys)}
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'DiagramModel':
+        return cls(ET.fromstring(data))
+
+    def _add_page(self, page: int, graph_model: ET.Element):
+        cells = {}
+        parents = {}
+        geometry = {}
+        styles = {}
+        for cell in graph_model.iter('mxCell'):
+            self.cell_count += 1
+            cell_id = cell.get('id', '')
+            parents[cell_id] = cell.get('parent')
+            styles[cell_id] = cell.get('style', '')
+            if cell.get('edge') == '1':
+                cells[cell_id] = 'edge'
+                self.edges.append((cell_id, page, cell.get('source'), cell.get('target')))
+            elif cell.get('vertex') == '1':
+                cells[cell_id] = 'vertex'
+                geo = cell.find('mxGeometry')
+                if geo is not None and geo.get('relative') != '1':
+                    geometry[cell_id] = (float(geo.get('x', 0)), float(geo.get('y', 0)),
+                                         float(geo.get('width', 0)), float(geo.get('height', 0)))
+            else:
+                cells[cell_id] = 'other'
+
+        has_children = {parent for cell_id, parent in parents.items() if cells.get(cell_id) == 'vertex'}
+        origins = {}
+
+        def origin(cell_id, depth=0):
+            # 父级图形左上角的绝对坐标（父级不是图形时为原点）
+            if cell_id not in geometry or depth > 50:
+                return 0.0, 0.0
+            if cell_id not in origins:
+                ox, oy = origin(parents.get(cell_id), depth + 1)
+                x, y = geometry[cell_id][:2]
+                origins[cell_id] = (ox + x, oy + y)
+            return origins[cell_id]
+
+        for cell_id, kind in cells.items():
+            self.cell_kinds[(page, cell_id)] = kind
+            if kind != 'vertex' or cell_id not in geometry:
+                continue
+            x, y = origin(cell_id)
+            width, height = geometry[cell_id][2:]
+            names, values = parse_style(styles[cell_id])
+            is_shape = (width > 0 and height > 0 and cell_id not in has_children
+                        and not names & NON_SHAPE_STYLES
+                        and values.get('shape') not in NON_SHAPE_STYLES
+                        and values.get('container') != '1'
+                        and cells.get(parents.get(cell_id)) != 'edge')
+            self.node_keys.append((page, cell_id))
+            self.node_rects.append((x, y, width, height))
+            self.node_styles.append(styles[cell_id])
+            self.node_is_shape.append(is_shape)
+
+    @cached_property
+    def adjacency(self) -> Tuple[Dict[int, List[int]], Dict[int, List[int]]]:
+        """邻接索引：(节点序号 -> 出边序号列表, 节点序号 -> 入边序号列表)"""
+        outgoing: Dict[int, List[int]] = {}
+        incoming: Dict[int, List[int]] = {}
+        for edge_no, (_, page, source, target) in enumerate(self.edges):
+            node = self.node_index.get((page, source))
+            if node is not None:
+                outgoing.setdefault(node, []).append(edge_no)
+            node = self.node_index.get((page, target))
+            if node is not None:
+                incoming.setdefault(node, []).append(edge_no)
+        return outgoing, incoming
+
+    @cached_property
+    def spatial_index(self) -> Dict[Tuple[int, int, int], List[int]]:
+        """空间索引：(页面, 桶x, 桶y) -> 该桶内的图形节点序号"""
+        buckets: Dict[Tuple[int, int, int], List[int]] = {}
+        for node, (x, y, width, height) in enumerate(self.node_rects):
+            if not self.node_is_shape[node]:
+                continue
+            page = self.node_keys[node][0]
+            for bx in range(int(x // BUCKET_SIZE), int((x + width) // BUCKET_SIZE) + 1):
+                for by in range(int(y // BUCKET_SIZE), int((y + height) // BUCKET_SIZE) + 1):
+                    buckets.setdefault((page, bx, by), []).append(node)
+        return buckets
+
+    def overlapping_pairs(self) -> List[Tuple[int, int]]:
+        """内部互相重叠的图形节点对"""
+        pairs = set()
+        rects = self.node_rects
+        for nodes in self.spatial_index.values():
+            for i, a in enumerate(nodes):
+                ax, ay, aw, ah = rects[a]
+                for b in nodes[i + 1:]:
+                    bx, by, bw, bh = rects[b]
+                    if ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah:
+                        pairs.add((min(a, b), max(a, b)))
+        return sorted(pairs)
+
+
+@dataclass(frozen=True)
+class QualityCheck:
+    """一个检查项
+
+    scope 为 file 时 func(file_path, size) 检查文件本身；为 model 时 func(model)
+    检查解析后的模型。blocking 为 False 的问题只提示，不判定文件不合格。
+    """
+    name: str
+    func: Callable[..., List[str]]
+    scope: str = 'model'
+    category: str = 'content'
+    blocking: bool = True
+
+
+# 已注册的检查项（按注册顺序执行）
+CHECKS: Dict[str, QualityCheck] = {}
+
+
+def register_check(name: str, scope: str = 'model', category: str = 'content', blocking: bool = True):
+    """注册检查项的装饰器"""
+    if scope not in ('file', 'model'):
+        raise ValueError(f"未知的检查范围: {scope}")
+
+    def decorator(func):
+        CHECKS[name] = QualityCheck(name, func, scope, category, blocking)
+        return func
+    return decorator
+
+
+@register_check('file_empty', scope='file')
+def check_file_empty(file_path: Path, size: int) -> List[str]:
+    return ["文件为空"] if size == 0 else []
+
+
+@register_check('file_small', scope='file', blocking=False)
+def check_file_small(file_path: Path, size: int) -> List[str]:
+    # Draw.io文件通常至少几百字节
+    return ["文件过小，可能内容不完整"] if 0 < size < 500 else []
+
+
+@register_check('naming', scope='file', category='naming')
+def check_naming(file_path: Path, size: int) -> List[str]:
+    """检查文件命名规范"""
+    filename = file_path.name
+    issues = []
+
+    # 检查文件扩展名
+    if not filename.endswith('.drawio'):
+        issues.append(f"文件扩展名不正确: {filename}")
+
+    # 检查是否包含"流程图"字样
+    if "流程图" not in filename:
+        issues.append(f"文件名缺少'流程图'标识: {filename}")
+
+    # 检查是否以HQ-QP-开头
+    base_name = filename.replace('_流程图.drawio', '')
+    if not base_name.startswith('HQ-QP-'):
+        issues.append(f"文件名不符合HQ-QP-开头规范: {filename}")
+
+    return issues
+
+
+@register_check('graph_model')
+def check_graph_model(model: DiagramModel) -> List[str]:
+    return [] if model.page_count else ["缺少mxGraphModel元素"]
+
+
+@register_check('cells')
+def check_cells(model: DiagramModel) -> List[str]:
+    if not model.cell_count:
+        return ["缺少mxCell元素"]
+    # 至少应该有开始、处理、结束节点
+    if model.cell_count < 3:
+        return [f"流程图节点数量过少: {model.cell_count}"]
+    return []
+
+
+@register_check('edges')
+def check_edges(model: DiagramModel) -> List[str]:
+    return [] if model.edges else ["缺少连接线"]
+
+
+@register_check('dangling_edges', blocking=False)
+def check_dangling_edges(model: DiagramModel) -> List[str]:
+    """连接线的起点、终点必须是同一页面中存在的单元格"""
+    issues = []
+    for edge_id, page, source, target in model.edges:
+        missing = [end for end in (source, target) if end and (page, end) not in model.cell_kinds]
+        if missing:
+            issues.append(f"连接线 {edge_id} 引用了不存在的节点: {', '.join(missing)}")
+    return issues
+
+
+@register_check('overlapping_nodes', blocking=False)
+def check_overlapping_nodes(model: DiagramModel) -> List[str]:
+    return [f"节点重叠: {model.node_keys[a][1]} 与 {model.node_keys[b][1]}"
+            for a, b in model.overlapping_pairs()]
+
+
+@register_check('isolated_nodes', blocking=False)
+def check_isolated_nodes(model: DiagramModel) -> List[str]:
+    """有连接线的流程图中，没有任何连接线的图形节点"""
+    if not model.edges:
+        return []
+    outgoing, incoming = model.adjacency
+    isolated = [model.node_keys[node][1] for node, is_shape in enumerate(model.node_is_shape)
+                if is_shape and node not in outgoing and node not in incoming]
+    return [f"孤立节点（无连接线）: {', '.join(isolated)}"] if isolated else []
+
+
+def checks_signature(check_names) -> str:
+    """检查项签名，检查项变化时缓存整体失效"""
+    text = json.dumps([CACHE_VERSION, list(check_names)])
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+def run_model_checks(data: bytes, check_names) -> List[Tuple[str, bool]]:
+    """解析文件内容并执行模型级检查，返回 [(问题, 是否判定不合格)]"""
+    try:
+        model = DiagramModel.from_bytes(data)
+    except ET.ParseError as e:
+        return [(f"XML格式错误: {str(e)}", True)]
+    except Exception as e:
+        return [(f"文件读取错误: {str(e)}", True)]
+
+    issues = []
+    for name in check_names:
+        check = CHECKS[name]
+        issues.extend((issue, check.blocking) for issue in check.func(model))
+    return issues
+
+
+# 工作进程内执行的模型级检查项名称
+_worker_checks: Tuple[str, ...] = ()
+
+
+def _init_worker(check_names):
+    global _worker_checks
+    _worker_checks = tuple(check_names)
+
+
+def _check_content(data: bytes) -> List[Tuple[str, bool]]:
+    """进程池任务：检查一个文件的内容"""
+    return run_model_checks(data, _worker_checks)
+
+
+class CheckCache:
+    """检查结果缓存（SQLite）：文件内容SHA-256 -> 模型级检查结果，检查项变化时整体失效"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS results (
+        sha256 TEXT NOT NULL,
+        signature TEXT NOT NULL,
+        issues TEXT NOT NULL,
+        PRIMARY KEY (sha256, signature)
+    )
+    """
+
+    def __init__(self, db_file: Path, signature: str):
+        self.db_file = Path(db_file)
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self.signature = signature
+        self._conn = sqlite3.connect(str(self.db_file))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(self.SCHEMA)
+
+    def lookup(self, sha256: str):
+        row = self._conn.execute(
+            "SELECT issues FROM results WHERE sha256 = ? AND signature = ?", (sha256, self.signature)
+        ).fetchone()
+        return [tuple(issue) for issue in json.loads(row[0])] if row else None
+
+    def store(self, sha256: str, issues):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO results (sha256, signature, issues) VALUES (?, ?, ?)",
+            (sha256, self.signature, json.dumps(issues, ensure_ascii=False))
+        )
+
+    def close(self):
+        self._conn.commit()
+        self._conn.close()
+
+
 class FlowchartQualityChecker:
-    def __init__(self, output_dir):
+    def __init__(self, output_dir, cache_file=CACHE_FILE, checks=None, recursive=False):
+        """
+        Args:
+            output_dir: 流程图目录
+            cache_file: 检查结果缓存文件，None 表示不使用缓存
+            checks: 执行的检查项名称，默认全部已注册的检查项
+            recursive: 是否包含子目录中的流程图
+        """
         self.output_dir = Path(output_dir)
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.recursive = recursive
+        names = list(checks) if checks is not None else list(CHECKS)
+        unknown = [name for name in names if name not in CHECKS]
+        if unknown:
+            raise ValueError(f"未注册的检查项: {', '.join(unknown)}")
+        self.file_checks = [CHECKS[name] for name in names if CHECKS[name].scope == 'file']
+        self.model_checks = tuple(name for name in names if CHECKS[name].scope == 'model')
         self.report_data = {
             'check_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             'total_files': 0,
             'valid_files': 0,
             'invalid_files': 0,
+            'cached_files': 0,
+            'seconds': 0.0,
             'naming_issues': [],
             'content_issues': [],
             'file_details': []
         }
+        self._seen_issues = set()
     
     def check_file_naming(self, file_path):
         """检查文件命名规范"""
-        filename = file_path.name
-        issues = []
-        
-        # 检查文件扩展名
-        if not filename.endswith('.drawio'):
-            issues.append(f"文件扩展名不正确: {filename}")
-        
-        # 检查是否包含"流程图"字样
-        if "流程图" not in filename:
-            issues.append(f"文件名缺少'流程图'标识: {filename}")
-        
-        # 检查是否以HQ-QP-开头
-        base_name = filename.replace('_流程图.drawio', '')
-        if not base_name.startswith('HQ-QP-'):
-            issues.append(f"文件名不符合HQ-QP-开头规范: {filename}")
-        
-        return issues
+        return check_naming(Path(file_path), 0)
     
     def check_drawio_content(self, file_path):
         """检查Draw.io文件内容"""
-        issues = []
-        
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # 检查是否为有效的XML
-            try:
-                root = ET.fromstring(content)
-            except ET.ParseError as e:
-                issues.append(f"XML格式错误: {str(e)}")
-                return issues
-            
-            # 检查是否包含mxGraphModel
-            if 'mxGraphModel' not in content:
-                issues.append("缺少mxGraphModel元素")
-            
-            # 检查是否包含基本的流程图元素
-            if 'mxCell' not in content:
-                issues.append("缺少mxCell元素")
-            
-            # 检查是否包含流程图节点
-            node_count = content.count('mxCell')
-            if node_count < 3:  # 至少应该有开始、处理、结束节点
-                issues.append(f"流程图节点数量过少: {node_count}")
-            
-            # 检查是否包含连接线
-            edge_count = content.count('edge="1"')
-            if edge_count < 1:
-                issues.append("缺少连接线")
-            
+            data = Path(file_path).read_bytes()
         except Exception as e:
-            issues.append(f"文件读取错误: {str(e)}")
-        
-        return issues
+            return [f"文件读取错误: {str(e)}"]
+        return [issue for issue, _ in run_model_checks(data, self.model_checks)]
     
-    def check_single_file(self, file_path):
-        """检查单个文件"""
+    def _new_file_info(self, file_path, size):
+        """文件信息和文件级检查结果"""
         file_info = {
             'filename': file_path.name,
             'path': str(file_path),
-            'size': file_path.stat().st_size if file_path.exists() else 0,
+            'size': size,
             'naming_issues': [],
             'content_issues': [],
             'is_valid': True
         }
-        
+        for check in self.file_checks:
+            issues = check.func(file_path, size)
+            file_info[f"{check.category}_issues"].extend(issues)
+            if issues and check.blocking:
+                file_info['is_valid'] = False
+        return file_info
+    
+    @staticmethod
+    def _add_content_issues(file_info, issues):
+        for issue, blocking in issues:
+            file_info['content_issues'].append(issue)
+            if blocking:
+                file_info['is_valid'] = False
+        return file_info
+    
+    def check_single_file(self, file_path):
+        """检查单个文件"""
+        file_path = Path(file_path)
         # 检查文件是否存在
         if not file_path.exists():
-            file_info['content_issues'].append("文件不存在")
-            file_info['is_valid'] = False
+            file_info = self._new_file_info(file_path, 0)
+            file_info.update(naming_issues=[], content_issues=["文件不存在"], is_valid=False)
             return file_info
         
-        # 检查文件大小
-        if file_info['size'] == 0:
-            file_info['content_issues'].append("文件为空")
-            file_info['is_valid'] = False
-        elif file_info['size'] < 500:  # Draw.io文件通常至少几百字节
-            file_info['content_issues'].append("文件过小，可能内容不完整")
-        
-        # 检查命名规范
-        naming_issues = self.check_file_naming(file_path)
-        file_info['naming_issues'] = naming_issues
-        if naming_issues:
-            file_info['is_valid'] = False
-        
-        # 检查内容
-        content_issues = self.check_drawio_content(file_path)
-        file_info['content_issues'].extend(content_issues)
-        if content_issues:
-            file_info['is_valid'] = False
+        file_info = self._new_file_info(file_path, file_path.stat().st_size)
+        try:
+            data = file_path.read_bytes()
+        except Exception as e:
+            return self._add_content_issues(file_info, [(f"文件读取错误: {str(e)}", True)])
+        return self._add_content_issues(file_info, run_model_checks(data, self.model_checks))
+    
+    def find_files(self):
+        """目录中的所有.drawio文件（按路径排序）"""
+        pattern = '**/*.drawio' if self.recursive else '*.drawio'
+        return sorted(self.output_dir.glob(pattern))
+    
+    def _record(self, file_info):
+        """汇总一个文件的检查结果"""
+        self.report_data['file_details'].append(file_info)
+        if file_info['is_valid']:
+            self.report_data['valid_files'] += 1
+            print(f"  ✅ 通过: {file_info['filename']}")
+            return
         
-        return file_info
+        self.report_data['invalid_files'] += 1
+        print(f"  ❌ {file_info['filename']} 发现问题:")
+        for issue in file_info['naming_issues'] + file_info['content_issues']:
+            print(f"    - {issue}")
+            if issue not in self._seen_issues:
+                self._seen_issues.add(issue)
+                if '命名' in issue or '文件名' in issue:
+                    self.report_data['naming_issues'].append(issue)
+                else:
+                    self.report_data['content_issues'].append(issue)
     
-    def run_quality_check(self):
-        """运行质量检查"""
+    def run_quality_check(self, workers=None, force=False):
+        """运行质量检查
+
+        Args:
+            workers: 进程数（默认CPU核数）；为1时在当前进程中检查
+            force: 忽略缓存，全部重新检查
+        """
         print(f"开始质量检查: {self.output_dir}")
+        start = time.perf_counter()
+        self._seen_issues = set()
         
         # 获取所有.drawio文件
-        drawio_files = list(self.output_dir.glob('*.drawio'))
+        drawio_files = self.find_files()
         self.report_data['total_files'] = len(drawio_files)
-        
         print(f"找到 {len(drawio_files)} 个流程图文件")
         
-        # 检查每个文件
-        for i, file_path in enumerate(drawio_files, 1):
-            print(f"[{i}/{len(drawio_files)}] 检查: {file_path.name}")
-            
-            file_info = self.check_single_file(file_path)
-            self.report_data['file_details'].append(file_info)
-            
-            if file_info['is_valid']:
-                self.report_data['valid_files'] += 1
-                print(f"  ✅ 通过")
-            else:
-                self.report_data['invalid_files'] += 1
-                print(f"  ❌ 发现问题:")
-                for issue in file_info['naming_issues'] + file_info['content_issues']:
-                    print(f"    - {issue}")
-                    if issue not in self.report_data['naming_issues'] + self.report_data['content_issues']:
-                        if '命名' in issue or '文件名' in issue:
-                            self.report_data['naming_issues'].append(issue)
-                        else:
-                            self.report_data['content_issues'].append(issue)
+        signature = checks_signature(self.model_checks)
+        cache = CheckCache(self.cache_file, signature) if self.cache_file else None
+        workers = max(1, min(workers or os.cpu_count() or 1, len(drawio_files)))
+        # 下标 -> (文件信息, 内容哈希)；内容检查结果回来后按文件顺序汇总
+        results: Dict[int, dict] = {}
+        pending = {}
+        
+        def collect(done):
+            for future in done:
+                index, sha256 = pending.pop(future)
+                issues = future.result()
+                if cache:
+                    cache.store(sha256, issues)
+                self._add_content_issues(results[index], issues)
+        
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                       initargs=(self.model_checks,)) if workers > 1 else None
+        try:
+            for index, file_path in enumerate(drawio_files):
+                try:
+                    data = file_path.read_bytes()
+                except Exception as e:
+                    results[index] = self._add_content_issues(
+                        self._new_file_info(file_path, 0), [(f"文件读取错误: {str(e)}", True)])
+                    continue
+                
+                file_info = results[index] = self._new_file_info(file_path, len(data))
+                sha256 = hashlib.sha256(data).hexdigest()
+                cached = cache.lookup(sha256) if cache and not force else None
+                if cached is not None:
+                    self.report_data['cached_files'] += 1
+                    self._add_content_issues(file_info, cached)
+                elif executor is None:
+                    issues = run_model_checks(data, self.model_checks)
+                    if cache:
+                        cache.store(sha256, issues)
+                    self._add_content_issues(file_info, issues)
+                else:
+                    pending[executor.submit(_check_content, data)] = (index, sha256)
+                    if len(pending) >= workers * QUEUE_PER_WORKER:
+                        collect(wait(pending, return_when=FIRST_COMPLETED).done)
+            collect(wait(pending).done)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+            if cache:
+                cache.close()
+        
+        for index in range(len(drawio_files)):
+            self._record(results[index])
         
+        self.report_data['seconds'] = round(time.perf_counter() - start, 3)
+        print(f"检查耗时 {self.report_data['seconds']:.2f} 秒（缓存命中 {self.report_data['cached_files']} 个）")
         return self.report_data
     
     def generate_quality_report(self):
@@ -213,10 +604,22 @@ class FlowchartQualityChecker:
         return report_path
 
 def main():
-    output_dir = "S:/PG-GMO/02-Output/品高ISO流程图"
+    parser = argparse.ArgumentParser(description="品高ISO流程图质量检查")
+    parser.add_argument("output_dir", nargs="?", default="S:/PG-GMO/02-Output/品高ISO流程图",
+                        help="流程图目录")
+    parser.add_argument("-r", "--recursive", action="store_true", help="包含子目录")
+    parser.add_argument("-w", "--workers", type=int, help="并行进程数（默认CPU核数）")
+    parser.add_argument("-f", "--force", action="store_true", help="忽略缓存，全部重新检查")
+    parser.add_argument("--checks", help="只执行指定检查项（逗号分隔），可选: " + ", ".join(CHECKS))
+    args = parser.parse_args()
+    output_dir = args.output_dir
     
-    checker = FlowchartQualityChecker(output_dir)
-    report_data = checker.run_quality_check()
+    checks = [name.strip() for name in args.checks.split(',') if name.strip()] if args.checks else None
+    checker = FlowchartQualityChecker(output_dir, checks=checks, recursive=args.recursive)
+    report_data = checker.run_quality_check(workers=args.workers, force=args.force)
+    if not report_data['total_files']:
+        print("❌ 未找到任何流程图文件")
+        return report_data
     report_path = checker.generate_quality_report()
     
     print(f"\n=== 质量检查完成 ===")
@@ -230,4 +633,4 @@ def main():
     return report_data
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
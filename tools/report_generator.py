@@ -13,6 +13,8 @@ from datetime import datetime
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from tools.directory_tree import render_tree
+
 try:
     from tools.config_loader import ConfigLoader
 except ImportError:
@@ -30,46 +32,21 @@ class ReportGenerator:
         """初始化报告生成器"""
         self.config = ConfigLoader.load_config()
 
-    def generate_directory_tree(self, paths: Set[str], max_depth: int = 3) -> str:
-        """生成目录树结构"""
+    def generate_directory_tree(self, paths: Set[str], max_depth: int = 3,
+                                dirs: Optional[Set[str]] = None) -> str:
+        """生成目录树结构
+
+        作为其他路径前缀的条目、dirs 中的条目以及以 / 结尾的路径视为目录。提供
+        dirs（如 DirectoryScanner.directories）时不访问文件系统；未提供时，无法
+        从快照判断的叶子条目用 is_dir() 判断。
+        """
         if not paths:
             return "(空目录)"
 
-        # 将路径转换为Path对象并排序
-        path_objects = [Path(p) for p in paths]
-        path_objects.sort()
-
-        # 构建树结构
-        tree_lines = []
-        processed_dirs = set()
-
-        for path_obj in path_objects:
-            # 获取相对于项目根目录的路径
-            try:
-                rel_path = path_obj.relative_to(project_root)
-            except ValueError:
-                rel_path = path_obj
-
-            parts = rel_path.parts
-            if len(parts) > max_depth:
-                continue
-
-            # 构建每一级的缩进
-            for i, part in enumerate(parts):
-                current_path = Path(*parts[: i + 1])
-                if current_path not in processed_dirs:
-                    indent = "│   " * i
-                    if i == len(parts) - 1:
-                        # 最后一级，判断是文件还是目录
-                        if path_obj.is_dir():
-                            tree_lines.append(f"{indent}├── {part}/")
-                        else:
-                            tree_lines.append(f"{indent}├── {part}")
-                    else:
-                        tree_lines.append(f"{indent}├── {part}/")
-                    processed_dirs.add(current_path)
-
-        return "\n".join(tree_lines)
+        if dirs is not None:
+            return render_tree(paths, dirs, root=project_root, max_depth=max_depth)
+        return render_tree(paths, root=project_root, max_depth=max_depth,
+                           probe=lambda path: Path(path).is_dir())
 
     def format_file_list(self, files: List[Path], title: str = "文件列表") -> str:
         """格式化文件列表"""
@@ -179,10 +156,14 @@ class ReportGenerator:
         )
 
     def generate_directory_section(
-        self, paths: Set[str], title: str = "完整目录树"
+        self, paths: Set[str], title: str = "完整目录树", dirs: Optional[Set[str]] = None
     ) -> str:
-        """生成目录结构部分"""
-        tree_content = self.generate_directory_tree(paths)
+        """生成目录结构部分
+
+        dirs 为扫描器已知的目录集合（如 DirectoryScanner.directories），提供后渲染时
+        不再访问文件系统。
+        """
+        tree_content = self.generate_directory_tree(paths, dirs=dirs)
 
         # 从配置文件读取目录树根节点名称
         structure_config = self.config.get("structure_check", {})
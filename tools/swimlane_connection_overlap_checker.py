@@ -3,14 +3,76 @@
 """
 泳道与连接线重合检查工具
 专门检查流程图中连接线与泳道边框线重合的问题
+
+连接线的水平、垂直线段和泳道边框线分别按坐标排序，用扫描线找出容差范围内的
+线段与边框线，检查耗时为 O((n+k) log n)（k 为问题数），不再对每条连接线遍历
+所有泳道；check_directory 一次检查目录中的所有 .drawio 文件。
 """
 
+import io
+import sys
+import json
+import contextlib
 import xml.etree.ElementTree as ET
 from datetime import datetime
+from pathlib import Path
 from collections import defaultdict
 
+# 容差范围（像素）
+TOLERANCE = 5
+
+# 严重度为 high 的最大偏差（像素）
+HIGH_SEVERITY_DISTANCE = 2
+
+
+def build_segment_index(connection_paths):
+    """连接线线段索引
+
+    Returns:
+        {'horizontal': [(y, x起, x止, 连接线序号, 线段序号)],
+         'vertical': [(x, y起, y止, 连接线序号, 线段序号)]}，按坐标排序；
+        线段序号为该线段在连接线 crosses_horizontal / crosses_vertical 中的位置
+    """
+    horizontal = []
+    vertical = []
+    for conn_no, info in enumerate(connection_paths.values()):
+        points = info['path_points']
+        h_no = v_no = 0
+        for (prev_x, prev_y), (x, y) in zip(points, points[1:]):
+            if y == prev_y:
+                horizontal.append((y, min(x, prev_x), max(x, prev_x), conn_no, h_no))
+                h_no += 1
+            if x == prev_x:
+                vertical.append((x, min(y, prev_y), max(y, prev_y), conn_no, v_no))
+                v_no += 1
+    horizontal.sort()
+    vertical.sort()
+    return {'horizontal': horizontal, 'vertical': vertical}
+
+
+def sweep_boundary_matches(segments, boundaries, tolerance=TOLERANCE):
+    """扫描线：线段和边框线均按坐标排序，窗口随线段坐标单调前移，
+    输出坐标相差不超过 tolerance 的 (线段, 边框线)"""
+    start = 0
+    count = len(boundaries)
+    for segment in segments:
+        coord = segment[0]
+        while start < count and boundaries[start][0] < coord - tolerance:
+            start += 1
+        i = start
+        while i < count and boundaries[i][0] <= coord + tolerance:
+            yield segment, boundaries[i]
+            i += 1
+
+
 class SwimlaneConnectionOverlapChecker:
     def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        """清空上一次检查的结果"""
+        self.segment_index = None
+        self.last_error = None
         self.check_results = {
             "swimlane_positions": {},
             "connection_paths": {},
@@ -25,6 +87,8 @@ class SwimlaneConnectionOverlapChecker:
         print(f"⏰ 检查时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("=" * 80)
         
+        # 先清空上一个文件的结果，解析失败时不会残留
+        self.reset()
         try:
             # 解析文件
             tree = ET.parse(file_path)
@@ -46,6 +110,7 @@ class SwimlaneConnectionOverlapChecker:
             return True
             
         except Exception as e:
+            self.last_error = str(e)
             print(f"❌ 检查过程中发生错误: {str(e)}")
             return False
     
@@ -139,6 +204,7 @@ class SwimlaneConnectionOverlapChecker:
             connection_paths[conn_id] = path_info
         
         self.check_results["connection_paths"] = connection_paths
+        self.segment_index = build_segment_index(connection_paths)
         
         print(f"   ✅ 分析连接线: {len(connection_paths)}条")
         
@@ -156,37 +222,52 @@ class SwimlaneConnectionOverlapChecker:
         swimlanes = self.check_results["swimlane_positions"]
         connections = self.check_results["connection_paths"]
         
+        # 泳道上下、左右边框线，按坐标排序
+        lane_names = list(swimlanes)
+        conn_ids = list(connections)
+        horizontal_lines = sorted(
+            (lane_y, lane_no, line_no)
+            for lane_no, lane_info in enumerate(swimlanes.values())
+            for line_no, lane_y in enumerate(lane_info['horizontal_lines'])
+        )
+        vertical_lines = sorted(
+            (lane_x, lane_no, line_no)
+            for lane_no, lane_info in enumerate(swimlanes.values())
+            for line_no, lane_x in enumerate(lane_info['vertical_lines'])
+        )
+        
+        # 扫描线找出容差范围内的线段与边框线
+        segment_index = self.segment_index or build_segment_index(connections)
+        found = []
+        for axis, segments, lines in ((0, segment_index['horizontal'], horizontal_lines),
+                                      (1, segment_index['vertical'], vertical_lines)):
+            for segment, (lane_coord, lane_no, line_no) in sweep_boundary_matches(segments, lines):
+                coord, _, _, conn_no, segment_no = segment
+                found.append(((conn_no, lane_no, axis, segment_no, line_no), conn_ids[conn_no], coord, lane_coord))
+        
+        # 按连接线、泳道、方向的原有顺序输出
+        found.sort(key=lambda item: item[0])
         overlap_issues = []
-        tolerance = 5  # 容差范围（像素）
-        
-        for conn_id, conn_info in connections.items():
-            for lane_name, lane_info in swimlanes.items():
-                
-                # 检查水平线段与泳道水平边界重合
-                for y_coord in conn_info['crosses_horizontal']:
-                    for lane_y in lane_info['horizontal_lines']:
-                        if abs(y_coord - lane_y) <= tolerance:
-                            overlap_issues.append({
-                                'type': 'horizontal_overlap',
-                                'connection': conn_id,
-                                'swimlane': lane_name,
-                                'connection_y': y_coord,
-                                'swimlane_y': lane_y,
-                                'severity': 'high' if abs(y_coord - lane_y) <= 2 else 'medium'
-                            })
-                
-                # 检查垂直线段与泳道垂直边界重合
-                for x_coord in conn_info['crosses_vertical']:
-                    for lane_x in lane_info['vertical_lines']:
-                        if abs(x_coord - lane_x) <= tolerance:
-                            overlap_issues.append({
-                                'type': 'vertical_overlap',
-                                'connection': conn_id,
-                                'swimlane': lane_name,
-                                'connection_x': x_coord,
-                                'swimlane_x': lane_x,
-                                'severity': 'high' if abs(x_coord - lane_x) <= 2 else 'medium'
-                            })
+        for (_, lane_no, axis, _, _), conn_id, coord, lane_coord in found:
+            severity = 'high' if abs(coord - lane_coord) <= HIGH_SEVERITY_DISTANCE else 'medium'
+            if axis == 0:
+                overlap_issues.append({
+                    'type': 'horizontal_overlap',
+                    'connection': conn_id,
+                    'swimlane': lane_names[lane_no],
+                    'connection_y': coord,
+                    'swimlane_y': lane_coord,
+                    'severity': severity
+                })
+            else:
+                overlap_issues.append({
+                    'type': 'vertical_overlap',
+                    'connection': conn_id,
+                    'swimlane': lane_names[lane_no],
+                    'connection_x': coord,
+                    'swimlane_x': lane_coord,
+                    'severity': severity
+                })
         
         self.check_results["overlap_analysis"] = {
             'total_overlaps': len(overlap_issues),
@@ -312,13 +393,54 @@ class SwimlaneConnectionOverlapChecker:
                         print(f"      ...等共{len(rec['affected_connections'])}条连接线")
         
         return quality_score >= 80
+    
+    def check_directory(self, directory, recursive=True, quiet=True):
+        """
+        检查目录中的所有 .drawio 文件
+        
+        Args:
+            directory: 目录
+            recursive: 是否包含子目录
+            quiet: 是否隐藏单个文件的详细输出
+            
+        Returns:
+            {文件路径: 检查结果}，检查失败的文件只有 {"success": False, "error": 错误信息}
+        """
+        directory = Path(directory)
+        files = sorted(directory.rglob('*.drawio') if recursive else directory.glob('*.drawio'))
+        print(f"📁 检查目录: {directory}，共 {len(files)} 个流程图")
+        
+        results = {}
+        for file_path in files:
+            output = io.StringIO() if quiet else None
+            with contextlib.redirect_stdout(output) if quiet else contextlib.nullcontext():
+                success = self.check_overlap_issues(str(file_path))
+            if success:
+                results[str(file_path)] = dict(self.check_results, success=True)
+                overlaps = self.check_results.get("overlap_analysis", {}).get('total_overlaps', 0)
+            else:
+                results[str(file_path)] = {"success": False, "error": self.last_error}
+                overlaps = '-'
+            print(f"   {'✅' if success else '❌'} {file_path.name}: 重合问题 {overlaps} 个")
+        
+        return results
 
 def main():
     """主函数"""
     file_path = "s:\\PG-GMO\\office\\业务部\\综合订单全流程ERP系统业务流程图-重新生成版.drawio"
+    if len(sys.argv) > 1:
+        file_path = sys.argv[1]
     
     checker = SwimlaneConnectionOverlapChecker()
     
+    if Path(file_path).is_dir():
+        results = checker.check_directory(file_path)
+        report_file = Path(file_path) / f"泳道连接线重合检查报告_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(report_file, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"📄 检查结果已保存到: {report_file}")
+        return all(result['success'] for result in results.values())
+    
     try:
         success = checker.check_overlap_issues(file_path)
         
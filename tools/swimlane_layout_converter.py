@@ -3,12 +3,27 @@
 """
 部门泳道布局重排工具
 将综合订单全流程ERP系统业务流程图重新排列为部门泳道布局
+
+连接线由 OrthogonalRouter 一次完成正交路由（避开步骤框和泳道边框，平行线段错开），
+输出带端口位置和路径点，不再是穿过其他步骤的直线。
 """
 
 import xml.etree.ElementTree as ET
 from datetime import datetime
 import re
 
+from orthogonal_router import OrthogonalRouter
+
+
+def edge_geometry_xml(points, indent="          "):
+    """连接线的 mxGeometry（含路径点）"""
+    if not points:
+        return f'{indent}<mxGeometry relative="1" as="geometry" />'
+    lines = [f'{indent}<mxGeometry relative="1" as="geometry">', f'{indent}  <Array as="points">']
+    lines.extend(f'{indent}    <mxPoint x="{x}" y="{y}" />' for x, y in points)
+    lines.extend([f'{indent}  </Array>', f'{indent}</mxGeometry>'])
+    return '\n'.join(lines)
+
 class SwimlaneBPMNLayoutGenerator:
     def __init__(self):
         # 根据业务跟单流程图的部门泳道定义部门列
@@ -149,6 +164,10 @@ class SwimlaneBPMNLayoutGenerator:
         
         # 生成步骤单元格
         step_positions = {}  # 记录步骤位置，用于连接线
+        router = OrthogonalRouter()
+        for dept, config in self.department_columns.items():
+            router.add_lane(config['x'], 100, self.column_width, 1200)
+        router.add_node('title', 50, 20, 1800, 60)
         
         for dept, dept_step_list in dept_steps.items():
             if dept not in self.department_columns:
@@ -167,6 +186,7 @@ class SwimlaneBPMNLayoutGenerator:
                     'y': y + step['height'] // 2,
                     'cell_id': cell_id
                 }
+                router.add_node(cell_id, x, y, self.column_width - 20, step['height'])
                 
                 # 确定样式
                 if step['shape_type'] == 'ellipse':
@@ -181,7 +201,8 @@ class SwimlaneBPMNLayoutGenerator:
         </mxCell>''')
                 cell_id += 1
         
-        # 添加连接线（按步骤顺序连接）
+        # 添加连接线（按步骤顺序连接），先统一路由再输出
+        connections = []
         for i in range(len(steps) - 1):
             current_step = steps[i]
             next_step = steps[i + 1]
@@ -189,22 +210,28 @@ class SwimlaneBPMNLayoutGenerator:
             if current_step['id'] in step_positions and next_step['id'] in step_positions:
                 current_pos = step_positions[current_step['id']]
                 next_pos = step_positions[next_step['id']]
-                
-                # 判断是否跨部门连接
-                if current_step['department'] != next_step['department']:
-                    # 跨部门连接，使用特殊样式
-                    xml_cells.append(f'''        <mxCell id="{cell_id}" value="S{current_step['id']:02d}→S{next_step['id']:02d}" style="endArrow=classic;html=1;rounded=0;strokeWidth=2;strokeColor=#FF6B6B;fontSize=10;fontColor=#FF6B6B;" edge="1" parent="1">
-          <mxGeometry relative="1" as="geometry">
-            <mxPoint x="{current_pos['x']}" y="{current_pos['y']}" as="sourcePoint" />
-            <mxPoint x="{next_pos['x']}" y="{next_pos['y']}" as="targetPoint" />
-          </mxGeometry>
+                router.add_edge(cell_id, current_pos['cell_id'], next_pos['cell_id'])
+                connections.append((cell_id, current_step, next_step))
+                cell_id += 1
+        
+        router.route_all()
+        
+        for edge_id, current_step, next_step in connections:
+            source_id = step_positions[current_step['id']]['cell_id']
+            target_id = step_positions[next_step['id']]['cell_id']
+            geometry = edge_geometry_xml(router.waypoints(edge_id))
+            
+            # 判断是否跨部门连接
+            if current_step['department'] != next_step['department']:
+                # 跨部门连接，使用特殊样式
+                xml_cells.append(f'''        <mxCell id="{edge_id}" value="S{current_step['id']:02d}→S{next_step['id']:02d}" style="endArrow=classic;html=1;rounded=0;strokeWidth=2;strokeColor=#FF6B6B;fontSize=10;fontColor=#FF6B6B;{router.port_style(edge_id)}" edge="1" parent="1" source="{source_id}" target="{target_id}">
+{geometry}
         </mxCell>''')
-                else:
-                    # 同部门连接，使用普通样式
-                    xml_cells.append(f'''        <mxCell id="{cell_id}" value="" style="endArrow=classic;html=1;rounded=0;strokeWidth=2;strokeColor=#4CAF50;" edge="1" parent="1" source="{current_pos['cell_id']}" target="{next_pos['cell_id']}">
-          <mxGeometry relative="1" as="geometry" />
+            else:
+                # 同部门连接，使用普通样式
+                xml_cells.append(f'''        <mxCell id="{edge_id}" value="" style="endArrow=classic;html=1;rounded=0;strokeWidth=2;strokeColor=#4CAF50;{router.port_style(edge_id)}" edge="1" parent="1" source="{source_id}" target="{target_id}">
+{geometry}
         </mxCell>''')
-                cell_id += 1
         
         xml_footer = '''      </root>
     </mxGraphModel>
@@ -245,6 +272,7 @@ class SwimlaneBPMNLayoutGenerator:
         print(f"📐 新布局特点:")
         print(f"   • 采用部门泳道布局（各部门作为列）")
         print(f"   • 事件单元按部门垂直排列")
+        print(f"   • 连接线正交路由，避开步骤框和泳道边框")
         print(f"   • 跨部门连接线用红色标识")
         print(f"   • 同部门连接线用绿色标识")
         
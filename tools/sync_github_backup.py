@@ -14,7 +14,6 @@ GitHub备份同步验证脚本
 
 import sys
 import os
-import shutil
 import subprocess
 import yaml
 from pathlib import Path
@@ -27,6 +26,7 @@ TOOLS_DIR = PROJECT_ROOT / "tools"
 # 添加tools目录到Python路径
 sys.path.insert(0, str(TOOLS_DIR))
 from logging_config import get_logger
+from delta_sync import build_manifest, plan_sync, sync_tree
 
 logger = get_logger("sync_github_backup")
 
@@ -91,18 +91,22 @@ def compare_directories(source_dir, target_dir):
         differences.append(f"目标目录不存在: {target_dir}")
         return differences
     
-    # 比较文件和子目录
-    source_items = set(item.name for item in source_dir.rglob('*') if item.is_file())
-    target_items = set(item.name for item in target_dir.rglob('*') if item.is_file())
+    # 按相对路径比较大小、修改时间，必要时比较内容
+    source = build_manifest(source_dir)
+    target = build_manifest(target_dir)
+    plan = plan_sync(source, target)
     
-    only_in_source = source_items - target_items
-    only_in_target = target_items - source_items
+    only_in_source = [p for p in plan.copy if p not in target]
+    changed = [p for p in plan.copy if p in target]
     
     if only_in_source:
-        differences.append(f"仅在源目录中存在的文件: {list(only_in_source)}")
+        differences.append(f"仅在源目录中存在的文件({len(only_in_source)}): {only_in_source[:20]}")
     
-    if only_in_target:
-        differences.append(f"仅在目标目录中存在的文件: {list(only_in_target)}")
+    if changed:
+        differences.append(f"内容不同的文件({len(changed)}): {changed[:20]}")
+    
+    if plan.delete:
+        differences.append(f"仅在目标目录中存在的文件({len(plan.delete)}): {plan.delete[:20]}")
     
     return differences
 
@@ -115,13 +119,12 @@ def sync_directory(source_dir, target_dir, dry_run=False):
         return False
     
     try:
+        # 只复制变化的文件、删除已移除的文件
+        plan = sync_tree(source_dir, target_dir, dry_run=dry_run)
         if not dry_run:
-            if target_dir.exists():
-                shutil.rmtree(target_dir)
-            shutil.copytree(source_dir, target_dir)
             logger.info(f"目录同步完成: {target_dir}")
         else:
-            logger.info(f"[模拟] 将同步目录: {source_dir} -> {target_dir}")
+            logger.info(f"[模拟] 将复制 {len(plan.copy)} 个文件，删除 {len(plan.delete)} 个文件: {source_dir} -> {target_dir}")
         return True
     except Exception as e:
         logger.error(f"同步目录失败: {e}")
@@ -0,0 +1,164 @@
+"""违规记录存储测试"""
+
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+pytest.importorskip("watchdog")
+
+from compliance_monitor import ComplianceMonitor, ComplianceViolation, ViolationStore
+
+
+def make_violation(violation_type="unauthorized_file_creation", file_path="s:/PG-GMO/a.txt",
+                   severity="error", days_ago=0, resolved=False):
+    violation = ComplianceViolation(violation_type, file_path, f"描述: {file_path}", severity)
+    violation.timestamp = datetime.now() - timedelta(days=days_ago)
+    violation.resolved = resolved
+    return violation
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ViolationStore(tmp_path / "violations.sqlite3")
+    yield store
+    store.close()
+
+
+class TestViolationStore:
+    """追加、查询和计数"""
+
+    def test_append_and_query(self, store):
+        violation = make_violation()
+        violation.date_issues = ["发现未来日期: 2999年1月1日"]
+        violation_id = store.append(violation)
+
+        (loaded,) = store.query()
+        assert loaded.id == violation_id == violation.id
+        assert loaded.to_dict() == violation.to_dict()
+        assert loaded.date_issues == violation.date_issues
+        assert loaded.suggested_fixes == []
+
+    def test_query_filters(self, store):
+        store.append_many([
+            make_violation(file_path="s:/PG-GMO/docs/a.md", days_ago=3),
+            make_violation(file_path="s:/PG-GMO/docs/b.md", severity="warning", days_ago=2),
+            make_violation("directory_structure_violation", "s:/PG-GMO/tmp", "warning", days_ago=1),
+            make_violation(file_path="s:/PG-GMO/tools/c.py", resolved=True),
+        ])
+
+        def paths(**kwargs):
+            return [v.file_path for v in store.query(**kwargs)]
+
+        assert paths() == ["s:/PG-GMO/tools/c.py", "s:/PG-GMO/tmp", "s:/PG-GMO/docs/b.md", "s:/PG-GMO/docs/a.md"]
+        assert paths(violation_type="directory_structure_violation") == ["s:/PG-GMO/tmp"]
+        assert paths(severity="warning", limit=1) == ["s:/PG-GMO/tmp"]
+        assert paths(path_prefix="s:/PG-GMO/docs/") == ["s:/PG-GMO/docs/b.md", "s:/PG-GMO/docs/a.md"]
+        assert paths(since=datetime.now() - timedelta(days=2, hours=1),
+                     until=datetime.now() - timedelta(hours=1)) == ["s:/PG-GMO/tmp", "s:/PG-GMO/docs/b.md"]
+        assert paths(resolved=True) == ["s:/PG-GMO/tools/c.py"]
+
+
+class TestTriggers:
+    """触发器维护的汇总计数"""
+
+    def test_counts_follow_insert_and_resolve(self, store):
+        first = store.append(make_violation())
+        store.append(make_violation(severity="warning"))
+        store.append(make_violation("directory_structure_violation", severity="warning"))
+
+        store.mark_resolved(first, "已移动")
+        store.mark_resolved(first, "重复标记")
+
+        counts = store.counts()
+        assert counts["total"] == 3
+        assert counts["resolved"] == 1
+        assert counts["unresolved"] == 2
+        assert counts["by_severity"] == {"error": 1, "warning": 2}
+        assert counts["by_type"] == {
+            "unauthorized_file_creation": {"total": 2, "resolved": 1},
+            "directory_structure_violation": {"total": 1, "resolved": 0},
+        }
+        assert store.query(resolved=True)[0].resolution_action == "重复标记"
+
+    def test_counts_match_full_scan(self, store):
+        """任意写入、解决、清理之后，计数与全表统计一致"""
+        for i in range(20):
+            store.append(make_violation(("a", "b", "c")[i % 3], f"f{i}", ("error", "warning")[i % 2],
+                                        days_ago=i * 3, resolved=i % 4 == 0))
+        for violation in store.query(severity="warning"):
+            store.mark_resolved(violation.id)
+        store.compact(30)
+
+        rows = store.query()
+        counts = store.counts()
+        assert counts["total"] == len(rows)
+        assert counts["resolved"] == sum(v.resolved for v in rows)
+        for violation_type in ("a", "b", "c"):
+            assert counts["by_type"].get(violation_type, {"total": 0})["total"] == \
+                sum(v.violation_type == violation_type for v in rows)
+
+
+class TestCompact:
+    """保留期清理"""
+
+    def test_removes_only_old_resolved(self, store):
+        store.append_many([
+            make_violation(file_path="old-resolved", days_ago=40, resolved=True),
+            make_violation(file_path="old-open", days_ago=40),
+            make_violation(file_path="new-resolved", days_ago=5, resolved=True),
+        ])
+
+        assert store.compact(30) == 1
+        assert sorted(v.file_path for v in store.query()) == ["new-resolved", "old-open"]
+        assert store.counts()["total"] == 2
+        assert store.compact(30) == 0
+
+
+class TestMigration:
+    """旧版 violations.json 导入"""
+
+    def write_legacy(self, root: Path, items):
+        legacy = root / "logs" / "合规性报告" / "violations.json"
+        legacy.parent.mkdir(parents=True, exist_ok=True)
+        legacy.write_text(json.dumps(items, ensure_ascii=False), encoding="utf-8")
+        return legacy
+
+    def test_imports_once_and_renames(self, tmp_path):
+        item = make_violation(days_ago=1, resolved=True).to_dict()
+        item["date_issues"] = ["发现禁止的历史日期: 2024年"]
+        legacy = self.write_legacy(tmp_path, [item, make_violation(severity="warning").to_dict()])
+
+        monitor = ComplianceMonitor(str(tmp_path))
+        try:
+            assert not legacy.exists()
+            assert legacy.with_suffix(".json.migrated").exists()
+            counts = monitor.store.counts()
+            assert (counts["total"], counts["resolved"]) == (2, 1)
+            assert monitor.store.query(resolved=True)[0].date_issues == item["date_issues"]
+        finally:
+            monitor.store.close()
+
+        again = ComplianceMonitor(str(tmp_path))
+        try:
+            assert again.store.counts()["total"] == 2
+        finally:
+            again.store.close()
+
+    def test_does_not_import_into_non_empty_store(self, tmp_path):
+        """存储中已有记录时不重复导入，但旧文件仍改名"""
+        store = ViolationStore(tmp_path / "logs" / "合规性报告" / "violations.sqlite3")
+        store.append(make_violation())
+        store.close()
+        legacy = self.write_legacy(tmp_path, [make_violation().to_dict()])
+
+        monitor = ComplianceMonitor(str(tmp_path))
+        try:
+            assert monitor.store.counts()["total"] == 1
+            assert legacy.with_suffix(".json.migrated").exists()
+        finally:
+            monitor.store.close()
@@ -0,0 +1,65 @@
+"""文档日期扫描器测试"""
+
+import io
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from date_scanner import DateScanner, parse_date
+
+
+class TestDateScanner:
+    """带标签日期与禁止标记的单次扫描"""
+
+    def test_labeled_dates_with_positions(self):
+        text = "标题\n创建日期：2025年7月8日\n  更新日期: 2025-07-09\n发布日期：2025/8/1\n"
+        matches = DateScanner().scan_text(text)
+        assert [(m.label, m.value, m.line, m.column) for m in matches] == [
+            ("创建日期", "2025年7月8日", 2, 6),
+            ("更新日期", "2025-07-09", 3, 9),
+            ("发布日期", "2025/8/1", 4, 6),
+        ]
+        assert matches[1].line_content == "更新日期: 2025-07-09"
+
+    def test_label_and_date_must_be_on_same_line(self):
+        assert DateScanner().scan_text("创建日期：\n2025年7月8日\n") == []
+
+    def test_custom_labels(self):
+        scanner = DateScanner(labels=["创建日期"])
+        matches = scanner.scan_text("创建日期：2025-01-01\n发布日期：2099-01-01\n")
+        assert [m.label for m in matches] == ["创建日期"]
+
+    def test_forbidden_markers_inside_and_outside_labels(self):
+        scanner = DateScanner(forbidden_markers=["2024年", "2024年1月"])
+        matches = scanner.scan_text("写于2024年1月\n创建日期：2024年3月1日\n")
+        assert [(m.kind, m.value, m.line) for m in matches] == [
+            ("forbidden", "2024年1月", 1),
+            ("labeled", "2024年3月1日", 2),
+            ("forbidden", "2024年", 2),
+        ]
+
+    def test_stream_chunks_keep_line_numbers(self):
+        text = "".join(f"第{i}行\n" for i in range(1, 50)) + "修改日期：2025-02-03\n"
+        matches = list(DateScanner().scan_stream(io.StringIO(text), chunk_size=16))
+        assert [(m.value, m.line) for m in matches] == [("2025-02-03", 50)]
+
+    def test_scan_file(self, tmp_path):
+        path = tmp_path / "doc.md"
+        path.write_text("最后更新：2025年1月2日\n", encoding="utf-8")
+        assert [m.value for m in DateScanner().scan_file(path)] == ["2025年1月2日"]
+
+
+class TestParseDate:
+    def test_formats(self):
+        assert parse_date("2025年7月8日") == datetime(2025, 7, 8)
+        assert parse_date("2025-07-08") == datetime(2025, 7, 8)
+        assert parse_date("2025/7/8") == datetime(2025, 7, 8)
+        assert parse_date("2025年7月") is None
+
+    def test_invalid_date_raises(self):
+        with pytest.raises(ValueError):
+            parse_date("2025-02-30")
@@ -0,0 +1,29 @@
+"""目录增量同步测试"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from delta_sync import sync_tree
+
+
+class TestDefaultIgnore:
+    """默认只跳过.git、__pycache__和Python缓存文件"""
+
+    def test_dotfiles_and_lock_files_are_synced(self, tmp_path):
+        source = tmp_path / "src"
+        target = tmp_path / "dst"
+        for rel in (".gitignore", ".gitattributes", ".github/workflows/ci.yml", "poetry.lock",
+                    "yarn.lock", ".git/HEAD", "__pycache__/m.cpython-311.pyc", "m.pyc", "m.py"):
+            path = source / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(rel, encoding="utf-8")
+        (target / ".git").mkdir(parents=True)
+        (target / ".git" / "config").write_text("keep", encoding="utf-8")
+
+        sync_tree(source, target)
+
+        synced = sorted(p.relative_to(target).as_posix() for p in target.rglob("*") if p.is_file())
+        assert synced == [".git/config", ".gitattributes", ".github/workflows/ci.yml", ".gitignore",
+                          "m.py", "poetry.lock", "yarn.lock"]
@@ -0,0 +1,41 @@
+"""目录树渲染测试"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from tools.directory_tree import render_tree
+
+
+class TestRenderTree:
+    """render_tree 的目录判断"""
+
+    def test_ancestor_at_depth_boundary_is_directory(self):
+        """超过 max_depth 的路径不显示，但其第 max_depth 级祖先仍显示为目录"""
+        tree = render_tree(["a/b/c/d/f.txt", "a/g.txt"], max_depth=3)
+        assert tree.splitlines() == [
+            "├── a/",
+            "│   ├── b/",
+            "│   │   ├── c/",
+            "│   ├── g.txt",
+        ]
+
+    def test_empty_directory_from_dirs(self):
+        """dirs 中的空目录显示为目录，不访问文件系统"""
+        calls = []
+        tree = render_tree(["empty", "readme.md"], dirs={"empty"},
+                           probe=lambda path: calls.append(path) or False)
+        assert tree.splitlines() == ["├── empty/", "├── readme.md"]
+        assert calls == ["readme.md"]
+
+    def test_empty_directory_from_probe(self, tmp_path):
+        """未提供 dirs 时，叶子条目按 probe 判断"""
+        (tmp_path / "empty").mkdir()
+        (tmp_path / "readme.md").write_text("x", encoding="utf-8")
+        paths = [str(tmp_path / "empty"), str(tmp_path / "readme.md")]
+        tree = render_tree(paths, root=tmp_path, probe=lambda path: Path(path).is_dir())
+        assert tree.splitlines() == ["├── empty/", "├── readme.md"]
+
+    def test_trailing_slash_marks_directory(self):
+        assert render_tree(["logs/", "logs/archive/"]).splitlines() == ["├── logs/", "│   ├── archive/"]
@@ -0,0 +1,61 @@
+"""编码审计缓存测试"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from encoding_audit import DEFAULT_EXCLUDE_DIRS, EncodingAuditor
+
+
+class CountingAuditor(EncodingAuditor):
+    """记录实际检测的文件"""
+
+    def _detect(self, rel_paths):
+        self.detected = list(rel_paths)
+        return super()._detect(rel_paths)
+
+
+def fixer_auditor(root, cache_file):
+    # 与 batch_encoding_fixer 相同的范围
+    return CountingAuditor(root, exclude_dirs=DEFAULT_EXCLUDE_DIRS | {'bak'}, cache_file=cache_file)
+
+
+def analysis_auditor(root, cache_file):
+    # 与 encoding_compliance_analysis 相同的范围
+    return CountingAuditor(root, exclude_dirs=DEFAULT_EXCLUDE_DIRS, extensions={'.py', '.md'},
+                           cache_file=cache_file)
+
+
+class TestSharedCache:
+    """不同扫描范围共用缓存文件"""
+
+    def test_alternating_scopes_keep_each_others_entries(self, tmp_path):
+        (tmp_path / "bak").mkdir()
+        (tmp_path / "bak" / "old.py").write_text("print(1)\n", encoding="utf-8")
+        (tmp_path / "a.py").write_text("print(2)\n", encoding="utf-8")
+        (tmp_path / "notes.txt").write_text("文本\n", encoding="utf-8")
+        cache_file = tmp_path / ".cache" / "encoding_audit.json"
+
+        fixer_auditor(tmp_path, cache_file).audit()
+        analysis_auditor(tmp_path, cache_file).audit()
+
+        fixer = fixer_auditor(tmp_path, cache_file)
+        fixer.detected = []
+        assert [r.path for r in fixer.audit()] == ["a.py", "notes.txt"]
+        analysis = analysis_auditor(tmp_path, cache_file)
+        analysis.detected = []
+        assert [r.path for r in analysis.audit()] == ["a.py", "bak/old.py"]
+        assert fixer.detected == [] and analysis.detected == []
+
+    def test_deleted_files_are_pruned(self, tmp_path):
+        (tmp_path / "a.py").write_text("x = 1\n", encoding="utf-8")
+        (tmp_path / "b.py").write_text("y = 2\n", encoding="utf-8")
+        cache_file = tmp_path / ".cache" / "encoding_audit.json"
+        EncodingAuditor(tmp_path, cache_file=cache_file).audit()
+
+        (tmp_path / "b.py").unlink()
+        (tmp_path / "c.py").write_text("z = 3\n", encoding="utf-8")
+        auditor = EncodingAuditor(tmp_path, cache_file=cache_file)
+        auditor.audit()
+        assert set(auditor._cache) == {"a.py", "c.py"}
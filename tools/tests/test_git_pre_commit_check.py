@@ -0,0 +1,30 @@
+"""Git提交前检查的日期检查测试"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+try:
+    from git_pre_commit_check import GitPreCommitChecker
+except SyntaxError:  # logging_config、exceptions 使用了 Python 3.12 的多行 f-string
+    pytest.skip("git_pre_commit_check 需要 Python 3.12+", allow_module_level=True)
+
+
+class TestCheckFileDates:
+    """未来日期只警告，且只检查创建/修改/更新日期"""
+
+    def test_future_created_date_is_warning(self, tmp_path):
+        (tmp_path / "a.md").write_text("创建日期：2999-01-01\n", encoding="utf-8")
+        checker = GitPreCommitChecker(str(tmp_path))
+        assert checker.check_file_dates("a.md") is True
+        assert checker.errors == []
+        assert len(checker.warnings) == 1 and "2999-01-01" in checker.warnings[0]
+
+    def test_planned_release_date_is_ignored(self, tmp_path):
+        (tmp_path / "a.md").write_text("发布日期：2999-01-01\n完成日期：2999年1月1日\n", encoding="utf-8")
+        checker = GitPreCommitChecker(str(tmp_path))
+        assert checker.check_file_dates("a.md") is True
+        assert checker.errors == [] and checker.warnings == []
@@ -0,0 +1,101 @@
+"""HTML转PDF批量转换测试（使用占位渲染器，不启动浏览器）"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import html_to_pdf_converter
+from chrome_pdf_pool import PlaceholderRenderer
+from html_to_pdf_converter import HTMLToPDFConverter
+
+
+def make_html(directory, names):
+    files = []
+    for name in names:
+        path = directory / name
+        path.write_text(f"<html><body>{name}</body></html>", encoding="utf-8")
+        files.append(str(path))
+    return files
+
+
+class FlakyRenderer(PlaceholderRenderer):
+    """第一个创建的会话渲染时出错，其余正常"""
+
+    created = []
+
+    def __init__(self):
+        self.closed = False
+        self.fail = not FlakyRenderer.created
+        FlakyRenderer.created.append(self)
+
+    def render(self, url, output_pdf):
+        if self.fail:
+            raise RuntimeError("renderer crashed")
+        super().render(url, output_pdf)
+
+    def close(self):
+        self.closed = True
+
+
+class TestConvertBatch:
+    """批量转换"""
+
+    def test_output_paths_and_order(self, tmp_path):
+        files = make_html(tmp_path, [f"doc{i}.html" for i in range(8)])
+        out_dir = tmp_path / "pdf"
+
+        results = HTMLToPDFConverter().convert_batch(files, str(out_dir), workers=3,
+                                                     renderer_factory=PlaceholderRenderer)
+
+        assert [r["status"] for r in results] == ["success"] * 8
+        assert [r["input_file"] for r in results] == files
+        assert [r["output_file"] for r in results] == [str(out_dir / f"doc{i}.pdf") for i in range(8)]
+        assert all(Path(r["output_file"]).read_bytes().startswith(b"%PDF") for r in results)
+
+    def test_default_output_next_to_html(self, tmp_path):
+        files = make_html(tmp_path, ["a.html"])
+        result, = HTMLToPDFConverter().convert_batch(files, renderer_factory=PlaceholderRenderer)
+        assert result["output_file"] == str(tmp_path / "a.pdf")
+        assert (tmp_path / "a.pdf").exists()
+
+    def test_missing_input(self, tmp_path):
+        files = make_html(tmp_path, ["a.html"]) + [str(tmp_path / "missing.html")]
+        results = HTMLToPDFConverter().convert_batch(files, renderer_factory=PlaceholderRenderer)
+        assert results[0]["status"] == "success"
+        assert results[1]["status"] == "error"
+        assert "HTML文件不存在" in results[1]["message"]
+        assert not (tmp_path / "missing.pdf").exists()
+
+    def test_failed_session_is_discarded_and_rebuilt(self, tmp_path):
+        FlakyRenderer.created = []
+        files = make_html(tmp_path, ["a.html", "b.html", "c.html"])
+
+        results = HTMLToPDFConverter().convert_batch(files, workers=1, renderer_factory=FlakyRenderer)
+
+        assert [r["status"] for r in results] == ["error", "success", "success"]
+        assert "renderer crashed" in results[0]["message"]
+        assert len(FlakyRenderer.created) == 2
+        assert all(session.closed for session in FlakyRenderer.created)
+
+    def test_falls_back_to_cli_when_pool_unavailable(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(html_to_pdf_converter, "is_available", lambda: False)
+        converter = HTMLToPDFConverter()
+        calls = []
+        monkeypatch.setattr(converter, "convert_html_to_pdf_chrome",
+                            lambda html_file, output_pdf=None: calls.append((html_file, output_pdf))
+                            or {"status": "success"})
+        files = make_html(tmp_path, ["a.html", "b.html"])
+
+        results = converter.convert_batch(files, str(tmp_path / "out"))
+
+        assert results == [{"status": "success"}] * 2
+        assert calls == [(files[0], str(tmp_path / "out" / "a.pdf")),
+                         (files[1], str(tmp_path / "out" / "b.pdf"))]
+
+    def test_cli_fallback_without_chrome(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(html_to_pdf_converter, "is_available", lambda: False)
+        monkeypatch.setattr(html_to_pdf_converter, "find_chrome_executable", lambda: None)
+        results = HTMLToPDFConverter().convert_batch(make_html(tmp_path, ["a.html"]))
+        assert results[0]["status"] == "error"
+        assert "未找到Chrome" in results[0]["message"]
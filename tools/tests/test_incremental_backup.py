@@ -0,0 +1,104 @@
+"""增量备份测试"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import incremental_backup
+from incremental_backup import IncrementalBackup
+
+
+def make_project(root: Path) -> Path:
+    """docs 下一个文本文件、一个已压缩格式文件和一个子目录文件"""
+    (root / "docs" / "sub").mkdir(parents=True)
+    (root / "docs" / "readme.md").write_text("说明\n" * 1000, encoding="utf-8")
+    (root / "docs" / "report.pdf").write_bytes(bytes(range(256)) * 10)
+    (root / "docs" / "sub" / "data.txt").write_text("数据", encoding="utf-8")
+    return root
+
+
+def read_tree(root: Path) -> dict:
+    return {p.relative_to(root).as_posix(): p.read_bytes() for p in root.rglob("*") if p.is_file()}
+
+
+def make_engine(tmp_path: Path) -> IncrementalBackup:
+    project = make_project(tmp_path / "project")
+    return IncrementalBackup(project, tmp_path / "backup", backup_dirs=["docs"], max_workers=2)
+
+
+class TestRoundTrip:
+    """备份、校验、恢复往返"""
+
+    def test_backup_verify_restore(self, tmp_path):
+        """恢复出的文件内容和修改时间与源文件一致"""
+        engine = make_engine(tmp_path)
+        manifest = engine.backup()
+
+        assert manifest["stats"]["files"] == 3
+        assert engine.verify() == []
+
+        target = tmp_path / "restored"
+        assert engine.restore(manifest["name"], target) == 3
+        assert read_tree(target) == read_tree(engine.project_root)
+        source = engine.project_root / "docs" / "readme.md"
+        assert (target / "docs" / "readme.md").stat().st_mtime_ns == source.stat().st_mtime_ns
+
+    def test_restore_selected_paths(self, tmp_path):
+        """paths 限定目录前缀时只恢复该目录下的文件"""
+        engine = make_engine(tmp_path)
+        manifest = engine.backup()
+
+        target = tmp_path / "restored"
+        assert engine.restore(manifest["name"], target, ["docs/sub/"]) == 1
+        assert list(read_tree(target)) == ["docs/sub/data.txt"]
+
+    def test_second_backup_reuses_unchanged_files(self, tmp_path):
+        """第二次备份只读取变化的文件，恢复得到新内容"""
+        engine = make_engine(tmp_path)
+        engine.backup()
+        (engine.project_root / "docs" / "sub" / "data.txt").write_text("新数据", encoding="utf-8")
+
+        manifest = engine.backup()
+
+        assert manifest["stats"]["unchanged"] == 2
+        assert manifest["stats"]["changed"] == 1
+        target = tmp_path / "restored"
+        engine.restore(None, target)
+        assert (target / "docs" / "sub" / "data.txt").read_text(encoding="utf-8") == "新数据"
+
+    def test_verify_reports_corrupted_chunk(self, tmp_path):
+        """块被篡改时 verify 报告引用该块的文件"""
+        engine = make_engine(tmp_path)
+        manifest = engine.backup()
+        digest = manifest["files"]["docs/sub/data.txt"]["chunks"][0]
+        engine.store.object_path(digest).write_bytes(b"Rbroken")
+
+        problems = engine.verify()
+
+        assert len(problems) == 1
+        assert problems[0].startswith("docs/sub/data.txt: 块已损坏")
+
+
+class TestManifestNames:
+    """清单命名"""
+
+    def test_same_timestamp_gets_unique_names(self, tmp_path, monkeypatch):
+        """同一时刻的两次备份生成不同的清单，最新清单是后一次"""
+        class FrozenDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return cls(2025, 1, 26, 10, 30, 0, 123456)
+
+        monkeypatch.setattr(incremental_backup, "datetime", FrozenDatetime)
+        engine = make_engine(tmp_path)
+        first = engine.backup()
+        (engine.project_root / "docs" / "sub" / "data.txt").write_text("新数据", encoding="utf-8")
+        second = engine.backup()
+
+        assert first["name"] == "20250126_103000_123456"
+        assert second["name"] == "20250126_103000_123456_001"
+        assert [p.stem for p in engine.list_manifests()] == [first["name"], second["name"]]
+        assert engine.load_manifest(first["name"])["stats"]["changed"] == 3
+        assert engine.load_manifest()["name"] == second["name"]
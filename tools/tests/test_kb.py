@@ -0,0 +1,90 @@
+"""项目看板图表渲染测试"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+plt = pytest.importorskip("matplotlib.pyplot")
+
+import kb
+from kb import KanbanChartRenderer, ProjectKanban
+
+DPI = 40
+
+# 测试环境没有中文字体
+pytestmark = pytest.mark.filterwarnings("ignore:Glyph .* missing from font")
+
+
+@pytest.fixture
+def kanban(tmp_path):
+    return ProjectKanban(str(tmp_path))
+
+
+def panel_pixels(dpi):
+    width, height = KanbanChartRenderer.PANEL_SIZE
+    return int(height * dpi), int(width * dpi)
+
+
+class TestKanbanChartRenderer:
+    """面板绘制与拼接"""
+
+    def test_render_panel(self, kanban):
+        pixels = KanbanChartRenderer(kanban.modules).render_panel(0, DPI)
+        assert pixels.shape == panel_pixels(DPI) + (4,)
+
+    def test_render_stitches_panels_without_pyplot_figures(self, kanban, tmp_path):
+        """四个面板拼成 2×2 加标题栏，不创建 pyplot 图窗"""
+        output = tmp_path / "chart.png"
+        KanbanChartRenderer(kanban.modules).render(output, dpi=DPI)
+
+        height, width = panel_pixels(DPI)
+        assert plt.imread(output).shape[:2] == (2 * height + int(KanbanChartRenderer.TITLE_HEIGHT * DPI), 2 * width)
+        assert plt.get_fignums() == []
+
+    def test_parallel_matches_serial(self, kanban, tmp_path):
+        renderer = KanbanChartRenderer(kanban.modules)
+        renderer.render(tmp_path / "serial.png", dpi=DPI)
+        renderer.render(tmp_path / "parallel.png", dpi=DPI, parallel=True)
+
+        assert (plt.imread(tmp_path / "serial.png") == plt.imread(tmp_path / "parallel.png")).all()
+
+
+class TestRenderSkipping:
+    """模块状态未变化时跳过渲染"""
+
+    def test_chart_rendered_only_when_model_changes(self, kanban):
+        assert kanban.generate_overview_chart(dpi=DPI)
+        assert not kanban.generate_overview_chart(dpi=DPI)
+
+        kanban.modules["后端API模块"]["用户认证模块"]["progress"] = 50
+        assert kanban.generate_overview_chart(dpi=DPI)
+        assert kanban.generate_overview_chart(dpi=DPI, force=True)
+
+    def test_missing_output_is_rendered_again(self, kanban):
+        kanban.generate_overview_chart(dpi=DPI)
+        (kanban.project_root / "docs" / "03-管理" / "项目进度看板.png").unlink()
+        assert kanban.generate_overview_chart(dpi=DPI)
+
+    def test_high_res_export_uses_separate_file(self, kanban, monkeypatch):
+        """高清导出保存到单独的文件，与日常图表各自记录渲染状态"""
+        monkeypatch.setattr(kb, "HIGH_RES_DPI", 2 * DPI)
+        kanban.generate_overview_chart(dpi=DPI)
+
+        assert kanban.generate_overview_chart(dpi=2 * DPI)
+        assert (kanban.project_root / "docs" / "03-管理" / "项目进度看板_高清.png").exists()
+        assert not kanban.generate_overview_chart(dpi=DPI)
+
+    def test_markdown_not_rewritten_when_unchanged(self, kanban):
+        kanban_file = kanban.project_root / "docs" / "03-管理" / "看板.md"
+        kanban_file.parent.mkdir(parents=True)
+        kanban.update_kanban_md()
+        kanban_file.write_text("未改动", encoding="utf-8")
+
+        kanban.update_kanban_md()
+        assert kanban_file.read_text(encoding="utf-8") == "未改动"
+
+        kanban.update_kanban_md(force=True)
+        assert kanban_file.read_text(encoding="utf-8") != "未改动"
@@ -0,0 +1,125 @@
+"""正交连接线路由测试"""
+
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orthogonal_router import OrthogonalRouter
+
+SIZE = (80, 40)
+
+
+def grid_router(seed, gap=20, count=30, edges=40, columns=6):
+    """count 个节点按 columns 列网格排列，随机连接 edges 条连接线"""
+    rnd = random.Random(seed)
+    router = OrthogonalRouter()
+    for i in range(count):
+        router.add_node(f"n{i}", 100 + (i % columns) * (SIZE[0] + gap),
+                        100 + (i // columns) * (SIZE[1] + gap), *SIZE)
+    ids = list(router.nodes)
+    for k in range(edges):
+        router.add_edge(f"e{k}", *rnd.sample(ids, 2))
+    return router
+
+
+def crossings(router):
+    """穿过非端点节点的 (连接线id, 节点id)"""
+    found = []
+    for edge_id, path in router.routes.items():
+        ends = router.edges[edge_id]
+        for p, q in zip(path, path[1:]):
+            found.extend((edge_id, node_id) for node_id, rect in router.nodes.items()
+                         if node_id not in ends and rect.crosses(p, q))
+    return found
+
+
+def is_clear(router, node_id, x, y, gap):
+    """节点移动到 (x, y) 后与其他节点的间距不小于 gap"""
+    rect = router.nodes[node_id]
+    return all(x >= other.right + gap or other.x >= x + rect.width + gap
+               or y >= other.bottom + gap or other.y >= y + rect.height + gap
+               for other_id, other in router.nodes.items() if other_id != node_id)
+
+
+class TestRouteAll:
+    """全部路由"""
+
+    def test_tight_grid_has_no_shared_segments_or_crossings(self):
+        """节点间距恰为 2×margin 时也不共用线段、不穿过节点"""
+        for seed in range(10):
+            router = grid_router(seed)
+            router.route_all()
+            assert router.shared_segments() == [], seed
+            assert crossings(router) == [], seed
+
+    def test_facing_ports_are_separated(self):
+        """间距 2×margin 的两个节点上相对的端口错开，引出线不共线"""
+        router = OrthogonalRouter()
+        router.add_node("a", 0, 0, *SIZE)
+        router.add_node("b", 100, 0, *SIZE)
+        router.add_node("c", 200, -60, *SIZE)
+        router.add_node("d", -100, 60, *SIZE)
+        router.add_edge("ac", "a", "c")
+        router.add_edge("db", "d", "b")
+        router.route_all()
+
+        a_port, b_port = router.ports["ac"][0], router.ports["db"][1]
+        assert (a_port.side, b_port.side) == ("right", "left")
+        assert a_port.point[1] != b_port.point[1]
+        assert router.shared_segments() == []
+        assert crossings(router) == []
+
+
+class TestMoveNode:
+    """移动节点后的增量路由"""
+
+    def test_reroutes_only_affected_edges(self):
+        """只有与被移动节点相连的连接线重新路由，其余路径不变"""
+        router = OrthogonalRouter()
+        for i, x in enumerate((0, 200, 400)):
+            router.add_node(f"top{i}", x, 0, *SIZE)
+            router.add_node(f"bottom{i}", x, 200, *SIZE)
+        router.add_edge("left", "top0", "bottom0")
+        router.add_edge("middle", "top1", "bottom1")
+        router.add_edge("right", "top2", "bottom2")
+        before = {edge_id: list(path) for edge_id, path in router.route_all().items()}
+
+        affected = router.move_node("bottom2", 440, 240)
+
+        assert affected == {"right"}
+        assert router.routes["left"] == before["left"]
+        assert router.routes["middle"] == before["middle"]
+        assert router.routes["right"][-1] == (480, 240)
+
+    def test_reroutes_edges_crossing_new_position(self):
+        """节点移动到已有连接线上时，被挡住的连接线也重新路由并绕开"""
+        router = OrthogonalRouter()
+        router.add_node("a", 0, 0, *SIZE)
+        router.add_node("b", 0, 300, *SIZE)
+        router.add_node("c", 300, 0, *SIZE)
+        router.add_edge("ab", "a", "b")
+        router.route_all()
+
+        affected = router.move_node("c", 0, 140)
+
+        assert affected == {"ab"}
+        assert crossings(router) == []
+
+    def test_moves_keep_invariants(self):
+        """多次移动（保持 2×margin 间距）后仍不共用线段、不穿过节点"""
+        for seed in range(5):
+            router = grid_router(seed)
+            router.route_all()
+            rnd = random.Random(seed)
+            moved = 0
+            while moved < 5:
+                node_id = rnd.choice(list(router.nodes))
+                rect = router.nodes[node_id]
+                x, y = rect.x + rnd.randint(-200, 200), rect.y + rnd.randint(-200, 200)
+                if is_clear(router, node_id, x, y, 2 * router.margin):
+                    router.move_node(node_id, x, y)
+                    moved += 1
+            assert router.shared_segments() == [], seed
+            assert crossings(router) == [], seed
@@ -0,0 +1,151 @@
+"""前置操作检查测试"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pre_operation_check
+from pre_operation_check import PathTrie, ProjectComplianceChecker
+
+# (相对路径, 操作, 普通模式结果, 增强模式结果)，与规则编译前的逐条检查实现一致
+DECISIONS = [
+    ("README.md", "create", False, False),
+    ("notes.txt", "create", False, False),
+    ("setup.py", "create", False, False),
+    ("random.bin", "create", False, False),
+    ("docs/image.png", "create", False, False),
+    ("docs/notes.txt", "create", True, True),
+    ("tools/run.sh", "create", True, True),
+    ("tools/data.csv", "create", False, False),
+    ("weird/file.txt", "create", False, False),
+    ("docs/bad|name.txt", "create", False, False),
+    ("tools/finish.py", "modify", False, False),
+    ("docs/01-设计/技术方案.md", "delete", False, False),
+    ("docs/01-设计/技术方案.md", "create", True, False),
+    ("tools/sub/finish.py", "modify", True, False),
+    ("project/src/app.js", "delete", True, True),
+    ("AI助理生产成果/part.prt", "create", False, False),
+    ("logs/run.log", "create", True, True),
+]
+
+
+def write_config(root: Path, protected_patterns):
+    config_file = root / "docs" / "03-管理" / "project_config.yaml"
+    config_file.parent.mkdir(parents=True, exist_ok=True)
+    config = {"compliance": {"enhanced_pre_check": {
+        "monitoring": {"log_violations": True, "block_operations": True},
+        "strict_mode": {"enabled": False, "protected_patterns": protected_patterns},
+    }}}
+    config_file.write_text(json.dumps(config, ensure_ascii=False), encoding="utf-8")
+
+
+class TestPathTrie:
+    """路径前缀树"""
+
+    def test_longest_prefix(self):
+        trie = PathTrie()
+        trie.insert(["docs"], "docs")
+        trie.insert(["docs", "01-设计"], "design")
+
+        assert trie.longest_prefix(["docs", "01-设计", "a.md"]) == "design"
+        assert trie.longest_prefix(["docs", "02-开发", "a.md"]) == "docs"
+        assert trie.longest_prefix(["tools", "a.py"]) is None
+
+
+class TestDecisions:
+    """编译后的规则与逐条检查的判定一致"""
+
+    @pytest.mark.parametrize("rel_path,operation,plain,enhanced", DECISIONS)
+    def test_plain_mode(self, tmp_path, rel_path, operation, plain, enhanced):
+        checker = ProjectComplianceChecker(str(tmp_path), enhanced_mode=False)
+        passed, _ = checker.check_file_operation(str(tmp_path / rel_path), operation)
+        assert passed is plain
+
+    @pytest.mark.parametrize("rel_path,operation,plain,enhanced", DECISIONS)
+    def test_enhanced_mode(self, tmp_path, rel_path, operation, plain, enhanced):
+        checker = ProjectComplianceChecker(str(tmp_path), enhanced_mode=True)
+        passed, _ = checker.check_file_operation(str(tmp_path / rel_path), operation)
+        assert passed is enhanced
+
+    def test_protected_directory_prefix_only_matches_whole_segments(self, tmp_path):
+        """受保护文件按路径段匹配，tools/finish.py.bak 不受保护"""
+        checker = ProjectComplianceChecker(str(tmp_path), enhanced_mode=False)
+        _, messages = checker.check_file_operation(str(tmp_path / "tools" / "finish.py.bak"), "modify")
+        assert not any("核心文件" in message for message in messages)
+
+    def test_path_outside_project_root(self, tmp_path):
+        """项目根目录以外的路径判为不通过，不抛出异常"""
+        checker = ProjectComplianceChecker(str(tmp_path / "root"), enhanced_mode=False)
+        passed, messages = checker.check_file_operation(str(tmp_path / "other" / "a.txt"), "create")
+        assert not passed
+        assert messages[0].startswith("[错误] 文件路径不在项目根目录下")
+
+
+class TestResultCache:
+    """检查结果缓存"""
+
+    def test_repeated_check_uses_cache(self, tmp_path, monkeypatch):
+        checker = ProjectComplianceChecker(str(tmp_path), enhanced_mode=False)
+        calls = []
+        evaluate = checker._evaluate_rules
+        monkeypatch.setattr(checker, "_evaluate_rules",
+                            lambda *args: calls.append(args) or evaluate(*args))
+
+        first = checker.check_file_operation(str(tmp_path / "docs" / "a.txt"), "create")
+        second = checker.check_file_operation(str(tmp_path / "docs" / "a.txt"), "create")
+        checker.check_file_operation(str(tmp_path / "docs" / "a.txt"), "delete")
+
+        assert first == second
+        assert len(calls) == 2
+
+    def test_config_change_invalidates_cache(self, tmp_path, monkeypatch):
+        """配置文件变化后重新编译规则，之前缓存的结果不再使用"""
+        monkeypatch.setattr(pre_operation_check, "CONFIG_CHECK_INTERVAL", 0)
+        checker = ProjectComplianceChecker(str(tmp_path), enhanced_mode=True)
+        target = str(tmp_path / "docs" / "notes.txt")
+        assert checker.check_file_operation(target, "create")[0]
+
+        write_config(tmp_path, ["*.txt"])
+        passed, messages = checker.check_file_operation(target, "create")
+
+        assert not passed
+        assert messages[0] == "[保护模式] 文件受保护: notes.txt 匹配模式 *.txt"
+        assert checker.check_file_operation(str(tmp_path / "docs" / "guide.md"), "create")[0]
+
+
+class TestCheckMany:
+    """批量检查"""
+
+    def test_matches_single_checks(self, tmp_path):
+        paths = list(dict.fromkeys(str(tmp_path / rel_path) for rel_path, _, _, _ in DECISIONS))
+        results = ProjectComplianceChecker(str(tmp_path)).check_many(paths)
+
+        single = ProjectComplianceChecker(str(tmp_path))
+        assert list(results) == paths
+        for path in paths:
+            assert results[path] == single.check_file_operation(path, "create")
+
+    def test_writes_violation_log_once(self, tmp_path):
+        """批量检查的违规记录在结束时一起写入"""
+        checker = ProjectComplianceChecker(str(tmp_path))
+        results = checker.check_many([str(tmp_path / "notes.txt"), str(tmp_path / "docs" / "a.txt"),
+                                      str(tmp_path / "weird" / "b.txt")])
+
+        lines = checker.violation_log_path.read_text(encoding="utf-8").splitlines()
+        failed = [path for path, (passed, _) in results.items() if not passed]
+        assert [json.loads(line)["file_path"] for line in lines] == failed
+        assert checker.get_violation_statistics()["total_violations"] == 2
+
+    def test_skip_date_check(self, tmp_path):
+        """check_dates=False 时不读取文件内容"""
+        target = tmp_path / "docs" / "a.txt"
+        target.parent.mkdir()
+        target.write_text("创建日期：2999年1月1日", encoding="utf-8")
+        checker = ProjectComplianceChecker(str(tmp_path))
+
+        assert not checker.check_many([str(target)])[str(target)][0]
+        assert checker.check_many([str(target)], check_dates=False)[str(target)][0]
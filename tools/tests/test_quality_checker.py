@@ -0,0 +1,182 @@
+"""流程图质量检查测试"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import quality_checker
+from quality_checker import DiagramModel, FlowchartQualityChecker, register_check
+
+DIAGRAM = """<mxfile><diagram><mxGraphModel><root>
+<mxCell id="0"/><mxCell id="1" parent="0"/>
+<mxCell id="lane" value="销售部" style="swimlane;" vertex="1" parent="1">
+  <mxGeometry x="100" y="100" width="300" height="400" as="geometry"/>
+</mxCell>
+<mxCell id="A" value="开始" style="rounded=1;" vertex="1" parent="lane">
+  <mxGeometry x="20" y="40" width="100" height="50" as="geometry"/>
+</mxCell>
+<mxCell id="B" value="处理" style="rounded=1;" vertex="1" parent="1">
+  <mxGeometry x="150" y="160" width="100" height="50" as="geometry"/>
+</mxCell>
+<mxCell id="C" value="孤立" style="rounded=1;" vertex="1" parent="1">
+  <mxGeometry x="600" y="600" width="100" height="50" as="geometry"/>
+</mxCell>
+<mxCell id="T" value="标题" style="text;html=1;" vertex="1" parent="1">
+  <mxGeometry x="100" y="100" width="300" height="30" as="geometry"/>
+</mxCell>
+<mxCell id="e1" edge="1" parent="1" source="A" target="B"><mxGeometry relative="1" as="geometry"/></mxCell>
+<mxCell id="lbl" value="是" style="edgeLabel;" vertex="1" parent="e1">
+  <mxGeometry x="-0.5" relative="1" as="geometry"/>
+</mxCell>
+%s
+</root></mxGraphModel></diagram></mxfile>
+"""
+
+DANGLING_EDGE = '<mxCell id="e2" edge="1" parent="1" source="B" target="missing"><mxGeometry relative="1" as="geometry"/></mxCell>'
+
+
+def write(directory, name, extra=""):
+    path = directory / name
+    path.write_text(DIAGRAM % extra, encoding="utf-8")
+    return path
+
+
+class TestDiagramModel:
+    """紧凑模型与共用索引"""
+
+    def setup_method(self):
+        self.model = DiagramModel.from_bytes((DIAGRAM % DANGLING_EDGE).encode("utf-8"))
+
+    def rect(self, cell_id):
+        return self.model.node_rects[self.model.node_index[(0, cell_id)]]
+
+    def test_child_coordinates_are_absolute(self):
+        assert self.rect("A") == (120.0, 140.0, 100.0, 50.0)
+        assert self.rect("B") == (150.0, 160.0, 100.0, 50.0)
+
+    def test_shapes_exclude_containers_text_and_edge_labels(self):
+        shapes = {key[1] for key, is_shape in zip(self.model.node_keys, self.model.node_is_shape) if is_shape}
+        assert shapes == {"A", "B", "C"}
+        assert (0, "lbl") not in self.model.node_index
+
+    def test_adjacency_index(self):
+        outgoing, incoming = self.model.adjacency
+        a, b = self.model.node_index[(0, "A")], self.model.node_index[(0, "B")]
+        assert [self.model.edges[i][0] for i in outgoing[a]] == ["e1"]
+        assert [self.model.edges[i][0] for i in incoming[b]] == ["e1"]
+        assert [self.model.edges[i][0] for i in outgoing[b]] == ["e2"]
+
+    def test_overlapping_pairs_uses_spatial_index(self):
+        pairs = [(self.model.node_keys[a][1], self.model.node_keys[b][1])
+                 for a, b in self.model.overlapping_pairs()]
+        assert pairs == [("A", "B")]
+
+    def test_pages_have_separate_ids(self):
+        page = "<diagram><mxGraphModel><root><mxCell id='0'/><mxCell id='n' vertex='1' parent='0'>" \
+               "<mxGeometry x='0' y='0' width='10' height='10' as='geometry'/></mxCell></root></mxGraphModel></diagram>"
+        model = DiagramModel.from_bytes(f"<mxfile>{page}{page}</mxfile>".encode("utf-8"))
+        assert model.page_count == 2
+        assert set(model.node_index) == {(0, "n"), (1, "n")}
+
+
+class TestChecks:
+    """检查项与判定结果"""
+
+    def test_new_model_checks_do_not_fail_the_gate(self, tmp_path):
+        path = write(tmp_path, "HQ-QP-01_流程图.drawio", DANGLING_EDGE)
+        info = FlowchartQualityChecker(tmp_path, cache_file=None).check_single_file(path)
+        assert info["is_valid"] is True
+        assert any("missing" in issue for issue in info["content_issues"])
+        assert any("节点重叠" in issue for issue in info["content_issues"])
+        assert any("孤立节点" in issue and "C" in issue for issue in info["content_issues"])
+
+    def test_baseline_checks_still_fail(self, tmp_path):
+        path = tmp_path / "bad.drawio"
+        path.write_text("<mxfile><diagram>", encoding="utf-8")
+        info = FlowchartQualityChecker(tmp_path, cache_file=None).check_single_file(path)
+        assert info["is_valid"] is False
+        assert any("文件名" in issue for issue in info["naming_issues"])
+        assert any(issue.startswith("XML格式错误") for issue in info["content_issues"])
+
+    def test_register_and_select_checks(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(quality_checker, "CHECKS", dict(quality_checker.CHECKS))
+
+        @register_check("too_many_edges")
+        def too_many_edges(model):
+            return ["连接线过多"] if len(model.edges) > 1 else []
+
+        path = write(tmp_path, "HQ-QP-01_流程图.drawio", DANGLING_EDGE)
+        checker = FlowchartQualityChecker(tmp_path, cache_file=None, checks=["naming", "too_many_edges"])
+        info = checker.check_single_file(path)
+        assert info["content_issues"] == ["连接线过多"]
+        assert info["is_valid"] is False
+
+    def test_unknown_check_and_scope_are_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            FlowchartQualityChecker(tmp_path, checks=["no_such_check"])
+        with pytest.raises(ValueError):
+            register_check("x", scope="directory")
+
+
+class TestBatch:
+    """批量检查、缓存和进程池"""
+
+    def make_library(self, directory):
+        for i in range(6):
+            # 每个文件内容不同（缓存按内容哈希命中）
+            write(directory, f"HQ-QP-{i:02d}_流程图.drawio", (DANGLING_EDGE if i % 2 else "") + f"<!-- {i} -->")
+        (directory / "broken_流程图.drawio").write_text("not xml", encoding="utf-8")
+
+    def run(self, directory, cache_file, **kwargs):
+        checker = FlowchartQualityChecker(directory, cache_file=cache_file)
+        return checker.run_quality_check(**kwargs)
+
+    @staticmethod
+    def details(report):
+        return [(d["filename"], d["is_valid"], d["naming_issues"], d["content_issues"])
+                for d in report["file_details"]]
+
+    def test_cache_hits_and_force(self, tmp_path):
+        library = tmp_path / "lib"
+        library.mkdir()
+        self.make_library(library)
+        cache_file = tmp_path / "cache.sqlite3"
+
+        first = self.run(library, cache_file, workers=1)
+        assert first["cached_files"] == 0
+        second = self.run(library, cache_file, workers=1)
+        assert second["cached_files"] == 7
+        assert self.details(second) == self.details(first)
+        assert self.run(library, cache_file, workers=1, force=True)["cached_files"] == 0
+
+    def test_cache_is_keyed_on_content(self, tmp_path):
+        library = tmp_path / "lib"
+        library.mkdir()
+        write(library, "HQ-QP-01_流程图.drawio")
+        cache_file = tmp_path / "cache.sqlite3"
+        self.run(library, cache_file, workers=1)
+
+        # 相同内容、不同文件名：命中缓存，但命名检查按新文件名执行
+        (library / "HQ-QP-01_流程图.drawio").rename(library / "renamed.drawio")
+        report = self.run(library, cache_file, workers=1)
+        assert report["cached_files"] == 1
+        assert report["file_details"][0]["naming_issues"]
+
+        # 内容变化后重新检查
+        write(library, "renamed.drawio", DANGLING_EDGE)
+        report = self.run(library, cache_file, workers=1)
+        assert report["cached_files"] == 0
+        assert any("missing" in issue for issue in report["file_details"][0]["content_issues"])
+
+    def test_pool_matches_serial(self, tmp_path):
+        library = tmp_path / "lib"
+        library.mkdir()
+        self.make_library(library)
+
+        serial = self.run(library, None, workers=1)
+        parallel = self.run(library, None, workers=2)
+        assert self.details(parallel) == self.details(serial)
+        assert [parallel[k] for k in ("total_files", "valid_files", "invalid_files")] == [7, 6, 1]
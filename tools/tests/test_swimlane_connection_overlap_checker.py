@@ -0,0 +1,52 @@
+"""泳道与连接线重合检查测试"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from swimlane_connection_overlap_checker import SwimlaneConnectionOverlapChecker
+
+# 一个泳道（左边框 x=100），一条连接线沿 x=102 垂直经过
+OVERLAPPING = """<mxfile><diagram><mxGraphModel><root>
+<mxCell id="0"/><mxCell id="1" parent="0"/>
+<mxCell id="lane" value="销售部" style="swimlane;" vertex="1" parent="1">
+  <mxGeometry x="100" y="100" width="200" height="400" as="geometry"/>
+</mxCell>
+<mxCell id="e1" edge="1" parent="1">
+  <mxGeometry relative="1" as="geometry">
+    <Array as="points"><mxPoint x="102" y="150"/><mxPoint x="102" y="300"/></Array>
+  </mxGeometry>
+</mxCell>
+</root></mxGraphModel></diagram></mxfile>
+"""
+
+
+class TestCheckDirectory:
+    """目录批量检查"""
+
+    def test_failed_file_does_not_inherit_previous_results(self, tmp_path):
+        (tmp_path / "a.drawio").write_text(OVERLAPPING, encoding="utf-8")
+        (tmp_path / "b.drawio").write_text("<mxfile><diagram>", encoding="utf-8")
+
+        results = SwimlaneConnectionOverlapChecker().check_directory(tmp_path)
+
+        good = results[str(tmp_path / "a.drawio")]
+        assert good["success"] is True
+        assert list(good["swimlane_positions"]) == ["销售部"]
+        assert good["overlap_analysis"]["total_overlaps"] == 1
+
+        bad = results[str(tmp_path / "b.drawio")]
+        assert bad["success"] is False
+        assert set(bad) == {"success", "error"}
+        assert bad["error"]
+
+    def test_state_is_cleared_after_failure(self, tmp_path):
+        checker = SwimlaneConnectionOverlapChecker()
+        (tmp_path / "a.drawio").write_text(OVERLAPPING, encoding="utf-8")
+        (tmp_path / "b.drawio").write_text("not xml", encoding="utf-8")
+
+        assert checker.check_overlap_issues(str(tmp_path / "a.drawio"))
+        assert not checker.check_overlap_issues(str(tmp_path / "b.drawio"))
+        assert checker.check_results["swimlane_positions"] == {}
+        assert checker.segment_index is None
@@ -0,0 +1,46 @@
+"""多模式文本扫描引擎测试"""
+
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from text_pattern_scanner import MultiPatternScanner
+
+# 与 ProjectNameStandardizer 相同顺序的部分规则
+RULES = [
+    (r"\b3AI\b", "PG-GMO"),
+    (r"\b3ai\b", "PG-GMO"),
+    (r'container_name:\s*"3ai-([\w-]+)"', r'container_name: "3AI-\1"'),
+    (r"3ai_db", "3AI_db"),
+    (r"@3ai\.studio", "@3AI.studio"),
+    (r'"name":\s*"3ai-([\w-]+)"', r'"name": "3AI-\1"'),
+]
+
+
+def chained_sub(text):
+    for pattern, replacement in RULES:
+        text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+    return text
+
+
+class TestSubstitute:
+    """替换结果与逐条 re.sub 一致"""
+
+    def setup_method(self):
+        self.scanner = MultiPatternScanner([p for p, _ in RULES], replacements=[r for _, r in RULES])
+
+    def test_earlier_rule_applies_first(self):
+        assert self.scanner.substitute('container_name: "3ai-web"') == 'container_name: "PG-GMO-web"'
+        assert self.scanner.substitute('"name": "3ai-app"') == '"name": "PG-GMO-app"'
+        assert self.scanner.substitute("user@3ai.studio") == "user@PG-GMO.studio"
+
+    def test_matches_chained_sub(self):
+        for text in ['db: 3ai_db, 3AI', 'x = "3Ai-tool" @3ai.studio', "无匹配内容", "3ai_test_db"]:
+            assert self.scanner.substitute(text) == chained_sub(text)
+
+    def test_iter_substitutions_reports_each_changing_rule(self):
+        steps = list(self.scanner.iter_substitutions("3AI and 3ai_db"))
+        assert [rule for rule, _ in steps] == [0, 3]
+        assert steps[-1][1] == "PG-GMO and 3AI_db"
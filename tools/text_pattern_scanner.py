@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多模式文本扫描引擎
+
+将多条正则规则合并为一个带命名分组的预编译表达式，对整个文件做一次 finditer，
+通过预先计算的换行位置映射行号和列号。批量扫描在进程池中并行执行，结果按文件
+内容哈希缓存，文件大小和修改时间未变化时直接复用，不再读取文件。
+
+供 PathStandardizer 和 ProjectNameStandardizer 共用。
+"""
+
+import os
+import re
+import json
+import bisect
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+# 少于该数量的待扫描文件直接在当前进程中处理
+PARALLEL_THRESHOLD = 32
+
+CACHE_VERSION = 1
+
+
+class ScanMatch(NamedTuple):
+    """一次匹配"""
+    rule: int           # 规则序号
+    text: str           # 匹配到的文本
+    line: int           # 行号（从1开始）
+    column: int         # 列号（从1开始）
+    line_text: str      # 所在行内容
+
+
+def read_text(file_path, encodings: Sequence[str] = ("utf-8",)) -> Tuple[Optional[str], bytes]:
+    """按顺序尝试编码读取文件，返回 (文本, 原始字节)；全部失败时文本为 None"""
+    with open(file_path, "rb") as f:
+        raw = f.read()
+    for encoding in encodings:
+        try:
+            return raw.decode(encoding), raw
+        except UnicodeDecodeError:
+            continue
+    return None, raw
+
+
+def iter_files(root: Path, exclude_dirs: Iterable[str] = (),
+               accept: Optional[Callable[[str], bool]] = None) -> Iterator[Path]:
+    """遍历目录，跳过排除目录（不进入其子树），accept 按文件名过滤"""
+    exclude_dirs = set(exclude_dirs)
+    stack = [str(root)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+        for entry in reversed(entries):
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in exclude_dirs:
+                    stack.append(entry.path)
+        for entry in entries:
+            if entry.is_file(follow_symlinks=False) and (accept is None or accept(entry.name)):
+                yield Path(entry.path)
+
+
+class MultiPatternScanner:
+    """多模式单次扫描器"""
+
+    def __init__(self, patterns: Sequence[str], flags: int = re.IGNORECASE,
+                 replacements: Optional[Sequence[str]] = None):
+        """
+        Args:
+            patterns: 正则表达式列表，匹配结果中的 rule 为其序号
+            flags: 正则标志
+            replacements: 与 patterns 一一对应的替换文本（可使用 \\1 等分组引用）
+        """
+        self.patterns = list(patterns)
+        self.flags = flags
+        self.replacements = list(replacements) if replacements is not None else None
+        self.rules = [re.compile(pattern, flags) for pattern in self.patterns]
+        # 排在前面的规则在同一位置优先匹配
+        self.combined = re.compile(
+            "|".join(f"(?P<_r{i}>{pattern})" for i, pattern in enumerate(self.patterns)),
+            flags
+        )
+        signature = json.dumps([self.patterns, flags], ensure_ascii=False)
+        self.signature = hashlib.blake2b(signature.encode("utf-8"), digest_size=8).hexdigest()
+
+    def scan_text(self, text: str) -> List[ScanMatch]:
+        """扫描文本，返回所有匹配及其行列位置"""
+        newlines = None
+        matches = []
+        for match in self.combined.finditer(text):
+            if newlines is None:
+                newlines = [i for i, ch in enumerate(text) if ch == "\n"] if "\n" in text else []
+            start = match.start()
+            line_index = bisect.bisect_left(newlines, start)
+            line_start = newlines[line_index - 1] + 1 if line_index else 0
+            line_end = newlines[line_index] if line_index < len(newlines) else len(text)
+            matches.append(ScanMatch(
+                int(match.lastgroup[2:]),
+                match.group(0),
+                line_index + 1,
+                start - line_start + 1,
+                text[line_start:line_end].rstrip("\r")
+            ))
+        return matches
+
+    def iter_substitutions(self, text: str) -> Iterator[Tuple[int, str]]:
+        """按规则顺序依次替换（与逐条 re.sub 的结果相同，前面规则的输出作为后面规则的输入）
+
+        合并表达式只用于预筛选：没有任何规则匹配的文本直接跳过。
+
+        Yields:
+            (规则序号, 替换后的文本)，只输出改变了文本的规则
+        """
+        if self.replacements is None:
+            raise ValueError("未配置替换规则")
+        if self.combined.search(text) is None:
+            return
+        for rule, (compiled, replacement) in enumerate(zip(self.rules, self.replacements)):
+            new_text = compiled.sub(replacement, text)
+            if new_text != text:
+                text = new_text
+                yield rule, text
+
+    def substitute(self, text: str) -> str:
+        """按替换规则依次替换文本，返回最终结果"""
+        for _, text in self.iter_substitutions(text):
+            pass
+        return text
+
+    def scan_file(self, file_path, encodings: Sequence[str] = ("utf-8",)) -> Optional[List[ScanMatch]]:
+        """扫描单个文件，无法解码时返回 None"""
+        text, _ = read_text(file_path, encodings)
+        if text is None:
+            return None
+        return self.scan_text(text)
+
+    def scan_paths(self, file_paths: Iterable[Path], encodings: Sequence[str] = ("utf-8",),
+                   cache_file: Optional[Path] = None, max_workers: Optional[int] = None
+                   ) -> Dict[str, Optional[List[ScanMatch]]]:
+        """批量扫描文件
+
+        Args:
+            file_paths: 文件路径
+            encodings: 依次尝试的编码
+            cache_file: 结果缓存文件，None 表示不缓存
+            max_workers: 进程数
+
+        Returns:
+            {文件路径: 匹配列表}，读取或解码失败的文件值为 None
+        """
+        cache = _ScanCache(cache_file, self.signature) if cache_file else None
+        results: Dict[str, Optional[List[ScanMatch]]] = {}
+        pending = []
+
+        for file_path in file_paths:
+            key = str(file_path)
+            try:
+                st = os.stat(key)
+            except OSError:
+                results[key] = None
+                continue
+            cached = cache.lookup(key, st) if cache else None
+            if cached is not None:
+                results[key] = cached
+            else:
+                pending.append((key, st))
+
+        if pending:
+            paths = [key for key, _ in pending]
+            if len(paths) < PARALLEL_THRESHOLD:
+                scanned = _scan_batch(self, paths, encodings)
+            else:
+                workers = max_workers or os.cpu_count() or 1
+                batch = max(8, len(paths) // (workers * 4))
+                batches = [paths[i:i + batch] for i in range(0, len(paths), batch)]
+                scanned = []
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    for batch_result in executor.map(_scan_batch, [self] * len(batches), batches,
+                                                     [encodings] * len(batches)):
+                        scanned.extend(batch_result)
+
+            for (key, st), (digest, matches) in zip(pending, scanned):
+                results[key] = matches
+                if cache and digest:
+                    cache.store(key, st, digest, matches)
+
+        if cache:
+            cache.save()
+        return results
+
+
+def _scan_batch(scanner: MultiPatternScanner, paths: List[str],
+                encodings: Sequence[str]) -> List[Tuple[Optional[str], Optional[List[ScanMatch]]]]:
+    """进程池任务：读取、哈希并扫描一批文件"""
+    results = []
+    for path in paths:
+        try:
+            text, raw = read_text(path, encodings)
+        except OSError:
+            results.append((None, None))
+            continue
+        digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+        results.append((digest, scanner.scan_text(text) if text is not None else None))
+    return results
+
+
+class _ScanCache:
+    """扫描结果缓存：路径 -> (大小, 修改时间, 内容哈希)，内容哈希 -> 匹配结果"""
+
+    def __init__(self, cache_file: Path, signature: str):
+        self.cache_file = Path(cache_file)
+        self.signature = signature
+        self.files: Dict[str, list] = {}
+        self.results: Dict[str, Optional[list]] = {}
+        self.dirty = False
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION and data.get("signature") == signature:
+                self.files = data.get("files", {})
+                self.results = data.get("results", {})
+        except (OSError, ValueError):
+            pass
+
+    def lookup(self, key: str, st: os.stat_result) -> Optional[List[ScanMatch]]:
+        entry = self.files.get(key)
+        if not entry or entry[0] != st.st_size or entry[1] != st.st_mtime_ns or entry[2] not in self.results:
+            return None
+        matches = self.results[entry[2]]
+        return [ScanMatch(*m) for m in matches] if matches is not None else None
+
+    def store(self, key: str, st: os.stat_result, digest: str, matches: Optional[List[ScanMatch]]):
+        self.files[key] = [st.st_size, st.st_mtime_ns, digest]
+        self.results[digest] = [list(m) for m in matches] if matches is not None else None
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        # 清理不再被引用的结果
+        referenced = {entry[2] for entry in self.files.values()}
+        self.results = {digest: r for digest, r in self.results.items() if digest in referenced}
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump({
+                    "version": CACHE_VERSION,
+                    "signature": self.signature,
+                    "files": self.files,
+                    "results": self.results
+                }, f, ensure_ascii=False)
+            os.replace(tmp_file, self.cache_file)
+        except OSError:
+            pass
+        self.dirty = False
@@ -14,12 +14,14 @@ import schedule
 import time
 from pathlib import Path
 from typing import Set, List, Optional, Dict
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
 # 添加项目根目录到Python路径
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from tools.directory_tree import render_tree
+
 try:
     from tools.config_loader import ConfigLoader
 except ImportError:
@@ -29,6 +31,8 @@ except ImportError:
         def load_config():
             return {}
 
+from tools.compliance_metrics_store import ComplianceMetricsStore, MetricSummary
+
 try:
     from tools.compliance_monitor import ComplianceMonitor
     from tools.pre_operation_check import ProjectComplianceChecker
@@ -49,6 +53,11 @@ class UnifiedReportGenerator:
         self.reports_dir = self.project_root / "logs" / "compliance_reports"
         self.reports_dir.mkdir(parents=True, exist_ok=True)
         
+        # 合规指标时间序列（写入时预聚合，周报和区间报告无需重新读取日报）
+        self.metrics = ComplianceMetricsStore(self.reports_dir / "metrics.sqlite3")
+        if self.metrics.is_empty():
+            self._import_daily_reports()
+        
         # 初始化监控和检查器（如果可用）
         if ComplianceMonitor:
             self.monitor = ComplianceMonitor(str(self.project_root))
@@ -62,46 +71,21 @@ class UnifiedReportGenerator:
 
     # ==================== 基础报告生成功能 ====================
     
-    def generate_directory_tree(self, paths: Set[str], max_depth: int = 3) -> str:
-        """生成目录树结构"""
+    def generate_directory_tree(self, paths: Set[str], max_depth: int = 3,
+                                dirs: Optional[Set[str]] = None) -> str:
+        """生成目录树结构
+
+        作为其他路径前缀的条目、dirs 中的条目以及以 / 结尾的路径视为目录。提供
+        dirs（如 DirectoryScanner.directories）时不访问文件系统；未提供时，无法
+        从快照判断的叶子条目用 is_dir() 判断。
+        """
         if not paths:
             return "(空目录)"
 
-        # 将路径转换为Path对象并排序
-        path_objects = [Path(p) for p in paths]
-        path_objects.sort()
-
-        # 构建树结构
-        tree_lines = []
-        processed_dirs = set()
-
-        for path_obj in path_objects:
-            # 获取相对于项目根目录的路径
-            try:
-                rel_path = path_obj.relative_to(self.project_root)
-            except ValueError:
-                rel_path = path_obj
-
-            parts = rel_path.parts
-            if len(parts) > max_depth:
-                continue
-
-            # 构建每一级的缩进
-            for i, part in enumerate(parts):
-                current_path = Path(*parts[: i + 1])
-                if current_path not in processed_dirs:
-                    indent = "│   " * i
-                    if i == len(parts) - 1:
-                        # 最后一级，判断是文件还是目录
-                        if path_obj.is_dir():
-                            tree_lines.append(f"{indent}├── {part}/")
-                        else:
-                            tree_lines.append(f"{indent}├── {part}")
-                    else:
-                        tree_lines.append(f"{indent}├── {part}/")
-                    processed_dirs.add(current_path)
-
-        return "\n".join(tree_lines)
+        if dirs is not None:
+            return render_tree(paths, dirs, root=self.project_root, max_depth=max_depth)
+        return render_tree(paths, root=self.project_root, max_depth=max_depth,
+                           probe=lambda path: Path(path).is_dir())
 
     def format_file_list(self, files: List[Path], title: str = "文件列表") -> str:
         """格式化文件列表"""
@@ -182,9 +166,14 @@ class UnifiedReportGenerator:
         header += "\n\n"
         return header
 
-    def generate_directory_section(self, paths: Set[str], title: str = "完整目录树") -> str:
-        """生成目录结构部分"""
-        tree_content = self.generate_directory_tree(paths)
+    def generate_directory_section(self, paths: Set[str], title: str = "完整目录树",
+                                   dirs: Optional[Set[str]] = None) -> str:
+        """生成目录结构部分
+
+        dirs 为扫描器已知的目录集合（如 DirectoryScanner.directories），提供后渲染时
+        不再访问文件系统。
+        """
+        tree_content = self.generate_directory_tree(paths, dirs=dirs)
 
         # 从配置文件读取目录树根节点名称
         structure_config = self.config.get("structure_check", {})
@@ -223,6 +212,9 @@ class UnifiedReportGenerator:
             "recommendations": self._generate_recommendations(status)
         }
         
+        # 记录指标（同时更新日、周预聚合）
+        self.metrics.append(report["summary"])
+        
         # 保存报告
         report_file = self.reports_dir / f"daily_report_{datetime.now().strftime('%Y%m%d')}.json"
         with open(report_file, 'w', encoding='utf-8') as f:
@@ -234,32 +226,20 @@ class UnifiedReportGenerator:
         print(f"✅ 每日报告已生成: {report_file}")
         
     def generate_weekly_report(self):
-        """生成每周合规性报告"""
+        """生成每周合规性报告（最近7天）"""
         print(f"📈 生成每周合规性报告 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
-        # 收集一周内的所有日报
-        week_start = datetime.now() - timedelta(days=7)
-        daily_reports = []
+        today = datetime.now().date()
+        report = self._build_period_report("weekly", today - timedelta(days=6), today)
         
-        for i in range(7):
-            date = week_start + timedelta(days=i)
-            report_file = self.reports_dir / f"daily_report_{date.strftime('%Y%m%d')}.json"
-            if report_file.exists():
-                with open(report_file, 'r', encoding='utf-8') as f:
-                    daily_reports.append(json.load(f))
-        
-        # 生成周报
-        report = {
-            "report_type": "weekly",
-            "generated_at": datetime.now().isoformat(),
-            "period": {
-                "start": week_start.strftime('%Y-%m-%d'),
-                "end": datetime.now().strftime('%Y-%m-%d')
-            },
-            "daily_reports_count": len(daily_reports),
-            "trends": self._analyze_trends(daily_reports),
-            "summary": self._generate_weekly_summary(daily_reports)
-        }
+        # 本自然周与上一自然周对比（直接读取周预聚合）
+        current_week = self.metrics.week_summary(today)
+        previous_week = self.metrics.week_summary(today - timedelta(days=7))
+        if "compliance_score" in current_week and "compliance_score" in previous_week:
+            report["week_over_week"] = {
+                name: current_week[name].mean - previous_week[name].mean
+                for name in current_week if name in previous_week
+            }
         
         # 保存周报
         report_file = self.reports_dir / f"weekly_report_{datetime.now().strftime('%Y%m%d')}.json"
@@ -271,6 +251,53 @@ class UnifiedReportGenerator:
         
         print(f"✅ 每周报告已生成: {report_file}")
         
+    def generate_range_report(self, start: date, end: date):
+        """生成任意时间段的合规性报告"""
+        print(f"📈 生成区间合规性报告 - {start.isoformat()} 至 {end.isoformat()}")
+        
+        report = self._build_period_report("range", start, end)
+        
+        report_file = self.reports_dir / f"range_report_{start.strftime('%Y%m%d')}_{end.strftime('%Y%m%d')}.json"
+        with open(report_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        
+        self._generate_markdown_report(report, "range")
+        
+        print(f"✅ 区间报告已生成: {report_file}")
+        
+    def _build_period_report(self, report_type: str, start: date, end: date) -> Dict:
+        """从预聚合指标生成周报或区间报告"""
+        summaries = self.metrics.summary(start, end)
+        days_with_data = summaries["compliance_score"].days if "compliance_score" in summaries else 0
+        
+        return {
+            "report_type": report_type,
+            "generated_at": datetime.now().isoformat(),
+            "period": {
+                "start": start.strftime('%Y-%m-%d'),
+                "end": end.strftime('%Y-%m-%d'),
+                "days": (end - start).days + 1
+            },
+            "daily_reports_count": days_with_data,
+            "trends": self._analyze_trends(start, end),
+            "summary": self._generate_weekly_summary(summaries),
+            "metrics": {name: summary.to_dict() for name, summary in summaries.items()}
+        }
+        
+    def _import_daily_reports(self):
+        """首次使用指标存储时导入已有的日报"""
+        samples = []
+        for report_file in sorted(self.reports_dir.glob("daily_report_*.json")):
+            try:
+                with open(report_file, 'r', encoding='utf-8') as f:
+                    report = json.load(f)
+                samples.append((datetime.fromisoformat(report["generated_at"]), report.get("summary", {})))
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️ 跳过无法导入的日报 {report_file.name}: {e}")
+        if samples:
+            self.metrics.append_many(samples)
+            print(f"📥 已导入 {len(samples)} 份历史日报到指标存储")
+        
     def _generate_summary(self, status: Dict) -> Dict:
         """生成状态摘要"""
         total_violations = status.get('total_violations', 0)
@@ -301,34 +328,42 @@ class UnifiedReportGenerator:
             
         return recommendations
         
-    def _analyze_trends(self, daily_reports: List[Dict]) -> Dict:
-        """分析趋势"""
-        if not daily_reports:
+    def _analyze_trends(self, start: date, end: date) -> Dict:
+        """分析趋势（未解决违规数的每日序列、7日滑动平均和百分位数）"""
+        trend = self.metrics.trend("unresolved_violations", start, end)
+        if "series" not in trend:
             return {"trend": "无数据"}
-            
-        violations_trend = []
-        for report in daily_reports:
-            summary = report.get('summary', {})
-            violations_trend.append(summary.get('unresolved_violations', 0))
-            
+        
+        score_trend = self.metrics.trend("compliance_score", start, end)
+        slope = trend["slope_per_day"]
+        
         return {
-            "violations_trend": violations_trend,
-            "average_violations": sum(violations_trend) / len(violations_trend),
-            "trend_direction": "改善" if violations_trend[-1] < violations_trend[0] else "恶化" if violations_trend[-1] > violations_trend[0] else "稳定"
+            "violations_trend": trend["series"],
+            "days": trend["days"],
+            "average_violations": trend["average"],
+            "moving_average_violations": trend["moving_average"],
+            "violations_percentiles": trend["percentiles"],
+            "compliance_score_moving_average": score_trend.get("moving_average", []),
+            "compliance_score_percentiles": score_trend.get("percentiles", {}),
+            "slope_per_day": slope,
+            "trend_direction": "改善" if slope < 0 else "恶化" if slope > 0 else "稳定"
         }
         
-    def _generate_weekly_summary(self, daily_reports: List[Dict]) -> Dict:
-        """生成周摘要"""
-        if not daily_reports:
-            return {"message": "本周无数据"}
-            
-        total_violations = sum(r.get('summary', {}).get('total_violations', 0) for r in daily_reports)
-        avg_compliance_score = sum(r.get('summary', {}).get('compliance_score', 0) for r in daily_reports) / len(daily_reports)
+    def _generate_weekly_summary(self, summaries: Dict[str, MetricSummary]) -> Dict:
+        """生成周期摘要"""
+        score = summaries.get("compliance_score")
+        if not score or not score.days:
+            return {"message": "本周期无数据"}
+        
+        total = summaries.get("total_violations")
+        avg_compliance_score = score.mean_daily_last
         
         return {
-            "total_violations_week": total_violations,
+            "total_violations_week": total.sum_daily_last if total else 0,
             "average_compliance_score": avg_compliance_score,
-            "days_with_data": len(daily_reports),
+            "min_compliance_score": score.minimum,
+            "max_compliance_score": score.maximum,
+            "days_with_data": score.days,
             "compliance_grade": self._get_compliance_grade(avg_compliance_score)
         }
         
@@ -348,11 +383,16 @@ class UnifiedReportGenerator:
     def _generate_markdown_report(self, report: Dict, report_type: str):
         """生成Markdown格式报告"""
         timestamp = datetime.now().strftime('%Y%m%d')
+        if report_type == "range":
+            period = report["period"]
+            timestamp = f"{period['start'].replace('-', '')}_{period['end'].replace('-', '')}"
         md_file = self.reports_dir / f"{report_type}_report_{timestamp}.md"
         
         with open(md_file, 'w', encoding='utf-8') as f:
             if report_type == "daily":
                 self._write_daily_markdown(f, report)
+            elif report_type == "range":
+                self._write_weekly_markdown(f, report, "区间合规性报告")
             else:
                 self._write_weekly_markdown(f, report)
                 
@@ -376,9 +416,9 @@ class UnifiedReportGenerator:
                 f.write(f"- {rec}\n")
             f.write("\n")
                 
-    def _write_weekly_markdown(self, f, report: Dict):
-        """写入每周Markdown报告"""
-        f.write(f"# 每周合规性报告\n\n")
+    def _write_weekly_markdown(self, f, report: Dict, title: str = "每周合规性报告"):
+        """写入每周（或任意区间）Markdown报告"""
+        f.write(f"# {title}\n\n")
         f.write(f"**生成时间**: {report['generated_at']}\n\n")
         
         period = report.get('period', {})
@@ -389,12 +429,21 @@ class UnifiedReportGenerator:
         f.write(f"- **平均合规评分**: {summary.get('average_compliance_score', 0):.1f}/100\n")
         f.write(f"- **合规等级**: {summary.get('compliance_grade', 'N/A')}\n")
         f.write(f"- **本周总违规**: {summary.get('total_violations_week', 0)}\n")
-        f.write(f"- **有数据天数**: {summary.get('days_with_data', 0)}/7\n\n")
+        f.write(f"- **有数据天数**: {summary.get('days_with_data', 0)}/{period.get('days', 7)}\n\n")
         
         trends = report.get('trends', {})
         f.write(f"## 📊 趋势分析\n\n")
         f.write(f"- **趋势方向**: {trends.get('trend_direction', 'N/A')}\n")
-        f.write(f"- **平均违规数**: {trends.get('average_violations', 0):.1f}\n\n")
+        f.write(f"- **平均违规数**: {trends.get('average_violations', 0):.1f}\n")
+        week_over_week = report.get('week_over_week')
+        if week_over_week:
+            f.write(f"- **合规评分较上周**: {week_over_week.get('compliance_score', 0):+.1f}\n")
+        moving_average = trends.get('moving_average_violations')
+        if moving_average:
+            f.write(f"- **7日滑动平均（期末）**: {moving_average[-1]:.1f}\n")
+        for name, value in trends.get('violations_percentiles', {}).items():
+            f.write(f"- **违规数{name.upper()}**: {value:.1f}\n")
+        f.write("\n")
 
     # ==================== 定时任务功能 ====================
     
@@ -427,6 +476,7 @@ def main():
     parser = argparse.ArgumentParser(description="统一报告生成器")
     parser.add_argument("--daily", action="store_true", help="生成每日报告")
     parser.add_argument("--weekly", action="store_true", help="生成每周报告")
+    parser.add_argument("--range", nargs=2, metavar=("START", "END"), help="生成指定日期区间的报告（YYYY-MM-DD）")
     parser.add_argument("--schedule", action="store_true", help="启动定时任务")
     parser.add_argument("--project-root", default="s:/PG-GMO", help="项目根目录")
     
@@ -438,10 +488,17 @@ def main():
         generator.generate_daily_report()
     elif args.weekly:
         generator.generate_weekly_report()
+    elif args.range:
+        try:
+            start, end = (date.fromisoformat(value) for value in args.range)
+        except ValueError as e:
+            print(f"❌ 日期格式错误: {e}")
+            return
+        generator.generate_range_report(start, end)
     elif args.schedule:
         generator.run_scheduler()
     else:
-        print("请指定操作: --daily, --weekly, 或 --schedule")
+        print("请指定操作: --daily, --weekly, --range, 或 --schedule")
         parser.print_help()
 
 